@@ -2,7 +2,10 @@ import json
 import os
 import signal
 import time
-from typing import Dict, Optional, Tuple, Union
+from bisect import bisect_left
+from collections import deque
+from threading import Event, Lock
+from typing import Dict, List, Optional, Tuple, Union
 
 import msgpack
 from rocksq.blocking import PersistentQueueWithCapacity
@@ -31,8 +34,14 @@ from savant_rs.zmq import (
     WriterSocketType,
 )
 
+from adapters.python.shared.message_dump import MessageDumpIndex, get_index_path
 from adapters.shared.thread import BaseThreadWorker
-from savant.metrics import get_or_create_counter, get_or_create_gauge
+from savant.metrics import (
+    HistogramFamily,
+    get_or_create_counter,
+    get_or_create_gauge,
+    get_or_create_histogram,
+)
 from savant.utils.config import opt_config, req_config, strtobool
 from savant.utils.log import get_logger, init_logging
 from savant.utils.welcome import get_starting_message
@@ -44,6 +53,22 @@ QUEUE_ITEM_SIZE = 3
 logger = get_logger(LOGGER_NAME)
 
 
+def get_latency_histogram() -> HistogramFamily:
+    """Histogram of message latencies by stage, in seconds.
+
+    Stages:
+    - ingress_push: pushing messages to the buffer;
+    - queue_wait: time messages wait in the buffer;
+    - egress_send: sending a message to the sink ZeroMQ socket;
+    - end_to_end: time from the frame creation to sending it to the sink ZeroMQ socket.
+    """
+    return get_or_create_histogram(
+        'stage_latency',
+        'Latency of messages by adapter stage, in seconds',
+        ['stage'],
+    )
+
+
 class MetricsConfig:
     """Metrics configuration for the adapter."""
 
@@ -86,6 +111,16 @@ class BufferConfig:
         self.threshold = int(len_items * threshold_percentage / 100) * QUEUE_ITEM_SIZE
 
 
+class BatchConfig:
+    """Batching configuration for the adapter."""
+
+    def __init__(self):
+        self.max_size = opt_config('BATCH_MAX_SIZE', 1, int)
+        assert self.max_size > 0, 'BATCH_MAX_SIZE must be positive'
+        self.max_linger = opt_config('BATCH_MAX_LINGER', 0.01, float)
+        assert self.max_linger >= 0, 'BATCH_MAX_LINGER must be non-negative'
+
+
 class Config:
     """Configuration for the adapter."""
 
@@ -95,13 +130,18 @@ class Config:
         self.zmq_sink_endpoint = req_config('ZMQ_SINK_ENDPOINT')
         self.buffer = BufferConfig()
         self.message_dump = MessageDumpConfig()
+        self.batch = BatchConfig()
         self.idle_polling_period = opt_config('IDLE_POLLING_PERIOD', 0.005, float)
         self.stats_log_interval = opt_config('STATS_LOG_INTERVAL', 60, int)
         self.metrics = MetricsConfig()
 
 
 class MessageDumper:
-    """Message dump for the adapter."""
+    """Message dump for the adapter.
+
+    An index of the segment is written when the segment is rotated
+    or the dumper is closed.
+    """
 
     def __init__(self, config: MessageDumpConfig):
         self._config = config
@@ -113,6 +153,8 @@ class MessageDumper:
         self._segment_start = 0
         self._segment_path = self._get_segment_path()
         self._file = None
+        self._index: Optional[MessageDumpIndex] = None
+        self._offset = 0
 
     def dump(self, message: ZeroMQMessage):
         """Dump the message to the message dump."""
@@ -122,24 +164,37 @@ class MessageDumper:
             return
 
         if time.time() - self._segment_start > self._config.segment_duration:
+            self.close()
             self._segment_start = time.time()
             self._segment_path = self._get_segment_path()
             logger.info(
                 'Rotating message dump segment. New segment: %s', self._segment_path
             )
-            if self._file is not None:
-                self._file.close()
             self._file = open(self._segment_path, 'wb')
+            self._index = MessageDumpIndex()
+            self._offset = 0
 
         topic = message.topic
         meta = message.message
         content = message.content
         ts = time.time_ns()
-        self._file.write(
-            msgpack.packb(
-                (ts, topic, save_message_to_bytes(meta), content), use_bin_type=True
-            )
+        data = msgpack.packb(
+            (ts, topic, save_message_to_bytes(meta), content), use_bin_type=True
         )
+        self._file.write(data)
+        self._index.add(ts, bytes(topic).decode(), self._offset)
+        self._offset += len(data)
+
+    def close(self):
+        """Close the current segment and write its index."""
+
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        index_path = get_index_path(self._segment_path)
+        logger.info('Writing message dump index %s', index_path)
+        self._index.write(index_path)
 
     def _get_segment_path(self):
         return os.path.join(
@@ -148,16 +203,128 @@ class MessageDumper:
         )
 
 
+class BatchSizeStats:
+    """Distribution of batch sizes in power of two buckets."""
+
+    def __init__(self, max_size: int):
+        self._upper_bounds = []
+        upper_bound = 1
+        while upper_bound < max_size:
+            self._upper_bounds.append(upper_bound)
+            upper_bound *= 2
+        self._upper_bounds.append(max_size)
+        self._labels = []
+        lower_bound = 1
+        for upper_bound in self._upper_bounds:
+            if lower_bound == upper_bound:
+                self._labels.append(str(upper_bound))
+            else:
+                self._labels.append(f'{lower_bound}-{upper_bound}')
+            lower_bound = upper_bound + 1
+        self._counts = [0] * len(self._upper_bounds)
+
+    def add(self, size: int):
+        """Add a batch of the specified size."""
+        self._counts[bisect_left(self._upper_bounds, size)] += 1
+
+    @property
+    def distribution(self) -> Dict[str, int]:
+        """Number of batches by batch size bucket."""
+        return dict(zip(self._labels, self._counts))
+
+
+class BufferQueueTracker:
+    """Tracks messages in the buffer queue: wakes up Egress when messages
+    are pushed and measures the time messages wait in the buffer.
+
+    :param untracked: Number of messages already in the buffer
+        (e.g. left from the previous run), their wait time is not measured.
+    """
+
+    def __init__(self, untracked: int = 0):
+        self._lock = Lock()
+        self._pushed_event = Event()
+        # [push timestamp, number of messages]
+        self._pushes = deque()
+        self._untracked = untracked
+        self._wait_time = 0.0
+        self._wait_messages = 0
+        self._latency_histogram = get_latency_histogram()
+
+    def push(self, n_messages: int):
+        """Record messages before pushing them to the buffer."""
+        with self._lock:
+            self._pushes.append([time.time(), n_messages])
+
+    def cancel_push(self, n_messages: int):
+        """Cancel the last record when the messages were not pushed."""
+        with self._lock:
+            self._pushes[-1][1] -= n_messages
+            if self._pushes[-1][1] <= 0:
+                self._pushes.pop()
+
+    def pushed(self):
+        """Notify waiters the messages were pushed to the buffer."""
+        self._pushed_event.set()
+
+    def wait_pushed(self, timeout: float):
+        """Wait until messages are pushed to the buffer or timeout expires.
+
+        :param timeout: Timeout in seconds.
+        """
+        self._pushed_event.wait(timeout)
+
+    def reset_pushed(self):
+        """Reset the pushed state before checking the buffer is empty."""
+        self._pushed_event.clear()
+
+    def popped(self, n_messages: int):
+        """Record messages popped from the buffer."""
+        now = time.time()
+        with self._lock:
+            untracked = min(self._untracked, n_messages)
+            self._untracked -= untracked
+            n_messages -= untracked
+            while n_messages > 0 and self._pushes:
+                push = self._pushes[0]
+                n_popped = min(push[1], n_messages)
+                self._wait_time += (now - push[0]) * n_popped
+                self._latency_histogram.observe(
+                    now - push[0], ('queue_wait',), n_popped
+                )
+                self._wait_messages += n_popped
+                n_messages -= n_popped
+                push[1] -= n_popped
+                if push[1] == 0:
+                    self._pushes.popleft()
+
+    @property
+    def wait_time(self) -> float:
+        """Total time the popped messages waited in the buffer, in seconds."""
+        return self._wait_time
+
+    @property
+    def wait_messages(self) -> int:
+        """Number of popped messages with measured wait time."""
+        return self._wait_messages
+
+
 class Ingress(BaseThreadWorker):
     """Receives messages from the source ZeroMQ socket and pushes them to the buffer."""
 
-    def __init__(self, queue: PersistentQueueWithCapacity, config: Config):
+    def __init__(
+        self,
+        queue: PersistentQueueWithCapacity,
+        queue_tracker: BufferQueueTracker,
+        config: Config,
+    ):
         super().__init__(
             thread_name='Ingress',
             logger_name=f'{LOGGER_NAME}.{self.__class__.__name__}',
             daemon=True,
         )
         self._queue = queue
+        self._queue_tracker = queue_tracker
         self._config = config
         self._message_dumper = MessageDumper(config.message_dump)
         self._buffer_is_full = False
@@ -167,7 +334,19 @@ class Ingress(BaseThreadWorker):
         self._last_pushed_message = 0
         self._dropped_messages = 0
         self._last_dropped_message = 0
-        self._zmq_source = ZeroMQSource(config.zmq_src_endpoint)
+        # frames accumulated to push them to the buffer at once
+        self._batch_parts: List[bytes] = []
+        self._batch_started = 0
+        self._batch_stats = BatchSizeStats(config.batch.max_size)
+        self._latency_histogram = get_latency_histogram()
+        if config.batch.max_size > 1:
+            # wake up in time to push the lingering batch
+            self._zmq_source = ZeroMQSource(
+                config.zmq_src_endpoint,
+                receive_timeout=max(1, int(config.batch.max_linger * 1000)),
+            )
+        else:
+            self._zmq_source = ZeroMQSource(config.zmq_src_endpoint)
 
     def workload(self):
         self.logger.info('Starting Ingress')
@@ -178,10 +357,21 @@ class Ingress(BaseThreadWorker):
                 if zmq_message is not None:
                     self.logger.debug('Received message from the source ZeroMQ socket')
                     self.handle_next_message(zmq_message)
+                if (
+                    self._batch_parts
+                    and time.time() - self._batch_started
+                    >= self._config.batch.max_linger
+                ):
+                    self.flush()
             except Exception as e:
                 self.logger.error('Failed to poll message: %s', e)
                 self.is_running = False
                 break
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.error('Failed to push messages: %s', e)
+        self._message_dumper.close()
         self._zmq_source.terminate()
         self.logger.info('Ingress was stopped')
 
@@ -191,20 +381,21 @@ class Ingress(BaseThreadWorker):
         self._received_messages += 1
         self._last_received_message = time.time()
         if message.message.is_video_frame():
-            pushed = self.push_frame(message)
-        else:
-            pushed = self.push_service_message(message)
-        if pushed:
-            self._pushed_messages += 1
-            self._last_pushed_message = time.time()
+            accepted = self.push_frame(message)
         else:
+            accepted = self.push_service_message(message)
+        if not accepted:
             self._dropped_messages += 1
             self._last_dropped_message = time.time()
 
     def push_frame(self, message: ZeroMQMessage) -> bool:
-        """Push frame to the buffer."""
+        """Push frame to the buffer.
 
-        buffer_size = self._queue.len
+        The frame is pushed in a batch when the batch is full
+        or its linger time is expired.
+        """
+
+        buffer_size = self._queue.len + len(self._batch_parts)
         if self._buffer_is_full:
             if buffer_size >= self._config.buffer.threshold:
                 self.logger.debug('Buffer is full, dropping the frame')
@@ -217,15 +408,20 @@ class Ingress(BaseThreadWorker):
             self.logger.debug('Buffer is full, dropping the frame')
             return False
 
-        self._push_message(message)
-        self.logger.debug('Pushed frame to the buffer')
+        if not self._batch_parts:
+            self._batch_started = time.time()
+        self._batch_parts.extend(self._message_parts(message))
+        if len(self._batch_parts) >= self._config.batch.max_size * QUEUE_ITEM_SIZE:
+            self.flush()
         return True
 
     def push_service_message(self, message: ZeroMQMessage) -> bool:
         """Push service message to the buffer."""
 
+        # keep the order of the messages
+        self.flush()
         try:
-            self._push_message(message)
+            self._push_messages(self._message_parts(message))
         except Exception as e:
             if e.args[0] != 'Failed to push item: Queue is full':
                 raise
@@ -235,13 +431,46 @@ class Ingress(BaseThreadWorker):
         self.logger.debug('Pushed message to the buffer')
         return True
 
-    def _push_message(self, message: ZeroMQMessage):
-        message_parts = [
+    def flush(self):
+        """Push the accumulated frames to the buffer."""
+
+        if not self._batch_parts:
+            return
+        message_parts = self._batch_parts
+        self._batch_parts = []
+        self._push_messages(message_parts)
+        self.logger.debug(
+            'Pushed %s frames to the buffer', len(message_parts) // QUEUE_ITEM_SIZE
+        )
+
+    def _message_parts(self, message: ZeroMQMessage) -> List[bytes]:
+        return [
             bytes(message.topic),
             save_message_to_bytes(message.message),
             message.content,
         ]
-        self._queue.push(message_parts)
+
+    def _push_messages(self, message_parts: List[bytes]):
+        n_messages = len(message_parts) // QUEUE_ITEM_SIZE
+        self._queue_tracker.push(n_messages)
+        started = time.perf_counter()
+        try:
+            self._queue.push(message_parts)
+        except Exception:
+            self._queue_tracker.cancel_push(n_messages)
+            raise
+        self._latency_histogram.observe(
+            time.perf_counter() - started, ('ingress_push',), n_messages
+        )
+        self._queue_tracker.pushed()
+        self._batch_stats.add(n_messages)
+        self._pushed_messages += n_messages
+        self._last_pushed_message = time.time()
+
+    @property
+    def batch_sizes(self) -> Dict[str, int]:
+        """Number of batches pushed to the buffer by batch size."""
+        return self._batch_stats.distribution
 
     @property
     def received_messages(self) -> int:
@@ -280,6 +509,7 @@ class Egress(BaseThreadWorker):
     def __init__(
         self,
         queue: PersistentQueueWithCapacity,
+        queue_tracker: BufferQueueTracker,
         pipeline: VideoPipeline,
         config: Config,
     ):
@@ -289,7 +519,11 @@ class Egress(BaseThreadWorker):
             daemon=True,
         )
         self._queue = queue
+        self._queue_tracker = queue_tracker
         self._idle_polling_period = config.idle_polling_period
+        self._batch_max_size = config.batch.max_size
+        self._batch_stats = BatchSizeStats(config.batch.max_size)
+        self._latency_histogram = get_latency_histogram()
         self._sent_messages = 0
         self._last_sent_message = 0
         self._pipeline = pipeline
@@ -315,28 +549,8 @@ class Egress(BaseThreadWorker):
         self._writer.start()
         while self.is_running:
             try:
-                message = self.pop_next_message()
-                if message is not None:
-                    is_sent = False
-                    while not is_sent:
-                        self.logger.debug('Sending a message to the sink ZeroMQ socket')
-                        send_message_result = self._writer.send_message(*message)
-                        if isinstance(
-                            send_message_result, (WriterResultSuccess, WriterResultAck)
-                        ):
-                            self._sent_messages += 1
-                            self._last_sent_message = time.time()
-                            is_sent = True
-                        elif isinstance(send_message_result, WriterResultSendTimeout):
-                            self.logger.warning(
-                                'Failed to send message to the sink ZeroMQ socket due to timeout. Retrying'
-                            )
-                        else:
-                            self.logger.warning(
-                                'Error sending a message to the sink ZeroMQ socket: %s. Ignoring',
-                                send_message_result,
-                            )
-                            is_sent = True
+                for message in self.pop_next_messages():
+                    self.send_message(message)
             except Exception as e:
                 self.logger.error('Failed to send message: %s', e)
                 self.is_running = False
@@ -344,28 +558,66 @@ class Egress(BaseThreadWorker):
         self._writer.shutdown()
         self.logger.info('Egress was stopped')
 
-    def pop_next_message(self) -> Optional[Tuple[str, Message, bytes]]:
-        """Pop the next message from the buffer.
-
-        When the buffer is empty, wait until it is not empty and then pop the message.
+    def send_message(self, message: Tuple[str, Message, bytes]):
+        """Send the message to the sink ZeroMQ socket, retry on timeout."""
+
+        is_sent = False
+        started = time.perf_counter()
+        while not is_sent:
+            self.logger.debug('Sending a message to the sink ZeroMQ socket')
+            send_message_result = self._writer.send_message(*message)
+            if isinstance(send_message_result, (WriterResultSuccess, WriterResultAck)):
+                self._sent_messages += 1
+                self._last_sent_message = time.time()
+                is_sent = True
+                self._observe_latencies(message[1], started)
+            elif isinstance(send_message_result, WriterResultSendTimeout):
+                self.logger.warning(
+                    'Failed to send message to the sink ZeroMQ socket due to timeout. Retrying'
+                )
+            else:
+                self.logger.warning(
+                    'Error sending a message to the sink ZeroMQ socket: %s. Ignoring',
+                    send_message_result,
+                )
+                is_sent = True
+
+    def _observe_latencies(self, message: Message, started: float):
+        self._latency_histogram.observe(time.perf_counter() - started, ('egress_send',))
+        if message.is_video_frame():
+            frame_age = time.time_ns() - message.as_video_frame().creation_timestamp_ns
+            self._latency_histogram.observe(max(frame_age, 0) / 1e9, ('end_to_end',))
+
+    def pop_next_messages(self) -> List[Tuple[str, Message, bytes]]:
+        """Pop the next messages from the buffer, up to the maximum batch size.
+
+        When the buffer is empty, wait until messages are pushed to the buffer
+        or the idle polling period expires and return an empty list.
         """
 
         if self._queue.len < QUEUE_ITEM_SIZE:
-            self.logger.trace(
-                'Buffer is empty, waiting for %s seconds',
-                self._idle_polling_period,
-            )
-            time.sleep(self._idle_polling_period)
-            return None
+            self._queue_tracker.reset_pushed()
+            if self._queue.len < QUEUE_ITEM_SIZE:
+                self.logger.trace(
+                    'Buffer is empty, waiting for %s seconds',
+                    self._idle_polling_period,
+                )
+                self._queue_tracker.wait_pushed(self._idle_polling_period)
+                return []
 
-        topic, message, data = self._queue.pop(QUEUE_ITEM_SIZE)
-        topic = topic.decode()
-        message = load_message_from_bytes(message)
+        items = self._queue.pop(QUEUE_ITEM_SIZE * self._batch_max_size)
+        messages = []
+        for i in range(0, len(items), QUEUE_ITEM_SIZE):
+            topic, message, data = items[i : i + QUEUE_ITEM_SIZE]
+            messages.append((topic.decode(), load_message_from_bytes(message), data))
 
-        frame_id = self._pipeline.add_frame('fps-meter', self._video_frame)
-        self._pipeline.delete(frame_id)
+            frame_id = self._pipeline.add_frame('fps-meter', self._video_frame)
+            self._pipeline.delete(frame_id)
 
-        return topic, message, data
+        self._queue_tracker.popped(len(messages))
+        self._batch_stats.add(len(messages))
+
+        return messages
 
     @property
     def last_sent_message(self) -> int:
@@ -377,6 +629,11 @@ class Egress(BaseThreadWorker):
         """Number of messages sent to the sink ZeroMQ socket."""
         return self._sent_messages
 
+    @property
+    def batch_sizes(self) -> Dict[str, int]:
+        """Number of batches popped from the buffer by batch size."""
+        return self._batch_stats.distribution
+
 
 class StatsAggregator:
     """Aggregates statistics from the adapter threads."""
@@ -384,10 +641,12 @@ class StatsAggregator:
     def __init__(
         self,
         queue: PersistentQueueWithCapacity,
+        queue_tracker: BufferQueueTracker,
         ingress: Ingress,
         egress: Egress,
     ):
         self._queue = queue
+        self._queue_tracker = queue_tracker
         self._ingress = ingress
         self._egress = egress
 
@@ -399,7 +658,11 @@ class StatsAggregator:
         - pushed_messages: number of messages pushed to the buffer;
         - dropped_messages: number of messages dropped by the adapter;
         - sent_messages: number of messages sent to the sink ZeroMQ socket;
-        - buffer_size: number of messages in the buffer.
+        - buffer_size: number of messages in the buffer;
+        - ingress_batches: number of batches pushed to the buffer by batch size;
+        - egress_batches: number of batches popped from the buffer by batch size;
+        - queue_wait_time: total time the sent messages waited in the buffer;
+        - queue_wait_messages: number of the sent messages with measured wait time.
         """
 
         received_messages = self._ingress.received_messages
@@ -424,6 +687,10 @@ class StatsAggregator:
             'last_pushed_message': last_pushed_message,
             'last_dropped_message': last_dropped_message,
             'last_sent_message': last_sent_message,
+            'ingress_batches': self._ingress.batch_sizes,
+            'egress_batches': self._egress.batch_sizes,
+            'queue_wait_time': self._queue_tracker.wait_time,
+            'queue_wait_messages': self._queue_tracker.wait_messages,
         }
 
 
@@ -455,7 +722,7 @@ class StatsLogger(BaseThreadWorker):
 
         stats = self._stats_aggregator.get_stats()
         self.logger.info(
-            'Received %s, pushed %s, dropped %s, sent %s, buffer size %s, payload size %s, last message received %s, last message pushed %s, last message dropped %s, last message sent %s',
+            'Received %s, pushed %s, dropped %s, sent %s, buffer size %s, payload size %s, last message received %s, last message pushed %s, last message dropped %s, last message sent %s, mean queue wait time %.6f',
             stats['received_messages'],
             stats['pushed_messages'],
             stats['dropped_messages'],
@@ -466,15 +733,21 @@ class StatsLogger(BaseThreadWorker):
             stats['last_pushed_message'],
             stats['last_dropped_message'],
             stats['last_sent_message'],
+            stats['queue_wait_time'] / max(stats['queue_wait_messages'], 1),
         )
 
 
 class AdapterMetricsCollector(BaseThreadWorker):
     """Adapter metrics collector for Prometheus."""
 
-    def counter(self, name: str, description: str):
+    def counter(
+        self,
+        name: str,
+        description: str,
+        label_names: Optional[List[str]] = None,
+    ):
         """Create a counter."""
-        self._metrics[name] = get_or_create_counter(name, description)
+        self._metrics[name] = get_or_create_counter(name, description, label_names)
 
     def gauge(self, name: str, description: str):
         """Create a gauge."""
@@ -528,11 +801,33 @@ class AdapterMetricsCollector(BaseThreadWorker):
             'last_sent_message',
             'Number of messages sent to the sink ZeroMQ socket',
         )
+        self.counter(
+            'ingress_batches',
+            'Number of batches pushed to the buffer by batch size',
+            ['batch_size'],
+        )
+        self.counter(
+            'egress_batches',
+            'Number of batches popped from the buffer by batch size',
+            ['batch_size'],
+        )
+        self.gauge(
+            'queue_wait_time',
+            'Total time the sent messages waited in the buffer, in seconds',
+        )
+        self.counter(
+            'queue_wait_messages',
+            'Number of the sent messages with measured wait time in the buffer',
+        )
 
     def update_all_metrics(self):
         for k, v in self._stats_aggregator.get_stats().items():
             self.logger.debug('Updating metrics %s=%s', k, v)
-            self._metrics[k].set(v, label_values=[])
+            if isinstance(v, dict):
+                for label_value, value in v.items():
+                    self._metrics[k].set(value, label_values=[label_value])
+            else:
+                self._metrics[k].set(v, label_values=[])
 
     def workload(self):
         while self.is_running:
@@ -578,9 +873,10 @@ def main():
     )
     # VideoPipeline is used to count passed frames
     pipeline = build_video_pipeline(config)
-    ingress = Ingress(queue, config)
-    egress = Egress(queue, pipeline, config)
-    stats_aggregator = StatsAggregator(queue, ingress, egress)
+    queue_tracker = BufferQueueTracker(queue.len // QUEUE_ITEM_SIZE)
+    ingress = Ingress(queue, queue_tracker, config)
+    egress = Egress(queue, queue_tracker, pipeline, config)
+    stats_aggregator = StatsAggregator(queue, queue_tracker, ingress, egress)
     stats_logger = StatsLogger(stats_aggregator, config)
     metrics_collector = AdapterMetricsCollector(stats_aggregator)
     set_extra_labels(config.metrics.extra_labels)
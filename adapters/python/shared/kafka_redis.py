@@ -4,10 +4,14 @@ import signal
 import time
 from abc import ABC, abstractmethod
 from asyncio import Event, Queue
-from typing import Any, Dict, Optional, Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
 
 from confluent_kafka.admin import AdminClient, ClusterMetadata, NewTopic
+from savant_rs.primitives import VideoFrame
+from savant_rs.webserver import init_webserver
 
+from savant.metrics import get_or_create_histogram
 from savant.utils.config import opt_config, req_config, strtobool
 from savant.utils.fps_meter import FPSMeter
 from savant.utils.log import get_logger, init_logging
@@ -16,6 +20,8 @@ from savant.utils.welcome import get_starting_message
 LOGGER_NAME = 'adapters.kafka_redis'
 logger = get_logger(LOGGER_NAME)
 
+T = TypeVar('T')
+
 
 class FpsMeterConfig:
     """FPS measurement configuration."""
@@ -63,6 +69,12 @@ class BaseConfig:
 
     def __init__(self):
         self.queue_size = opt_config('QUEUE_SIZE', 50, int)
+        self.batch_size = opt_config('BATCH_SIZE', 1, int)
+        assert self.batch_size > 0, 'BATCH_SIZE must be positive'
+        self.batch_max_linger = opt_config('BATCH_MAX_LINGER', 0.01, float)
+        self.processor_workers = opt_config('PROCESSOR_WORKERS', 1, int)
+        assert self.processor_workers > 0, 'PROCESSOR_WORKERS must be positive'
+        self.webserver_port = opt_config('WEBSERVER_PORT', None, int)
         self.fps = FpsMeterConfig()
 
 
@@ -70,6 +82,10 @@ STOP = object()
 """Stop signal for the queues. Needed to gracefully stop the adapter."""
 
 
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+"""Upper bounds of the stage latency buckets, in seconds."""
+
+
 class BaseKafkaRedisAdapter(ABC):
     """Base class for kafka-redis adapters.
 
@@ -77,6 +93,7 @@ class BaseKafkaRedisAdapter(ABC):
     """
 
     _poller_queue: Queue
+    _processing_queue: Queue[Tuple[int, asyncio.Task]]
     _sender_queue: Queue
     _stop_event: Event
 
@@ -89,6 +106,14 @@ class BaseKafkaRedisAdapter(ABC):
         self._is_running = False
         self._error: Optional[str] = None
         self._logger = get_logger(f'{LOGGER_NAME}.{self.__class__.__name__}')
+        self._latency_stages: List[str] = []
+        self._latency_metric = get_or_create_histogram(
+            'stage_latency',
+            'Latency of messages by adapter stage, in seconds',
+            ['stage'],
+            LATENCY_BUCKETS,
+        )
+        self._processor_executor: Optional[ThreadPoolExecutor] = None
 
     async def run(self):
         """Run the adapter."""
@@ -100,12 +125,25 @@ class BaseKafkaRedisAdapter(ABC):
                 f'KAFKA_CREATE_TOPIC={self._config.kafka.create_topic}'
             )
         self._poller_queue = Queue(self._config.queue_size)
+        self._processing_queue = Queue(self._config.processor_workers)
         self._sender_queue = Queue(self._config.queue_size)
         self._stop_event = Event()
+        if self._config.processor_workers > 1:
+            self._processor_executor = ThreadPoolExecutor(
+                max_workers=self._config.processor_workers,
+                thread_name_prefix='processor',
+            )
         await self.on_start()
         self._is_running = True
         self._fps_meter.start()
-        await asyncio.gather(self.poller(), self.messages_processor(), self.sender())
+        await asyncio.gather(
+            self.poller(),
+            self.messages_processor(),
+            self.results_reassembler(),
+            self.sender(),
+        )
+        if self._processor_executor is not None:
+            self._processor_executor.shutdown()
         self.log_fps()
         await self.on_stop()
         self._stop_event.set()
@@ -133,11 +171,76 @@ class BaseKafkaRedisAdapter(ABC):
         """Poll messages from the source and put them into the poller queue."""
         pass
 
-    @abstractmethod
     async def messages_processor(self):
-        """Process messages from the poller queue and put them into the sender queue."""
+        """Take batches of messages from the poller queue and start processing them.
+
+        Up to PROCESSOR_WORKERS batches are processed concurrently.
+        """
+
+        self._logger.info('Starting processor')
+        stopped = False
+        while self._error is None and not stopped:
+            self._logger.debug('Waiting for the next message')
+            batch, stopped = await self.get_batch(
+                self._poller_queue,
+                self._config.batch_max_linger,
+            )
+            if batch:
+                task = asyncio.create_task(self.process_batch(batch))
+                await self._processing_queue.put((len(batch), task))
+        await self._processing_queue.put(STOP)
+        self._logger.info('Processor was stopped')
+
+    async def results_reassembler(self):
+        """Put results of the processed batches to the sender queue
+        in the order the messages were received."""
+
+        self._logger.info('Starting reassembler')
+        while True:
+            item = await self._processing_queue.get()
+            if item is STOP:
+                self._logger.debug('Received stop signal')
+                break
+            batch_size, task = item
+            if self._error is not None:
+                task.cancel()
+            else:
+                try:
+                    results = await task
+                except Exception as e:
+                    self._is_running = False
+                    self.set_error(f'Failed to process message: {e}')
+                    # In case self._poller_queue is full, so poller won't stuck
+                    self.clear_queue(self._poller_queue)
+                else:
+                    for result in results:
+                        await self._sender_queue.put(result)
+            for _ in range(batch_size):
+                self._poller_queue.task_done()
+        await self._sender_queue.put(STOP)
+        self._logger.info('Reassembler was stopped')
+
+    @abstractmethod
+    async def process_batch(self, batch: List[Any]) -> List[Any]:
+        """Process a batch of messages from the poller queue.
+
+        :param batch: The messages from the poller queue.
+        :return: The messages to put into the sender queue.
+        """
         pass
 
+    async def run_in_processor(self, func: Callable[..., T], *args) -> T:
+        """Run CPU-bound part of processing a batch.
+
+        The function runs in the processor thread pool when PROCESSOR_WORKERS
+        is more than 1 and in the event loop thread otherwise.
+        """
+
+        if self._processor_executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._processor_executor, func, *args)
+
     @abstractmethod
     async def sender(self):
         """Send messages from the sender queue to the sink."""
@@ -199,6 +302,85 @@ class BaseKafkaRedisAdapter(ABC):
 
         return False
 
+    async def get_batch(
+        self,
+        queue: Queue,
+        max_linger: float = 0,
+    ) -> Tuple[List[Any], bool]:
+        """Get up to BATCH_SIZE items from the queue.
+
+        Waits for the first item, then for the rest of the batch
+        for at most max_linger seconds. The stop signal is not included
+        to the batch and is marked as done.
+
+        :param queue: The queue to get items from.
+        :param max_linger: The maximum time to wait for the batch to fill, in seconds.
+        :return: The items and whether the stop signal was received.
+        """
+
+        batch = [await queue.get()]
+        deadline = time.time() + max_linger
+        while len(batch) < self._config.batch_size and batch[-1] is not STOP:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        if batch[-1] is STOP:
+            self._logger.debug('Received stop signal')
+            batch.pop()
+            queue.task_done()
+            return batch, True
+
+        return batch, False
+
+    def observe_latency(self, stage: str, latency: float, n: int = 1):
+        """Add observations to the latency histogram of the stage.
+
+        :param stage: The stage name.
+        :param latency: The latency in seconds.
+        :param n: The number of observations.
+        """
+
+        if stage not in self._latency_stages:
+            self._latency_stages.append(stage)
+        self._latency_metric.observe(latency, (stage,), n)
+
+    def latency_message(self, stage: str) -> str:
+        """Latency stats of the stage for logging."""
+
+        counts, value_sum = self._latency_metric.get((stage,))
+        total = counts[-1]
+        if total == 0:
+            return f'{stage} latency: no data'
+        buckets = []
+        prev = 0
+        for upper_bound, cumulative in zip(LATENCY_BUCKETS, counts):
+            if cumulative > prev:
+                buckets.append(f'<={upper_bound * 1000:g}ms: {cumulative - prev}')
+            prev = cumulative
+        if total > prev:
+            buckets.append(f'>{LATENCY_BUCKETS[-1] * 1000:g}ms: {total - prev}')
+        return (
+            f'{stage} latency: count {total}, '
+            f'mean {value_sum / total * 1000:.3f}ms, {", ".join(buckets)}'
+        )
+
+    def observe_frame_latency(self, video_frame: VideoFrame):
+        """Add an observation of the time since the frame creation
+        to the end-to-end latency histogram."""
+
+        frame_age = time.time_ns() - video_frame.creation_timestamp_ns
+        self.observe_latency('end-to-end', max(frame_age, 0) / 1e9)
+
     def clear_queue(self, queue: Queue):
         """Clear the queue. Needed to prevent the adapter from hanging in the case of failure."""
 
@@ -214,10 +396,13 @@ class BaseKafkaRedisAdapter(ABC):
     def log_fps(self):
         """Log FPS."""
 
-        if self._config.fps.output == 'stdout':
-            print(self._fps_meter.message)
-        elif self._config.fps.output == 'logger':
-            self._logger.info(self._fps_meter.message)
+        messages = [self._fps_meter.message]
+        messages.extend(self.latency_message(x) for x in self._latency_stages)
+        for message in messages:
+            if self._config.fps.output == 'stdout':
+                print(message)
+            elif self._config.fps.output == 'logger':
+                self._logger.info(message)
 
 
 def run_kafka_redis_adapter(
@@ -236,7 +421,11 @@ def run_kafka_redis_adapter(
     logger.info(get_starting_message(name))
     # To gracefully shutdown the adapter on SIGTERM (raise KeyboardInterrupt)
     signal.signal(signal.SIGTERM, signal.getsignal(signal.SIGINT))
-    source = adapter_class(config_class())
+    config = config_class()
+    if config.webserver_port is not None:
+        # exports metrics at /metrics
+        init_webserver(config.webserver_port)
+    source = adapter_class(config)
     loop = asyncio.get_event_loop()
     try:
         loop.run_until_complete(source.run())
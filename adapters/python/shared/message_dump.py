@@ -0,0 +1,202 @@
+"""Message dump format.
+
+A message dump segment is a stream of msgpack tuples
+``(timestamp, topic, serialized message, content)``. A segment can have a
+sidecar index file with ``(timestamp, source ID, offset)`` records of its
+messages. The index allows to seek in the segment by time and to filter
+messages by source without unpacking the other messages. Segments without
+an index are read sequentially.
+"""
+
+import mmap
+import os
+from typing import Iterator, List, Optional, Set, Tuple
+
+import msgpack
+import numpy as np
+
+INDEX_SUFFIX = '.index'
+INDEX_VERSION = 1
+INDEX_DTYPE = np.dtype([('ts', '<i8'), ('offset', '<u8'), ('source', '<u4')])
+
+DumpRecord = Tuple[int, bytes, bytes, bytes]
+"""Timestamp in nanoseconds, topic, serialized message and content."""
+
+
+def get_index_path(segment_path: str) -> str:
+    """Get path to the index file of the segment."""
+    return segment_path + INDEX_SUFFIX
+
+
+class MessageDumpIndex:
+    """Index of the messages in a message dump segment.
+
+    Source ID of a message is its topic.
+    """
+
+    def __init__(
+        self,
+        records: Optional[np.ndarray] = None,
+        sources: Optional[List[str]] = None,
+    ):
+        self._sources = sources or []
+        self._source_ids = {x: i for i, x in enumerate(self._sources)}
+        if records is None:
+            self._pending = []
+            self._records = np.empty(0, dtype=INDEX_DTYPE)
+        else:
+            self._pending = None
+            self._records = records
+
+    def add(self, ts: int, source_id: str, offset: int):
+        """Add a record of the message written to the segment."""
+
+        source = self._source_ids.get(source_id)
+        if source is None:
+            source = self._source_ids[source_id] = len(self._sources)
+            self._sources.append(source_id)
+        self._pending.append((ts, offset, source))
+
+    @property
+    def records(self) -> np.ndarray:
+        """Index records, structured array of INDEX_DTYPE."""
+
+        if self._pending:
+            self._records = np.concatenate(
+                [self._records, np.array(self._pending, dtype=INDEX_DTYPE)]
+            )
+            self._pending = []
+        return self._records
+
+    @property
+    def sources(self) -> List[str]:
+        """Source IDs in the segment."""
+        return self._sources
+
+    def select(
+        self,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        source_ids: Optional[Set[str]] = None,
+    ) -> np.ndarray:
+        """Select positions of the records matching the filters.
+
+        :param start_ts: Minimal timestamp of the messages, in nanoseconds.
+        :param end_ts: Maximal timestamp of the messages, in nanoseconds.
+        :param source_ids: Source IDs of the messages.
+        :return: Positions of the matching records in the index.
+        """
+
+        records = self.records
+        # timestamps are from the wall clock, don't rely on them being sorted
+        mask = np.ones(len(records), dtype=bool)
+        if start_ts is not None:
+            mask &= records['ts'] >= start_ts
+        if end_ts is not None:
+            mask &= records['ts'] <= end_ts
+        if source_ids is not None:
+            sources = [self._source_ids[x] for x in source_ids if x in self._source_ids]
+            mask &= np.isin(records['source'], sources)
+
+        return np.flatnonzero(mask)
+
+    def write(self, path: str):
+        """Write the index to the file.
+
+        The index is written to a temporary file first, so readers never
+        see a partially written index.
+        """
+
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(
+                msgpack.packb(
+                    (INDEX_VERSION, self._sources, self.records.tobytes()),
+                    use_bin_type=True,
+                )
+            )
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path: str) -> 'MessageDumpIndex':
+        """Load the index from the file."""
+
+        with open(path, 'rb') as f:
+            version, sources, records = msgpack.unpackb(f.read(), raw=False)
+        if version != INDEX_VERSION:
+            raise ValueError(f'Unsupported message dump index version: {version}')
+
+        return MessageDumpIndex(np.frombuffer(records, dtype=INDEX_DTYPE), sources)
+
+
+class MessageDumpSegmentReader:
+    """Reads records from a message dump segment.
+
+    Segments with an index are memory-mapped and only the selected messages
+    are unpacked. Segments without an index are unpacked sequentially.
+
+    :param path: Path to the segment.
+    :param start_ts: Minimal timestamp of the messages, in nanoseconds.
+    :param end_ts: Maximal timestamp of the messages, in nanoseconds.
+    :param source_ids: Source IDs of the messages.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        source_ids: Optional[Set[str]] = None,
+    ):
+        self._path = path
+        self._start_ts = start_ts
+        self._end_ts = end_ts
+        self._source_ids = source_ids
+        index_path = get_index_path(path)
+        if os.path.exists(index_path):
+            self._index = MessageDumpIndex.load(index_path)
+        else:
+            self._index = None
+
+    @property
+    def is_indexed(self) -> bool:
+        """Whether the segment has an index."""
+        return self._index is not None
+
+    def __iter__(self) -> Iterator[DumpRecord]:
+        if self._index is None:
+            return self._read_sequentially()
+        return self._read_indexed()
+
+    def _read_indexed(self) -> Iterator[DumpRecord]:
+        positions = self._index.select(self._start_ts, self._end_ts, self._source_ids)
+        if not len(positions):
+            return
+        offsets = self._index.records['offset']
+        with open(self._path, 'rb') as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for pos in positions:
+                start = int(offsets[pos])
+                end = int(offsets[pos + 1]) if pos + 1 < len(offsets) else len(mm)
+                yield self._check_record(msgpack.unpackb(mm[start:end]))
+
+    def _read_sequentially(self) -> Iterator[DumpRecord]:
+        with open(self._path, 'rb') as f:
+            for record in msgpack.Unpacker(f):
+                ts, topic, meta, content = self._check_record(record)
+                if self._start_ts is not None and ts < self._start_ts:
+                    continue
+                if self._end_ts is not None and ts > self._end_ts:
+                    continue
+                if (
+                    self._source_ids is not None
+                    and bytes(topic).decode() not in self._source_ids
+                ):
+                    continue
+                yield ts, topic, meta, content
+
+    def _check_record(self, record) -> DumpRecord:
+        if not isinstance(record, (tuple, list)) or len(record) != 4:
+            raise ValueError(f'Invalid message format: {record}')
+        return record
@@ -22,7 +22,7 @@ class ChunkWriter:
         content: Optional[bytes],
         can_start_new_chunk: bool,
     ) -> bool:
-        if can_start_new_chunk and 0 < self.chunk_size <= self.frames_in_chunk:
+        if can_start_new_chunk and self._is_chunk_full():
             self.close()
         if not self.opened:
             self.open()
@@ -57,6 +57,9 @@ class ChunkWriter:
             return
         self._flush()
 
+    def _is_chunk_full(self) -> bool:
+        return 0 < self.chunk_size <= self.frames_in_chunk
+
     def _open(self):
         pass
 
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
+import io
 import os
 import signal
+import tarfile
+import time
 import traceback
-from typing import Dict, Optional
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Dict, Optional
 
 from savant_rs.primitives import EndOfStream, VideoFrame
 
@@ -26,10 +33,190 @@ LOGGER_NAME = 'adapters.image_files_sink'
 DEFAULT_CHUNK_SIZE = 10000
 
 
+class FsyncPolicy(Enum):
+    """When written images are synced to the storage."""
+
+    NONE = 'none'
+    """Rely on the OS to write the data."""
+
+    CHUNK = 'chunk'
+    """Sync all images of a chunk when the chunk is closed."""
+
+    FILE = 'file'
+    """Sync each image after writing."""
+
+
+class ImageWritePool:
+    """Writes images in background threads.
+
+    Tasks with the same key are executed by the same thread in the order
+    they were submitted. The number of pending tasks is limited, submitting
+    blocks when the limit is reached.
+
+    :param workers: Number of writing threads.
+    :param queue_size: Maximum number of pending tasks.
+    :param stats_log_interval: Interval between logging the writing stats in seconds.
+    """
+
+    def __init__(self, workers: int, queue_size: int, stats_log_interval: float):
+        self.logger = get_logger(f'{LOGGER_NAME}.{self.__class__.__name__}')
+        self.executors = [
+            ThreadPoolExecutor(1, thread_name_prefix=f'image-writer-{i}')
+            for i in range(workers)
+        ]
+        self.slots = BoundedSemaphore(queue_size)
+        self.stats_log_interval = stats_log_interval
+        self.last_stats_log = time.time()
+        self.lock = Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.write_time = 0
+        self.max_write_time = 0
+
+    def submit(self, key: str, func: Callable, *args):
+        """Submit a task, block when the queue is full."""
+
+        self.slots.acquire()
+        with self.lock:
+            self.pending += 1
+        executor = self.executors[zlib.crc32(key.encode()) % len(self.executors)]
+        executor.submit(self._run, func, *args)
+        if time.time() - self.last_stats_log >= self.stats_log_interval:
+            self.log_stats()
+
+    def shutdown(self):
+        """Wait for pending tasks and stop the threads."""
+
+        for executor in self.executors:
+            executor.shutdown(wait=True)
+        self.log_stats()
+
+    def log_stats(self):
+        with self.lock:
+            mean_write_time = self.write_time / self.completed if self.completed else 0
+            self.logger.info(
+                'Queue depth %s, completed %s, failed %s, '
+                'write latency mean %.2f ms, max %.2f ms.',
+                self.pending,
+                self.completed,
+                self.failed,
+                mean_write_time * 1000,
+                self.max_write_time * 1000,
+            )
+            self.max_write_time = 0
+        self.last_stats_log = time.time()
+
+    def _run(self, func: Callable, *args):
+        started = time.time()
+        failed = False
+        try:
+            func(*args)
+        except Exception:
+            self.logger.error('Failed to write images.', exc_info=True)
+            failed = True
+        write_time = time.time() - started
+        with self.lock:
+            self.pending -= 1
+            self.completed += 1
+            self.failed += failed
+            self.write_time += write_time
+            self.max_write_time = max(self.max_write_time, write_time)
+        self.slots.release()
+
+
+class ImageChunkOutput:
+    """Writes images of a chunk to a directory.
+
+    :param location: Directory of the chunk.
+    :param fsync_policy: When written images are synced to the storage.
+    """
+
+    def __init__(self, location: str, fsync_policy: FsyncPolicy):
+        self.location = location
+        self.fsync_policy = fsync_policy
+        self.written_files = []
+
+    def open(self):
+        os.makedirs(self.location, exist_ok=True)
+
+    def write(self, filename: str, content: bytes):
+        filepath = os.path.join(self.location, filename)
+        with open(filepath, 'wb') as f:
+            f.write(content)
+            if self.fsync_policy == FsyncPolicy.FILE:
+                f.flush()
+                os.fsync(f.fileno())
+        if self.fsync_policy == FsyncPolicy.CHUNK:
+            self.written_files.append(filepath)
+
+    def close(self):
+        if self.fsync_policy == FsyncPolicy.NONE:
+            return
+        for filepath in self.written_files:
+            fsync_path(filepath)
+        self.written_files = []
+        fsync_path(self.location)
+
+
+class TarImageChunkOutput(ImageChunkOutput):
+    """Writes images of a chunk to a tar archive ``<location>.tar``."""
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.location), exist_ok=True)
+        self.file = open(f'{self.location}.tar', 'wb')
+        self.tar = tarfile.open(fileobj=self.file, mode='w')
+
+    def write(self, filename: str, content: bytes):
+        info = tarfile.TarInfo(filename)
+        info.size = len(content)
+        info.mtime = time.time()
+        self.tar.addfile(info, io.BytesIO(content))
+        if self.fsync_policy == FsyncPolicy.FILE:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.tar.close()
+        if self.fsync_policy != FsyncPolicy.NONE:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.file.close()
+
+
+def fsync_path(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
 class ImageFilesWriter(ChunkWriter):
-    def __init__(self, base_location: str, chunk_size: int):
+    """Writes images to chunk directories or tar archives.
+
+    :param base_location: Location of the images, ``%chunk_idx`` is replaced with the chunk index.
+    :param chunk_size: Chunk size in frames, 0 means no limit.
+    :param write_pool: Pool to write images in background, images are
+        written synchronously when not set.
+    :param fsync_policy: When written images are synced to the storage.
+    :param tar_output: Write images of each chunk to a tar archive.
+    """
+
+    def __init__(
+        self,
+        base_location: str,
+        chunk_size: int,
+        write_pool: Optional[ImageWritePool] = None,
+        fsync_policy: FsyncPolicy = FsyncPolicy.NONE,
+        tar_output: bool = False,
+    ):
         self.base_location = base_location
         self.chunk_location = None
+        self.output: Optional[ImageChunkOutput] = None
+        self.write_pool = write_pool
+        self.fsync_policy = fsync_policy
+        self.tar_output = tar_output
         super().__init__(chunk_size, logger_prefix=LOGGER_NAME)
 
     def _write_video_frame(
@@ -53,19 +240,12 @@ class ImageFilesWriter(ChunkWriter):
         else:
             return True
 
-        filepath = os.path.join(
-            self.chunk_location,
-            f'{frame_num:0{self.chunk_size_digits}}.{frame.codec}',
+        filename = f'{frame_num:0{self.chunk_size_digits}}.{frame.codec}'
+        self.logger.debug(
+            'Writing frame to file %s in %s', filename, self.chunk_location
         )
-        self.logger.debug('Writing frame to file %s', filepath)
-        try:
-            with open(filepath, 'wb') as f:
-                f.write(content)
-        except Exception:
-            traceback.print_exc()
-            return False
 
-        return True
+        return self._run(self.output.write, filename, content)
 
     def _write_eos(self, eos: EndOfStream) -> bool:
         return True
@@ -74,8 +254,32 @@ class ImageFilesWriter(ChunkWriter):
         self.chunk_location = self.base_location.replace(
             Patterns.CHUNK_IDX, f'{self.chunk_idx:0{self.chunk_size_digits}}'
         )
-        self.logger.info('Creating directory %s', self.chunk_location)
-        os.makedirs(self.chunk_location, exist_ok=True)
+        if self.tar_output:
+            self.output = TarImageChunkOutput(self.chunk_location, self.fsync_policy)
+            self.logger.info('Creating archive %s.tar', self.chunk_location)
+        else:
+            self.output = ImageChunkOutput(self.chunk_location, self.fsync_policy)
+            self.logger.info('Creating directory %s', self.chunk_location)
+        self._run(self.output.open)
+
+    def _close(self):
+        self._run(self.output.close)
+
+    def _run(self, func: Callable, *args) -> bool:
+        """Run the output operation synchronously or in the write pool."""
+
+        if self.write_pool is not None:
+            # operations of the writer are executed in order
+            self.write_pool.submit(self.base_location, func, *args)
+            return True
+
+        try:
+            func(*args)
+        except Exception:
+            traceback.print_exc()
+            return False
+
+        return True
 
 
 class ImageFilesSink:
@@ -85,6 +289,9 @@ class ImageFilesSink:
         chunk_size: int,
         skip_frames_without_objects: bool = False,
         metadata_format: MetadataJsonFormat = MetadataJsonFormat.LEGACY,
+        write_pool: Optional[ImageWritePool] = None,
+        fsync_policy: FsyncPolicy = FsyncPolicy.NONE,
+        tar_output: bool = False,
     ):
         self.logger = get_logger(f'{LOGGER_NAME}.{self.__class__.__name__}')
         self.location = location
@@ -93,6 +300,9 @@ class ImageFilesSink:
         self.writers: Dict[str, ChunkWriter] = {}
         self.last_writer_per_source: Dict[str, (str, ChunkWriter)] = {}
         self.metadata_format = metadata_format
+        self.write_pool = write_pool
+        self.fsync_policy = fsync_policy
+        self.tar_output = tar_output
 
     def write(self, zmq_message: ZeroMQMessage):
         message = zmq_message.message
@@ -126,7 +336,13 @@ class ImageFilesSink:
         if writer is None:
             writer = CompositeChunkWriter(
                 [
-                    ImageFilesWriter(os.path.join(location, 'images'), self.chunk_size),
+                    ImageFilesWriter(
+                        os.path.join(location, 'images'),
+                        self.chunk_size,
+                        self.write_pool,
+                        self.fsync_policy,
+                        self.tar_output,
+                    ),
                     MetadataJsonWriter(
                         os.path.join(location, 'metadata.json'),
                         self.chunk_size,
@@ -139,11 +355,11 @@ class ImageFilesSink:
             if writer is not last_source_writer:
                 if last_source_writer is not None:
                     self.logger.info(
-                        'Flushing previous writer for source=%s, location=%s',
+                        'Closing previous writer for source=%s, location=%s',
                         video_frame.source_id,
                         last_source_location,
                     )
-                    last_source_writer.flush()
+                    last_source_writer.close()
                     self.logger.info(
                         'Removing previous writer for source=%s, location=%s',
                         video_frame.source_id,
@@ -173,6 +389,8 @@ class ImageFilesSink:
     def terminate(self):
         for file_writer in self.writers.values():
             file_writer.close()
+        if self.write_pool is not None:
+            self.write_pool.shutdown()
 
 
 def main():
@@ -192,6 +410,11 @@ def main():
     source_id = opt_config('SOURCE_ID')
     source_id_prefix = opt_config('SOURCE_ID_PREFIX')
     metadata_format = opt_config_metadata_format('METADATA_JSON_FORMAT')
+    write_workers = opt_config('WRITE_WORKERS', 0, int)
+    write_queue_size = opt_config('WRITE_QUEUE_SIZE', 100, int)
+    fsync_policy = opt_config('FSYNC_POLICY', FsyncPolicy.NONE, FsyncPolicy)
+    tar_output = opt_config('TAR_OUTPUT', False, strtobool)
+    stats_log_interval = opt_config('STATS_LOG_INTERVAL', 60, float)
 
     # possible exceptions will cause app to crash and log error by default
     # no need to handle exceptions here
@@ -201,8 +424,17 @@ def main():
         source_id_prefix=source_id_prefix,
     )
 
+    write_pool = None
+    if write_workers > 0:
+        write_pool = ImageWritePool(write_workers, write_queue_size, stats_log_interval)
     image_sink = ImageFilesSink(
-        dir_location, chunk_size, skip_frames_without_objects, metadata_format
+        dir_location,
+        chunk_size,
+        skip_frames_without_objects,
+        metadata_format,
+        write_pool=write_pool,
+        fsync_policy=fsync_policy,
+        tar_output=tar_output,
     )
     logger.info('Image files sink started')
 
@@ -1,7 +1,7 @@
 import asyncio
 import time
 from asyncio import Queue
-from typing import Tuple
+from typing import Dict, List, Set, Tuple
 
 from confluent_kafka import KafkaError, Producer
 from redis.asyncio import Redis
@@ -10,7 +10,7 @@ from savant_rs.primitives import (
     VideoFrameContent,
     VideoFrameTranscodingMethod,
 )
-from savant_rs.utils.serialization import save_message_to_bytes
+from savant_rs.utils.serialization import Message, save_message_to_bytes
 
 from adapters.python.shared.kafka_redis import (
     STOP,
@@ -65,8 +65,8 @@ class KafkaRedisSink(BaseKafkaRedisAdapter):
     """Kafka-redis sink adapter."""
 
     _config: Config
-    _poller_queue: Queue[SinkResult]
-    _sender_queue: Queue[Tuple[bytes, bytes]]
+    _poller_queue: Queue[Tuple[float, SinkResult]]
+    _sender_queue: Queue[Tuple[float, bytes, bytes]]
 
     def __init__(self, config: Config):
         super().__init__(config)
@@ -129,7 +129,7 @@ class KafkaRedisSink(BaseKafkaRedisAdapter):
                 async for result in self._sink:
                     if not self._is_running:
                         break
-                    await self._poller_queue.put(result)
+                    await self._poller_queue.put((time.time(), result))
                     if (
                         time.time() - self._last_flush_ts
                         > self._config.kafka.flush_interval
@@ -142,176 +142,236 @@ class KafkaRedisSink(BaseKafkaRedisAdapter):
         await self._poller_queue.put(STOP)
         self._logger.info('Poller was stopped')
 
-    async def messages_processor(self):
-        """Process messages from the poller queue and put them to the sender queue.
+    async def process_batch(
+        self,
+        batch: List[Tuple[float, SinkResult]],
+    ) -> List[Tuple[float, bytes, bytes]]:
+        """Process a batch of messages from the poller queue.
 
-        Frame content is saved to Redis and frame metadata is updated with the content location.
+        Frame content is saved to Redis and frame metadata is updated with
+        the content location. Messages are serialized for Kafka.
         """
 
-        self._logger.info('Starting serializer')
-        while self._error is None:
-            result = await self._poller_queue.get()
-            if result is STOP:
-                self._logger.debug('Received stop signal')
-                self._poller_queue.task_done()
-                break
-            try:
-                message, source_id = await self.process_message(result)
-            except Exception as e:
-                self._is_running = False
-                self.set_error(f'Failed to serialize message: {e}')
-                self._poller_queue.task_done()
-                # In case self._poller_queue is full, so poller won't stuck
-                self.clear_queue(self._poller_queue)
-                break
-            await self._sender_queue.put(
-                (source_id.encode(), save_message_to_bytes(message))
-            )
-            self._poller_queue.task_done()
-        await self._sender_queue.put(STOP)
-        self._logger.info('Serializer was stopped')
+        now = time.time()
+        for received_ts, _ in batch:
+            self.observe_latency('poller-queue', now - received_ts)
+        serialized = await self.process_messages([x for _, x in batch])
+        processed_ts = time.time()
+
+        return [(processed_ts, source_id, data) for source_id, data in serialized]
 
     async def sender(self):
-        """Send messages from the sender queue to Kafka topic."""
+        """Send messages from the sender queue to Kafka topic.
+
+        Up to BATCH_SIZE messages are sent to the producer at once.
+        """
 
         self._logger.info('Starting sender')
         loop = asyncio.get_running_loop()
-        while self._error is None:
-            message = await self._sender_queue.get()
-            if message is STOP:
-                self._logger.debug('Received stop signal')
-                self._sender_queue.task_done()
-                break
-            source_id, data = message
+        stopped = False
+        while self._error is None and not stopped:
+            batch, stopped = await self.get_batch(
+                self._sender_queue,
+                self._config.batch_max_linger,
+            )
+            if not batch:
+                continue
+
+            now = time.time()
+            for processed_ts, _, _ in batch:
+                self.observe_latency('sender-queue', now - processed_ts)
             try:
-                await loop.run_in_executor(None, self.send_to_producer, source_id, data)
+                await loop.run_in_executor(
+                    None,
+                    self.send_batch_to_producer,
+                    [(source_id, data) for _, source_id, data in batch],
+                )
             except Exception as e:
                 self._is_running = False
                 self.set_error(f'Failed to send message: {e}')
-                self._sender_queue.task_done()
+                for _ in batch:
+                    self._sender_queue.task_done()
                 # In case self._sender_queue is full, so serializer won't stuck
                 self.clear_queue(self._sender_queue)
                 break
-            self._sender_queue.task_done()
+            self.observe_latency('kafka-produce', time.time() - now, len(batch))
+            for _ in batch:
+                self._sender_queue.task_done()
 
         self._logger.info('Sender was stopped')
 
-    async def process_message(self, result: SinkResult):
-        """Process one message from the poller queue.
+    async def process_messages(
+        self,
+        results: List[SinkResult],
+    ) -> List[Tuple[bytes, bytes]]:
+        """Process a batch of messages from the poller queue.
+
+        Frame contents are saved to Redis and frame metadata is updated
+        with the content locations.
 
-        Frame content is saved to Redis and frame metadata is updated with the content location.
+        :return: Source IDs and serialized messages.
         """
 
-        if result.frame_meta is not None:
-            frame_meta = result.frame_meta
-            source_id = frame_meta.source_id
-            self._logger.debug(
-                'Received frame %s/%s (keyframe=%s)',
-                source_id,
-                frame_meta.pts,
-                frame_meta.keyframe,
-            )
-            if result.frame_content is not None:
-                frame_meta.content = await self.store_frame_content(
-                    frame_meta, result.frame_content
+        frames = []
+        for result in results:
+            if result.frame_meta is not None:
+                self._logger.debug(
+                    'Received frame %s/%s (keyframe=%s)',
+                    result.frame_meta.source_id,
+                    result.frame_meta.pts,
+                    result.frame_meta.keyframe,
                 )
-            message = frame_meta.to_message()
-            self.count_frame()
+                self.observe_frame_latency(result.frame_meta)
+                if result.frame_content is not None:
+                    frames.append((result.frame_meta, result.frame_content))
 
-        else:
-            source_id = result.eos.source_id
-            self._logger.debug('Received EOS for source %s', source_id)
-            message = result.eos.to_message()
+        if frames:
+            ts = time.time()
+            contents = await self.store_frame_contents(frames)
+            self.observe_latency('redis-store', time.time() - ts, len(frames))
+            for (frame, _), content in zip(frames, contents):
+                frame.content = content
 
-        return message, source_id
+        serialized = await self.run_in_processor(self.serialize_messages, results)
+        for result in results:
+            if result.frame_meta is not None:
+                self.count_frame()
 
-    async def store_frame_content(
+        return serialized
+
+    def serialize_messages(
         self,
-        frame: VideoFrame,
-        content: bytes,
-    ) -> VideoFrameContent:
-        """Store frame content.
-
-        If Redis is configured, store frame content to Redis and update frame
-        metadata with the content location. Otherwise, store frame content
-        directly to the VideoFrame.
+        results: List[SinkResult],
+    ) -> List[Tuple[bytes, bytes]]:
+        """Serialize messages for Kafka.
+
+        :return: Source IDs and serialized messages.
+        """
+
+        serialized = []
+        for result in results:
+            if result.frame_meta is not None:
+                message: Message = result.frame_meta.to_message()
+                source_id = result.frame_meta.source_id
+            else:
+                source_id = result.eos.source_id
+                self._logger.debug('Received EOS for source %s', source_id)
+                message = result.eos.to_message()
+            serialized.append((source_id.encode(), save_message_to_bytes(message)))
+
+        return serialized
+
+    async def store_frame_contents(
+        self,
+        frames: List[Tuple[VideoFrame, bytes]],
+    ) -> List[VideoFrameContent]:
+        """Store contents of the frames.
+
+        If Redis is configured, store frame contents to Redis with a single
+        pipeline and return the content locations. Otherwise, store frame
+        contents directly to the VideoFrame.
         """
 
         if self._redis_client is None:
-            self._logger.debug(
-                'Storing content of the frame %s from source %s internally (%s bytes)',
-                frame.source_id,
-                frame.pts,
-                len(content),
-            )
-            return VideoFrameContent.internal(content)
-
-        content_key = f'{self._config.redis.key_prefix}:{frame.uuid}'
-        location = f'{self._config.redis.host}:{self._config.redis.port}:{self._config.redis.db}/{content_key}'
-
-        if await self.need_to_store_content_to_redis(frame, content_key, location):
-            self._logger.debug(
-                'Storing content of the frame %s from source %s to Redis location %r (%s bytes)',
-                frame.pts,
-                frame.source_id,
-                location,
-                len(content),
-            )
-            await self._redis_client.set(
-                content_key,
-                content,
-                ex=self._config.redis.ttl_seconds,
+            contents = []
+            for frame, content in frames:
+                self._logger.debug(
+                    'Storing content of the frame %s from source %s internally (%s bytes)',
+                    frame.source_id,
+                    frame.pts,
+                    len(content),
+                )
+                contents.append(VideoFrameContent.internal(content))
+            return contents
+
+        content_keys = [
+            f'{self._config.redis.key_prefix}:{frame.uuid}' for frame, _ in frames
+        ]
+        stored_content_keys = await self.find_stored_contents(frames, content_keys)
+
+        contents = []
+        pipeline = self._redis_client.pipeline(transaction=False)
+        for (frame, content), content_key in zip(frames, content_keys):
+            location = f'{self._config.redis.host}:{self._config.redis.port}:{self._config.redis.db}/{content_key}'
+            if (
+                content_key in stored_content_keys
+                and frame.transcoding_method != VideoFrameTranscodingMethod.Encoded
+            ):
+                self._logger.debug(
+                    'Content of the frame %s from source %s is already in Redis at %r.',
+                    frame.pts,
+                    frame.source_id,
+                    location,
+                )
+            else:
+                self._logger.debug(
+                    'Storing content of the frame %s from source %s to Redis location %r (%s bytes)',
+                    frame.pts,
+                    frame.source_id,
+                    location,
+                    len(content),
+                )
+                pipeline.set(content_key, content, ex=self._config.redis.ttl_seconds)
+                if self._config.deduplicate:
+                    stored_content_keys.add(content_key)
+            contents.append(
+                VideoFrameContent.external(ExternalFrameType.REDIS.value, location)
             )
+        if len(pipeline) > 0:
+            await pipeline.execute()
 
-        return VideoFrameContent.external(ExternalFrameType.REDIS.value, location)
+        return contents
 
-    async def need_to_store_content_to_redis(
+    async def find_stored_contents(
         self,
-        frame: VideoFrame,
-        content_key: str,
-        location: str,
-    ):
-        """Check if the frame content needs to be stored to Redis.
+        frames: List[Tuple[VideoFrame, bytes]],
+        content_keys: List[str],
+    ) -> Set[str]:
+        """Find frame contents which don't need to be stored to Redis.
 
         The frame content doesn't need to be stored in Redis when the following conditions are met:
         - the deduplication is enabled;
         - the module before the adapter works in pass-through mode;
         - Redis already contains the frame content at the location.
 
-        In that case only TTL of the content in Redis is updated. Otherwise,
-        the frame content should be stored in Redis.
+        In that case only TTL of the content in Redis is updated.
+
+        :return: Keys of the contents already stored in Redis.
         """
 
         if not self._config.deduplicate:
-            return True
-
-        if frame.transcoding_method == VideoFrameTranscodingMethod.Encoded:
-            self._logger.debug(
-                'Content of the frame %s from source %s was modified.',
-                location,
-                frame.source_id,
-            )
-            return True
-
-        if await self._redis_client.expire(
-            content_key,
-            self._config.redis.ttl_seconds,
-        ):
-            self._logger.debug(
-                'Content of the frame %s from source %s is already in Redis at %r. TTL was updated.',
-                frame.pts,
-                frame.source_id,
-                location,
-            )
-            return False
-
-        self._logger.debug(
-            'Content of the frame %s from source %s is not in Redis at %r.',
-            frame.pts,
-            frame.source_id,
-            location,
-        )
-        return True
+            return set()
+
+        # preserve the order of the keys for the results of the pipeline
+        keys_to_check: Dict[str, None] = {}
+        for (frame, _), content_key in zip(frames, content_keys):
+            if frame.transcoding_method == VideoFrameTranscodingMethod.Encoded:
+                self._logger.debug(
+                    'Content of the frame %s from source %s was modified.',
+                    frame.pts,
+                    frame.source_id,
+                )
+            else:
+                keys_to_check[content_key] = None
+        if not keys_to_check:
+            return set()
+
+        pipeline = self._redis_client.pipeline(transaction=False)
+        for content_key in keys_to_check:
+            pipeline.expire(content_key, self._config.redis.ttl_seconds)
+        expired = await pipeline.execute()
+
+        return {
+            content_key
+            for content_key, is_updated in zip(keys_to_check, expired)
+            if is_updated
+        }
+
+    def send_batch_to_producer(self, messages: List[Tuple[bytes, bytes]]):
+        """Send messages to Kafka topic."""
+
+        for key, value in messages:
+            self.send_to_producer(key, value)
 
     def send_to_producer(self, key: str, value: bytes):
         """Send message to Kafka topic."""
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 
+import gzip
+import io
 import json
 import os
 import signal
+import time
 import traceback
 from enum import Enum
-from typing import Dict, Optional
+from queue import Queue
+from threading import Thread
+from typing import Dict, Optional, TextIO
 
 from savant_rs.match_query import MatchQuery
 from savant_rs.primitives import (
@@ -15,10 +20,11 @@ from savant_rs.primitives import (
     EndOfStream,
     VideoFrame,
 )
+from savant_rs.utils.serialization import Message
 
 from adapters.python.sinks.chunk_writer import ChunkWriter
 from savant.api.constants import DEFAULT_NAMESPACE
-from savant.api.parser import parse_video_frame
+from savant.api.parser import encode_video_frame
 from savant.utils.config import opt_config, req_config, strtobool
 from savant.utils.log import get_logger, init_logging
 from savant.utils.welcome import get_starting_message
@@ -46,16 +52,74 @@ class MetadataJsonFormat(Enum):
     LEGACY = 'legacy'
 
 
+class Compression(Enum):
+    """Compression of the metadata JSON files."""
+
+    NONE = 'none'
+    GZIP = 'gzip'
+    ZSTD = 'zstd'
+
+    @property
+    def extension(self) -> str:
+        """Extension added to the compressed file names."""
+        return {Compression.GZIP: '.gz', Compression.ZSTD: '.zst'}.get(self, '')
+
+
+def open_output_file(path: str, compression: Compression, buffer_size: int) -> TextIO:
+    """Open a text file for writing with optional streaming compression.
+
+    :param path: Path to the file.
+    :param compression: Compression of the file.
+    :param buffer_size: Size of the write buffer in bytes, data is passed
+        to the compressor and to the file in chunks of this size.
+    """
+
+    if compression == Compression.GZIP:
+        raw = gzip.GzipFile(path, 'wb')
+    elif compression == Compression.ZSTD:
+        # zstandard is installed only in the python adapters image
+        import zstandard
+
+        raw = zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+    else:
+        raw = io.FileIO(path, 'w')
+
+    return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size), encoding='utf8')
+
+
 class MetadataJsonWriter(ChunkWriter):
+    """Writes metadata to newline-delimited JSON files.
+
+    :param pattern: Location of the file, ``%chunk_idx`` is replaced with the chunk index.
+    :param chunk_size: Chunk size in frames, 0 means no limit.
+    :param metadata_format: Format of the metadata.
+    :param buffer_size: Size of the write buffer in bytes.
+    :param compression: Compression of the files.
+    :param rotate_size: Start a new chunk after writing this number of
+        bytes of uncompressed metadata, 0 means no limit.
+    :param rotate_interval: Start a new chunk after this number of seconds,
+        0 means no limit.
+    """
+
     def __init__(
         self,
         pattern: str,
         chunk_size: int,
         metadata_format: MetadataJsonFormat = MetadataJsonFormat.LEGACY,
+        buffer_size: int = io.DEFAULT_BUFFER_SIZE,
+        compression: Compression = Compression.NONE,
+        rotate_size: int = 0,
+        rotate_interval: float = 0,
     ):
         super().__init__(chunk_size, logger_prefix=LOGGER_NAME)
         self.pattern = pattern
         self.metadata_format = metadata_format
+        self.buffer_size = buffer_size
+        self.compression = compression
+        self.rotate_size = rotate_size
+        self.rotate_interval = rotate_interval
+        self.bytes_in_chunk = 0
+        self.chunk_opened_at = 0
         self.logger.info('File name pattern is %s', self.pattern)
 
     def _write_video_frame(
@@ -67,11 +131,12 @@ class MetadataJsonWriter(ChunkWriter):
         if self.metadata_format == MetadataJsonFormat.NATIVE:
             metadata_str = frame.json
         else:
-            metadata = parse_video_frame(frame)
-            metadata['schema'] = 'VideoFrame'
             if frame_num is not None:
-                metadata['frame_num'] = frame_num
-            metadata_str = json.dumps(metadata)
+                metadata_str = encode_video_frame(
+                    frame, schema='VideoFrame', frame_num=frame_num
+                )
+            else:
+                metadata_str = encode_video_frame(frame, schema='VideoFrame')
         return self._write_meta_to_file(metadata_str, frame_num)
 
     def _write_eos(self, eos: EndOfStream) -> bool:
@@ -86,20 +151,30 @@ class MetadataJsonWriter(ChunkWriter):
     ) -> bool:
         self.logger.debug('Writing meta to file %s', self.location)
         try:
-            self.file.write(metadata_str)
-            self.file.write('\n')
+            self.file.write(metadata_str + '\n')
         except Exception:
             traceback.print_exc()
             return False
+        self.bytes_in_chunk += len(metadata_str) + 1
 
         return True
 
+    def _is_chunk_full(self) -> bool:
+        if super()._is_chunk_full():
+            return True
+        if 0 < self.rotate_size <= self.bytes_in_chunk:
+            return True
+        return (
+            self.rotate_interval > 0
+            and time.time() - self.chunk_opened_at >= self.rotate_interval
+        )
+
     def _flush(self):
-        self.logger.info('Flushing file %s', self.file.name)
+        self.logger.debug('Flushing file %s', self.location)
         self.file.flush()
 
     def _close(self):
-        self.logger.info('Closing file %s', self.file.name)
+        self.logger.info('Closing file %s', self.location)
         self.file.close()
 
     def _open(self):
@@ -107,13 +182,20 @@ class MetadataJsonWriter(ChunkWriter):
             Patterns.CHUNK_IDX, f'{self.chunk_idx:0{self.chunk_size_digits}}'
         )
         self.lines = 0
+        self.bytes_in_chunk = 0
+        self.chunk_opened_at = time.time()
         self.logger.info('Opening file %s', self.location)
         os.makedirs(os.path.dirname(self.location), exist_ok=True)
-        self.file = open(self.location, 'w')
+        self.file = open_output_file(self.location, self.compression, self.buffer_size)
 
 
 class MetadataJsonSink:
-    """Writes frames metadata to JSON files."""
+    """Writes frames metadata to JSON files.
+
+    When ``write_queue_size`` is set, messages are encoded and written in a
+    background thread, so receiving of the messages is not blocked by
+    the disk I/O.
+    """
 
     def __init__(
         self,
@@ -121,26 +203,70 @@ class MetadataJsonSink:
         skip_frames_without_objects: bool = True,
         chunk_size: int = 0,
         metadata_format: MetadataJsonFormat = MetadataJsonFormat.LEGACY,
+        buffer_size: int = io.DEFAULT_BUFFER_SIZE,
+        compression: Compression = Compression.NONE,
+        rotate_size: int = 0,
+        rotate_interval: float = 0,
+        write_queue_size: int = 0,
     ):
         self.logger = get_logger(f'{LOGGER_NAME}.{self.__class__.__name__}')
         self.skip_frames_without_objects = skip_frames_without_objects
         self.chunk_size = chunk_size
         self.metadata_format = metadata_format
+        self.buffer_size = buffer_size
+        self.compression = compression
+        self.rotate_size = rotate_size
+        self.rotate_interval = rotate_interval
         self.writers: Dict[str, MetadataJsonWriter] = {}
         self.last_writer_per_source: Dict[str, (str, MetadataJsonWriter)] = {}
 
         path, ext = os.path.splitext(location)
         ext = ext or '.json'
-        if self.chunk_size > 0 and Patterns.CHUNK_IDX not in location:
+        is_chunked = self.chunk_size > 0 or self.rotate_size > 0 or rotate_interval > 0
+        if is_chunked and Patterns.CHUNK_IDX not in location:
             path += f'_{Patterns.CHUNK_IDX}'
-        self.location = f'{path}{ext}'
+        self.location = f'{path}{ext}{compression.extension}'
+
+        self.error: Optional[Exception] = None
+        self.write_queue: Optional[Queue] = None
+        self.write_thread: Optional[Thread] = None
+        if write_queue_size > 0:
+            self.write_queue = Queue(write_queue_size)
+            self.write_thread = Thread(target=self._write_messages, daemon=True)
+            self.write_thread.start()
 
     def terminate(self):
+        if self.write_thread is not None:
+            self.write_queue.put(None)
+            self.write_thread.join()
         for file_writer in self.writers.values():
             file_writer.close()
 
     def write(self, zmq_message: ZeroMQMessage):
-        message = zmq_message.message
+        if self.write_queue is None:
+            return self._write_message(zmq_message.message)
+
+        if self.error is not None:
+            raise RuntimeError(f'Failed to write metadata: {self.error}')
+        self.write_queue.put(zmq_message.message)
+        return True
+
+    def _write_messages(self):
+        while True:
+            message = self.write_queue.get()
+            if message is None:
+                break
+            try:
+                self._write_message(message)
+            except Exception as e:
+                self.logger.error('Failed to write metadata: %s', e, exc_info=True)
+                self.error = e
+                # drain the queue so the receiving is not blocked
+                while self.write_queue.get() is not None:
+                    pass
+                break
+
+    def _write_message(self, message: Message):
         message.validate_seq_id()
         if message.is_video_frame():
             return self._write_video_frame(message.as_video_frame())
@@ -165,7 +291,15 @@ class MetadataJsonSink:
         ) or (None, None)
 
         if writer is None:
-            writer = MetadataJsonWriter(location, self.chunk_size, self.metadata_format)
+            writer = MetadataJsonWriter(
+                location,
+                self.chunk_size,
+                self.metadata_format,
+                buffer_size=self.buffer_size,
+                compression=self.compression,
+                rotate_size=self.rotate_size,
+                rotate_interval=self.rotate_interval,
+            )
             self.writers[location] = writer
         if writer is not last_source_writer:
             if last_source_writer is not None:
@@ -269,6 +403,12 @@ def main():
     source_id_prefix = opt_config('SOURCE_ID_PREFIX')
 
     format_enum = opt_config_metadata_format('METADATA_JSON_FORMAT')
+    buffer_size = opt_config('BUFFER_SIZE', 1024 * 1024, int)
+    compression = opt_config('COMPRESSION', Compression.NONE, Compression)
+    rotate_size = opt_config('ROTATE_SIZE', 0, int)
+    rotate_interval = opt_config('ROTATE_INTERVAL', 0, float)
+    background_writing = opt_config('BACKGROUND_WRITING', False, strtobool)
+    write_queue_size = opt_config('WRITE_QUEUE_SIZE', 1000, int)
 
     # possible exceptions will cause app to crash and log error by default
     # no need to handle exceptions here
@@ -283,6 +423,11 @@ def main():
         skip_frames_without_objects,
         chunk_size,
         metadata_format=format_enum,
+        buffer_size=buffer_size,
+        compression=compression,
+        rotate_size=rotate_size,
+        rotate_interval=rotate_interval,
+        write_queue_size=write_queue_size if background_writing else 0,
     )
     logger.info('Metadata JSON sink started with format %s', format_enum.value)
 
@@ -1,6 +1,8 @@
 import asyncio
+import time
 from asyncio import Queue
-from typing import AsyncIterator, Dict, Optional, Tuple, Union
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
 from confluent_kafka import Consumer, KafkaError, TopicPartition
 from redis.asyncio import Redis
@@ -119,39 +121,22 @@ class KafkaRedisSource(BaseKafkaRedisAdapter):
         await self._poller_queue.put(STOP)
         self._logger.info('Poller was stopped')
 
-    async def messages_processor(self):
-        """Process messages from the poller queue and put them to the sender queue.
+    async def process_batch(
+        self,
+        batch: List[Tuple[TopicPartition, bytes]],
+    ) -> List[Tuple[TopicPartition, Union[Tuple[VideoFrame, bytes], EndOfStream]]]:
+        """Process a batch of messages from the poller queue.
 
         Frame content is fetched from Redis and frame metadata is updated.
+        Messages which can't be sent are skipped.
         """
 
-        self._logger.info('Starting deserializer')
-        while self._error is None:
-            self._logger.debug('Waiting for the next message')
-            message = await self._poller_queue.get()
-            if message is STOP:
-                self._logger.debug('Received stop signal')
-                self._poller_queue.task_done()
-                break
-
-            topic_partition, data = message
-
-            try:
-                deserialized = await self.process_message(data)
-            except Exception as e:
-                self._is_running = False
-                self.set_error(f'Failed to deserialize message: {e}')
-                self._poller_queue.task_done()
-                # In case self._poller_queue is full, so poller won't stuck
-                self.clear_queue(self._poller_queue)
-                break
-
-            if deserialized is not None:
-                await self._sender_queue.put((topic_partition, deserialized))
-            self._poller_queue.task_done()
-
-        await self._sender_queue.put(STOP)
-        self._logger.info('Deserializer was stopped')
+        deserialized = await self.process_messages([data for _, data in batch])
+        return [
+            (topic_partition, result)
+            for (topic_partition, _), result in zip(batch, deserialized)
+            if result is not None
+        ]
 
     async def sender(self):
         """Send messages from the sender queue to ZeroMQ socket."""
@@ -171,48 +156,94 @@ class KafkaRedisSource(BaseKafkaRedisAdapter):
             self.clear_queue(self._sender_queue)
         self._logger.info('Sender was stopped')
 
-    async def process_message(
+    async def process_messages(
         self,
-        data: bytes,
-    ) -> Optional[Union[Tuple[VideoFrame, bytes], EndOfStream]]:
-        """Process one message from the poller queue.
+        data: List[bytes],
+    ) -> List[Optional[Union[Tuple[VideoFrame, bytes], EndOfStream]]]:
+        """Process a batch of messages from the poller queue.
 
         Frame content is fetched from Redis and frame metadata is updated.
+        The results are in the same order as the messages.
         """
 
-        message: Message = load_message_from_bytes(data)
-        if message.is_video_frame():
-            video_frame = message.as_video_frame()
-            return await self.fetch_video_frame_content(video_frame)
-        if message.is_end_of_stream():
-            return message.as_end_of_stream()
+        results, redis_frames = await self.run_in_processor(
+            self.deserialize_messages, data
+        )
+        if not redis_frames:
+            return results
+
+        ts = time.time()
+        contents = await self.fetch_contents_from_redis(
+            [video_frame.content.get_location() for _, video_frame in redis_frames]
+        )
+        self.observe_latency('redis-fetch', time.time() - ts, len(redis_frames))
+        for (idx, video_frame), content in zip(redis_frames, contents):
+            if content is None:
+                continue
+            self.count_frame()
+            video_frame.content = VideoFrameContent.external(
+                ExternalFrameType.ZEROMQ.value, None
+            )
+            results[idx] = video_frame, content
 
-        if message.is_unknown():
-            raise RuntimeError(f'Unknown message: {message}')
+        return results
 
-    async def fetch_video_frame_content(
+    def deserialize_messages(
+        self,
+        data: List[bytes],
+    ) -> Tuple[
+        List[Optional[Union[Tuple[VideoFrame, bytes], EndOfStream]]],
+        List[Tuple[int, VideoFrame]],
+    ]:
+        """Deserialize messages.
+
+        :return: The results and the frames with content stored in Redis
+            along with their indexes in the results.
+        """
+
+        results = []
+        redis_frames = []
+        for item in data:
+            message: Message = load_message_from_bytes(item)
+            if message.is_video_frame():
+                video_frame = message.as_video_frame()
+                if self.is_stored_in_redis(video_frame):
+                    redis_frames.append((len(results), video_frame))
+                    results.append(None)
+                else:
+                    results.append(self.get_video_frame_content(video_frame))
+            elif message.is_end_of_stream():
+                results.append(message.as_end_of_stream())
+            elif message.is_unknown():
+                raise RuntimeError(f'Unknown message: {message}')
+            else:
+                results.append(None)
+
+        return results, redis_frames
+
+    def is_stored_in_redis(self, video_frame: VideoFrame) -> bool:
+        """Check if the frame content is stored in Redis."""
+
+        return (
+            video_frame.content.is_external()
+            and video_frame.content.get_method() == ExternalFrameType.REDIS.value
+        )
+
+    def get_video_frame_content(
         self,
         video_frame: VideoFrame,
     ) -> Optional[Tuple[VideoFrame, bytes]]:
-        """Fetch frame content from Redis and update frame metadata."""
+        """Get frame content not stored in Redis and update frame metadata."""
 
         if video_frame.content.is_internal():
             content = video_frame.content.get_data()
 
         elif video_frame.content.is_external():
-            if video_frame.content.get_method() != ExternalFrameType.REDIS.value:
-                self._logger.warning(
-                    'Unsupported external frame type %r',
-                    video_frame.content.get_method(),
-                )
-                return None
-            content = await self.fetch_content_from_redis(
-                video_frame.content.get_location()
+            self._logger.warning(
+                'Unsupported external frame type %r',
+                video_frame.content.get_method(),
             )
-            if content is None:
-                return None
-
-            self.count_frame()
+            return None
 
         else:
             self._logger.warning('Unsupported frame content %r', video_frame.content)
@@ -237,28 +268,57 @@ class KafkaRedisSource(BaseKafkaRedisAdapter):
                 break
             topic_partition, data = message
             yield data
+            if isinstance(data, tuple):
+                self.observe_frame_latency(data[0])
             self._logger.debug('Storing offset %s', topic_partition)
             self._consumer.store_offsets(offsets=[topic_partition])
             self._sender_queue.task_done()
 
-    async def fetch_content_from_redis(self, location: str) -> Optional[bytes]:
-        """Fetch frame content from Redis."""
+    async def fetch_contents_from_redis(
+        self,
+        locations: List[str],
+    ) -> List[Optional[bytes]]:
+        """Fetch frame contents from Redis.
 
-        self._logger.debug('Fetching frame from %r', location)
-        host_port_db, key = location.split('/', 1)
-        frame_client = self._frame_clients.get(host_port_db)
+        Keys are grouped by Redis server and fetched with a single MGET
+        per server. Servers are queried concurrently.
+        """
+
+        keys_by_server: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        for idx, location in enumerate(locations):
+            self._logger.debug('Fetching frame from %r', location)
+            host_port_db, key = location.split('/', 1)
+            keys_by_server[host_port_db].append((idx, key))
+
+        server_contents = await asyncio.gather(
+            *[
+                self.get_frame_client(host_port_db).mget([key for _, key in keys])
+                for host_port_db, keys in keys_by_server.items()
+            ]
+        )
 
+        contents: List[Optional[bytes]] = [None] * len(locations)
+        for keys, values in zip(keys_by_server.values(), server_contents):
+            for (idx, _), content in zip(keys, values):
+                if content is None:
+                    self._logger.warning(
+                        'Failed to fetch frame from %r', locations[idx]
+                    )
+                contents[idx] = content
+
+        return contents
+
+    def get_frame_client(self, host_port_db: str) -> Redis:
+        """Get Redis client for the server, connect if necessary."""
+
+        frame_client = self._frame_clients.get(host_port_db)
         if frame_client is None:
             self._logger.info('Connecting to %r', host_port_db)
             host, port, db = host_port_db.split(':')
             frame_client = Redis(host=host, port=int(port), db=int(db))
             self._frame_clients[host_port_db] = frame_client
 
-        content = await frame_client.get(key)
-        if content is None:
-            self._logger.warning('Failed to fetch frame from %r', location)
-
-        return content
+        return frame_client
 
     def on_consumer_error(self, error: KafkaError):
         """Handle consumer error."""
@@ -1,11 +1,14 @@
+import os
 import signal
 import time
-from typing import Optional, Tuple
+from threading import Lock, Thread
+from typing import Iterator, List, Optional, Set, Tuple
 
-import msgpack
+from savant_rs.primitives import EndOfStream, UserData
 from savant_rs.utils.serialization import Message, load_message_from_bytes
 from savant_rs.zmq import BlockingWriter, WriterConfigBuilder
 
+from adapters.python.shared.message_dump import DumpRecord, MessageDumpSegmentReader
 from savant.utils.config import opt_config, req_config, strtobool
 from savant.utils.log import get_logger, init_logging
 from savant.utils.welcome import get_starting_message
@@ -19,15 +22,49 @@ class Config:
     """Configuration for the adapter."""
 
     def __init__(self):
-        self.playlist_path = req_config('PLAYLIST_PATH')
+        self.playlist_paths: List[str] = req_config('PLAYLIST_PATH').split(',')
         self.zmq_endpoint = req_config('ZMQ_ENDPOINT')
         self.sync_output = opt_config('SYNC_OUTPUT', False, strtobool)
+        self.speed_factor = opt_config('SPEED_FACTOR', 1.0, float)
+        assert self.speed_factor > 0, 'SPEED_FACTOR must be positive'
+        self.target_fps = opt_config('TARGET_FPS', None, float)
+        assert (
+            self.target_fps is None or self.target_fps > 0
+        ), 'TARGET_FPS must be positive'
+        self.clones = opt_config('CLONES', 1, int)
+        assert self.clones > 0, 'CLONES must be positive'
+        self.source_id_template = opt_config(
+            'SOURCE_ID_TEMPLATE',
+            '{source_id}-{clone}' if self.clones > 1 else '{source_id}',
+        )
+        self.stats_log_interval = opt_config('STATS_LOG_INTERVAL', 10, float)
+        self.start_timestamp = opt_config('START_TIMESTAMP', None, float)
+        self.end_timestamp = opt_config('END_TIMESTAMP', None, float)
+        self.source_ids = opt_config(
+            'SOURCE_IDS', None, lambda x: set(x.split(',')) if x else None
+        )
 
 
 class MessageDumpReader:
-    """Reads messages from the message dump file."""
+    """Reads messages from the message dump files.
 
-    def __init__(self, file_path: str):
+    Indexed message dump files are seeked to the start timestamp and only
+    messages from the specified sources are unpacked. Files without an index
+    are unpacked sequentially and filtered.
+
+    :param file_path: Path to the playlist file.
+    :param start_timestamp: Minimal timestamp of the messages, in seconds.
+    :param end_timestamp: Maximal timestamp of the messages, in seconds.
+    :param source_ids: Source IDs of the messages.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        start_timestamp: Optional[float] = None,
+        end_timestamp: Optional[float] = None,
+        source_ids: Optional[Set[str]] = None,
+    ):
         self._logger = get_logger(f'{LOGGER_NAME}.{self.__class__.__name__}')
 
         try:
@@ -35,30 +72,30 @@ class MessageDumpReader:
         except Exception:
             raise ValueError(f'Failed to open a file: {file_path}')
 
-        self._message_dump_file = None
-        self._unpacker = None
+        self._start_ts = (
+            int(start_timestamp * 1e9) if start_timestamp is not None else None
+        )
+        self._end_ts = int(end_timestamp * 1e9) if end_timestamp is not None else None
+        self._source_ids = source_ids
+        self._records: Optional[Iterator[DumpRecord]] = None
         self._next_message_dump_file()
 
     def read(self) -> Optional[Tuple[int, str, Message, bytes]]:
         """Unpack the next message from the file."""
 
-        if not self._unpacker:
+        if not self._records:
             return None
         message = None
         while message is None:
             try:
-                message = self._unpacker.unpack()
-            except msgpack.OutOfData:
+                message = next(self._records)
+            except StopIteration:
                 if not self._next_message_dump_file():
                     return None
             except Exception as e:
                 self._logger.error('Failed to unpack message: %s', e)
                 raise RuntimeError('Failed to unpack message')
 
-        if not isinstance(message, (Tuple, list)) or len(message) != 4:
-            self._logger.error('Invalid message format: %s', message)
-            raise RuntimeError('Invalid message format')
-
         ts, topic, meta, content = message
 
         return ts, bytes(topic).decode(), load_message_from_bytes(meta), content
@@ -66,61 +103,145 @@ class MessageDumpReader:
     def _next_message_dump_file(self):
         """Open the next message dump file from the list."""
 
-        if self._message_dump_file:
-            self._message_dump_file.close()
+        self._close_message_dump_file()
 
         file_path = self._list_file.readline()
         if not file_path:
             return False
 
-        try:
-            self._message_dump_file = open(file_path.strip(), 'rb')
-        except FileNotFoundError:
+        file_path = file_path.strip().decode()
+        if not os.path.exists(file_path):
             self._logger.error('Message dump file not found: %s', file_path)
             raise RuntimeError('Message dump file not found')
-        except OSError as e:
-            self._logger.error(
-                'Failed to open a message dump file [%s]: %s', file_path, e
-            )
-            raise RuntimeError('Failed to open a message dump file')
         try:
-            self._unpacker = msgpack.Unpacker(self._message_dump_file)
+            reader = MessageDumpSegmentReader(
+                file_path,
+                start_ts=self._start_ts,
+                end_ts=self._end_ts,
+                source_ids=self._source_ids,
+            )
         except Exception as e:
-            self._logger.error('Failed to create unpacker for message dump file: %s', e)
-            raise RuntimeError('Failed to create unpacker for message dump file')
+            self._logger.error(
+                'Failed to read index of a message dump file [%s]: %s', file_path, e
+            )
+            raise RuntimeError('Failed to read index of a message dump file')
+        self._logger.info(
+            'Playing message dump file %s (%s)',
+            file_path,
+            'indexed' if reader.is_indexed else 'not indexed',
+        )
+        self._records = iter(reader)
 
         return True
 
+    def _close_message_dump_file(self):
+        if self._records is not None:
+            self._records.close()
+            self._records = None
+
     def __del__(self):
         try:
-            if self._message_dump_file:
-                self._message_dump_file.close()
+            self._close_message_dump_file()
             if self._list_file:
                 self._list_file.close()
         except Exception as e:
             self._logger.error('Failed to clean up the resources: %s', e)
 
 
+class RateStats:
+    """Achieved and requested rate of sending the messages from the dump.
+
+    Speed factor is None when the output is not synchronized,
+    the dump rate is reported unscaled then.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target_rate: Optional[float],
+        speed_factor: Optional[float],
+    ):
+        self._logger = get_logger(f'{LOGGER_NAME}.{self.__class__.__name__}')
+        self._name = name
+        self._target_rate = target_rate
+        self._speed_factor = speed_factor
+        self._start_time = None
+        self._first_ts = None
+        self._last_ts = None
+        self._messages = 0
+
+    def add(self, ts: int):
+        """Count the message sent with the original timestamp in nanoseconds."""
+
+        if self._start_time is None:
+            self._start_time = time.time()
+            self._first_ts = ts
+        self._last_ts = ts
+        self._messages += 1
+
+    def log(self):
+        """Log the achieved and requested rates."""
+
+        if self._messages < 2:
+            return
+        achieved = self._messages / (time.time() - self._start_time)
+        if self._target_rate is not None:
+            requested = f'{self._target_rate:.2f}'
+        elif self._last_ts > self._first_ts:
+            dump_rate = (self._messages - 1) / ((self._last_ts - self._first_ts) / 1e9)
+            if self._speed_factor is not None:
+                dump_rate *= self._speed_factor
+            requested = f'{dump_rate:.2f}'
+        else:
+            requested = 'n/a'
+        self._logger.info(
+            '%s: sent %s messages, achieved rate %.2f msg/s, requested rate %s msg/s',
+            self._name,
+            self._messages,
+            achieved,
+            requested,
+        )
+
+
 class Player:
-    """Receives messages from the dump and sends them to ZeroMQ socket."""
+    """Receives messages from the dump and sends them to ZeroMQ socket.
+
+    Sending is rate-controlled when SYNC_OUTPUT (the original timing scaled
+    by SPEED_FACTOR) or TARGET_FPS is set. Each message is sent CLONES times
+    with source IDs rewritten with SOURCE_ID_TEMPLATE.
+    """
 
     def __init__(
         self,
+        name: str,
         reader: MessageDumpReader,
+        writer: BlockingWriter,
+        writer_lock: Lock,
         config: Config,
     ):
         self._logger = get_logger(f'{LOGGER_NAME}.{self.__class__.__name__}')
+        self._name = name
         self._reader = reader
-
-        config_builder = WriterConfigBuilder(config.zmq_endpoint)
-        self._writer = BlockingWriter(config_builder.build())
+        self._writer = writer
+        self._writer_lock = writer_lock
         self._sync_output = config.sync_output
-        # Last sending time in seconds and last frame timestamp in nanoseconds for synchronization
-        self._last_send_time = None
-        self._last_ts = None
+        self._speed_factor = config.speed_factor
+        self._target_fps = config.target_fps
+        self._clones = config.clones
+        self._source_id_template = config.source_id_template
+        self._stats_log_interval = config.stats_log_interval
+        # Start sending time in seconds and first frame timestamp in nanoseconds for synchronization
+        self._start_time = None
+        self._start_ts = None
+        self._sent_messages = 0
+        self._rate_stats = RateStats(
+            name,
+            config.target_fps,
+            config.speed_factor if config.sync_output else None,
+        )
 
     def play(self):
-        self._writer.start()
+        last_stats_log = time.time()
         message = self._reader.read()
         while message is not None:
             try:
@@ -130,27 +251,83 @@ class Player:
             except Exception as e:
                 self._logger.error('Failed to send message: %s', e)
                 break
-        self._logger.info('There are no more messages to send. Stopping the adapter.')
-        self._writer.shutdown()
+            if time.time() - last_stats_log >= self._stats_log_interval:
+                self._rate_stats.log()
+                last_stats_log = time.time()
+        self._rate_stats.log()
+        self._logger.info('%s: there are no more messages to send.', self._name)
 
     def _send_message(self, ts: int, topic: str, meta: Message, content: bytes):
         """Send a message to the sink ZeroMQ socket. Synchronize the sending if needed."""
 
         self._logger.debug('Sending message to the sink ZeroMQ socket')
 
-        if self._sync_output:
-            if self._last_send_time is not None:
-                delta = (ts - self._last_ts) / 1.0e9 - (
-                    time.time() - self._last_send_time
-                )
-                if delta > 0:
-                    time.sleep(delta)
-                elif delta < 0:
-                    self._logger.warning('Message is late by %f seconds', -delta)
-            self._last_send_time = time.time()
-            self._last_ts = ts
+        self._wait(ts)
+        for clone in range(self._clones):
+            clone_topic, clone_meta = self._rewrite_source_id(topic, meta, clone)
+            with self._writer_lock:
+                self._writer.send_message(clone_topic, clone_meta, content)
+        self._sent_messages += 1
+        self._rate_stats.add(ts)
+
+    def _wait(self, ts: int):
+        """Wait until the message should be sent.
+
+        The sending is scheduled from the start of the playing, so delays
+        of individual messages don't accumulate.
+        """
+
+        if self._target_fps is None and not self._sync_output:
+            return
+
+        if self._start_time is None:
+            self._start_time = time.time()
+            self._start_ts = ts
+            return
+
+        if self._target_fps is not None:
+            send_at = self._start_time + self._sent_messages / self._target_fps
+        else:
+            send_at = (
+                self._start_time + (ts - self._start_ts) / 1.0e9 / self._speed_factor
+            )
+        delta = send_at - time.time()
+        if delta > 0:
+            time.sleep(delta)
+        elif delta < 0:
+            self._logger.debug('Message is late by %f seconds', -delta)
 
-        self._writer.send_message(topic, meta, content)
+    def _rewrite_source_id(
+        self,
+        topic: str,
+        meta: Message,
+        clone: int,
+    ) -> Tuple[str, Message]:
+        """Rewrite source ID of the message for the clone of the stream.
+
+        Source IDs of video frames, EOS and user data are rewritten. Other
+        messages (e.g. video frame batches) are sent with the rewritten topic
+        only.
+        """
+
+        source_id = self._source_id_template.format(source_id=topic, clone=clone)
+        if source_id == topic:
+            return topic, meta
+
+        if meta.is_video_frame():
+            video_frame = meta.as_video_frame().copy()
+            video_frame.source_id = source_id
+            meta = video_frame.to_message()
+        elif meta.is_end_of_stream():
+            meta = EndOfStream(source_id).to_message()
+        elif meta.is_user_data():
+            user_data = meta.as_user_data()
+            rewritten = UserData(source_id)
+            for namespace, name in user_data.attributes:
+                rewritten.set_attribute(user_data.get_attribute(namespace, name))
+            meta = rewritten.to_message()
+
+        return source_id, meta
 
 
 def main():
@@ -161,19 +338,41 @@ def main():
 
     try:
         config = Config()
-        reader = MessageDumpReader(config.playlist_path)
-        player = Player(reader, config)
+        writer = BlockingWriter(WriterConfigBuilder(config.zmq_endpoint).build())
+        writer_lock = Lock()
+        players = []
+        for playlist_path in config.playlist_paths:
+            reader = MessageDumpReader(
+                playlist_path,
+                start_timestamp=config.start_timestamp,
+                end_timestamp=config.end_timestamp,
+                source_ids=config.source_ids,
+            )
+            players.append(Player(playlist_path, reader, writer, writer_lock, config))
     except Exception as e:
         logger.error('Failed to start the adapter: %s', e)
         exit(1)
 
+    writer.start()
     try:
-        player.play()
+        if len(players) == 1:
+            players[0].play()
+        else:
+            # playlists are played concurrently
+            threads = [Thread(target=x.play, daemon=True) for x in players]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(1)
+        logger.info('There are no more messages to send. Stopping the adapter.')
     except KeyboardInterrupt:
         logger.info('Stopping the adapter')
     except Exception as e:
         logger.error('Adapter failed during execution: %s', e)
         exit(1)
+    finally:
+        writer.shutdown()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Run benchmark for drawing labelled objects with the CPU artist.
+
+Compares rasterizing each label on a full-frame overlay (as ArtistGPUMat
+does) with drawing cached label sprites by ArtistNumPy. No GPU is required.
+"""
+
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+import cv2
+import numpy as np
+
+sys.path.append('../')
+
+from savant_rs.primitives.geometry import BBox
+
+from savant.utils.artist import ArtistNumPy, Position
+from savant.utils.artist.artist_numpy import alpha_over
+from savant.utils.artist.position import get_bottom_left_point
+
+scale = 10**3  # milliseconds
+FRAME_WIDTH = 1920
+FRAME_HEIGHT = 1080
+NUM_OBJECTS = 200
+NUM_TRACKS = 300
+FONT_FACE = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def measure(func: Callable[[int], None], n_iters: int) -> List[float]:
+    measurements = []
+    for i in range(n_iters):
+        ts1 = time.perf_counter()
+        func(i)
+        ts2 = time.perf_counter()
+        measurements.append((ts2 - ts1) * scale)
+    return measurements
+
+
+def draw_per_label(frame: np.ndarray, objects):
+    """Rasterize every label on a full-frame overlay and blend the whole frame."""
+
+    overlay = np.zeros_like(frame)
+    for bbox, text in objects:
+        frame[int(bbox.top) : int(bbox.bottom), int(bbox.left) : int(bbox.left) + 2] = (
+            0,
+            255,
+            0,
+            255,
+        )
+        text_size, baseline = cv2.getTextSize(text, FONT_FACE, 0.5, 1)
+        left, bottom = get_bottom_left_point(
+            Position.LEFT_BOTTOM, (int(bbox.left), int(bbox.top)), text_size, baseline
+        )
+        cv2.rectangle(
+            overlay,
+            (left, bottom - text_size[1]),
+            (left + text_size[0], bottom + baseline),
+            (0, 0, 0, 255),
+            cv2.FILLED,
+        )
+        cv2.putText(
+            overlay,
+            text,
+            (left, bottom),
+            FONT_FACE,
+            0.5,
+            (255, 255, 255, 255),
+            1,
+            cv2.LINE_AA,
+        )
+    frame[:] = alpha_over(overlay, frame)
+
+
+def draw_with_artist(frame: np.ndarray, objects):
+    with ArtistNumPy(frame) as artist:
+        for bbox, text in objects:
+            artist.add_bbox(bbox, border_width=2)
+            artist.add_text(
+                text,
+                (int(bbox.left), int(bbox.top)),
+                anchor_point_type=Position.LEFT_BOTTOM,
+            )
+
+
+def main(args):
+    n_iters = int(args[1]) if len(args) > 1 else 100
+
+    rng = np.random.default_rng(0)
+    frame = np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 4), dtype=np.uint8)
+    frame[:, :, 3] = 255
+    # objects keep their tracks between frames, tracks are reassigned slowly
+    frames_objects = []
+    track_ids = rng.choice(NUM_TRACKS, NUM_OBJECTS, replace=False)
+    for _ in range(n_iters):
+        track_ids[rng.integers(0, NUM_OBJECTS)] = rng.integers(0, NUM_TRACKS)
+        centers = rng.random((NUM_OBJECTS, 2)) * (
+            FRAME_WIDTH - 200,
+            FRAME_HEIGHT - 200,
+        ) + (100, 100)
+        frames_objects.append(
+            [
+                (BBox(xc, yc, 60, 120), f'person #{track_id}')
+                for (xc, yc), track_id in zip(centers.tolist(), track_ids.tolist())
+            ]
+        )
+
+    for name, func in (
+        ('per-label', draw_per_label),
+        ('cached sprites', draw_with_artist),
+    ):
+        measurements = measure(lambda i: func(frame, frames_objects[i]), n_iters)
+        metrics = [
+            ('min', min(measurements)),
+            ('max', max(measurements)),
+            ('mean', statistics.mean(measurements)),
+            ('median', statistics.median(measurements)),
+            ('95%', statistics.quantiles(measurements, n=20)[-1]),
+        ]
+        print(
+            f'drawing {NUM_OBJECTS} labelled objects, {name} (ms): '
+            + ', '.join(f'{metric} {val:.3f}' for metric, val in metrics)
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv)
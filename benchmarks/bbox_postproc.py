@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Run benchmark for per-object vs batched post-processing of detected boxes.
+
+Post-processes synthetic converter outputs on CPU, no GPU is required.
+"""
+
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+import numpy as np
+
+sys.path.append('../')
+
+from savant.utils.bbox_postproc import BBoxPostprocessor
+
+scale = 10**3  # milliseconds
+NUM_CLASSES = 80
+NUM_MODEL_CLASSES = 10
+NUM_DETECTIONS = 50
+FRAME_RECT = (0.0, 0.0, 1919.0, 1079.0)
+
+
+def measure(func: Callable[[], None], n_iters: int) -> List[float]:
+    measurements = []
+    for _ in range(n_iters):
+        ts1 = time.perf_counter()
+        func()
+        ts2 = time.perf_counter()
+        measurements.append((ts2 - ts1) * scale)
+    return measurements
+
+
+def postprocess_per_object(bbox_tensor: np.ndarray, frame_rect, class_ids):
+    """Per-object post-processing as done before the batched kernel."""
+
+    bbox_tensor[:, 2] -= bbox_tensor[:, 4] / 2
+    bbox_tensor[:, 3] -= bbox_tensor[:, 5] / 2
+    bbox_tensor[:, 4] += bbox_tensor[:, 2]
+    bbox_tensor[:, 5] += bbox_tensor[:, 3]
+    bbox_tensor[:, 2][bbox_tensor[:, 2] < frame_rect[0]] = frame_rect[0]
+    bbox_tensor[:, 3][bbox_tensor[:, 3] < frame_rect[1]] = frame_rect[1]
+    bbox_tensor[:, 4][bbox_tensor[:, 4] > frame_rect[2]] = frame_rect[2]
+    bbox_tensor[:, 5][bbox_tensor[:, 5] > frame_rect[3]] = frame_rect[3]
+    bbox_tensor[:, 4] -= bbox_tensor[:, 2]
+    bbox_tensor[:, 5] -= bbox_tensor[:, 3]
+    bbox_tensor[:, 2] += bbox_tensor[:, 4] / 2
+    bbox_tensor[:, 3] += bbox_tensor[:, 5] / 2
+    bbox_tensor = np.concatenate(
+        [bbox_tensor, np.zeros((bbox_tensor.shape[0], 1), dtype=np.float32)],
+        axis=1,
+    )
+    bbox_tensor = np.concatenate(
+        [
+            bbox_tensor,
+            np.arange(bbox_tensor.shape[0], dtype=np.float32).reshape(-1, 1),
+        ],
+        axis=1,
+    )
+    for class_id in class_ids:
+        for bbox in bbox_tensor[bbox_tensor[:, 0] == class_id]:
+            bbox[2:7], bbox[1]
+
+
+def main(args):
+    batch_size = int(args[1]) if len(args) > 1 else 64
+    n_iters = int(args[2]) if len(args) > 2 else 100
+
+    rng = np.random.default_rng(0)
+    bbox_tensors = [
+        np.concatenate(
+            [
+                rng.integers(0, NUM_CLASSES, (NUM_DETECTIONS, 1)),
+                rng.random((NUM_DETECTIONS, 1)),
+                rng.random((NUM_DETECTIONS, 2)) * 2000 - 40,
+                rng.random((NUM_DETECTIONS, 2)) * 200,
+            ],
+            axis=1,
+        ).astype(np.float32)
+        for _ in range(batch_size)
+    ]
+    frame_rects = np.array([FRAME_RECT] * batch_size, dtype=np.float32)
+    class_ids = list(range(NUM_MODEL_CLASSES))
+    postprocessor = BBoxPostprocessor(class_ids)
+
+    def per_object():
+        for bbox_tensor in bbox_tensors:
+            postprocess_per_object(bbox_tensor.copy(), FRAME_RECT, class_ids)
+
+    def batched():
+        bboxes = postprocessor(bbox_tensors, frame_rects)
+        for roi_idx in range(batch_size):
+            for class_idx in range(len(class_ids)):
+                for bbox in bboxes.select(roi_idx, class_idx).tolist():
+                    bbox[2:7], bbox[1]
+
+    for name, func in (('per-object', per_object), ('batched', batched)):
+        measurements = measure(func, n_iters)
+        metrics = [
+            ('min', min(measurements)),
+            ('max', max(measurements)),
+            ('mean', statistics.mean(measurements)),
+            ('median', statistics.median(measurements)),
+            ('95%', statistics.quantiles(measurements, n=20)[-1]),
+        ]
+        print(
+            f'bbox post-processing {name} (batch size {batch_size}, ms): '
+            + ', '.join(f'{metric} {val:.3f}' for metric, val in metrics)
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv)
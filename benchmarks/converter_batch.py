@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Run benchmark for per-ROI vs batched model output converters.
+
+Feeds synthetic tensors to the converters on CPU, no GPU is required.
+"""
+
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Callable, List
+
+import numpy as np
+
+sys.path.append('../')
+
+from savant.converter.classifier import TensorToLabelConverter
+from savant.converter.yolo import TensorToBBoxConverter
+
+scale = 10**3  # milliseconds
+MODEL_SIZE = 640
+NUM_DETECTED_CLASSES = 80
+NUM_DETECTIONS = 8400
+NUM_CONFIDENT_DETECTIONS = 50
+NUM_CLASSIFIER_LABELS = 1000
+
+
+def measure(func: Callable[[], None], n_iters: int) -> List[float]:
+    measurements = []
+    for _ in range(n_iters):
+        ts1 = time.perf_counter()
+        func()
+        ts2 = time.perf_counter()
+        measurements.append((ts2 - ts1) * scale)
+    return measurements
+
+
+def yolo_benchmark(batch_size: int):
+    model = SimpleNamespace(
+        input=SimpleNamespace(
+            width=MODEL_SIZE,
+            height=MODEL_SIZE,
+            maintain_aspect_ratio=True,
+        ),
+        output=SimpleNamespace(num_detected_classes=NUM_DETECTED_CLASSES),
+    )
+    rng = np.random.default_rng(0)
+    # YOLOv8 layout: (num_detected_classes + 4) x N
+    output = rng.random(
+        (batch_size, NUM_DETECTED_CLASSES + 4, NUM_DETECTIONS), dtype=np.float32
+    )
+    output[:, :4] *= MODEL_SIZE
+    # most of the scores are below the threshold, some are confident
+    output[:, 4:] *= 0.2
+    for i in range(batch_size):
+        det_idx = rng.choice(NUM_DETECTIONS, NUM_CONFIDENT_DETECTIONS, replace=False)
+        class_idx = rng.integers(0, NUM_DETECTED_CLASSES, NUM_CONFIDENT_DETECTIONS)
+        output[i, 4 + class_idx, det_idx] = 0.9
+    rois = (rng.random((batch_size, 4)) * 500 + 100).astype(np.float32)
+    converter = TensorToBBoxConverter(nms_iou_threshold=0.45)
+
+    def per_roi():
+        for i in range(batch_size):
+            converter(output[i], model=model, roi=tuple(rois[i]))
+
+    def batched():
+        converter.convert_batch(output, model=model, rois=rois)
+
+    return per_roi, batched
+
+
+def classifier_benchmark(batch_size: int):
+    model = SimpleNamespace(
+        output=SimpleNamespace(
+            attributes=[
+                SimpleNamespace(
+                    name='label',
+                    labels=[str(i) for i in range(NUM_CLASSIFIER_LABELS)],
+                    multi_label=False,
+                    threshold=0.5,
+                )
+            ]
+        ),
+    )
+    rng = np.random.default_rng(0)
+    output = rng.random((batch_size, NUM_CLASSIFIER_LABELS), dtype=np.float32) * 10
+    rois = np.zeros((batch_size, 4), dtype=np.float32)
+    converter = TensorToLabelConverter()
+
+    def per_roi():
+        for i in range(batch_size):
+            converter(output[i], model=model, roi=tuple(rois[i]))
+
+    def batched():
+        converter.convert_batch(output, model=model, rois=rois)
+
+    return per_roi, batched
+
+
+BENCHMARKS = {
+    'yolo': yolo_benchmark,
+    'classifier': classifier_benchmark,
+}
+
+
+def main(args):
+    assert (
+        len(args) > 1
+    ), 'Usage: ./converter_batch.py <benchmark-name> [batch-size] [n-iters]'
+    benchmark_name = args[1]
+    assert (
+        benchmark_name in BENCHMARKS
+    ), f'Available benchmark names: {", ".join(BENCHMARKS.keys())}'
+    batch_size = int(args[2]) if len(args) > 2 else 100
+    n_iters = int(args[3]) if len(args) > 3 else 100
+
+    per_roi, batched = BENCHMARKS[benchmark_name](batch_size)
+    for name, func in (('per-roi', per_roi), ('batched', batched)):
+        measurements = measure(func, n_iters)
+        metrics = [
+            ('min', min(measurements)),
+            ('max', max(measurements)),
+            ('mean', statistics.mean(measurements)),
+            ('median', statistics.median(measurements)),
+            ('95%', statistics.quantiles(measurements, n=20)[-1]),
+        ]
+        print(
+            f'{benchmark_name} {name} (batch size {batch_size}, ms): '
+            + ', '.join(f'{metric} {val:.3f}' for metric, val in metrics)
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv)
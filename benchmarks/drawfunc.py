@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Run benchmark for drawing object specs by the default draw function.
+
+Compares looking up and copying the draw spec of each object with the
+compiled render instructions. Draws with a mocked Artist counting the
+calls, so only the Python overhead of the draw function is measured.
+Requires the DeepStream environment to import the draw function,
+no GPU is required.
+"""
+
+import statistics
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Callable, List
+
+import cv2
+import numpy as np
+
+sys.path.append('../')
+
+from savant_rs.draw_spec import LabelPositionKind, ObjectDraw
+from savant_rs.primitives.geometry import BBox
+
+from savant.deepstream.drawfunc import NvDsDrawFunc
+from savant.meta.constants import UNTRACKED_OBJECT_ID
+from savant.utils.artist import Position
+
+scale = 10**3  # milliseconds
+NUM_OBJECTS = 200
+RENDERED_OBJECTS = {
+    'detector': {
+        'person': {
+            'bbox': {'border_color': '00FF00FF', 'padding': {'left': 2, 'top': 2}},
+            'label': {'format': ['{label} #{track_id}', '{confidence:.2f}']},
+            'central_dot': {},
+        },
+        'car': {
+            'bbox': {'border_color': 'FF0000FF'},
+            'label': {'format': ['{label}'], 'position': {'position': 'Center'}},
+        },
+        'face': {'blur': True},
+    }
+}
+
+
+class CountingArtist:
+    """Artist mock counting the calls."""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def add_bbox(self, *args, **kwargs):
+        self.calls['add_bbox'] += 1
+
+    def add_text(self, *args, **kwargs):
+        self.calls['add_text'] += 1
+        return (100, 12), 4
+
+    def add_circle(self, *args, **kwargs):
+        self.calls['add_circle'] += 1
+
+    def blur(self, *args, **kwargs):
+        self.calls['blur'] += 1
+
+
+class PerObjectDrawFunc(NvDsDrawFunc):
+    """Draw function looking up and converting the draw spec of each object."""
+
+    def draw_on_frame(self, frame_meta, artist):
+        for obj_meta in frame_meta.objects:
+            if obj_meta.is_primary:
+                continue
+
+            if len(self.draw_spec) > 0:
+                if (obj_meta.element_name, obj_meta.draw_label) in self.draw_spec:
+                    spec = self.draw_spec[(obj_meta.element_name, obj_meta.draw_label)]
+                    spec = self.override_draw_spec(obj_meta, spec.copy())
+                else:
+                    continue
+            elif obj_meta.track_id != UNTRACKED_OBJECT_ID:
+                spec = self.default_spec_track_id
+            else:
+                spec = self.default_spec_no_track_id
+
+            if spec.blur:
+                artist.blur(obj_meta.bbox)
+            if spec.bounding_box:
+                padding = (
+                    spec.bounding_box.padding.padding
+                    if spec.bounding_box.padding is not None
+                    else (0, 0, 0, 0)
+                )
+                artist.add_bbox(
+                    obj_meta.bbox,
+                    spec.bounding_box.thickness,
+                    spec.bounding_box.border_color.rgba,
+                    spec.bounding_box.background_color.rgba,
+                    padding,
+                )
+            if spec.label:
+                self.draw_label_per_object(obj_meta, artist, spec.label)
+            if spec.central_dot:
+                artist.add_circle(
+                    (round(obj_meta.bbox.xc), round(obj_meta.bbox.yc)),
+                    spec.central_dot.radius,
+                    spec.central_dot.color.rgba,
+                    cv2.FILLED,
+                )
+
+    def draw_label_per_object(self, obj_meta, artist, spec):
+        if spec.position.position == LabelPositionKind.Center:
+            anchor_x = int(obj_meta.bbox.xc)
+            anchor_y = int(obj_meta.bbox.yc)
+            anchor_point = Position.CENTER
+        else:
+            anchor_x = int(obj_meta.bbox.left)
+            anchor_y = int(obj_meta.bbox.top)
+            if spec.position.position == LabelPositionKind.TopLeftInside:
+                anchor_point = Position.LEFT_TOP
+            else:
+                anchor_point = Position.LEFT_BOTTOM
+        anchor_x += spec.position.margin_x
+        anchor_y += spec.position.margin_y
+        padding = spec.padding.padding if spec.padding is not None else (0, 0, 0, 0)
+        if spec.position.position == LabelPositionKind.TopLeftOutside:
+            lines_sequence = reversed(spec.format)
+            offset_sign = -1
+        else:
+            lines_sequence = spec.format
+            offset_sign = 1
+        for format_str in lines_sequence:
+            text = format_str.format(
+                model=obj_meta.element_name,
+                label=obj_meta.draw_label,
+                confidence=obj_meta.confidence,
+                track_id=obj_meta.track_id,
+            )
+            text_size, baseline = artist.add_text(
+                text,
+                (anchor_x, anchor_y),
+                spec.font_scale,
+                spec.thickness,
+                spec.font_color.rgba,
+                1,
+                spec.border_color.rgba,
+                spec.background_color.rgba,
+                padding,
+                anchor_point,
+            )
+            anchor_y += offset_sign * (text_size[1] + baseline)
+
+
+class OverridingDrawFunc(NvDsDrawFunc):
+    """Draw function overriding the draw spec of each object."""
+
+    def override_draw_spec(self, object_meta, draw_spec: ObjectDraw) -> ObjectDraw:
+        return draw_spec
+
+
+def measure(func: Callable[[], None], n_iters: int) -> List[float]:
+    measurements = []
+    for _ in range(n_iters):
+        ts1 = time.perf_counter()
+        func()
+        ts2 = time.perf_counter()
+        measurements.append((ts2 - ts1) * scale)
+    return measurements
+
+
+def main(args):
+    n_iters = int(args[1]) if len(args) > 1 else 1000
+
+    rng = np.random.default_rng(0)
+    labels = ['person', 'car', 'face', 'bicycle']
+    frame_meta = SimpleNamespace(
+        objects=[
+            SimpleNamespace(
+                element_name='detector',
+                draw_label=labels[i % len(labels)],
+                is_primary=False,
+                track_id=i,
+                confidence=float(rng.random()),
+                bbox=BBox(*(rng.random(2) * 1800 + 60).tolist(), 60, 120),
+            )
+            for i in range(NUM_OBJECTS)
+        ]
+    )
+
+    for name, draw_func_cls in (
+        ('per-object specs', PerObjectDrawFunc),
+        ('compiled specs', NvDsDrawFunc),
+        ('compiled specs, overridden', OverridingDrawFunc),
+    ):
+        draw_func = draw_func_cls(condition={}, rendered_objects=RENDERED_OBJECTS)
+        artist = CountingArtist()
+        draw_func.draw_on_frame(frame_meta, artist)
+        calls = dict(artist.calls)
+        measurements = measure(
+            lambda: draw_func.draw_on_frame(frame_meta, artist), n_iters
+        )
+        metrics = [
+            ('min', min(measurements)),
+            ('max', max(measurements)),
+            ('mean', statistics.mean(measurements)),
+            ('median', statistics.median(measurements)),
+            ('95%', statistics.quantiles(measurements, n=20)[-1]),
+        ]
+        print(
+            f'draw func {name} ({NUM_OBJECTS} objects, ms): '
+            + ', '.join(f'{metric} {val:.3f}' for metric, val in metrics)
+        )
+        print(f'  artist calls per frame: {calls}')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Run benchmark for reading image files and parsing their headers
+as ImageSource does.
+
+Usage: ./image_source.py <images-dir> [n-iters]
+
+Compares parsing the header with libmagic and reading the file again
+(when python-magic is installed) to reading the file once and parsing
+the header from the content.
+"""
+
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+sys.path.append('../')
+
+from savant.client.image_source.img_header_parse import (
+    get_image_size_codec,
+    get_image_size_codec_from_buffer,
+)
+
+scale = 10**3  # milliseconds
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+MAGIC_SIZE_PATTERN = re.compile(r'(?<=, )(?P<width>\d+)( x |x)(?P<height>\d+)')
+
+
+def measure(func: Callable[[], None], n_iters: int) -> List[float]:
+    measurements = []
+    for _ in range(n_iters):
+        ts1 = time.perf_counter()
+        func()
+        ts2 = time.perf_counter()
+        measurements.append((ts2 - ts1) * scale)
+    return measurements
+
+
+def read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def main(args):
+    assert len(args) > 1, 'Usage: ./image_source.py <images-dir> [n-iters]'
+    images_dir = args[1]
+    n_iters = int(args[2]) if len(args) > 2 else 10
+    paths = [
+        os.path.join(dir_path, name)
+        for dir_path, _, names in os.walk(images_dir)
+        for name in names
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+    assert paths, f'No JPEG or PNG images found in {images_dir}.'
+
+    def header_and_read():
+        for path in paths:
+            get_image_size_codec(path)
+            read_file(path)
+
+    def single_read():
+        for path in paths:
+            get_image_size_codec_from_buffer(read_file(path))
+
+    benchmarks = [('header-and-read', header_and_read), ('single-read', single_read)]
+    try:
+        import magic
+
+        def libmagic():
+            for path in paths:
+                MAGIC_SIZE_PATTERN.search(magic.from_file(path))
+                read_file(path)
+
+        benchmarks.insert(0, ('libmagic', libmagic))
+    except ImportError:
+        print('python-magic is not installed, skipping libmagic benchmark.')
+
+    for name, func in benchmarks:
+        measurements = measure(func, n_iters)
+        metrics = [
+            ('min', min(measurements)),
+            ('max', max(measurements)),
+            ('mean', statistics.mean(measurements)),
+            ('median', statistics.median(measurements)),
+        ]
+        print(
+            f'image source {name} ({len(paths)} images, ms): '
+            + ', '.join(f'{metric} {val:.3f}' for metric, val in metrics)
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Run benchmark for video frame metadata serialization.
+
+Compares the previous parser querying children of every object with the
+parent index, JSON encoding of the parsed frames and the columnar batch
+parsing on synthetic frames.
+"""
+
+import json
+import random
+import statistics
+import sys
+import time
+
+from savant_rs.match_query import MatchQuery
+from savant_rs.primitives import (
+    Attribute,
+    AttributeValue,
+    VideoFrame,
+    VideoFrameContent,
+)
+from savant_rs.primitives.geometry import RBBox
+
+sys.path.append('../')
+
+from savant.api.parser import (
+    encode_video_frame,
+    parse_video_frame,
+    parse_video_object,
+    parse_video_objects_batch,
+)
+
+scale = 10**3  # milliseconds
+OBJECT_NUMS = [10, 100, 500, 1000]
+BATCH_SIZE = 16
+# share of the detected objects with a child object
+NESTED_SHARE = 0.2
+
+
+def build_frame(n_objects: int, rng: random.Random) -> VideoFrame:
+    frame = VideoFrame(
+        source_id='test',
+        framerate='30/1',
+        width=1920,
+        height=1080,
+        content=VideoFrameContent.none(),
+        codec=None,
+        keyframe=True,
+        pts=0,
+    )
+    for i in range(n_objects):
+        obj = frame.create_object(
+            'detector',
+            rng.choice(['person', 'car', 'truck']),
+            None,
+            rng.random(),
+            RBBox(rng.random() * 1920, rng.random() * 1080, 50, 100, None),
+            i,
+            None,
+            None,
+        )
+        obj.set_attribute(
+            Attribute(
+                'detector',
+                'score',
+                [AttributeValue.float(rng.random(), confidence=None)],
+                None,
+            )
+        )
+        if rng.random() < NESTED_SHARE:
+            frame.create_object(
+                'classifier',
+                'color',
+                obj.id,
+                rng.random(),
+                RBBox(rng.random() * 1920, rng.random() * 1080, 10, 10, None),
+                None,
+                None,
+                None,
+            )
+    return frame
+
+
+def parse_video_objects_per_object(frame: VideoFrame):
+    """Previous implementation of parse_video_objects."""
+
+    parents = {}
+    objects = {}
+    for obj in frame.access_objects(MatchQuery.idle()):
+        for child in frame.get_children(obj.id):
+            parents[child.id] = obj
+        objects[obj.id] = parse_video_object(obj)
+
+    for obj_id, parent in parents.items():
+        child = objects[obj_id]
+        child['parent_model_name'] = parent.namespace
+        child['parent_label'] = parent.label
+        child['parent_object_id'] = parent.track_id
+
+    return list(objects.values())
+
+
+def measure(func, frames, n_iters: int) -> float:
+    measurements = []
+    for _ in range(n_iters):
+        started = time.perf_counter()
+        func(frames)
+        measurements.append((time.perf_counter() - started) * scale / len(frames))
+    return statistics.median(measurements)
+
+
+def main(args):
+    n_iters = int(args[1]) if len(args) > 1 else 10
+    rng = random.Random(0)
+
+    benchmarks = [
+        (
+            'per_object_children_ms',
+            lambda frames: [parse_video_objects_per_object(x) for x in frames],
+        ),
+        (
+            'parent_index_ms',
+            lambda frames: [parse_video_frame(x) for x in frames],
+        ),
+        (
+            'json_dumps_ms',
+            lambda frames: [json.dumps(parse_video_frame(x)) for x in frames],
+        ),
+        (
+            'encode_video_frame_ms',
+            lambda frames: [encode_video_frame(x) for x in frames],
+        ),
+        ('columnar_batch_ms', parse_video_objects_batch),
+    ]
+    print('objects,' + ','.join(name for name, _ in benchmarks))
+    for n_objects in OBJECT_NUMS:
+        frames = [build_frame(n_objects, rng) for _ in range(BATCH_SIZE)]
+        results = [measure(func, frames, n_iters) for _, func in benchmarks]
+        print(f'{n_objects},' + ','.join(f'{x:.3f}' for x in results))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
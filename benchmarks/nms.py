@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Run benchmark for CPU NMS implementations.
+
+Compares the greedy ``nms_cpu`` with the vectorized ``nms_cpu_batched``
+on synthetic crowd scenes and checks that the kept indices are identical.
+"""
+
+import statistics
+import sys
+import time
+from typing import Tuple
+
+import numpy as np
+
+sys.path.append('../')
+
+from savant.utils.nms import nms_cpu, nms_cpu_batched
+
+scale = 10**3  # milliseconds
+BOX_NUMS = [100, 500, 1000, 2000, 5000, 10000, 20000]
+FRAME_WIDTH = 1920
+FRAME_HEIGHT = 1080
+# candidates per object, detectors produce a cluster of boxes for each object
+CLUSTER_SIZE = 20
+IOU_THRESHOLD = 0.45
+
+
+def crowd_scene(n_boxes: int, rng: np.random.Generator) -> Tuple[np.ndarray, ...]:
+    """Boxes (xc, yc, width, height) clustered around the objects and scores."""
+    n_objects = max(1, n_boxes // CLUSTER_SIZE)
+    centers = rng.random((n_objects, 2)) * [FRAME_WIDTH, FRAME_HEIGHT]
+    sizes = rng.random((n_objects, 2)) * [60, 120] + 20
+    objects = rng.integers(0, n_objects, n_boxes)
+    centers = centers[objects] + rng.normal(0, 4, (n_boxes, 2))
+    sizes = sizes[objects] * (1 + rng.normal(0, 0.05, (n_boxes, 2)))
+    bboxes = np.concatenate((centers, sizes), axis=1).astype(np.float32)
+    confidences = rng.random(n_boxes, dtype=np.float32)
+    return bboxes, confidences
+
+
+def main(args):
+    n_iters = int(args[1]) if len(args) > 1 else 10
+    rng = np.random.default_rng(0)
+
+    print('boxes,kept,nms_cpu_ms,nms_cpu_batched_ms,speedup')
+    for n_boxes in BOX_NUMS:
+        bboxes, confidences = crowd_scene(n_boxes, rng)
+        measurements = {nms_cpu: [], nms_cpu_batched: []}
+        for _ in range(n_iters):
+            results = []
+            for func, func_measurements in measurements.items():
+                ts1 = time.perf_counter()
+                results.append(func(bboxes, confidences, IOU_THRESHOLD, n_boxes))
+                ts2 = time.perf_counter()
+                func_measurements.append((ts2 - ts1) * scale)
+            assert np.array_equal(
+                results[0], results[1]
+            ), f'Kept indices differ for {n_boxes} boxes.'
+
+        greedy = statistics.median(measurements[nms_cpu])
+        vectorized = statistics.median(measurements[nms_cpu_batched])
+        print(
+            f'{n_boxes},{len(results[0])},{greedy:.3f},{vectorized:.3f},'
+            f'{greedy / vectorized:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Run latency benchmark for AsyncZeroMQSource over a local ZeroMQ loopback.
+
+Compares the event-driven receiver with the previous implementation
+polling a non-blocking reader every 10 ms.
+"""
+
+import asyncio
+import statistics
+import struct
+import sys
+import threading
+import time
+
+from savant_rs.primitives import EndOfStream
+from savant_rs.zmq import (
+    BlockingWriter,
+    NonBlockingReader,
+    ReaderConfig,
+    WriterConfigBuilder,
+)
+
+sys.path.append('../')
+
+from savant.utils.zeromq import AsyncZeroMQSource
+
+scale = 10**3  # milliseconds
+SOURCE_ID = 'latency-test'
+WRITER_SOCKET = 'pub+bind:ipc:///tmp/zmq-async-latency.ipc'
+READER_SOCKET = 'sub+connect:ipc:///tmp/zmq-async-latency.ipc'
+
+
+class PollingAsyncZeroMQSource(AsyncZeroMQSource):
+    """Previous implementation of AsyncZeroMQSource."""
+
+    def _create_zmq_reader(self, config: ReaderConfig):
+        return NonBlockingReader(config, 10)
+
+    async def next_message(self):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, self.reader.try_receive)
+        while result is None:
+            await asyncio.sleep(0.01)
+            result = await loop.run_in_executor(None, self.reader.try_receive)
+        return self._build_result(result)
+
+    def terminate(self):
+        self.reader.shutdown()
+
+
+def send_messages(n_messages: int, interval: float):
+    config = WriterConfigBuilder(WRITER_SOCKET).build()
+    writer = BlockingWriter(config)
+    writer.start()
+    # wait for the subscriber to connect
+    time.sleep(1)
+    message = EndOfStream(SOURCE_ID).to_message()
+    for _ in range(n_messages):
+        writer.send_message(SOURCE_ID, message, struct.pack('d', time.time()))
+        time.sleep(interval)
+    writer.shutdown()
+
+
+async def receive_messages(source: AsyncZeroMQSource, n_messages: int):
+    latencies = []
+    while len(latencies) < n_messages:
+        message = await source.next_message()
+        if message is None:
+            break
+        (sent_at,) = struct.unpack('d', message.content)
+        latencies.append((time.time() - sent_at) * scale)
+    return latencies
+
+
+def run(source_class, n_messages: int, interval: float):
+    source = source_class(READER_SOCKET)
+    source.start()
+    sender = threading.Thread(target=send_messages, args=(n_messages, interval))
+    sender.start()
+    latencies = asyncio.run(receive_messages(source, n_messages))
+    sender.join()
+    source.terminate()
+    return latencies
+
+
+def main(args):
+    n_messages = int(args[1]) if len(args) > 1 else 1000
+    interval = float(args[2]) if len(args) > 2 else 0.001
+
+    for name, source_class in (
+        ('polling', PollingAsyncZeroMQSource),
+        ('event-driven', AsyncZeroMQSource),
+    ):
+        latencies = run(source_class, n_messages, interval)
+        metrics = [
+            ('received', len(latencies)),
+            ('min', min(latencies)),
+            ('max', max(latencies)),
+            ('mean', statistics.mean(latencies)),
+            ('median', statistics.median(latencies)),
+            ('95%', statistics.quantiles(latencies, n=20)[-1]),
+        ]
+        print(
+            f'{name} latency (ms): '
+            + ', '.join(f'{metric} {val:.3f}' for metric, val in metrics)
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv)
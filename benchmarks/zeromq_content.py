@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Run benchmark for building content of the messages received from ZeroMQ.
+
+Compares joining the data parts of the message with ``get_message_content``
+and measures bytes allocated (copied) per frame for 4K payloads.
+"""
+
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+sys.path.append('../')
+
+from savant.utils.zeromq import get_message_content
+
+scale = 10**3  # milliseconds
+PAYLOADS = {
+    '4k-rgba': 3840 * 2160 * 4,
+    '4k-nv12': 3840 * 2160 * 3 // 2,
+    '4k-h264-keyframe': 1024 * 1024,
+    '4k-h264-delta': 64 * 1024,
+}
+
+
+class ReceivedMessage:
+    """Imitates data parts of ``ReaderResultMessage``."""
+
+    def __init__(self, parts: List[bytes]):
+        self._parts = parts
+
+    def data_len(self) -> int:
+        return len(self._parts)
+
+    def data(self, i: int) -> bytes:
+        return self._parts[i]
+
+
+def join_parts(result: ReceivedMessage) -> bytes:
+    return b''.join(result.data(i) for i in range(result.data_len()))
+
+
+def measure(func: Callable[[ReceivedMessage], bytes], result: ReceivedMessage):
+    """Measure bytes allocated by the function and its execution time."""
+
+    tracemalloc.start()
+    func(result)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    measurements = []
+    for _ in range(10):
+        ts1 = time.perf_counter()
+        func(result)
+        ts2 = time.perf_counter()
+        measurements.append((ts2 - ts1) * scale)
+
+    return peak, statistics.median(measurements)
+
+
+def main(args):
+    n_parts = int(args[1]) if len(args) > 1 else 1
+
+    print('payload,parts,function,bytes_copied,ms')
+    for name, size in PAYLOADS.items():
+        part_size = size // n_parts
+        result = ReceivedMessage([os.urandom(part_size) for _ in range(n_parts)])
+        for func in (join_parts, get_message_content):
+            copied, duration = measure(func, result)
+            print(f'{name},{n_parts},{func.__name__},{copied},{duration:.3f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
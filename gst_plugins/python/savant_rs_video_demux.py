@@ -1,11 +1,13 @@
 """SavantRsVideoDemux element."""
 
+import heapq
 import inspect
+import itertools
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from threading import Event, Lock, Thread
-from typing import Dict, NamedTuple, Optional, Union
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 from pygstsavantframemeta import gst_buffer_get_savant_frame_meta
 from savant_rs.pipeline2 import VideoPipeline
@@ -22,11 +24,13 @@ from savant.gstreamer.utils import (
     on_pad_event,
     required_property,
 )
+from savant.metrics import get_or_create_histogram
 from savant.utils.log import LoggerMixin
 
 DEFAULT_SOURCE_TIMEOUT = 60
 DEFAULT_SOURCE_EVICTION_INTERVAL = 15
 DEFAULT_EOS_ON_FRAME_RESOLUTION_CHANGE = True
+EVICTION_LAG_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 15, 30, 60, 120)
 OUT_CAPS = Gst.Caps.from_string(';'.join(x.value.caps_with_params for x in Codec))
 
 SAVANT_RS_VIDEO_DEMUX_PROPERTIES = {
@@ -170,6 +174,17 @@ class SavantRsVideoDemux(LoggerMixin, Gst.Element):
         self.source_eviction_interval = DEFAULT_SOURCE_EVICTION_INTERVAL
         self.last_eviction = 0
         self.source_lock = Lock()
+        # (deadline, seq, source) entries, one per source. Entries of removed
+        # or refreshed sources are invalidated lazily when popped.
+        self.expiry_queue: List[Tuple[float, int, SourceInfo]] = []
+        self.expiry_seq = itertools.count()
+        self.eviction_lag = get_or_create_histogram(
+            'source_eviction_lag',
+            'Time between source expiration and its eviction',
+            ['element'],
+            EVICTION_LAG_BUCKETS,
+            'seconds',
+        )
         self.is_running = False
         self.expiration_thread = Thread(target=self.eviction_job, daemon=True)
         self.max_parallel_streams: int = 0
@@ -430,6 +445,7 @@ class SavantRsVideoDemux(LoggerMixin, Gst.Element):
                 frame_info.video_frame.source_id, frame_info.params
             )
             self.sources[frame_info.video_frame.source_id] = source_info
+            self.schedule_expiry(source_info, time.time() + self.source_timeout)
 
         return source_info
 
@@ -474,6 +490,7 @@ class SavantRsVideoDemux(LoggerMixin, Gst.Element):
                 if source_info.src_pad is not None:
                     self.remove_source(source_info, send_eos=True)
                 del self.sources[source_id]
+            self.expiry_queue.clear()
         self.logger.debug('Emitting shutdown signal.')
         self.emit('shutdown')
 
@@ -580,27 +597,63 @@ class SavantRsVideoDemux(LoggerMixin, Gst.Element):
         while self.is_running:
             self.eviction_loop()
 
+    def schedule_expiry(self, source_info: SourceInfo, deadline: float):
+        """Schedule the source expiration check. Requires source_lock."""
+
+        heapq.heappush(
+            self.expiry_queue, (deadline, next(self.expiry_seq), source_info)
+        )
+
     def eviction_loop(self):
-        """Eviction job loop."""
+        """Eviction job loop.
+
+        Only sources with passed deadlines are checked. The lock is released
+        after each checked source to not block the frames processing.
+        """
         self.logger.debug('Start eviction loop')
-        with self.source_lock:
-            if not self.is_running:
-                return
-            for source_id, source_info in list(self.sources.items()):
-                if (
-                    not source_info.locked.is_set()
-                    and source_info.timestamp < time.time() - self.source_timeout
-                ):
-                    self.logger.debug('Source %s has expired', source_id)
-                    if source_info.src_pad is not None:
-                        self.remove_source(source_info, send_eos=True)
-                    del self.sources[source_id]
+        n_evicted = 0
+        while self.evict_next_source(time.time()):
+            n_evicted += 1
         self.logger.debug(
-            'Waiting %s seconds for the next eviction loop',
+            'Evicted %s sources. Waiting %s seconds for the next eviction loop',
+            n_evicted,
             self.source_eviction_interval,
         )
         time.sleep(self.source_eviction_interval)
 
+    def evict_next_source(self, now: float) -> bool:
+        """Check the source with the earliest passed deadline and evict it
+        when expired.
+
+        :return: Whether there can be more sources with passed deadlines.
+        """
+
+        with self.source_lock:
+            if not self.is_running:
+                return False
+            if not self.expiry_queue or self.expiry_queue[0][0] > now:
+                return False
+            _, _, source_info = heapq.heappop(self.expiry_queue)
+            if self.sources.get(source_info.source_id) is not source_info:
+                # source has already been removed
+                return True
+            if source_info.locked.is_set():
+                self.schedule_expiry(source_info, now + self.source_eviction_interval)
+                return True
+            deadline = source_info.timestamp + self.source_timeout
+            if deadline > now:
+                # source has received frames since the entry was scheduled
+                self.schedule_expiry(source_info, deadline)
+                return True
+
+            self.logger.debug('Source %s has expired', source_info.source_id)
+            if source_info.src_pad is not None:
+                self.remove_source(source_info, send_eos=True)
+            del self.sources[source_info.source_id]
+
+        self.eviction_lag.observe(now - deadline, (self.get_name(),))
+        return True
+
     def frame_params_equal(self, a: FrameParams, b: FrameParams) -> bool:
         if self.eos_on_frame_resolution_change:
             return a == b
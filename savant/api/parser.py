@@ -1,5 +1,8 @@
-from typing import Tuple, Union
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
+import numpy as np
 from savant_rs.match_query import MatchQuery
 from savant_rs.primitives import (
     Attribute,
@@ -8,6 +11,7 @@ from savant_rs.primitives import (
     VideoFrame,
     VideoFrameTransformation,
     VideoObject,
+    VideoObjectsView,
 )
 from savant_rs.primitives.geometry import BBox, RBBox
 
@@ -34,6 +38,14 @@ _attribute_value_to_python = {
     AttributeValueType.StringList: lambda x: x.as_strings(),
 }
 
+_has_parent_query = MatchQuery.parent_defined()
+# for frames with fewer objects requesting children of each object
+# is faster than deserializing the frame
+_parent_index_min_objects = 32
+
+# encoder is reused for all frames, parsed metadata has no circular references
+_json_encoder = json.JSONEncoder(check_circular=False)
+
 
 def parse_video_frame(frame: VideoFrame):
     # TODO: add content to metadata if its not embedded
@@ -79,21 +91,74 @@ def parse_tags(frame: VideoFrame):
     }
 
 
-def parse_video_objects(frame: VideoFrame):
-    parents = {}
-    objects = {}
-    for obj in frame.access_objects(MatchQuery.idle()):
-        for child in frame.get_children(obj.id):
-            parents[child.id] = obj
-        objects[obj.id] = parse_video_object(obj)
+def encode_video_frame(frame: VideoFrame, **extra: Any) -> str:
+    """Parse the frame and encode it to a JSON string.
+
+    :param frame: Video frame.
+    :param extra: Extra fields to add to the parsed frame.
+    """
+
+    parsed = parse_video_frame(frame)
+    parsed.update(extra)
+    return _json_encoder.encode(parsed)
+
+
+def get_parents(
+    frame: VideoFrame,
+    objects: Optional[VideoObjectsView] = None,
+) -> Dict[int, VideoObject]:
+    """Build an index of parent objects by child object IDs.
+
+    Requesting children of an object scans all objects of the frame, so for
+    crowded frames the parent IDs are taken from the serialized frame in one
+    pass instead. Frames without nested objects are indexed with a single query.
+
+    :param frame: Video frame.
+    :param objects: All objects of the frame, if already requested.
+    """
+
+    if not frame.access_objects(_has_parent_query):
+        return {}
 
-    for obj_id, parent in parents.items():
-        child = objects[obj_id]
-        child['parent_model_name'] = parent.namespace
-        child['parent_label'] = parent.label
-        child['parent_object_id'] = parent.track_id
+    if objects is None:
+        objects = frame.access_objects(MatchQuery.idle())
+    if len(objects) < _parent_index_min_objects:
+        parents = {}
+        for obj in objects:
+            for child_id in frame.get_children(obj.id).ids:
+                parents[child_id] = obj
+        return parents
+
+    parent_ids = {
+        obj['id']: obj['parent_id']
+        for obj in json.loads(frame.json)['objects']
+        if obj.get('parent_id') is not None
+    }
+    parent_objects = {
+        obj.id: obj
+        for obj in frame.access_objects_with_ids(list(set(parent_ids.values())))
+    }
+
+    return {
+        child_id: parent_objects[parent_id]
+        for child_id, parent_id in parent_ids.items()
+    }
+
+
+def parse_video_objects(frame: VideoFrame):
+    objects = frame.access_objects(MatchQuery.idle())
+    parents = get_parents(frame, objects)
+    parsed_objects = []
+    for obj in objects:
+        parsed = parse_video_object(obj)
+        parent = parents.get(obj.id)
+        if parent is not None:
+            parsed['parent_model_name'] = parent.namespace
+            parsed['parent_label'] = parent.label
+            parsed['parent_object_id'] = parent.track_id
+        parsed_objects.append(parsed)
 
-    return list(objects.values())
+    return parsed_objects
 
 
 def parse_video_object(obj: VideoObject):
@@ -164,3 +229,84 @@ def parse_transformation(transformation: VideoFrameTransformation):
         width, height = transformation.as_scale
         return {'type': 'scale', 'width': width, 'height': height}
     raise ValueError(f'Unknown transformation type: {transformation}')
+
+
+@dataclass
+class VideoObjectsBatch:
+    """Objects of a batch of frames in columnar form.
+
+    Row ``i`` of each array describes the same object.
+    """
+
+    frame_idx: np.ndarray
+    """Index of the object frame in the batch, int32."""
+
+    bboxes: np.ndarray
+    """Detection boxes ``(xc, yc, width, height, angle)``, float32 of shape (N, 5)."""
+
+    confidences: np.ndarray
+    """Object confidences, float32, NaN when not set."""
+
+    track_ids: np.ndarray
+    """Object track IDs, uint64, ``UNTRACKED_OBJECT_ID`` for untracked objects."""
+
+    parent_idx: np.ndarray
+    """Row of the parent object in the batch, int32, -1 for objects without a parent."""
+
+    model_names: np.ndarray
+    """Indices of object model names in :py:attr:`names`, int32."""
+
+    labels: np.ndarray
+    """Indices of object labels in :py:attr:`names`, int32."""
+
+    names: List[str]
+    """Model names and labels of the objects."""
+
+    def __len__(self):
+        return len(self.frame_idx)
+
+
+def parse_video_objects_batch(frames: Iterable[VideoFrame]) -> VideoObjectsBatch:
+    """Parse objects of the frames to columnar form.
+
+    :param frames: Video frames.
+    """
+
+    names: Dict[str, int] = {}
+    frame_idx = []
+    bboxes = []
+    confidences = []
+    track_ids = []
+    parent_ids = []
+    model_names = []
+    labels = []
+    rows: Dict[Tuple[int, int], int] = {}
+    for i, frame in enumerate(frames):
+        objects = frame.access_objects(MatchQuery.idle())
+        parents = get_parents(frame, objects)
+        for obj in objects:
+            rows[i, obj.id] = len(frame_idx)
+            frame_idx.append(i)
+            bbox = obj.detection_box
+            bboxes.append((bbox.xc, bbox.yc, bbox.width, bbox.height, bbox.angle or 0))
+            confidence = obj.confidence
+            confidences.append(np.nan if confidence is None else confidence)
+            track_id = obj.track_id
+            track_ids.append(UNTRACKED_OBJECT_ID if track_id is None else track_id)
+            parent = parents.get(obj.id)
+            parent_ids.append(None if parent is None else (i, parent.id))
+            model_names.append(names.setdefault(obj.namespace, len(names)))
+            labels.append(names.setdefault(obj.label, len(names)))
+
+    return VideoObjectsBatch(
+        frame_idx=np.array(frame_idx, dtype=np.int32),
+        bboxes=np.array(bboxes, dtype=np.float32).reshape(-1, 5),
+        confidences=np.array(confidences, dtype=np.float32),
+        track_ids=np.array(track_ids, dtype=np.uint64),
+        parent_idx=np.array(
+            [-1 if x is None else rows[x] for x in parent_ids], dtype=np.int32
+        ),
+        model_names=np.array(model_names, dtype=np.int32),
+        labels=np.array(labels, dtype=np.int32),
+        names=list(names),
+    )
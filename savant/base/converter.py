@@ -39,6 +39,33 @@ class BaseOutputConverter(BasePyFuncCallableImpl):
     ) -> Any:
         """Converts raw model output tensors to a model specific representation."""
 
+    def convert_batch(
+        self,
+        *output_layers: Union[np.ndarray, cp.ndarray],
+        model: ObjectModel,
+        rois: np.ndarray,
+    ) -> List[Any]:
+        """Converts raw model output tensors of a batch of ROIs at once.
+
+        Optional, implement it to let the model output processor call the
+        converter once per batch instead of once per ROI. The result must be
+        the same as calling the converter for each ROI separately.
+
+        :param output_layers: Model output layer tensors stacked along
+            the first axis, each tensor has shape ``(N, *layer_shape)``.
+        :param model: Model.
+        :param rois: ``(N, 4)`` array of ``[left, top, width, height]``
+            of the rectangles on which the model infers.
+        :return: List of ``N`` converted outputs, one per ROI, in the
+            :py:meth:`__call__` output format.
+        """
+        raise NotImplementedError
+
+    @property
+    def is_batched(self) -> bool:
+        """Whether the converter implements :py:meth:`convert_batch`."""
+        return type(self).convert_batch is not BaseOutputConverter.convert_batch
+
 
 class BaseObjectModelOutputConverter(BaseOutputConverter):
     """Base object model output converter."""
@@ -3,6 +3,7 @@ from typing import Optional
 from savant.client.log_provider import LogProvider
 from savant.client.runner.sink import AsyncSinkRunner, SinkRunner
 from savant.utils.log import get_logger
+from savant.utils.zeromq import Defaults
 
 logger = get_logger(__name__)
 
@@ -53,6 +54,7 @@ class SinkBuilder:
         module_health_check_interval: float = 5,
         source_id: Optional[str] = None,
         source_id_prefix: Optional[str] = None,
+        receive_prefetch: int = Defaults.RECEIVE_PREFETCH,
     ):
         self._socket = socket
         self._log_provider = log_provider
@@ -62,6 +64,7 @@ class SinkBuilder:
         self._module_health_check_interval = module_health_check_interval
         self._source_id = source_id
         self._source_id_prefix = source_id_prefix
+        self._receive_prefetch = receive_prefetch
 
     def with_socket(self, socket: str) -> 'SinkBuilder':
         """Set ZeroMQ socket for Sink."""
@@ -116,6 +119,14 @@ class SinkBuilder:
         """
         return self._with_field('source_id_prefix', source_id_prefix)
 
+    def with_receive_prefetch(self, receive_prefetch: int) -> 'SinkBuilder':
+        """Set the number of messages received in advance for async Sink.
+
+        Async Sink receives messages in a background thread while the previous
+        ones are processed. Not used by the sync Sink.
+        """
+        return self._with_field('receive_prefetch', receive_prefetch)
+
     def build(self) -> SinkRunner:
         """Build Sink."""
 
@@ -154,6 +165,7 @@ class SinkBuilder:
             module_health_check_interval=self._module_health_check_interval,
             source_id=self._source_id,
             source_id_prefix=self._source_id_prefix,
+            receive_prefetch=self._receive_prefetch,
         )
 
     def __repr__(self):
@@ -166,7 +178,8 @@ class SinkBuilder:
             f'module_health_check_timeout={self._module_health_check_timeout}, '
             f'module_health_check_interval={self._module_health_check_interval}, '
             f'source_id={self._source_id}, '
-            f'source_id_prefix={self._source_id_prefix})'
+            f'source_id_prefix={self._source_id_prefix}, '
+            f'receive_prefetch={self._receive_prefetch})'
         )
 
     def _with_field(self, field: str, value) -> 'SinkBuilder':
@@ -180,6 +193,7 @@ class SinkBuilder:
                 'module_health_check_interval': self._module_health_check_interval,
                 'source_id': self._source_id,
                 'source_id_prefix': self._source_id_prefix,
+                'receive_prefetch': self._receive_prefetch,
                 field: value,
             }
         )
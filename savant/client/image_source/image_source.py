@@ -14,7 +14,7 @@ from savant.api.enums import ExternalFrameType
 from savant.client.frame_source import FrameSource
 from savant.utils.log import get_logger
 
-from .img_header_parse import get_image_size_codec
+from .img_header_parse import get_image_size_codec_from_buffer
 
 SECOND_IN_NS = 10**9
 T = TypeVar('T', bound='ImageSource')
@@ -98,13 +98,13 @@ class ImageSource(FrameSource):
         return self._update_param('updates', self._updates + [update])
 
     def build_frame(self) -> Tuple[VideoFrame, bytes]:
-        width, height, codec = get_image_size_codec(self._file)
-
+        # the file is read once, the header is parsed from the content
         if isinstance(self._file, (str, PathLike)):
             with open(self._file, 'rb') as f:
                 content = f.read()
         else:
             content = self._file.read()
+        width, height, codec = get_image_size_codec_from_buffer(content)
 
         video_frame = VideoFrame(
             source_id=self._source_id,
@@ -1,40 +1,116 @@
 """Image header parse utility."""
 
-import re
+import struct
 from os import PathLike
-from typing import BinaryIO, Tuple, Union
+from typing import BinaryIO, Callable, Tuple, Union
 
-import magic
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+JPEG_SOI = b'\xff\xd8'
 
-# positive lookbehind is included to avoid matching density in the JPEG header
-PATTERN = re.compile(r'(?<=, )(?P<width>\d+)( x |x)(?P<height>\d+)')
+# start of frame markers, DHT (0xC4), JPG (0xC8) and DAC (0xCC) are not SOF
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# markers without a segment: TEM, RST0-RST7, SOI, EOI
+JPEG_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xDA)])
+JPEG_SOS_MARKER = 0xDA
+
+ReadAt = Callable[[int, int], bytes]
 
 
 def get_image_size_codec(file: Union[str, PathLike, BinaryIO]) -> Tuple[int, int, str]:
     """Get JPEG or PNG image width and height by parsing the file header.
+
+    Only the header is read: the file is parsed up to the JPEG SOF segment
+    or the PNG IHDR chunk. Position of a file handle is restored.
+
     :param file: Path to an image file or a file handle to an image file opened as binary.
     :return: Image width, height and codec.
     """
     if hasattr(file, 'read') and hasattr(file, 'seek'):
-        # read only the first 512 KB of the file hoping that the SOF header segment is there
-        magic_out = magic.from_buffer(file.read(512 * 1024))
-        file.seek(0)
+        start = file.tell()
+        try:
+            return parse_image_header(_file_reader(file, start))
+        finally:
+            file.seek(start)
     elif isinstance(file, (str, PathLike)):
-        magic_out = magic.from_file(file)
+        with open(file, 'rb') as f:
+            return parse_image_header(_file_reader(f, 0))
     else:
         raise ValueError('File path or file handle is expected.')
 
+
+def get_image_size_codec_from_buffer(buffer: bytes) -> Tuple[int, int, str]:
+    """Get JPEG or PNG image width and height by parsing the header
+    of the image in a buffer.
+
+    :param buffer: Image file content.
+    :return: Image width, height and codec.
+    """
+    view = memoryview(buffer)
+    return parse_image_header(lambda offset, size: view[offset : offset + size])
+
+
+def parse_image_header(read_at: ReadAt) -> Tuple[int, int, str]:
+    """Get JPEG or PNG image width and height by parsing the image header.
+
+    :param read_at: Function to read bytes of the image at the offset,
+        returns less bytes at the end of the image.
+    :return: Image width, height and codec.
+    """
     # codec str should correspond to savant.gstreamer.codecs.Codec enum values
     # can't import directly because of extra dependencies (gstreamer)
     # that aren't going to be present in all the adapter images
-    if magic_out.startswith('JPEG image data'):
-        codec = 'jpeg'
-    elif magic_out.startswith('PNG image data'):
-        codec = 'png'
-    else:
-        raise ValueError('Not a JPEG or PNG file.')
+    signature = bytes(read_at(0, len(PNG_SIGNATURE)))
+    if signature == PNG_SIGNATURE:
+        return (*_parse_png_size(read_at), 'png')
+    if signature.startswith(JPEG_SOI):
+        return (*_parse_jpeg_size(read_at), 'jpeg')
+    raise ValueError('Not a JPEG or PNG file.')
+
+
+def _parse_png_size(read_at: ReadAt) -> Tuple[int, int]:
+    # IHDR is the first chunk: length, type, width, height
+    chunk = read_at(len(PNG_SIGNATURE), 16)
+    if len(chunk) < 16 or chunk[4:8] != b'IHDR':
+        raise ValueError('Failed to get image size from image header.')
+    width, height = struct.unpack('>II', chunk[8:16])
+    return width, height
+
+
+def _parse_jpeg_size(read_at: ReadAt) -> Tuple[int, int]:
+    offset = len(JPEG_SOI)
+    while True:
+        data = read_at(offset, 2)
+        if len(data) < 2 or data[0] != 0xFF:
+            break
+        marker = data[1]
+        if marker == 0xFF:
+            # fill byte
+            offset += 1
+            continue
+        offset += 2
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == JPEG_SOS_MARKER:
+            # entropy-coded data, SOF must precede it
+            break
+
+        segment = read_at(offset, 7)
+        if len(segment) < 2:
+            break
+        if marker in JPEG_SOF_MARKERS:
+            if len(segment) < 7:
+                break
+            # length, precision, height, width
+            height, width = struct.unpack('>HH', segment[3:7])
+            return width, height
+        offset += struct.unpack('>H', segment[:2])[0]
 
-    match = PATTERN.search(magic_out)
-    if match:
-        return int(match['width']), int(match['height']), codec
     raise ValueError('Failed to get image size from image header.')
+
+
+def _file_reader(file: BinaryIO, start: int) -> ReadAt:
+    def read_at(offset: int, size: int) -> bytes:
+        file.seek(start + offset)
+        return file.read(size)
+
+    return read_at
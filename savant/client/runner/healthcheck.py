@@ -1,9 +1,12 @@
-import time
+import asyncio
+import threading
+import weakref
 from http import HTTPStatus
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import requests
 from requests import JSONDecodeError, RequestException
+from requests.adapters import HTTPAdapter
 
 from savant.utils.log import get_logger
 
@@ -13,9 +16,15 @@ logger = get_logger(__name__)
 class HealthCheck:
     """Service to check the health of the module.
 
+    The module status is polled by a background thread started on the first
+    wait. The thread reuses a pooled HTTP connection. Waiting for a running
+    module reads the last polled status without locks and without requests
+    to the module.
+
     :param url: URL of the health check endpoint.
     :param interval: Interval between health checks in seconds.
     :param timeout: Timeout for waiting the module to be ready in seconds.
+    :param request_timeout: Timeout for a health check request in seconds.
     """
 
     def __init__(
@@ -23,19 +32,35 @@ class HealthCheck:
         url: str,
         interval: float,
         timeout: float,
+        request_timeout: float = 5,
     ):
         self._url = url
         self._check_interval = interval
         self._wait_timeout = timeout
-        self._last_check_ts = 0
+        self._request_timeout = request_timeout
         self._last_status = None
 
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop_event = threading.Event()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._monitor: Optional[threading.Thread] = None
+
+    @property
+    def last_status(self) -> Optional[str]:
+        """Last polled status of the module."""
+        return self._last_status
+
     def check(self) -> Optional[str]:
         """Check the health of the module."""
 
         logger.debug('Checking module status.')
         try:
-            response = requests.get(self._url)
+            response = self._session.get(self._url, timeout=self._request_timeout)
         except RequestException as e:
             logger.warning('Health check failed. Error: %s.', e)
             return None
@@ -66,39 +91,94 @@ class HealthCheck:
     def wait_module_is_ready(self):
         """Wait until the module is ready."""
 
-        if time.time() - self._last_check_ts >= self._check_interval:
-            self._last_status = self.check()
-            self._last_check_ts = time.time()
+        if self._last_status == 'running':
+            return
 
-        time_limit = time.time() + self._wait_timeout
-        while self._last_status != 'running':
-            if time.time() > time_limit:
-                raise TimeoutError(
-                    f'Module is not ready after {self._wait_timeout} seconds.'
-                )
-            time.sleep(self._check_interval)
-            self._last_status = self.check()
-            self._last_check_ts = time.time()
+        self._start_monitor()
+        if not self._ready.wait(self._wait_timeout):
+            raise TimeoutError(
+                f'Module is not ready after {self._wait_timeout} seconds.'
+            )
 
     async def async_check(self) -> Optional[str]:
-        import asyncio
-
         return await asyncio.get_running_loop().run_in_executor(None, self.check)
 
     async def async_wait_module_is_ready(self):
         """Wait until the module is ready. Async version."""
-        import asyncio
 
-        if time.time() - self._last_check_ts >= self._check_interval:
-            self._last_status = await self.async_check()
-            self._last_check_ts = time.time()
+        if self._last_status == 'running':
+            return
 
-        time_limit = time.time() + self._wait_timeout
-        while self._last_status != 'running':
-            if time.time() > time_limit:
-                raise TimeoutError(
-                    f'Module is not ready after {self._wait_timeout} seconds.'
+        self._start_monitor()
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            if self._ready.is_set():
+                return
+            self._async_waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter[1], self._wait_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f'Module is not ready after {self._wait_timeout} seconds.'
+            ) from None
+        finally:
+            with self._lock:
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+
+    def close(self):
+        """Stop polling the module status."""
+
+        self._stop_event.set()
+        self._session.close()
+
+    def _start_monitor(self):
+        if self._monitor is not None:
+            return
+        with self._lock:
+            if self._monitor is None:
+                self._monitor = threading.Thread(
+                    target=_monitor_health,
+                    args=(weakref.ref(self),),
+                    name='HealthCheck',
+                    daemon=True,
                 )
-            await asyncio.sleep(self._check_interval)
-            self._last_status = await self.async_check()
-            self._last_check_ts = time.time()
+                self._monitor.start()
+
+    def _set_status(self, status: Optional[str]):
+        with self._lock:
+            self._last_status = status
+            if status != 'running':
+                self._ready.clear()
+                return
+            self._ready.set()
+            waiters, self._async_waiters = self._async_waiters, []
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve_waiter, future)
+            except RuntimeError:
+                # the loop of the waiter is closed
+                pass
+
+
+def _monitor_health(health_check_ref: 'weakref.ref[HealthCheck]'):
+    """Poll the module status until the health check is closed or collected."""
+
+    while True:
+        health_check = health_check_ref()
+        if health_check is None or health_check._stop_event.is_set():
+            return
+        health_check._set_status(health_check.check())
+        interval = health_check._check_interval
+        stop_event = health_check._stop_event
+        # don't keep the health check alive while waiting
+        del health_check
+        if stop_event.wait(interval):
+            return
+
+
+def _resolve_waiter(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
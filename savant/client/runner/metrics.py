@@ -0,0 +1,17 @@
+from savant.metrics import HistogramFamily, get_or_create_histogram
+
+
+def get_latency_histogram() -> HistogramFamily:
+    """Histogram of the client latencies by stage, in seconds.
+
+    Stages:
+    - source_build: building a frame from a frame source;
+    - source_prepare: preparing a message for a frame;
+    - source_send: sending a message to ZeroMQ socket;
+    - sink_end_to_end: time from the frame creation to receiving it by the sink.
+    """
+    return get_or_create_histogram(
+        'client_stage_latency',
+        'Latency of the client stages, in seconds',
+        ['stage'],
+    )
@@ -16,6 +16,7 @@ from savant.utils.zeromq import AsyncZeroMQSource, Defaults, ZeroMQMessage, Zero
 
 from .healthcheck import HealthCheck
 from .log_result import LogResult
+from .metrics import get_latency_histogram
 
 logger = get_logger(__name__)
 
@@ -64,6 +65,7 @@ class BaseSinkRunner(ABC):
             if module_health_check_url is not None
             else None
         )
+        self._latency_histogram = get_latency_histogram()
         self._source = self._build_zeromq_source(
             socket, receive_timeout, receive_hwm, source_id, source_id_prefix
         )
@@ -101,6 +103,7 @@ class BaseSinkRunner(ABC):
                 video_frame.source_id,
                 video_frame.pts,
             )
+            self._observe_frame_latency(video_frame)
             content = zmq_message.content
             if not zmq_message.content:
                 content = None
@@ -122,6 +125,8 @@ class BaseSinkRunner(ABC):
                 'Received video frame batch with %s frames.',
                 len(video_frame_batch.frames),
             )
+            for video_frame in video_frame_batch.frames:
+                self._observe_frame_latency(video_frame)
             return SinkResult(
                 frame_meta=None,
                 frame_content=None,
@@ -145,6 +150,10 @@ class BaseSinkRunner(ABC):
 
         raise Exception('Unknown message type')
 
+    def _observe_frame_latency(self, video_frame: VideoFrame):
+        frame_age = time.time_ns() - video_frame.creation_timestamp_ns
+        self._latency_histogram.observe(max(frame_age, 0) / 1e9, ('sink_end_to_end',))
+
 
 class SinkRunner(BaseSinkRunner):
     """Receives messages from ZeroMQ socket."""
@@ -197,10 +206,22 @@ class SinkRunner(BaseSinkRunner):
 
 
 class AsyncSinkRunner(BaseSinkRunner):
-    """Receives messages from ZeroMQ socket asynchronously."""
+    """Receives messages from ZeroMQ socket asynchronously.
+
+    :param receive_prefetch: Maximum number of messages received in advance.
+    """
 
     _source: AsyncZeroMQSource
 
+    def __init__(
+        self,
+        *args,
+        receive_prefetch: int = Defaults.RECEIVE_PREFETCH,
+        **kwargs,
+    ):
+        self._receive_prefetch = receive_prefetch
+        super().__init__(*args, **kwargs)
+
     def _build_zeromq_source(
         self,
         socket: str,
@@ -216,6 +237,7 @@ class AsyncSinkRunner(BaseSinkRunner):
             set_ipc_socket_permissions=None,
             source_id=source_id,
             source_id_prefix=source_id_prefix,
+            prefetch=self._receive_prefetch,
         )
 
     async def __anext__(self) -> SinkResult:
@@ -1,6 +1,19 @@
 import asyncio
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import AsyncIterable, Iterable, Optional, Set, Tuple, Union
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from savant_rs.pipeline2 import (
     StageFunction,
@@ -25,6 +38,7 @@ from savant.utils.zeromq import Defaults
 
 from .healthcheck import HealthCheck
 from .log_result import LogResult
+from .metrics import get_latency_histogram
 
 logger = get_logger(__name__)
 
@@ -46,6 +60,47 @@ class SourceResult(LogResult):
     """Status of sending the message."""
 
 
+@dataclass
+class SendStats:
+    """Statistics of sending sources with ``send_iter``.
+
+    Stage times are totals in seconds. With prefetching, frames are built
+    in the prefetch threads in parallel with sending, so the stage times
+    can add up to more than the elapsed time.
+    """
+
+    frames: int = 0
+    """Number of sent frames, including frames in batches."""
+    elapsed: float = 0
+    """Time elapsed from the start of sending."""
+    build: float = 0
+    """Time of building frames from frame sources."""
+    prepare: float = 0
+    """Time of preparing messages for the frames."""
+    send: float = 0
+    """Time of sending messages to ZeroMQ socket."""
+    wait: float = 0
+    """Time of waiting for the prefetched frames."""
+
+    @property
+    def fps(self) -> float:
+        """Achieved frames per second."""
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+    def log(self):
+        logger.info(
+            'Sent %s frames in %.3f s (%.1f frames/s). Stages: build %.3f s, '
+            'prepare %.3f s, send %.3f s, prefetch wait %.3f s.',
+            self.frames,
+            self.elapsed,
+            self.fps,
+            self.build,
+            self.prepare,
+            self.send,
+            self.wait,
+        )
+
+
 class SourceRunner:
     """Sends messages to ZeroMQ socket."""
 
@@ -86,6 +141,10 @@ class SourceRunner:
 
         self._last_send_time = 0
         self._writer = self._build_zeromq_writer(config)
+        self._latency_histogram = get_latency_histogram()
+        # statistics of the running and the last send_iter call
+        self._send_stats: Optional[SendStats] = None
+        self._last_send_stats: Optional[SendStats] = None
 
         self._pipeline_stage_name = 'savant-client'
         self._pipeline = VideoPipeline(
@@ -140,31 +199,51 @@ class SourceRunner:
 
         return result
 
+    @property
+    def send_stats(self) -> Optional[SendStats]:
+        """Statistics of the running or the last ``send_iter`` call."""
+        return self._last_send_stats
+
     def send_iter(
         self,
         sources: Iterable[SourceAndEos],
         send_eos: bool = True,
+        prefetch: int = 0,
     ) -> Iterable[SourceResult]:
         """Send multiple sources to ZeroMQ socket.
 
         :param sources: Frame sources to send.
         :param send_eos: Whether to send EOS after sending sources.
+        :param prefetch: Number of frames built from frame sources in advance
+            in a thread pool while the current frame is being sent.
+            0 means frames are built sequentially. Sources are sent
+            in the original order.
         :return: Results of sending the sources.
         """
 
-        source_ids = set()
-        for source in sources:
-            if isinstance(source, EndOfStream):
-                self.send_eos(source.source_id)
-                source_ids.remove(source.source_id)
-                continue
-
-            result = self.send(source, send_eos=False)
-            source_ids.update(result.source_ids)
-            yield result
-        if send_eos:
-            for source_id in source_ids:
-                self.send_eos(source_id)
+        stats = self._send_stats = self._last_send_stats = SendStats()
+        started = time.perf_counter()
+        if prefetch > 0:
+            sources = self._prefetch_frames(sources, prefetch)
+        try:
+            source_ids = set()
+            for source in sources:
+                if isinstance(source, EndOfStream):
+                    self.send_eos(source.source_id)
+                    source_ids.remove(source.source_id)
+                    continue
+
+                result = self.send(source, send_eos=False)
+                source_ids.update(result.source_ids)
+                stats.elapsed = time.perf_counter() - started
+                yield result
+            if send_eos:
+                for source_id in source_ids:
+                    self.send_eos(source_id)
+        finally:
+            self._send_stats = None
+            stats.elapsed = time.perf_counter() - started
+            stats.log()
 
     def send_eos(self, source_id: str) -> SourceResult:
         """Send EOS for a source to ZeroMQ socket.
@@ -209,8 +288,12 @@ class SourceRunner:
         :return: Result of sending the frame.
         """
 
-        zmq_topic, message, content, result = self._prepare_video_frame(source)
+        video_frame, content = self._build_frame(source)
+        started = time.perf_counter()
+        zmq_topic, message, result = self._prepare_video_frame(video_frame)
+        prepared = time.perf_counter()
         self._send_zmq_message(zmq_topic, message, content)
+        self._observe_latencies(started, prepared, 1)
         logger.debug('Sent video frame %s/%s.', zmq_topic, result.pts)
 
         return result
@@ -223,25 +306,83 @@ class SourceRunner:
         :return: Result of sending the batch.
         """
 
+        started = time.perf_counter()
         message, result = self._prepare_batch(zmq_topic, source)
+        prepared = time.perf_counter()
         self._send_zmq_message(zmq_topic, message)
+        self._observe_latencies(started, prepared, len(source.frames))
         logger.debug('Sent video frame batch to source %s.', zmq_topic)
 
         return result
 
+    def _prefetch_frames(
+        self, sources: Iterable[SourceAndEos], prefetch: int
+    ) -> Iterator[SourceAndEos]:
+        """Build frames from frame sources in a thread pool in advance.
+
+        Only building frames is done in parallel. Messages are prepared in
+        the sending order since their sequence IDs are assigned per source.
+        """
+
+        with ThreadPoolExecutor(prefetch, 'SourcePrefetch') as executor:
+            pending: Deque[Union[Future, SourceAndEos]] = deque()
+            for source in sources:
+                if isinstance(source, FrameSource):
+                    source = executor.submit(self._build_frame_timed, source)
+                pending.append(source)
+                if len(pending) > prefetch:
+                    yield self._resolve_prefetched(pending.popleft())
+            while pending:
+                yield self._resolve_prefetched(pending.popleft())
+
+    def _resolve_prefetched(self, item: Union[Future, SourceAndEos]) -> SourceAndEos:
+        if not isinstance(item, Future):
+            return item
+        started = time.perf_counter()
+        video_frame, content, build_time = item.result()
+        if self._send_stats is not None:
+            self._send_stats.wait += time.perf_counter() - started
+        self._observe_build(build_time)
+        return video_frame, content
+
+    def _build_frame_timed(
+        self, source: FrameSource
+    ) -> Tuple[VideoFrame, bytes, float]:
+        started = time.perf_counter()
+        video_frame, content = source.build_frame()
+        return video_frame, content, time.perf_counter() - started
+
     def _send_zmq_message(self, topic: str, message: Message, content: bytes = b''):
         self._writer.send_message(topic, message, content)
 
+    def _observe_latencies(self, started: float, prepared: float, n_frames: int):
+        prepare_time = prepared - started
+        send_time = time.perf_counter() - prepared
+        self._latency_histogram.observe(prepare_time, ('source_prepare',))
+        self._latency_histogram.observe(send_time, ('source_send',))
+        if self._send_stats is not None:
+            self._send_stats.frames += n_frames
+            self._send_stats.prepare += prepare_time
+            self._send_stats.send += send_time
+
+    def _observe_build(self, build_time: float):
+        self._latency_histogram.observe(build_time, ('source_build',))
+        if self._send_stats is not None:
+            self._send_stats.build += build_time
+
     def _build_zeromq_writer(self, config: WriterConfig):
         return BlockingWriter(config)
 
-    def _prepare_video_frame(self, source: Frame):
-        if isinstance(source, FrameSource):
-            logger.debug('Sending video frame from source %s.', source)
-            video_frame, content = source.build_frame()
-        else:
-            video_frame, content = source
-            logger.debug('Sending video frame from source %s.', video_frame.source_id)
+    def _build_frame(self, source: Frame) -> Tuple[VideoFrame, bytes]:
+        if not isinstance(source, FrameSource):
+            return source
+        started = time.perf_counter()
+        video_frame, content = source.build_frame()
+        self._observe_build(time.perf_counter() - started)
+        return video_frame, content
+
+    def _prepare_video_frame(self, video_frame: VideoFrame):
+        logger.debug('Sending video frame from source %s.', video_frame.source_id)
         frame_id = self._pipeline.add_frame(self._pipeline_stage_name, video_frame)
         message = video_frame.to_message()
         if self._telemetry_enabled:
@@ -255,7 +396,6 @@ class SourceRunner:
         return (
             video_frame.source_id,
             message,
-            content,
             SourceResult(
                 source_ids={video_frame.source_id},
                 pts=video_frame.pts,
@@ -352,21 +492,33 @@ class AsyncSourceRunner(SourceRunner):
         self,
         sources: Union[Iterable[SourceAndEos], AsyncIterable[SourceAndEos]],
         send_eos: bool = True,
+        prefetch: int = 0,
     ) -> AsyncIterable[SourceResult]:
-        source_ids = set()
-        if isinstance(sources, AsyncIterable):
-            async for source in sources:
-                result = await self._send_iter_item(source, source_ids)
-                if result is not None:
-                    yield result
-        else:
-            for source in sources:
-                result = await self._send_iter_item(source, source_ids)
-                if result is not None:
-                    yield result
-        if send_eos:
-            for source_id in source_ids:
-                await self.send_eos(source_id)
+        stats = self._send_stats = self._last_send_stats = SendStats()
+        started = time.perf_counter()
+        if prefetch > 0:
+            sources = self._async_prefetch_frames(sources, prefetch)
+        try:
+            source_ids = set()
+            if isinstance(sources, AsyncIterable):
+                async for source in sources:
+                    result = await self._send_iter_item(source, source_ids)
+                    if result is not None:
+                        stats.elapsed = time.perf_counter() - started
+                        yield result
+            else:
+                for source in sources:
+                    result = await self._send_iter_item(source, source_ids)
+                    if result is not None:
+                        stats.elapsed = time.perf_counter() - started
+                        yield result
+            if send_eos:
+                for source_id in source_ids:
+                    await self.send_eos(source_id)
+        finally:
+            self._send_stats = None
+            stats.elapsed = time.perf_counter() - started
+            stats.log()
 
     async def send_eos(self, source_id: str) -> SourceResult:
         if self._health_check is not None:
@@ -391,19 +543,63 @@ class AsyncSourceRunner(SourceRunner):
         return result
 
     async def _send_frame(self, source: Frame) -> SourceResult:
-        zmq_topic, message, content, result = self._prepare_video_frame(source)
+        video_frame, content = self._build_frame(source)
+        started = time.perf_counter()
+        zmq_topic, message, result = self._prepare_video_frame(video_frame)
+        prepared = time.perf_counter()
         await self._send_zmq_message(zmq_topic, message, content)
+        self._observe_latencies(started, prepared, 1)
         logger.debug('Sent video frame %s/%s.', zmq_topic, result.pts)
 
         return result
 
     async def _send_batch(self, zmq_topic: str, source: Batch) -> SourceResult:
+        started = time.perf_counter()
         message, result = self._prepare_batch(zmq_topic, source)
+        prepared = time.perf_counter()
         await self._send_zmq_message(zmq_topic, message)
+        self._observe_latencies(started, prepared, len(source.frames))
         logger.debug('Sent video frame batch to source %s.', zmq_topic)
 
         return result
 
+    async def _async_prefetch_frames(
+        self,
+        sources: Union[Iterable[SourceAndEos], AsyncIterable[SourceAndEos]],
+        prefetch: int,
+    ) -> AsyncIterator[SourceAndEos]:
+        """Build frames from frame sources in a thread pool in advance.
+
+        Only building frames is done in parallel. Messages are prepared in
+        the sending order since their sequence IDs are assigned per source.
+        """
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(prefetch, 'SourcePrefetch') as executor:
+            pending: Deque[Union[asyncio.Future, SourceAndEos]] = deque()
+            async for source in _iterate_async(sources):
+                if isinstance(source, FrameSource):
+                    source = loop.run_in_executor(
+                        executor, self._build_frame_timed, source
+                    )
+                pending.append(source)
+                if len(pending) > prefetch:
+                    yield await self._async_resolve_prefetched(pending.popleft())
+            while pending:
+                yield await self._async_resolve_prefetched(pending.popleft())
+
+    async def _async_resolve_prefetched(
+        self, item: Union[asyncio.Future, SourceAndEos]
+    ) -> SourceAndEos:
+        if not isinstance(item, asyncio.Future):
+            return item
+        started = time.perf_counter()
+        video_frame, content, build_time = await item
+        if self._send_stats is not None:
+            self._send_stats.wait += time.perf_counter() - started
+        self._observe_build(build_time)
+        return video_frame, content
+
     async def _send_zmq_message(
         self, topic: str, message: Message, content: bytes = b''
     ):
@@ -429,3 +625,14 @@ class AsyncSourceRunner(SourceRunner):
         source_ids.update(result.source_ids)
 
         return result
+
+
+async def _iterate_async(
+    sources: Union[Iterable[SourceAndEos], AsyncIterable[SourceAndEos]]
+) -> AsyncIterator[SourceAndEos]:
+    if isinstance(sources, AsyncIterable):
+        async for source in sources:
+            yield source
+    else:
+        for source in sources:
+            yield source
@@ -11,7 +11,8 @@ from savant.deepstream.nvinfer.element_config import (
     nvtracker_element_configurator,
 )
 from savant.gstreamer.codecs import CODEC_BY_NAME, Codec
-from savant.parameter_storage import init_param_storage
+from savant.parameter_storage import init_param_storage, param_storage
+from savant.remote_file import get_remote_file_cache, process_remotes
 from savant.utils.log import get_logger
 from savant.utils.singleton import SingletonMeta
 from savant.utils.sink_factories import SINK_REGISTRY
@@ -350,6 +351,56 @@ def merge_configs(
     return OmegaConf.unsafe_merge(default_cfg, user_cfg)
 
 
+def prefetch_remote_files(module_cfg: DictConfig) -> None:
+    """Download remote model files of the pipeline elements concurrently
+    before the elements are configured one by one.
+
+    :param module_cfg: module config
+    """
+
+    def iter_elements():
+        for item in module_cfg.pipeline.elements:
+            if 'element' in item:
+                yield item
+            elif 'group' in item and item.group.get('elements'):
+                yield from item.group.elements
+
+    remotes = []
+    for item in iter_elements():
+        model = item.get('model')
+        if not item.get('name') or not model or not model.get('remote'):
+            continue
+        try:
+            element, _, _ = get_elem_type_ver(item)
+        except ModuleConfigException:
+            continue
+        if element != 'nvinfer':
+            continue
+        # paths are the same as set by the nvinfer element configurator
+        download_path = Path(param_storage()['download_path']) / item.name
+        model_path = Path(
+            model.get('local_path') or Path(param_storage()['model_path']) / item.name
+        )
+        # remote config is passed as is, it's saved to check the files are fresh
+        remotes.append((model.remote, download_path, model_path))
+
+    if len(remotes) < 2:
+        return
+
+    logger.info('Downloading remote files of %s elements...', len(remotes))
+    try:
+        process_remotes(
+            remotes,
+            cache=get_remote_file_cache(
+                param_storage().get('remote_file_cache_path'),
+                param_storage().get('remote_file_cache_size', 0),
+            ),
+        )
+    except Exception as exc:
+        # the element configurators will try again and report the error
+        logger.warning('Failed to download remote files. %s', exc)
+
+
 def configure_pipeline(module_cfg: DictConfig) -> None:
     """Convert pipeline elements to proper types.
 
@@ -373,6 +424,7 @@ def configure_pipeline(module_cfg: DictConfig) -> None:
     if 'elements' not in module_cfg.pipeline or module_cfg.pipeline.elements is None:
         module_cfg.pipeline.elements = []
         return
+    prefetch_remote_files(module_cfg)
     group_schema = OmegaConf.structured(ElementGroup)
     for pipeline_el_idx, item in enumerate(module_cfg.pipeline.elements):
         if 'element' in item:
@@ -415,6 +415,20 @@ class SinkElement(PipelineElement):
     )
     """Frame filter for egress frames."""
 
+    queue_size: int = 0
+    """Size of the queue of messages for the sink. When the pipeline has
+    several sinks, each sink with a queue sends messages from a dedicated
+    thread, so a slow sink doesn't delay the others. ``0`` (default) means
+    that messages are sent to the sink synchronously.
+    """
+
+    overflow_policy: str = 'block'
+    """What to do with a video frame when the sink queue is full:
+    ``block`` - wait for the space in the queue,
+    ``drop_oldest`` - drop the oldest video frame in the queue,
+    ``drop_newest`` - drop the frame. EOS messages are never dropped.
+    """
+
 
 @dataclass
 class PyFuncElement(PipelineElement, PyFunc):
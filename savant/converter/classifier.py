@@ -50,7 +50,64 @@ class TensorToLabelConverter(BaseAttributeModelOutputConverter):
 
         return result
 
+    def convert_batch(
+        self,
+        *output_layers: np.ndarray,
+        model: AttributeModel,
+        rois: np.ndarray,
+    ) -> List[Optional[List[Tuple[str, str, float]]]]:
+        """Converts attribute (complex) model output layer values of a batch
+        of ROIs to lists of ``(attr_name, label, confidence)`` tuples."""
+        batch_size = rois.shape[0]
+        results = [[] for _ in range(batch_size)]
+        for values, attr_config in zip(output_layers, model.output.attributes):
+            values = values.reshape(batch_size, -1)
+            # values are out of range (0, 1) - raw output? - apply softmax
+            # (to get valid confidence)
+            if self.apply_softmax:
+                raw_mask = np.ones(batch_size, dtype=bool)
+            else:
+                raw_mask = np.any(values > 1.0, axis=1)
+            if raw_mask.any():
+                values = values.copy()
+                values[raw_mask] = softmax(values[raw_mask], axis=-1)
+
+            labels = attr_config.labels
+            threshold = attr_config.threshold
+            multi_label_mask = (
+                ~raw_mask if attr_config.multi_label else np.zeros_like(raw_mask)
+            )
+            if threshold is None:
+                keep = np.ones_like(values, dtype=bool)
+            else:
+                keep = values > threshold
+
+            # single label rows: the best value only
+            single_rows = np.flatnonzero(~multi_label_mask)
+            best_idx = np.argmax(values[single_rows], axis=1)
+            best_values = values[single_rows, best_idx]
+            best_keep = keep[single_rows, best_idx]
+            for row, idx, value in zip(
+                single_rows[best_keep].tolist(),
+                best_idx[best_keep].tolist(),
+                best_values[best_keep].tolist(),
+            ):
+                label = labels[idx] if labels else idx
+                results[row].append((attr_config.name, str(label), value))
+
+            # multi label rows: all the values passed the threshold
+            if multi_label_mask.any():
+                keep[~multi_label_mask] = False
+                for row, idx in zip(*np.nonzero(keep)):
+                    row, idx = int(row), int(idx)
+                    label = labels[idx] if labels else idx
+                    results[row].append(
+                        (attr_config.name, str(label), float(values[row, idx]))
+                    )
+
+        return results
+
 
-def softmax(x):
-    e_x = np.exp(x - np.max(x))
-    return e_x / e_x.sum()
+def softmax(x, axis=None):
+    e_x = np.exp(x - np.max(x, axis=axis, keepdims=axis is not None))
+    return e_x / e_x.sum(axis=axis, keepdims=axis is not None)
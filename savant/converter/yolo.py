@@ -2,13 +2,13 @@
 TODO: Add `symmetric-padding` support.
 """
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 
 from savant.base.converter import BaseObjectModelOutputConverter
 from savant.base.model import ObjectModel
-from savant.utils.nms import nms_cpu
+from savant.utils.nms import nms_cpu_batched
 
 
 class TensorToBBoxConverter(BaseObjectModelOutputConverter):
@@ -109,7 +109,9 @@ class TensorToBBoxConverter(BaseObjectModelOutputConverter):
         # TODO: ability to filter by size (width, height) and aspect ratio
         # apply class agnostic NMS (all classes are treated as one)
         if self.nms_iou_threshold > 0 and len(confidences) > 1:
-            nms_mask = nms_cpu(bboxes, confidences, self.nms_iou_threshold, self.top_k)
+            nms_mask = nms_cpu_batched(
+                bboxes, confidences, self.nms_iou_threshold, self.top_k
+            )
             bboxes = bboxes[nms_mask]
             class_ids = class_ids[nms_mask]
             confidences = confidences[nms_mask]
@@ -145,3 +147,161 @@ class TensorToBBoxConverter(BaseObjectModelOutputConverter):
             ),
             axis=1,
         )
+
+    def convert_batch(
+        self,
+        *output_layers: np.ndarray,
+        model: ObjectModel,
+        rois: np.ndarray,
+    ) -> List[Optional[np.ndarray]]:
+        """Converts detector output layer tensors of a batch of ROIs
+        to bbox tensors, one per ROI.
+
+        Filtering, NMS and scaling are performed for the whole batch at once.
+
+        :param output_layers: Output layer tensors stacked along the first axis
+        :param model: Model definition, required parameters: input tensor shape,
+            maintain_aspect_ratio
+        :param rois: (N, 4) array of [left, top, width, height] of the rectangles
+            on which the model infers
+        :return: List of bbox tensors (class_id, confidence, xc, yc, width, height)
+        """
+
+        assert len(output_layers) in (1, 3, 4)
+
+        batch_size = rois.shape[0]
+
+        if len(output_layers) == 1:
+            output = output_layers[0]
+            assert model.output.num_detected_classes is not None
+            if output.shape[1] == model.output.num_detected_classes + 4:
+                # reduce along the class axis without transposing the scores
+                scores = output[:, 4:]
+                class_axis = 1
+                bboxes = np.transpose(output[:, :4], (0, 2, 1))
+            else:
+                scores = output[:, :, 5:] * output[:, :, 4:5]  # obj_conf * cls_conf
+                class_axis = 2
+                bboxes = output[:, :, :4]  # xc, yc, width, height
+            # class ids are computed for the confident detections only (below)
+            class_ids = None
+            confidences = np.max(scores, axis=class_axis)
+            valid_mask = np.ones(confidences.shape, dtype=bool)
+
+        elif len(output_layers) == 3:
+            bboxes, scores, class_ids = output_layers
+            class_ids = class_ids.reshape(scores.shape[:2])
+            confidences = np.max(scores, axis=-1)
+            valid_mask = np.ones(confidences.shape, dtype=bool)
+
+        else:
+            num_dets, det_boxes, det_scores, det_classes = output_layers
+            num_dets = num_dets.reshape(batch_size, -1)[:, 0].astype(np.int64)
+            valid_mask = np.arange(det_boxes.shape[1]) < num_dets[:, None]
+            confidences = det_scores.reshape(valid_mask.shape)
+            class_ids = det_classes.reshape(valid_mask.shape)
+
+            # [0..1] -> model.input
+            bboxes = det_boxes * np.array(
+                [
+                    model.input.width,
+                    model.input.height,
+                    model.input.width,
+                    model.input.height,
+                ],
+                dtype=det_boxes.dtype,
+            )
+
+            # (left, top, right, bottom) -> (xc, yc, width, height)
+            bboxes[:, :, 2] -= bboxes[:, :, 0]
+            bboxes[:, :, 3] -= bboxes[:, :, 1]
+            bboxes[:, :, 0] += bboxes[:, :, 2] / 2
+            bboxes[:, :, 1] += bboxes[:, :, 3] / 2
+
+        # filter by confidence
+        if self.confidence_threshold:
+            valid_mask &= confidences > self.confidence_threshold
+
+        # flatten the batch, keeping ROI order and detection order within ROI
+        roi_idx, det_idx = np.nonzero(valid_mask)
+        bboxes = bboxes[roi_idx, det_idx].astype(np.float32)
+        confidences = confidences[roi_idx, det_idx]
+        if class_ids is None:
+            if class_axis == 1:
+                class_ids = np.argmax(scores[roi_idx, :, det_idx], axis=-1)
+            else:
+                class_ids = np.argmax(scores[roi_idx, det_idx], axis=-1)
+        else:
+            class_ids = class_ids[roi_idx, det_idx]
+
+        # filter by class
+        if self.class_ids:
+            class_mask = np.isin(class_ids, self.class_ids)
+            roi_idx = roi_idx[class_mask]
+            bboxes = bboxes[class_mask]
+            class_ids = class_ids[class_mask]
+            confidences = confidences[class_mask]
+
+        # apply class agnostic NMS (all classes are treated as one) per ROI
+        counts = np.bincount(roi_idx, minlength=batch_size)
+        if self.nms_iou_threshold > 0 and np.any(counts > 1):
+            selected = nms_cpu_batched(
+                bboxes,
+                confidences,
+                self.nms_iou_threshold,
+                self.top_k,
+                batch_ids=roi_idx,
+            )
+            # group by ROI keeping the decreasing order of scores
+            selected = selected[np.argsort(roi_idx[selected], kind='stable')]
+
+        # select top k per ROI
+        elif np.any(counts > self.top_k):
+            offsets = np.concatenate(([0], np.cumsum(counts)))
+            selected = []
+            for start, stop in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+                if stop - start > self.top_k:
+                    top_k_mask = np.argpartition(confidences[start:stop], -self.top_k)[
+                        -self.top_k :
+                    ]
+                    selected.append(top_k_mask + start)
+                else:
+                    selected.append(np.arange(start, stop))
+            selected = np.concatenate(selected)
+
+        else:
+            selected = None
+
+        if selected is not None:
+            roi_idx = roi_idx[selected]
+            bboxes = bboxes[selected]
+            class_ids = class_ids[selected]
+            confidences = confidences[selected]
+            counts = np.bincount(roi_idx, minlength=batch_size)
+
+        # scale
+        rois = rois.astype(np.float64)
+        if model.input.maintain_aspect_ratio:
+            scale = np.minimum(
+                model.input.width / rois[:, 2],
+                model.input.height / rois[:, 3],
+            ).astype(np.float32)
+            bboxes /= scale[roi_idx, None]
+        else:
+            scale_x = (model.input.width / rois[:, 2]).astype(np.float32)
+            scale_y = (model.input.height / rois[:, 3]).astype(np.float32)
+            bboxes[:, [0, 2]] /= scale_x[roi_idx, None]
+            bboxes[:, [1, 3]] /= scale_y[roi_idx, None]
+
+        # correct xc, yc
+        bboxes[:, :2] += rois[roi_idx, :2].astype(np.float32)
+
+        bbox_tensor = np.concatenate(
+            (
+                class_ids.reshape(-1, 1).astype(np.float32),
+                confidences.reshape(-1, 1).astype(np.float32),
+                bboxes,
+            ),
+            axis=1,
+        )
+        return np.split(bbox_tensor, np.cumsum(counts)[:-1])
@@ -9,7 +9,7 @@ import numpy as np
 
 from savant.base.converter import BaseComplexModelOutputConverter
 from savant.base.model import ComplexModel
-from savant.utils.nms import nms_cpu
+from savant.utils.nms import nms_cpu_batched
 
 
 class YoloV5faceConverter(BaseComplexModelOutputConverter):
@@ -58,7 +58,7 @@ class YoloV5faceConverter(BaseComplexModelOutputConverter):
             selected_preds = raw_predictions[
                 raw_predictions[:, 4] > self.confidence_threshold
             ]
-            keep = nms_cpu(
+            keep = nms_cpu_batched(
                 selected_preds[:, :4],
                 selected_preds[:, 4],
                 self.nms_iou_threshold,
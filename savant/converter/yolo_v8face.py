@@ -9,7 +9,7 @@ import numpy as np
 
 from savant.base.converter import BaseComplexModelOutputConverter
 from savant.base.model import ComplexModel
-from savant.utils.nms import nms_cpu
+from savant.utils.nms import nms_cpu_batched
 
 
 class YoloV8faceConverter(BaseComplexModelOutputConverter):
@@ -62,7 +62,7 @@ class YoloV8faceConverter(BaseComplexModelOutputConverter):
         if selected_predictions.shape[0] == 0:
             return
 
-        keep = nms_cpu(
+        keep = nms_cpu_batched(
             selected_predictions[:, :4],
             selected_predictions[:, 4],
             self.nms_iou_threshold,
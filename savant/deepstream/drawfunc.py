@@ -1,22 +1,24 @@
 """Default implementation PyFunc for drawing on frame."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 import cv2
-from savant_rs.draw_spec import (
-    BoundingBoxDraw,
-    DotDraw,
-    LabelDraw,
-    LabelPositionKind,
-    ObjectDraw,
-)
+from savant_rs.draw_spec import ObjectDraw
 from savant_rs.primitives.geometry import RBBox
 
 from savant.gstreamer import Gst  # noqa: F401
 from savant.meta.constants import UNTRACKED_OBJECT_ID
 from savant.meta.object import ObjectMeta
 from savant.utils.artist import Artist, Position
-from savant.utils.draw_spec import get_default_draw_spec, get_obj_draw_spec
+from savant.utils.draw_spec import (
+    BoundingBoxRender,
+    DotRender,
+    LabelRender,
+    ObjectRender,
+    compile_draw_spec,
+    get_default_draw_spec,
+    get_obj_draw_spec,
+)
 
 from .base_drawfunc import BaseNvDsDrawFunc
 from .meta.frame import NvDsFrameMeta
@@ -28,6 +30,9 @@ class NvDsDrawFunc(BaseNvDsDrawFunc):
     Uses OpenCV GpuMat to work with frame data without mapping to CPU
     through OpenCV-based Artist.
 
+    Draw specifications are compiled to render instructions once,
+    objects of a frame are grouped by the render instructions.
+
     PyFunc implementations are defined in and instantiated by a
     :py:class:`.PyFunc` structure.
     """
@@ -44,6 +49,18 @@ class NvDsDrawFunc(BaseNvDsDrawFunc):
             self.default_spec_track_id = get_default_draw_spec(track_id=True)
             self.default_spec_no_track_id = get_default_draw_spec(track_id=False)
 
+        self._renders = {key: compile_draw_spec(x) for key, x in self.draw_spec.items()}
+        if not self.draw_spec:
+            # by whether an object is tracked
+            self._default_renders = {
+                True: compile_draw_spec(self.default_spec_track_id),
+                False: compile_draw_spec(self.default_spec_no_track_id),
+            }
+        # specs are copied and compiled per object only when they can be overridden
+        self._draw_spec_overridden = (
+            type(self).override_draw_spec is not NvDsDrawFunc.override_draw_spec
+        )
+
     def draw(self, buffer: Gst.Buffer, frame_meta: NvDsFrameMeta):
         stream = self.get_cuda_stream(frame_meta)
         with nvds_to_gpu_mat(buffer, frame_meta.frame_meta) as frame_mat:
@@ -70,49 +87,72 @@ class NvDsDrawFunc(BaseNvDsDrawFunc):
         :param frame_meta: Frame metadata.
         :param artist: Artist to draw on the frame.
         """
+        groups = self._group_objects(frame_meta)
+
+        # blur should be the first to be applied
+        # to avoid blurring the other elements
+        for render, objects in groups:
+            if render.blur:
+                for obj_meta in objects:
+                    self._blur(obj_meta, artist)
+
+        # draw according to the specification
+        for render, objects in groups:
+            if render.bounding_box is not None:
+                for obj_meta in objects:
+                    self._draw_bounding_box(obj_meta, artist, render.bounding_box)
+            if render.label is not None:
+                for obj_meta in objects:
+                    self._draw_label(obj_meta, artist, render.label)
+            if render.central_dot is not None:
+                for obj_meta in objects:
+                    self._draw_central_dot(obj_meta, artist, render.central_dot)
+
+    def _group_objects(
+        self, frame_meta: NvDsFrameMeta
+    ) -> List[Tuple[ObjectRender, List[ObjectMeta]]]:
+        """Group objects of the frame by their render instructions,
+        objects without a draw specification are skipped."""
+
+        groups: Dict[Hashable, Tuple[ObjectRender, List[ObjectMeta]]] = {}
         for obj_meta in frame_meta.objects:
 
             if obj_meta.is_primary:
                 continue
 
-            if len(self.draw_spec) > 0:
-                if (obj_meta.element_name, obj_meta.draw_label) in self.draw_spec:
-                    spec = self.draw_spec[(obj_meta.element_name, obj_meta.draw_label)]
-                    spec = self.override_draw_spec(obj_meta, spec.copy())
-                else:
+            if self._renders:
+                key = (obj_meta.element_name, obj_meta.draw_label)
+                render = self._renders.get(key)
+                if render is None:
                     continue
+                if self._draw_spec_overridden:
+                    render = compile_draw_spec(
+                        self.override_draw_spec(obj_meta, self.draw_spec[key].copy())
+                    )
+                    key = render
+
+            else:
+                key = obj_meta.track_id != UNTRACKED_OBJECT_ID
+                render = self._default_renders[key]
 
-            elif obj_meta.track_id != UNTRACKED_OBJECT_ID:
-                spec = self.default_spec_track_id
+            group = groups.get(key)
+            if group is None:
+                groups[key] = render, [obj_meta]
             else:
-                spec = self.default_spec_no_track_id
-
-            # draw according to the specification
-            # blur should be the first to be applied
-            # to avoid blurring the other elements
-            if spec.blur:
-                self._blur(obj_meta, artist)
-            if spec.bounding_box:
-                self._draw_bounding_box(obj_meta, artist, spec.bounding_box)
-            if spec.label:
-                self._draw_label(obj_meta, artist, spec.label)
-            if spec.central_dot:
-                self._draw_central_dot(obj_meta, artist, spec.central_dot)
+                group[1].append(obj_meta)
+
+        return list(groups.values())
 
     def _draw_bounding_box(
-        self, obj_meta: ObjectMeta, artist: Artist, spec: BoundingBoxDraw
+        self, obj_meta: ObjectMeta, artist: Artist, spec: BoundingBoxRender
     ):
-        if spec.padding is not None:
-            padding = spec.padding.padding
-        else:
-            padding = (0, 0, 0, 0)
         try:
             artist.add_bbox(
                 obj_meta.bbox,
                 spec.thickness,
-                spec.border_color.rgba,
-                spec.background_color.rgba,
-                padding,
+                spec.border_color,
+                spec.background_color,
+                spec.padding,
             )
         except Exception as exc:
             self.logger.warning(
@@ -123,39 +163,18 @@ class NvDsDrawFunc(BaseNvDsDrawFunc):
                 exc_info=exc,
             )
 
-    def _draw_label(self, obj_meta: ObjectMeta, artist: Artist, spec: LabelDraw):
-        if (
-            isinstance(obj_meta.bbox, RBBox)
-            or spec.position.position == LabelPositionKind.Center
-        ):
-            anchor_x = int(obj_meta.bbox.xc)
-            anchor_y = int(obj_meta.bbox.yc)
+    def _draw_label(self, obj_meta: ObjectMeta, artist: Artist, spec: LabelRender):
+        bbox = obj_meta.bbox
+        if spec.centered or isinstance(bbox, RBBox):
+            anchor_x = int(bbox.xc) + spec.margin_x
+            anchor_y = int(bbox.yc) + spec.margin_y
             anchor_point = Position.CENTER
         else:
-            anchor_x = int(obj_meta.bbox.left)
-            anchor_y = int(obj_meta.bbox.top)
-            if spec.position.position == LabelPositionKind.TopLeftInside:
-                anchor_point = Position.LEFT_TOP
-            else:
-                # consider default position as TopLeftOutside
-                anchor_point = Position.LEFT_BOTTOM
-
-        anchor_x += spec.position.margin_x
-        anchor_y += spec.position.margin_y
-
-        if spec.padding is not None:
-            padding = spec.padding.padding
-        else:
-            padding = (0, 0, 0, 0)
-
-        if spec.position.position == LabelPositionKind.TopLeftOutside:
-            lines_sequence = reversed(spec.format)
-            offset_sign = -1
-        else:
-            lines_sequence = spec.format
-            offset_sign = 1
+            anchor_x = int(bbox.left) + spec.margin_x
+            anchor_y = int(bbox.top) + spec.margin_y
+            anchor_point = spec.anchor_point
 
-        for format_str in lines_sequence:
+        for format_str in spec.formats:
             try:
                 text = format_str.format(
                     model=obj_meta.element_name,
@@ -178,21 +197,22 @@ class NvDsDrawFunc(BaseNvDsDrawFunc):
                 (anchor_x, anchor_y),
                 spec.font_scale,
                 spec.thickness,
-                spec.font_color.rgba,
+                spec.font_color,
                 1,
-                spec.border_color.rgba,
-                spec.background_color.rgba,
-                padding,
+                spec.border_color,
+                spec.background_color,
+                spec.padding,
                 anchor_point,
             )
             text_box_height = text_size[1] + baseline
-            anchor_y += offset_sign * text_box_height
+            anchor_y += spec.line_offset_sign * text_box_height
 
-    def _draw_central_dot(self, obj_meta: ObjectMeta, artist: Artist, spec: DotDraw):
+    def _draw_central_dot(self, obj_meta: ObjectMeta, artist: Artist, spec: DotRender):
+        bbox = obj_meta.bbox
         artist.add_circle(
-            (round(obj_meta.bbox.xc), round(obj_meta.bbox.yc)),
+            (round(bbox.xc), round(bbox.yc)),
             spec.radius,
-            spec.color.rgba,
+            spec.color,
             cv2.FILLED,
         )
 
@@ -23,7 +23,7 @@ from savant.base.model import (
 )
 from savant.config.schema import get_element_name
 from savant.parameter_storage import param_storage
-from savant.remote_file import process_remote
+from savant.remote_file import get_remote_file_cache, process_remote
 from savant.utils.log import get_logger
 
 from .file_config import NvInferConfig, NvInferConfigType
@@ -138,7 +138,15 @@ def nvinfer_element_configurator(
 
     if model_config.get('remote'):
         download_path = Path(param_storage()['download_path']) / element_config.name
-        process_remote(model_config.remote, download_path, model_path)
+        process_remote(
+            model_config.remote,
+            download_path,
+            model_path,
+            cache=get_remote_file_cache(
+                param_storage().get('remote_file_cache_path'),
+                param_storage().get('remote_file_cache_size', 0),
+            ),
+        )
 
     # try to load nvinfer config
     nvinfer_config: Optional[NvInferConfigType] = None
@@ -1,6 +1,7 @@
 import logging
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
 
+import cupy as cp
 import numpy as np
 import pyds
 from pygstsavantframemeta import (
@@ -45,6 +46,7 @@ from savant.gstreamer import Gst  # noqa:F401
 from savant.meta.errors import UIDError
 from savant.meta.object import ObjectMeta
 from savant.meta.type import ObjectSelectionType
+from savant.utils.bbox_postproc import BBoxPostprocessor, PostprocessedBBoxes
 from savant.utils.log import get_logger
 from savant.utils.source_info import SourceInfoRegistry
 
@@ -52,6 +54,15 @@ from .element_config import MERGED_CLASSES
 from .model import NvInferAttributeModel, NvInferComplexModel, NvInferDetector
 
 
+class _ModelOutput(NamedTuple):
+    """Model output of an input object to be converted."""
+
+    nvds_frame_meta: pyds.NvDsFrameMeta
+    frame_rect: Tuple[float, float, float, float]
+    parent_nvds_obj_meta: pyds.NvDsObjectMeta
+    output_layers: List
+
+
 class NvInferProcessor:
     """NvInfer element processor.
     Performs nvinfer model pre- and post-processing.
@@ -124,6 +135,10 @@ class NvInferProcessor:
 
         if self._model.output.converter:
             self.postproc = self._process_custom_model_output
+            if self._is_object_model or self._is_complex_model:
+                self._bbox_postprocessor = BBoxPostprocessor(
+                    [obj.class_id for obj in self._model.output.objects]
+                )
             self._tensor_meta_to_outputs = nvds_infer_tensor_meta_to_outputs
             if self._model.output.converter.instance.tensor_format == TensorFormat.CuPy:
                 self._tensor_meta_to_outputs = nvds_infer_tensor_meta_to_outputs_cupy
@@ -282,6 +297,9 @@ class NvInferProcessor:
         )
         self._model: Union[NvInferAttributeModel, NvInferComplexModel]
         nvds_batch_meta = pyds.gst_buffer_get_nvds_batch_meta(hash(buffer))
+        # collect outputs of all the model input objects in the batch
+        # to convert them at once if the converter supports it
+        model_outputs: List[_ModelOutput] = []
         for nvds_frame_meta in nvds_frame_meta_iterator(nvds_batch_meta):
             source_id, frame_idx = self._get_frame_source_id_and_idx(
                 buffer,
@@ -294,9 +312,8 @@ class NvInferProcessor:
                 if not self._is_model_input_object(nvds_obj_meta):
                     continue
 
-                parent_nvds_obj_meta = nvds_obj_meta
                 for tensor_meta in nvds_tensor_output_iterator(
-                    parent_nvds_obj_meta, gie_uid=self._model_uid
+                    nvds_obj_meta, gie_uid=self._model_uid
                 ):
                     if self._logger.isEnabledFor(logging.TRACE):
                         self._logger.trace(
@@ -305,197 +322,224 @@ class NvInferProcessor:
                             self._element_name,
                             nvds_frame_meta.buf_pts,
                         )
-                    # parse and post-process model output
-                    output_layers = self._tensor_meta_to_outputs(
-                        tensor_meta=tensor_meta,
-                        layer_names=self._model.output.layer_names,
-                    )
-                    try:
-                        outputs = self._model.output.converter(
-                            *output_layers,
-                            model=self._model,
-                            roi=(
-                                parent_nvds_obj_meta.rect_params.left,
-                                parent_nvds_obj_meta.rect_params.top,
-                                parent_nvds_obj_meta.rect_params.width,
-                                parent_nvds_obj_meta.rect_params.height,
+                    model_outputs.append(
+                        _ModelOutput(
+                            nvds_frame_meta=nvds_frame_meta,
+                            frame_rect=frame_rect,
+                            parent_nvds_obj_meta=nvds_obj_meta,
+                            output_layers=self._tensor_meta_to_outputs(
+                                tensor_meta=tensor_meta,
+                                layer_names=self._model.output.layer_names,
                             ),
                         )
-                    except Exception as exc:  # pylint: disable=broad-except
-                        if self._model.output.converter.dev_mode:
-                            if not isinstance(exc, PyFuncNoopCallException):
-                                self._logger.exception('Error calling converter')
-                            outputs = None
-                        else:
-                            raise exc
-                    # for object/complex models output - `bbox_tensor` and
-                    # `selected_bboxes` - indices of selected bboxes and meta
-                    # for attribute/complex models output - `values`
-                    bbox_tensor: Optional[np.ndarray] = None
-                    selected_bboxes: Optional[List] = None
-                    values: Optional[List] = None
-
-                    if outputs is None:
-                        continue
-
-                    # complex model
-                    if self._is_complex_model:
-                        # output converter returns tensor and attribute values
-                        bbox_tensor, values = outputs
-                        assert bbox_tensor.shape[0] == len(
-                            values
-                        ), 'Number of detected boxes and attributes do not match.'
-
-                    # object model
-                    elif self._is_object_model:
-                        # output converter returns tensor with
-                        # (class_id, confidence, xc, yc, width, height, [angle]),
-                        # coordinates in roi scale (parent object scale)
-                        bbox_tensor = outputs
-
-                    # attribute model
-                    else:
-                        # output converter returns attribute values
-                        values = outputs
+                    )
 
-                    if bbox_tensor is not None and bbox_tensor.shape[0] > 0:
-                        # object or complex model with non-empty output
-                        if bbox_tensor.shape[1] == 6:  # no angle
-                            selection_type = ObjectSelectionType.REGULAR_BBOX
+        if model_outputs:
+            converted_outputs = self._convert_model_outputs(model_outputs)
+            bboxes = None
+            if self._is_object_model or self._is_complex_model:
+                # post-process boxes of all the input objects at once
+                bbox_tensors = converted_outputs
+                if self._is_complex_model:
+                    bbox_tensors = [
+                        None if x is None else x[0] for x in converted_outputs
+                    ]
+                bboxes = self._bbox_postprocessor(
+                    bbox_tensors,
+                    np.array([x.frame_rect for x in model_outputs], dtype=np.float32),
+                )
+            for roi_idx, (model_output, outputs) in enumerate(
+                zip(model_outputs, converted_outputs)
+            ):
+                if outputs is None:
+                    continue
+                self._add_custom_model_output(
+                    nvds_batch_meta,
+                    model_output.nvds_frame_meta,
+                    model_output.parent_nvds_obj_meta,
+                    outputs,
+                    bboxes,
+                    roi_idx,
+                )
+        self._restore_frame(buffer)
 
-                            # xc -> left, yc -> top
-                            bbox_tensor[:, 2] -= bbox_tensor[:, 4] / 2
-                            bbox_tensor[:, 3] -= bbox_tensor[:, 5] / 2
+    def _convert_model_outputs(self, model_outputs: List[_ModelOutput]) -> List:
+        """Parses and post-processes model outputs with the converter.
+        Calls the converter once for the whole batch if the converter
+        implements batch conversion, otherwise once per model input object.
+        """
+        converter = self._model.output.converter
+        rois = [
+            (
+                x.parent_nvds_obj_meta.rect_params.left,
+                x.parent_nvds_obj_meta.rect_params.top,
+                x.parent_nvds_obj_meta.rect_params.width,
+                x.parent_nvds_obj_meta.rect_params.height,
+            )
+            for x in model_outputs
+        ]
+
+        if getattr(converter.instance, 'is_batched', False):
+            stack = np.stack
+            if converter.instance.tensor_format == TensorFormat.CuPy:
+                stack = cp.stack
+            output_layers = [
+                None if any(x is None for x in layers) else stack(layers)
+                for layers in zip(*(x.output_layers for x in model_outputs))
+            ]
+            try:
+                outputs = converter.instance.convert_batch(
+                    *output_layers,
+                    model=self._model,
+                    rois=np.array(rois, dtype=np.float32),
+                )
+                assert len(outputs) == len(
+                    model_outputs
+                ), 'Number of converted outputs and ROIs do not match.'
+                return outputs
+            except Exception as exc:  # pylint: disable=broad-except
+                if converter.dev_mode:
+                    if not isinstance(exc, PyFuncNoopCallException):
+                        self._logger.exception('Error calling converter')
+                    return [None] * len(model_outputs)
+                raise exc
+
+        outputs = []
+        for model_output, roi in zip(model_outputs, rois):
+            try:
+                outputs.append(
+                    converter(
+                        *model_output.output_layers,
+                        model=self._model,
+                        roi=roi,
+                    )
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                if converter.dev_mode:
+                    if not isinstance(exc, PyFuncNoopCallException):
+                        self._logger.exception('Error calling converter')
+                    outputs.append(None)
+                else:
+                    raise exc
+        return outputs
 
-                            # width to right, height to bottom
-                            bbox_tensor[:, 4] += bbox_tensor[:, 2]
-                            bbox_tensor[:, 5] += bbox_tensor[:, 3]
+    def _add_custom_model_output(
+        self,
+        nvds_batch_meta: pyds.NvDsBatchMeta,
+        nvds_frame_meta: pyds.NvDsFrameMeta,
+        parent_nvds_obj_meta: pyds.NvDsObjectMeta,
+        outputs: Any,
+        bboxes: Optional[PostprocessedBBoxes],
+        roi_idx: int,
+    ):
+        """Adds converted custom model output to the frame meta.
 
-                            # clip
-                            bbox_tensor[:, 2][bbox_tensor[:, 2] < frame_rect[0]] = (
-                                frame_rect[0]
-                            )
-                            bbox_tensor[:, 3][bbox_tensor[:, 3] < frame_rect[1]] = (
-                                frame_rect[1]
-                            )
-                            bbox_tensor[:, 4][bbox_tensor[:, 4] > frame_rect[2]] = (
-                                frame_rect[2]
-                            )
-                            bbox_tensor[:, 5][bbox_tensor[:, 5] > frame_rect[3]] = (
-                                frame_rect[3]
-                            )
+        Boxes of object/complex models are taken from the post-processed
+        boxes of the batch, ``roi_idx`` is the index of the parent object.
+        """
+        # for object/complex models output - `bbox_tensor` and
+        # `selected_bboxes` - indices of selected bboxes and meta
+        # for attribute/complex models output - `values`
+        bbox_tensor: Optional[np.ndarray] = None
+        selected_bboxes: Optional[List] = None
+        values: Optional[List] = None
+
+        # complex model
+        if self._is_complex_model:
+            # output converter returns tensor and attribute values
+            bbox_tensor, values = outputs
+            assert bbox_tensor.shape[0] == len(
+                values
+            ), 'Number of detected boxes and attributes do not match.'
+
+        # object model
+        elif self._is_object_model:
+            # output converter returns tensor with
+            # (class_id, confidence, xc, yc, width, height, [angle]),
+            # coordinates in roi scale (parent object scale)
+            bbox_tensor = outputs
 
-                            # right to width, bottom to height
-                            bbox_tensor[:, 4] -= bbox_tensor[:, 2]
-                            bbox_tensor[:, 5] -= bbox_tensor[:, 3]
-
-                            # left -> xc , top-> yc
-                            bbox_tensor[:, 2] += bbox_tensor[:, 4] / 2
-                            bbox_tensor[:, 3] += bbox_tensor[:, 5] / 2
-
-                            # add 0 angle
-                            bbox_tensor = np.concatenate(
-                                [
-                                    bbox_tensor,
-                                    np.zeros(
-                                        (bbox_tensor.shape[0], 1), dtype=np.float32
-                                    ),
-                                ],
-                                axis=1,
-                            )
+        # attribute model
+        else:
+            # output converter returns attribute values
+            values = outputs
+
+        if bbox_tensor is not None and bbox_tensor.shape[0] > 0:
+            # object or complex model with non-empty output, boxes are
+            # (class_id, confidence, xc, yc, width, height, angle, index),
+            # regular boxes are clipped by the frame rect
+            if bboxes.rotated[roi_idx]:
+                selection_type = ObjectSelectionType.ROTATED_BBOX
+            else:
+                selection_type = ObjectSelectionType.REGULAR_BBOX
+
+            selected_bboxes = []
+            for obj_idx, obj in enumerate(self._model.output.objects):
+                cls_bbox_tensor = bboxes.select(roi_idx, obj_idx)
+                if cls_bbox_tensor.shape[0] == 0:
+                    continue
+                if obj.selector:
+                    try:
+                        # selector gets a copy, the boxes are shared by objects
+                        cls_bbox_tensor = obj.selector(cls_bbox_tensor.copy())
+                    except Exception as exc:  # pylint: disable=broad-except
+                        if obj.selector.dev_mode:
+                            if not isinstance(exc, PyFuncNoopCallException):
+                                self._logger.exception('Error calling selector.')
+                            cls_bbox_tensor = np.zeros((0, 8))
                         else:
-                            selection_type = ObjectSelectionType.ROTATED_BBOX
-
-                        # add index column to further filter attribute values
-                        bbox_tensor = np.concatenate(
-                            [
-                                bbox_tensor,
-                                np.arange(
-                                    bbox_tensor.shape[0], dtype=np.float32
-                                ).reshape(-1, 1),
-                            ],
-                            axis=1,
-                        )
-
-                        selected_bboxes = []
-                        for obj in self._model.output.objects:
-                            cls_bbox_tensor = bbox_tensor[
-                                bbox_tensor[:, 0] == obj.class_id
-                            ]
-                            if cls_bbox_tensor.shape[0] == 0:
-                                continue
-                            if obj.selector:
-                                try:
-                                    cls_bbox_tensor = obj.selector(cls_bbox_tensor)
-                                except Exception as exc:  # pylint: disable=broad-except
-                                    if obj.selector.dev_mode:
-                                        if not isinstance(exc, PyFuncNoopCallException):
-                                            self._logger.exception(
-                                                'Error calling selector.'
-                                            )
-                                        cls_bbox_tensor = np.zeros((0, 8))
-                                    else:
-                                        raise exc
-
-                            obj_label = build_model_object_key(
-                                self._element_name, obj.label
-                            )
-                            obj_cls_id = MERGED_CLASSES[self._element_name].get(
-                                obj.class_id
-                            )
-                            if obj_cls_id is None:
-                                obj_cls_id = obj.class_id
-                            else:
-                                if self._logger.isEnabledFor(logging.TRACE):
-                                    self._logger.trace(
-                                        'Updating %s custom objs id %s -> %s, '
-                                        'label "%s".',
-                                        len(cls_bbox_tensor),
-                                        obj.class_id,
-                                        obj_cls_id,
-                                        obj_label,
-                                    )
-                            for bbox in cls_bbox_tensor:
-                                if self._logger.isEnabledFor(logging.TRACE):
-                                    self._logger.trace(
-                                        'Adding obj %s into pyds meta for frame '
-                                        'with PTS %s.',
-                                        bbox[2:7],
-                                        nvds_frame_meta.buf_pts,
-                                    )
-                                _nvds_obj_meta = nvds_add_obj_meta_to_frame(
-                                    nvds_batch_meta,
-                                    nvds_frame_meta,
-                                    selection_type,
-                                    obj_cls_id,
-                                    self._model_uid,
-                                    bbox[2:7],
-                                    bbox[1],
-                                    obj_label,
-                                    parent=parent_nvds_obj_meta,
-                                )
-                                selected_bboxes.append((int(bbox[7]), _nvds_obj_meta))
+                            raise exc
 
-                    # attribute or complex model
-                    if values:
-                        if self._is_complex_model:
-                            values = [values[i] for i, _ in selected_bboxes]
-                        else:
-                            selected_bboxes = [(0, nvds_obj_meta)]
-                            values = [values]
-                        for (_, _nvds_obj_meta), _values in zip(
-                            selected_bboxes, values
-                        ):
-                            for attr_name, value, confidence in _values:
-                                nvds_add_attr_meta_to_obj(
-                                    frame_meta=nvds_frame_meta,
-                                    obj_meta=_nvds_obj_meta,
-                                    element_name=self._element_name,
-                                    name=attr_name,
-                                    value=value,
-                                    confidence=confidence,
-                                )
-        self._restore_frame(buffer)
+                obj_label = build_model_object_key(self._element_name, obj.label)
+                obj_cls_id = MERGED_CLASSES[self._element_name].get(obj.class_id)
+                if obj_cls_id is None:
+                    obj_cls_id = obj.class_id
+                else:
+                    if self._logger.isEnabledFor(logging.TRACE):
+                        self._logger.trace(
+                            'Updating %s custom objs id %s -> %s, label "%s".',
+                            len(cls_bbox_tensor),
+                            obj.class_id,
+                            obj_cls_id,
+                            obj_label,
+                        )
+                for bbox in cls_bbox_tensor.tolist():
+                    if self._logger.isEnabledFor(logging.TRACE):
+                        self._logger.trace(
+                            'Adding obj %s into pyds meta for frame with PTS %s.',
+                            bbox[2:7],
+                            nvds_frame_meta.buf_pts,
+                        )
+                    _nvds_obj_meta = nvds_add_obj_meta_to_frame(
+                        nvds_batch_meta,
+                        nvds_frame_meta,
+                        selection_type,
+                        obj_cls_id,
+                        self._model_uid,
+                        bbox[2:7],
+                        bbox[1],
+                        obj_label,
+                        parent=parent_nvds_obj_meta,
+                    )
+                    selected_bboxes.append((int(bbox[7]), _nvds_obj_meta))
+
+        # attribute or complex model
+        if values:
+            if self._is_complex_model:
+                values = [values[i] for i, _ in selected_bboxes]
+            else:
+                selected_bboxes = [(0, parent_nvds_obj_meta)]
+                values = [values]
+            for (_, _nvds_obj_meta), _values in zip(selected_bboxes, values):
+                for attr_name, value, confidence in _values:
+                    nvds_add_attr_meta_to_obj(
+                        frame_meta=nvds_frame_meta,
+                        obj_meta=_nvds_obj_meta,
+                        element_name=self._element_name,
+                        name=attr_name,
+                        value=value,
+                        confidence=confidence,
+                    )
 
     def _process_regular_detector_output(self, buffer: Gst.Buffer):
         """Processes output of nvinfer detector.
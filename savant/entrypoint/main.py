@@ -20,7 +20,7 @@ from savant.gstreamer.codecs import AUXILIARY_STREAM_CODECS
 from savant.healthcheck.status import set_module_status, ModuleStatus
 from savant.utils.check_display import check_display_env
 from savant.utils.log import get_logger, init_logging, update_logging
-from savant.utils.sink_factories import sink_factory
+from savant.utils.sink_factories import MultiSink, sink_factory
 from savant.utils.welcome import get_starting_message
 
 
@@ -96,8 +96,13 @@ def main(module_config: Union[str, Path, IO[Any]]):
     try:
         with RunnerClass(pipeline, status_filepath) as runner:
             try:
-                for msg in pipeline.stream():
-                    sink(msg, **dict(module_name=config.name))
+                try:
+                    for msg in pipeline.stream():
+                        sink(msg, **dict(module_name=config.name))
+                finally:
+                    # send the messages left in the sink queues, e.g. EOS
+                    if isinstance(sink, MultiSink):
+                        sink.close()
             except KeyboardInterrupt:
                 logger.info('Shutting down module "%s".', config.name)
             except Exception as exc:  # pylint: disable=broad-except
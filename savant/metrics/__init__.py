@@ -1,7 +1,13 @@
-from typing import List, Union
+from threading import Lock
+from typing import Dict, List, Sequence, Type, Union
 
 from savant_rs.metrics import CounterFamily, GaugeFamily, delete_metric_family
 
+from .histogram import DEFAULT_BUCKETS, HistogramFamily, SummaryFamily
+
+_histograms: Dict[str, HistogramFamily] = {}
+_histograms_lock = Lock()
+
 
 def get_or_create_counter(
     name: str,
@@ -27,6 +33,66 @@ def get_or_create_gauge(
     return GaugeFamily.get_or_create_gauge_family(name, description, label_names, unit)
 
 
+def get_or_create_histogram(
+    name: str,
+    description: str = None,
+    label_names: Union[List[str], None] = None,
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+    unit: Union[str, None] = None,
+) -> HistogramFamily:
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = HistogramFamily(
+                name, description, label_names, buckets, unit
+            )
+        else:
+            _check_existing(histogram, HistogramFamily, label_names, buckets)
+    return histogram
+
+
+def get_or_create_summary(
+    name: str,
+    description: str = None,
+    label_names: Union[List[str], None] = None,
+    unit: Union[str, None] = None,
+) -> SummaryFamily:
+    with _histograms_lock:
+        summary = _histograms.get(name)
+        if summary is None:
+            summary = _histograms[name] = SummaryFamily(
+                name, description, label_names, unit
+            )
+        else:
+            _check_existing(summary, SummaryFamily, label_names, ())
+    return summary
+
+
+def _check_existing(
+    histogram: HistogramFamily,
+    family_type: Type[HistogramFamily],
+    label_names: Union[List[str], None],
+    buckets: Sequence[float],
+):
+    """Check the existing metric matches the requested one."""
+
+    if type(histogram) is not family_type:
+        raise ValueError(
+            f'Metric {histogram.name} already exists '
+            f'as {type(histogram).__name__}, not {family_type.__name__}.'
+        )
+    if histogram.label_names != list(label_names or []):
+        raise ValueError(
+            f'Metric {histogram.name} already exists with labels '
+            f'{histogram.label_names}, requested {label_names}.'
+        )
+    if histogram.buckets != tuple(buckets):
+        raise ValueError(
+            f'Metric {histogram.name} already exists with buckets '
+            f'{histogram.buckets}, requested {tuple(buckets)}.'
+        )
+
+
 def get_counter(name: str) -> CounterFamily:
     return CounterFamily.get_counter_family(name)
 
@@ -35,5 +101,14 @@ def get_gauge(name: str) -> GaugeFamily:
     return GaugeFamily.get_gauge_family(name)
 
 
+def get_histogram(name: str) -> HistogramFamily:
+    return _histograms.get(name)
+
+
 def delete(name: str):
-    delete_metric_family(name)
+    with _histograms_lock:
+        histogram = _histograms.pop(name, None)
+    if histogram is not None:
+        histogram.delete()
+    else:
+        delete_metric_family(name)
@@ -0,0 +1,248 @@
+"""Histogram and summary metric families.
+
+Observations are accumulated per thread without contention and are
+periodically flushed to gauge families, exported with the other metrics:
+
+- ``<name>_bucket`` with ``le`` label: cumulative number of observations
+  less than or equal to the upper bound of the bucket;
+- ``<name>_sum``: sum of the observed values;
+- ``<name>_count``: number of observations.
+
+Summary families export only ``<name>_sum`` and ``<name>_count``.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from savant_rs.metrics import GaugeFamily, delete_metric_family
+
+from savant.utils.log import get_logger
+
+__all__ = ['HistogramFamily', 'SummaryFamily', 'DEFAULT_BUCKETS']
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Default upper bounds of the histogram buckets."""
+
+FLUSH_INTERVAL = 1.0
+"""Interval between flushing the accumulated observations, in seconds."""
+
+LabelValues = Tuple[str, ...]
+logger = get_logger(__name__)
+
+
+class _ThreadAccumulator:
+    """Observations of a single thread not flushed yet.
+
+    Values are ``[bucket counts, sum]`` by label values, bucket counts
+    are not cumulative and have an extra bucket for +Inf.
+    """
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.lock = threading.Lock()
+        self.values: Dict[LabelValues, list] = {}
+
+
+class HistogramFamily:
+    """Histogram metric family.
+
+    Use :py:func:`savant.metrics.get_or_create_histogram` to create it.
+
+    :param name: Metric name.
+    :param description: Metric description.
+    :param label_names: Names of the labels.
+    :param buckets: Upper bounds of the buckets, in increasing order.
+    :param unit: Metric unit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        label_names: Optional[List[str]] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        unit: Optional[str] = None,
+    ):
+        if list(buckets) != sorted(buckets):
+            raise ValueError('Histogram buckets must be in increasing order.')
+        self.name = name
+        self.label_names = list(label_names or [])
+        self.buckets = tuple(buckets)
+        self._bucket_labels = [f'{x:g}' for x in self.buckets] + ['+Inf']
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._accumulators: List[_ThreadAccumulator] = []
+        # [cumulative bucket counts, sum] by label values
+        self._totals: Dict[LabelValues, list] = {}
+        self._bucket_family = (
+            GaugeFamily.get_or_create_gauge_family(
+                f'{name}_bucket', description, self.label_names + ['le'], unit
+            )
+            if self.buckets
+            else None
+        )
+        self._sum_family = GaugeFamily.get_or_create_gauge_family(
+            f'{name}_sum', description, self.label_names, unit
+        )
+        self._count_family = GaugeFamily.get_or_create_gauge_family(
+            f'{name}_count', description, self.label_names, None
+        )
+        _flusher.register(self)
+
+    def observe(self, value: float, label_values: LabelValues = (), count: int = 1):
+        """Record observations of the value.
+
+        The call does not block on other threads recording observations.
+
+        :param value: Observed value.
+        :param label_values: Values of the labels, in the order of the label names.
+        :param count: Number of observations of the value.
+        """
+
+        if not isinstance(label_values, tuple):
+            label_values = tuple(label_values)
+        accumulator = getattr(self._local, 'accumulator', None)
+        if accumulator is None:
+            accumulator = self._add_accumulator()
+        bucket_idx = bisect_left(self.buckets, value)
+        with accumulator.lock:
+            entry = accumulator.values.get(label_values)
+            if entry is None:
+                entry = accumulator.values[label_values] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                ]
+            entry[0][bucket_idx] += count
+            entry[1] += value * count
+
+    @contextmanager
+    def time(self, label_values: LabelValues = ()):
+        """Record the duration of the block, in seconds."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, label_values)
+
+    def flush(self):
+        """Add the accumulated observations to the exported metrics."""
+
+        with self._lock:
+            updated = set()
+            accumulators = []
+            for accumulator in self._accumulators:
+                with accumulator.lock:
+                    values, accumulator.values = accumulator.values, {}
+                if values or accumulator.thread.is_alive():
+                    accumulators.append(accumulator)
+                for label_values, (counts, value_sum) in values.items():
+                    total = self._totals.get(label_values)
+                    if total is None:
+                        total = self._totals[label_values] = [
+                            [0] * (len(self.buckets) + 1),
+                            0.0,
+                        ]
+                    cumulative = 0
+                    for i, count in enumerate(counts):
+                        cumulative += count
+                        total[0][i] += cumulative
+                    total[1] += value_sum
+                    updated.add(label_values)
+            # accumulators of the finished threads are dropped when empty
+            self._accumulators = accumulators
+
+            for label_values in updated:
+                self._export(label_values, *self._totals[label_values])
+
+    def get(self, label_values: LabelValues = ()) -> Tuple[List[int], float]:
+        """Get flushed cumulative bucket counts (including +Inf bucket)
+        and sum of the observed values."""
+
+        with self._lock:
+            counts, value_sum = self._totals.get(
+                tuple(label_values), [[0] * (len(self.buckets) + 1), 0.0]
+            )
+            return list(counts), value_sum
+
+    def delete(self):
+        """Delete the exported metric families."""
+
+        _flusher.unregister(self)
+        if self._bucket_family is not None:
+            delete_metric_family(f'{self.name}_bucket')
+        delete_metric_family(f'{self.name}_sum')
+        delete_metric_family(f'{self.name}_count')
+
+    def _export(self, label_values: LabelValues, counts: List[int], value_sum: float):
+        label_values = list(label_values)
+        if self._bucket_family is not None:
+            for bucket_label, count in zip(self._bucket_labels, counts):
+                self._bucket_family.set(
+                    count, label_values=label_values + [bucket_label]
+                )
+        self._sum_family.set(value_sum, label_values=label_values)
+        self._count_family.set(counts[-1], label_values=label_values)
+
+    def _add_accumulator(self) -> _ThreadAccumulator:
+        accumulator = self._local.accumulator = _ThreadAccumulator()
+        with self._lock:
+            self._accumulators.append(accumulator)
+        return accumulator
+
+
+class SummaryFamily(HistogramFamily):
+    """Summary metric family, exports the sum and the number of observations.
+
+    Use :py:func:`savant.metrics.get_or_create_summary` to create it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        label_names: Optional[List[str]] = None,
+        unit: Optional[str] = None,
+    ):
+        super().__init__(name, description, label_names, (), unit)
+
+
+class _Flusher:
+    """Periodically flushes observations of all histogram families."""
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._families: List[HistogramFamily] = []
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, family: HistogramFamily):
+        with self._lock:
+            self._families.append(family)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='HistogramFlusher', daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, family: HistogramFamily):
+        with self._lock:
+            if family in self._families:
+                self._families.remove(family)
+
+    def _run(self):
+        while True:
+            time.sleep(self._interval)
+            with self._lock:
+                families = list(self._families)
+            for family in families:
+                try:
+                    family.flush()
+                except Exception:
+                    logger.exception('Failed to flush histogram %s.', family.name)
+
+
+_flusher = _Flusher(FLUSH_INTERVAL)
@@ -1,20 +1,29 @@
 """Remote file management."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from omegaconf import DictConfig, OmegaConf
 
 from savant.utils.log import get_logger
 
 from .base import RemoteFileError, RemoteFileManagerType
+from .cache import RemoteFileCache, get_remote_file_cache
 from .gcs import GCSFileHandler
 from .http import HTTPFileHandler
 from .s3 import S3FileHandler
 from .schema import RemoteFile
 from .utils import read_file_checksum, unpack_archive
 
-__all__ = ['process_remote', 'RemoteFile']
+__all__ = [
+    'process_remote',
+    'process_remotes',
+    'RemoteFile',
+    'RemoteFileCache',
+    'get_remote_file_cache',
+]
 
 
 RemoteFileManagerType.add_handler(S3FileHandler)
@@ -22,21 +31,73 @@ RemoteFileManagerType.add_handler(HTTPFileHandler)
 RemoteFileManagerType.add_handler(GCSFileHandler)
 logger = get_logger(__name__)
 
+# remote files processed by the current process,
+# (download path, destination path) -> remote file configuration
+_processed_remotes: Dict[Tuple[Path, Path], DictConfig] = {}
+_processed_remotes_lock = Lock()
+
+
+def process_remotes(
+    remotes: Iterable[Tuple[Union[DictConfig, RemoteFile], Path, Path]],
+    max_workers: int = 4,
+    cache: Optional[RemoteFileCache] = None,
+):
+    """Processes several remote archive files concurrently.
+
+    :param remotes: Remote file configurations with download and destination
+        paths, see :py:func:`process_remote`
+    :param max_workers: Maximum number of remote files processed at the same time
+    :param cache: Cache of remote files shared by modules
+    """
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(process_remote, *remote, cache=cache) for remote in remotes
+        ]
+        for future in futures:
+            future.result()
+
 
 def process_remote(
-    remote: Union[DictConfig, RemoteFile], download_path: Path, dst_path: Path
+    remote: Union[DictConfig, RemoteFile],
+    download_path: Path,
+    dst_path: Path,
+    cache: Optional[RemoteFileCache] = None,
 ):
     """Processes a remote archive file. Checks the relevance of local files
     (files are not relevant if the name, checksum or content has changed).
     Downloads, unpacks and moves the archive files to the specified location.
 
+    A remote file that has already been processed by the current process
+    with the same configuration is not checked again.
+
     :param remote: Remote file configuration
     :param download_path: Path to download remote files and cache them
         to check if they are up-to-date
     :param dst_path: Location of resulting (unpacked) files
+    :param cache: Cache of remote files shared by modules, the archive
+        is downloaded and unpacked once for all modules using the cache
     :return:
     """
     remote_config = OmegaConf.merge(RemoteFile(), remote)
+    key = (download_path.resolve(), dst_path.resolve())
+    with _processed_remotes_lock:
+        if _processed_remotes.get(key) == remote_config:
+            logger.debug('Remote file "%s" is already processed.', remote_config.url)
+            return
+
+    _process_remote(remote, remote_config, download_path, dst_path, cache)
+
+    with _processed_remotes_lock:
+        _processed_remotes[key] = remote_config
+
+
+def _process_remote(
+    remote: Union[DictConfig, RemoteFile],
+    remote_config: DictConfig,
+    download_path: Path,
+    dst_path: Path,
+    cache: Optional[RemoteFileCache],
+):
 
     download_path.mkdir(parents=True, exist_ok=True)
 
@@ -60,29 +121,83 @@ def process_remote(
                 f'Error downloading remote file {url}. {exc}'
             ) from exc
 
-    def update(checksum: bool = True):
-        if checksum and remote_config.checksum_url:
-            download(remote_config.checksum_url)
-
-        file_path = download(remote_config.url)
-
+    def download_with_checksum(
+        url: str, path: Path = download_path
+    ) -> Tuple[Path, str]:
         try:
-            file_list = unpack_archive(file_path, dst_path)
+            logger.info('Downloading %s...', url)
+            return handler.download_with_checksum(url, path)
         except Exception as exc:
             raise RemoteFileError(
-                f'Error unpacking downloaded file {file_path}. {exc}'
+                f'Error downloading remote file {url}. {exc}'
             ) from exc
 
+    def update(checksum: bool = True):
+        if cache is None:
+            file_list = download_and_unpack(checksum)
+        else:
+            file_list = update_from_cache(checksum)
+
         OmegaConf.save(remote, remote_config_file_path)
 
         logger.info(
             'Remote file "%s" has been downloaded and unpacked. '
             'Files %s have been placed in "%s".',
-            file_path,
+            remote_config.url,
             file_list,
             dst_path,
         )
 
+    def update_from_cache(checksum: bool) -> List[str]:
+        expected_checksum = None
+        if remote_config.checksum_url:
+            if checksum:
+                checksum_file_path = download(remote_config.checksum_url)
+            else:
+                checksum_file_path = download_path / handler.get_file_name(
+                    remote_config.checksum_url
+                )
+            expected_checksum = read_file_checksum(checksum_file_path)
+
+        return cache.materialize(
+            remote_config.url,
+            expected_checksum,
+            dst_path,
+            lambda path: download_with_checksum(remote_config.url, path),
+        )
+
+    def download_and_unpack(checksum: bool) -> List[str]:
+        if checksum and remote_config.checksum_url:
+            # checksum and archive files are downloaded at the same time
+            with ThreadPoolExecutor(1) as executor:
+                checksum_future = executor.submit(download, remote_config.checksum_url)
+                file_path, file_checksum = download_with_checksum(remote_config.url)
+                checksum_file_path = checksum_future.result()
+        else:
+            file_path, file_checksum = download_with_checksum(remote_config.url)
+            checksum_file_path = None
+            if remote_config.checksum_url:
+                checksum_file_path = download_path / handler.get_file_name(
+                    remote_config.checksum_url
+                )
+
+        if checksum_file_path is not None:
+            expected_checksum = read_file_checksum(checksum_file_path)
+            if file_checksum != expected_checksum.lower():
+                raise RemoteFileError(
+                    f'Checksum of the downloaded file {file_path} mismatch: '
+                    f'expected {expected_checksum}, got {file_checksum}.'
+                )
+
+        try:
+            file_list = unpack_archive(file_path, dst_path)
+        except Exception as exc:
+            raise RemoteFileError(
+                f'Error unpacking downloaded file {file_path}. {exc}'
+            ) from exc
+
+        return file_list
+
     # destination folder is empty
     if not any(dst_path.iterdir()):
         logger.info(
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import FrozenSet, Optional, Set, Type, Union
+from typing import FrozenSet, Optional, Set, Tuple, Type, Union
 from urllib.parse import urlparse
 
 from omegaconf import DictConfig
@@ -10,6 +10,7 @@ from omegaconf import DictConfig
 from savant.utils.log import get_logger
 
 from .schema import RemoteFile
+from .utils import get_file_checksum
 
 __all__ = ['RemoteFileManagerType', 'RemoteFileHandler', 'RemoteFileError']
 
@@ -42,6 +43,15 @@ class RemoteFileHandler(ABC):
         :return: Path to the downloaded file
         """
 
+    def download_with_checksum(self, url: str, dst_path: Path) -> Tuple[Path, str]:
+        """Downloads a file and calculates its md5 checksum. Handlers can
+        override it to calculate the checksum while downloading.
+
+        :return: Path to the downloaded file and its checksum
+        """
+        file_path = self.download(url, dst_path)
+        return file_path, get_file_checksum(file_path)
+
 
 class RemoteFileHandlerManager:
     """Manager registers handlers for remote files with different
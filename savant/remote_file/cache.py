@@ -0,0 +1,263 @@
+"""Content-addressed cache of remote files shared by modules."""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import stat
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from savant.utils.log import get_logger
+
+from .base import RemoteFileError
+from .utils import unpack_archive
+
+__all__ = ['RemoteFileCache', 'get_remote_file_cache']
+
+logger = get_logger(__name__)
+
+METADATA_FILE_NAME = 'metadata.json'
+FILES_DIR_NAME = 'files'
+READ_ONLY_MASK = ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+
+class RemoteFileCache:
+    """Cache of unpacked remote archives keyed by URL and checksum.
+
+    The cache can be shared by several modules on the same host. Cached files
+    are read-only, they are materialized to the destination with hard links
+    when the destination is on the same filesystem and copied otherwise.
+    Files are also copied when the process can write to read-only files
+    (e.g. runs as root), so a module rewriting a file in place (e.g. a model
+    engine) doesn't modify the cached one. The archive is downloaded
+    once, concurrent requests of the same archive wait for the download.
+    Least recently used entries are evicted when the cache size exceeds
+    the limit.
+
+    Layout of the cache directory::
+
+        entries/<key>/metadata.json
+        entries/<key>/files/...
+        locks/<key>.lock
+        tmp/
+
+    :param path: Cache directory.
+    :param max_size: Maximum size of the cached files in bytes, 0 means no limit.
+    """
+
+    def __init__(self, path: Path, max_size: int = 0):
+        self.path = Path(path)
+        self.max_size = max_size
+        self.entries_path = self.path / 'entries'
+        self.locks_path = self.path / 'locks'
+        self.tmp_path = self.path / 'tmp'
+        for path in [self.entries_path, self.locks_path, self.tmp_path]:
+            path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_key(url: str, checksum: str) -> str:
+        """Get cache key of a remote file."""
+        return hashlib.sha256(f'{url}\n{checksum.lower()}'.encode()).hexdigest()
+
+    def materialize(
+        self,
+        url: str,
+        checksum: Optional[str],
+        dst_path: Path,
+        download: Callable[[Path], Tuple[Path, str]],
+    ) -> List[str]:
+        """Place unpacked files of a remote archive to the destination.
+
+        :param url: URL of the archive.
+        :param checksum: Expected md5 checksum of the archive. When not
+            specified, the archive is downloaded to get the checksum.
+        :param dst_path: Location of resulting (unpacked) files.
+        :param download: Function to download the archive to a directory,
+            returns path to the archive and its checksum.
+        :return: List of unpacked files.
+        """
+
+        tmp_path = self.tmp_path / uuid.uuid4().hex
+        try:
+            archive_path = None
+            if checksum is None:
+                tmp_path.mkdir()
+                archive_path, checksum = download(tmp_path)
+            key = self.get_key(url, checksum)
+
+            with self._lock(key):
+                entry_path = self.entries_path / key
+                if entry_path.is_dir():
+                    logger.info('Remote file %s is found in the cache.', url)
+                else:
+                    if archive_path is None:
+                        tmp_path.mkdir()
+                        archive_path, file_checksum = download(tmp_path)
+                        if file_checksum != checksum.lower():
+                            raise RemoteFileError(
+                                f'Checksum of the downloaded file {archive_path} '
+                                f'mismatch: expected {checksum}, got {file_checksum}.'
+                            )
+                    self._add_entry(url, checksum, archive_path, tmp_path, entry_path)
+
+                # mark the entry as recently used
+                os.utime(entry_path / METADATA_FILE_NAME)
+                file_list = self._link_files(entry_path, dst_path)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+        self.evict(keep=key)
+
+        return file_list
+
+    def evict(self, keep: Optional[str] = None):
+        """Remove least recently used entries until the cache size is
+        within the limit. Entries being used are not removed.
+
+        :param keep: Key of the entry not to be removed.
+        """
+
+        if self.max_size <= 0:
+            return
+
+        with self._lock('.evict'):
+            entries = []
+            for entry_path in self.entries_path.iterdir():
+                metadata_path = entry_path / METADATA_FILE_NAME
+                try:
+                    with open(metadata_path, 'r', encoding='utf8') as f:
+                        size = json.load(f)['size']
+                    last_used = metadata_path.stat().st_mtime
+                except (OSError, ValueError, KeyError):
+                    continue
+                entries.append((last_used, entry_path.name, size))
+
+            cache_size = sum(size for _, _, size in entries)
+            for _, key, size in sorted(entries):
+                if cache_size <= self.max_size:
+                    break
+                if key == keep:
+                    continue
+                with self._lock(key, blocking=False) as locked:
+                    if not locked:
+                        continue
+                    logger.info(
+                        'Removing cache entry %s of %s bytes, cache size %s bytes '
+                        'exceeds the limit of %s bytes.',
+                        key,
+                        size,
+                        cache_size,
+                        self.max_size,
+                    )
+                    self._remove_entry(key)
+                cache_size -= size
+
+    def _add_entry(
+        self,
+        url: str,
+        checksum: str,
+        archive_path: Path,
+        tmp_path: Path,
+        entry_path: Path,
+    ):
+        files_path = tmp_path / FILES_DIR_NAME
+        files_path.mkdir()
+        try:
+            file_list = unpack_archive(archive_path, files_path)
+        except Exception as exc:
+            raise RemoteFileError(
+                f'Error unpacking downloaded file {archive_path}. {exc}'
+            ) from exc
+        archive_path.unlink()
+
+        size = 0
+        for dir_path, _, file_names in os.walk(files_path):
+            for name in file_names:
+                file_path = os.path.join(dir_path, name)
+                file_stat = os.stat(file_path)
+                size += file_stat.st_size
+                os.chmod(file_path, stat.S_IMODE(file_stat.st_mode) & READ_ONLY_MASK)
+        with open(tmp_path / METADATA_FILE_NAME, 'w', encoding='utf8') as f:
+            json.dump(
+                {
+                    'url': url,
+                    'checksum': checksum,
+                    'size': size,
+                    'files': file_list,
+                },
+                f,
+            )
+        # entry appears in the cache only when it is complete
+        os.rename(tmp_path, entry_path)
+        logger.info('Remote file %s is added to the cache as %s.', url, entry_path)
+
+    def _remove_entry(self, key: str):
+        # rename first so a partially removed entry is never used
+        removed_path = self.tmp_path / f'{key}-{uuid.uuid4().hex}'
+        os.rename(self.entries_path / key, removed_path)
+        shutil.rmtree(removed_path, ignore_errors=True)
+
+    def _link_files(self, entry_path: Path, dst_path: Path) -> List[str]:
+        with open(entry_path / METADATA_FILE_NAME, 'r', encoding='utf8') as f:
+            file_list = json.load(f)['files']
+
+        files_path = entry_path / FILES_DIR_NAME
+        dst_path.mkdir(parents=True, exist_ok=True)
+        for dir_path, _, file_names in os.walk(files_path):
+            dst_dir_path = dst_path / Path(dir_path).relative_to(files_path)
+            dst_dir_path.mkdir(parents=True, exist_ok=True)
+            for name in file_names:
+                src_file_path = Path(dir_path) / name
+                dst_file_path = dst_dir_path / name
+                if dst_file_path.is_file() or dst_file_path.is_symlink():
+                    dst_file_path.unlink()
+                if not os.access(src_file_path, os.W_OK):
+                    try:
+                        os.link(src_file_path, dst_file_path)
+                        continue
+                    except OSError:
+                        pass
+                # copies are writable, the cached file isn't affected
+                shutil.copy2(src_file_path, dst_file_path)
+                os.chmod(
+                    dst_file_path,
+                    stat.S_IMODE(os.stat(dst_file_path).st_mode) | stat.S_IWUSR,
+                )
+
+        return file_list
+
+    @contextmanager
+    def _lock(self, name: str, blocking: bool = True):
+        """Exclusive lock shared by processes and threads."""
+
+        with open(self.locks_path / f'{name}.lock', 'w') as f:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(f, flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@lru_cache(maxsize=None)
+def get_remote_file_cache(
+    path: Optional[str], max_size: int = 0
+) -> Optional[RemoteFileCache]:
+    """Get remote file cache in the directory.
+
+    :param path: Cache directory, the cache is disabled when not specified.
+    :param max_size: Maximum size of the cached files in bytes, 0 means no limit.
+    """
+
+    if not path:
+        return None
+    return RemoteFileCache(Path(path), max_size)
@@ -1,30 +1,107 @@
 """HTTP file handler."""
 
-import shutil
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from threading import Lock
+from typing import Dict, Optional, Set, Tuple
 
 import requests
 from tqdm import tqdm
 
-from .base import RemoteFileHandler
+from .base import RemoteFileError, RemoteFileHandler
 
 __all__ = ['HTTPFileHandler']
 
+STREAM_READ_SIZE = 1024 * 1024
+
+
+class HTTPRemoteFileError(RemoteFileError):
+    """HTTP remote file exception class."""
+
+
+@dataclass
+class HTTPFileInfo:
+    """Information about a remote file that supports range requests."""
+
+    size: int
+    """File size in bytes."""
+
+    validator: Optional[str]
+    """ETag or Last-Modified header of the file."""
+
+
+class OrderedChecksum:
+    """Calculates md5 checksum of a file downloaded in chunks.
+
+    Chunks can be added in any order, they are hashed in the file order
+    as soon as all the previous chunks are added. Only the data of the next
+    chunk in order is used, out-of-order chunks are read back from the file,
+    so they must be written before adding.
+
+    :param fd: File descriptor of the downloaded file.
+    :param chunk_size: Chunk size in bytes.
+    """
+
+    def __init__(self, fd: int, chunk_size: int):
+        self.fd = fd
+        self.chunk_size = chunk_size
+        self.md5 = hashlib.md5()
+        self.next_chunk = 0
+        self.pending: Dict[int, Optional[bytes]] = {}
+
+    def add(self, chunk_idx: int, data: Optional[bytes] = None):
+        """Add a chunk. Chunks without data are read from the file."""
+
+        # don't keep the data of out-of-order chunks in memory
+        self.pending[chunk_idx] = data if chunk_idx == self.next_chunk else None
+        while self.next_chunk in self.pending:
+            data = self.pending.pop(self.next_chunk)
+            if data is None:
+                data = os.pread(
+                    self.fd, self.chunk_size, self.next_chunk * self.chunk_size
+                )
+            self.md5.update(data)
+            self.next_chunk += 1
+
+    def hexdigest(self) -> str:
+        return self.md5.hexdigest()
+
 
 class HTTPFileHandler(RemoteFileHandler):
-    """HTTP/HTTPS/FTP remote file handler."""
+    """HTTP/HTTPS/FTP remote file handler.
+
+    Files from servers supporting range requests are downloaded in chunks
+    using several connections. Downloaded chunks are saved, so an interrupted
+    download is resumed on the next attempt.
+    """
 
     supported_schemes = frozenset(('http', 'https', 'ftp'))
 
-    def __init__(self, username: Optional[str] = None, password: Optional[str] = None):
-        super().__init__(username=username, password=password)
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        chunk_size: int = 8 * 1024 * 1024,
+        max_connections: int = 4,
+    ):
+        super().__init__(
+            username=username,
+            password=password,
+            chunk_size=chunk_size,
+            max_connections=max_connections,
+        )
         self.auth = None
         if 'username' in self.params and self.params['username']:
             self.auth = (
                 self.params['username'],
                 self.params['password'] if 'password' in self.params else None,
             )
+        self.chunk_size = chunk_size
+        self.max_connections = max_connections
 
     def download(self, url: str, dst_path: Path) -> Path:
         """Downloads a file using HTTP request.
@@ -32,13 +109,174 @@ class HTTPFileHandler(RemoteFileHandler):
         Username and password will be used to make a request using HTTP
         Basic auth.
         """
+        return self.download_with_checksum(url, dst_path)[0]
+
+    def download_with_checksum(self, url: str, dst_path: Path) -> Tuple[Path, str]:
+        """Downloads a file using HTTP request, the checksum is calculated
+        while downloading.
+        """
         dst_file_path = dst_path / self.get_file_name(url)
 
+        file_info = self._get_file_info(url)
+        if file_info is None or file_info.size <= self.chunk_size:
+            checksum = self._download_stream(url, dst_file_path)
+        else:
+            checksum = self._download_chunks(url, dst_file_path, file_info)
+
+        return dst_file_path, checksum
+
+    def _get_file_info(self, url: str) -> Optional[HTTPFileInfo]:
+        """Get information about the file if the server supports range requests."""
+
+        try:
+            with requests.head(url, auth=self.auth, allow_redirects=True) as resp:
+                resp.raise_for_status()
+                headers = resp.headers
+        except Exception as exc:
+            self.logger.debug('Failed to get file info for %s: %s', url, exc)
+            return None
+
+        if headers.get('Accept-Ranges', '').lower() != 'bytes':
+            return None
+        if not headers.get('Content-Length'):
+            return None
+
+        return HTTPFileInfo(
+            size=int(headers['Content-Length']),
+            validator=headers.get('ETag') or headers.get('Last-Modified'),
+        )
+
+    def _download_stream(self, url: str, dst_file_path: Path) -> str:
+        hash_md5 = hashlib.md5()
         with requests.get(url, stream=True, auth=self.auth) as req:
             req.raise_for_status()
-            file_size = int(req.headers.get('Content-Length'))
-            with tqdm.wrapattr(req.raw, 'read', total=file_size) as raw:
+            file_size = req.headers.get('Content-Length')
+            with tqdm(
+                total=int(file_size) if file_size else None,
+                unit='B',
+                unit_scale=True,
+            ) as pbar:
                 with open(dst_file_path, 'wb') as res:
-                    shutil.copyfileobj(raw, res)
+                    for data in req.iter_content(STREAM_READ_SIZE):
+                        hash_md5.update(data)
+                        res.write(data)
+                        pbar.update(len(data))
+
+        return hash_md5.hexdigest()
+
+    def _download_chunks(
+        self, url: str, dst_file_path: Path, file_info: HTTPFileInfo
+    ) -> str:
+        part_file_path = dst_file_path.with_name(f'{dst_file_path.name}.part')
+        state_file_path = dst_file_path.with_name(f'{dst_file_path.name}.part.json')
+        state = {
+            'url': url,
+            'size': file_info.size,
+            'validator': file_info.validator,
+            'chunk_size': self.chunk_size,
+        }
+        n_chunks = (file_info.size + self.chunk_size - 1) // self.chunk_size
+        downloaded = self._load_downloaded_chunks(
+            part_file_path, state_file_path, state
+        )
+        if downloaded:
+            self.logger.info(
+                'Resuming download of %s, %s of %s chunks are already downloaded.',
+                url,
+                len(downloaded),
+                n_chunks,
+            )
+        else:
+            with open(part_file_path, 'wb') as f:
+                f.truncate(file_info.size)
+
+        lock = Lock()
+        headers = {}
+        if file_info.validator:
+            # the server returns the whole file if it has been changed
+            headers['If-Range'] = file_info.validator
+
+        with open(part_file_path, 'r+b') as f, tqdm(
+            total=file_info.size,
+            initial=min(len(downloaded) * self.chunk_size, file_info.size),
+            unit='B',
+            unit_scale=True,
+        ) as pbar:
+            checksum = OrderedChecksum(f.fileno(), self.chunk_size)
+            for chunk_idx in sorted(downloaded):
+                checksum.add(chunk_idx)
+
+            def download_chunk(chunk_idx: int):
+                start = chunk_idx * self.chunk_size
+                end = min(start + self.chunk_size, file_info.size) - 1
+                with requests.get(
+                    url,
+                    auth=self.auth,
+                    headers={**headers, 'Range': f'bytes={start}-{end}'},
+                ) as resp:
+                    resp.raise_for_status()
+                    if resp.status_code != requests.codes.partial_content:
+                        raise HTTPRemoteFileError(
+                            f'Range request to {url} is not satisfied, '
+                            'the file might have been changed during downloading.'
+                        )
+                    data = resp.content
+                if len(data) != end - start + 1:
+                    raise HTTPRemoteFileError(
+                        f'Unexpected size of chunk {chunk_idx} of {url}: '
+                        f'{len(data)} bytes instead of {end - start + 1}.'
+                    )
+                os.pwrite(f.fileno(), data, start)
+                with lock:
+                    downloaded.add(chunk_idx)
+                    checksum.add(chunk_idx, data)
+                    self._save_downloaded_chunks(state_file_path, state, downloaded)
+                    pbar.update(len(data))
+
+            with ThreadPoolExecutor(self.max_connections) as executor:
+                futures = [
+                    executor.submit(download_chunk, chunk_idx)
+                    for chunk_idx in range(n_chunks)
+                    if chunk_idx not in downloaded
+                ]
+                for future in futures:
+                    future.result()
+
+        os.replace(part_file_path, dst_file_path)
+        state_file_path.unlink()
+
+        return checksum.hexdigest()
+
+    def _load_downloaded_chunks(
+        self, part_file_path: Path, state_file_path: Path, state: dict
+    ) -> Set[int]:
+        """Load indexes of the downloaded chunks of the same remote file."""
+
+        if not state['validator']:
+            # cannot check the remote file is the same
+            return set()
+        if not part_file_path.is_file() or not state_file_path.is_file():
+            return set()
+        if part_file_path.stat().st_size != state['size']:
+            return set()
+        try:
+            with open(state_file_path, 'r', encoding='utf8') as f:
+                saved_state = json.load(f)
+        except Exception as exc:
+            self.logger.warning(
+                'Failed to load download state %s: %s', state_file_path, exc
+            )
+            return set()
+        downloaded = saved_state.pop('downloaded', [])
+        if saved_state != state:
+            return set()
+
+        return set(downloaded)
 
-        return dst_file_path
+    def _save_downloaded_chunks(
+        self, state_file_path: Path, state: dict, downloaded: Set[int]
+    ):
+        tmp_file_path = state_file_path.with_name(f'{state_file_path.name}.tmp')
+        with open(tmp_file_path, 'w', encoding='utf8') as f:
+            json.dump({**state, 'downloaded': sorted(downloaded)}, f)
+        os.replace(tmp_file_path, state_file_path)
@@ -7,12 +7,14 @@ import zipfile
 from pathlib import Path
 from typing import List, Optional
 
+CHECKSUM_READ_SIZE = 1024 * 1024
+
 
 def get_file_checksum(file_path: Path) -> str:
     """Generates md5 checksum for a file."""
     hash_md5 = hashlib.md5()
     with open(file_path, 'rb') as file:
-        for chunk in iter(lambda: file.read(4096), b''):
+        for chunk in iter(lambda: file.read(CHECKSUM_READ_SIZE), b''):
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
 
@@ -4,7 +4,7 @@
 import numpy as np
 
 from savant.base.selector import BaseSelector
-from savant.utils.nms import nms_cpu
+from savant.utils.nms import nms_cpu_batched
 
 
 # @nb.njit('f4[:, :](f4[:, :], u2, u2, u2, u2)', nogil=True, cache=True)
@@ -127,7 +127,7 @@ def default_selector(
         )
 
     if nms_iou_threshold:
-        keep = nms_cpu(
+        keep = nms_cpu_batched(
             selected_bbox_tensor[:, 2:6],
             selected_bbox_tensor[:, 1],
             nms_iou_threshold,
@@ -1,4 +1,5 @@
 """Artists package."""
 
 from .artist_gpumat import ArtistGPUMat as Artist
+from .artist_numpy import ArtistNumPy
 from .position import Position
@@ -0,0 +1,606 @@
+"""Artist implementation using NumPy and OpenCV on CPU."""
+
+import threading
+from contextlib import AbstractContextManager
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from savant_rs.draw_spec import PaddingDraw
+from savant_rs.primitives.geometry import BBox, RBBox
+
+from .position import Position, get_bottom_left_point
+
+LABEL_SPRITE_CACHE_SIZE = 4096
+"""Maximum number of rasterized labels kept in the cache."""
+
+Color = Tuple[int, int, int, int]
+
+# zeroed overlays released by the artists, by thread and by frame size
+_free_overlays = threading.local()
+
+
+class LabelSprite(NamedTuple):
+    """Rasterized text label with its background and border."""
+
+    image: Optional[np.ndarray]
+    """RGBA image of the label, None if nothing is drawn."""
+
+    mask: Optional[np.ndarray]
+    """Pixels of the image to draw, None if all the pixels are drawn."""
+
+    offset: Tuple[int, int]
+    """Position of the image left-top corner relative to the text origin."""
+
+    text_size: Tuple[int, int]
+    """Text width and height."""
+
+    baseline: int
+    """Text baseline."""
+
+
+@lru_cache(maxsize=LABEL_SPRITE_CACHE_SIZE)
+def render_label_sprite(
+    text: str,
+    font_face: int,
+    font_scale: float,
+    font_thickness: int,
+    font_color: Color,
+    border_width: int,
+    border_color: Color,
+    bg_color: Optional[Color],
+    padding: Tuple[int, int, int, int],
+) -> LabelSprite:
+    """Rasterize a text label. The label is drawn the same way as
+    :py:meth:`ArtistGPUMat.add_text` draws it. Rasterized labels
+    are cached, the images are read-only."""
+
+    text_size, baseline = cv2.getTextSize(text, font_face, font_scale, font_thickness)
+    draw_text = font_scale > 0 and len(text) > 0 and font_color[3] > 0
+    draw_border = border_width > 0 and border_color[3] > 0
+    draw_bg = bg_color is not None and bg_color[3] > 0
+    if not text or not (draw_text or draw_border or draw_bg):
+        return LabelSprite(None, None, (0, 0), text_size, baseline)
+
+    # rect relative to the text origin (left-bottom corner of the text)
+    rect_left = -border_width - padding[0]
+    rect_top = -text_size[1] - border_width - padding[1]
+    rect_right = text_size[0] + border_width + padding[2]
+    rect_bottom = baseline + border_width + padding[3]
+
+    # border and glyphs can be drawn outside the rect
+    margin = border_width + font_thickness + text_size[1] // 2 + 2
+    origin_x = rect_left - margin
+    origin_y = rect_top - margin
+    canvas = np.zeros(
+        (
+            rect_bottom - rect_top + 1 + 2 * margin,
+            rect_right - rect_left + 1 + 2 * margin,
+            4,
+        ),
+        dtype=np.uint8,
+    )
+    rect_tl = rect_left - origin_x, rect_top - origin_y
+    rect_br = rect_right - origin_x, rect_bottom - origin_y
+
+    if draw_bg:
+        cv2.rectangle(canvas, rect_tl, rect_br, bg_color, cv2.FILLED)
+
+    if draw_border:
+        cv2.rectangle(canvas, rect_tl, rect_br, border_color, border_width)
+
+    if draw_text:
+        cv2.putText(
+            canvas,
+            text,
+            (-origin_x, -origin_y),
+            font_face,
+            font_scale,
+            font_color,
+            font_thickness,
+            cv2.LINE_AA,
+        )
+
+    drawn = canvas[:, :, 3] > 0
+    rows = np.flatnonzero(drawn.any(axis=1))
+    cols = np.flatnonzero(drawn.any(axis=0))
+    if len(rows) == 0:
+        return LabelSprite(None, None, (0, 0), text_size, baseline)
+
+    top, bottom = rows[0], rows[-1] + 1
+    left, right = cols[0], cols[-1] + 1
+    image = canvas[top:bottom, left:right].copy()
+    mask = drawn[top:bottom, left:right].copy()
+    image.flags.writeable = False
+    mask.flags.writeable = False
+    return LabelSprite(
+        image,
+        None if mask.all() else mask,
+        (int(origin_x + left), int(origin_y + top)),
+        text_size,
+        baseline,
+    )
+
+
+class ArtistNumPy(AbstractContextManager):
+    """Artist implementation using NumPy and OpenCV on CPU.
+
+    Has the same API as :py:class:`ArtistGPUMat`. Boxes are drawn on
+    the frame immediately, the rest of the elements are drawn on an overlay
+    which is alpha-blended with the frame on exit. The overlay is allocated
+    on the first use and only the region with the drawn elements is blended.
+    Text labels are rasterized once and are taken from a shared cache after
+    that (see :py:func:`render_label_sprite`).
+
+    :param frame: RGBA frame, array of shape (height, width, 4).
+    """
+
+    def __init__(self, frame: np.ndarray) -> None:
+        if frame.ndim != 3 or frame.shape[2] != 4:
+            raise ValueError('RGBA frame is expected.')
+        self.frame: np.ndarray = frame
+        self.height, self.width = self.frame.shape[:2]
+        self.max_col = self.width - 1
+        self.max_row = self.height - 1
+        self.overlay: Optional[np.ndarray] = None
+        self.font_face = cv2.FONT_HERSHEY_SIMPLEX
+        # left, top, right, bottom of the drawn overlay regions
+        self._regions: List[Tuple[int, int, int, int]] = []
+
+    def __exit__(self, *exc_details):
+        # apply alpha comp if overlay is not null
+        if self.overlay is None:
+            return
+        for left, top, right, bottom in self._regions:
+            overlay = self.overlay[top:bottom, left:right]
+            frame = self.frame[top:bottom, left:right]
+            # RGBA pixels as single values
+            overlay_px = overlay.view(np.uint32)[:, :, 0]
+            frame_px = frame.view(np.uint32)[:, :, 0]
+            alpha = overlay[:, :, 3]
+            # opaque pixels replace the frame pixels, only translucent ones are blended
+            np.copyto(frame_px, overlay_px, where=alpha == 255)
+            translucent = alpha - 1 < 254  # 0 < alpha < 255, uint8 wraps around
+            if translucent.any():
+                blended = alpha_over(
+                    overlay_px[translucent].view(np.uint8).reshape(-1, 4),
+                    frame_px[translucent].view(np.uint8).reshape(-1, 4),
+                )
+                frame_px[translucent] = blended.view(np.uint32)[:, 0]
+            # overlapping regions must not blend the same pixels twice,
+            # the overlay is reused zeroed
+            overlay_px[:] = 0
+        _release_overlay(self.overlay)
+        self.overlay = None
+        self._regions = []
+
+    @property
+    def frame_wh(self):
+        return self.width, self.height
+
+    def add_text(
+        self,
+        text: str,
+        anchor: Tuple[int, int],
+        font_scale: float = 0.5,
+        font_thickness: int = 1,
+        font_color: Tuple[int, int, int, int] = (255, 255, 255, 255),  # white
+        border_width: int = 0,
+        border_color: Tuple[int, int, int, int] = (255, 0, 0, 255),  # red
+        bg_color: Optional[Tuple[int, int, int, int]] = (0, 0, 0, 255),  # black
+        padding: Tuple[int, int, int, int] = (0, 0, 0, 0),
+        anchor_point_type: Position = Position.CENTER,
+    ) -> Tuple[Tuple[int, int], int]:
+        """Draw text, text background box and text background box border on the frame.
+        Does not draw anything if text is empty.
+
+        :param text: Display text.
+        :param anchor: X,Y coordinates of text position.
+        :param font_scale: Font scale factor that is multiplied by the font-specific base size.
+        :param font_thickness: Thickness of the lines used to draw the text, >= 0.
+        :param font_color: Font color, RGBA, ints in range [0;255].
+        :param border_width: Border width around the text.
+        :param border_color: Border color around the text, RGBA, ints in range [0;255].
+        :param bg_color: Background color, RGBA, ints in range [0;255].
+        :param padding: Increase the size of the rectangle around
+            the text in each direction (left, top, right, bottom), in pixels.
+        :param anchor_point_type: Anchor point of a  rectangle with text.
+            For example, if you select Position.CENTER, the rectangle with the text
+            will be drawn so that the center of the rectangle is at (x,y).
+        :return: Text [width, height] and baseline height
+            (total text box height = text height + baseline).
+            Returns this even if nothing was drawn.
+        """
+        sprite = render_label_sprite(
+            text,
+            self.font_face,
+            font_scale,
+            font_thickness,
+            tuple(font_color),
+            border_width,
+            tuple(border_color),
+            tuple(bg_color) if bg_color is not None else None,
+            tuple(padding),
+        )
+        if sprite.image is not None:
+            text_left, text_bottom = get_bottom_left_point(
+                anchor_point_type, anchor, sprite.text_size, sprite.baseline
+            )
+            self.__paste(
+                sprite.image,
+                sprite.mask,
+                text_left + sprite.offset[0],
+                text_bottom + sprite.offset[1],
+            )
+        return sprite.text_size, sprite.baseline
+
+    # pylint:disable=too-many-arguments
+    def add_bbox(
+        self,
+        bbox: Union[BBox, RBBox],
+        border_width: int = 3,
+        border_color: Tuple[int, int, int, int] = (0, 255, 0, 255),  # RGBA, Green
+        bg_color: Optional[Tuple[int, int, int, int]] = None,  # RGBA
+        padding: Tuple[int, int, int, int] = (0, 0, 0, 0),
+    ):
+        """Draw bbox on frame. Translucent colors are alpha-blended with the frame.
+
+        :param bbox: Bounding box.
+        :param border_width:  Border width.
+        :param border_color:  Border color, RGBA, ints in range [0;255].
+        :param bg_color: Background color, RGBA, ints in range [0;255].
+            If None, the rectangle will be transparent.
+        :param padding: Increase the size of the rectangle in each direction,
+            value in pixels, tuple of 4 values (left, top, right, bottom).
+        """
+        draw_border = border_width > 0 and border_color[3] > 0
+        draw_bg = bg_color is not None and bg_color[3] > 0
+        if not draw_border and not draw_bg:
+            return
+
+        if isinstance(bbox, BBox):
+            left, top, right, bottom = bbox.get_visual_box(
+                PaddingDraw(*padding), border_width, self.max_col, self.max_row
+            ).as_ltrb_int()
+
+            if (right - left) < 1 or (bottom - top) < 1:
+                raise ValueError('Wrong bbox size.')
+
+            if draw_bg:
+                self.__fill(left, top, right, bottom, bg_color)
+
+            if draw_border and (border_color != bg_color or not draw_bg):
+                inner_top = min(top + border_width, bottom)
+                inner_bottom = max(bottom - border_width, inner_top)
+                self.__fill(left, top, right, inner_top, border_color)
+                self.__fill(left, inner_bottom, right, bottom, border_color)
+                self.__fill(
+                    left,
+                    inner_top,
+                    min(left + border_width, right),
+                    inner_bottom,
+                    border_color,
+                )
+                self.__fill(
+                    max(right - border_width, left + border_width),
+                    inner_top,
+                    right,
+                    inner_bottom,
+                    border_color,
+                )
+
+        elif isinstance(bbox, RBBox):
+            padded = bbox.new_padded(PaddingDraw(*padding))
+            self.add_polygon(
+                padded.vertices_int,
+                border_width,
+                border_color,
+                bg_color,
+            )
+
+    def add_rounded_rect(
+        self,
+        bbox: BBox,
+        radius: int,
+        bg_color: Tuple[int, int, int, int],  # RGBA
+    ):
+        """Draw rounded rect.
+
+        :param bbox: Bounding box.
+        :param radius: Border radius, in px.
+        :param bg_color: Background color, RGBA, ints in range [0;255].
+        """
+        if bg_color[3] <= 0:
+            return
+
+        # anti-aliased corners are drawn up to 1px outside the box
+        overlay = self.__init_overlay(
+            int(bbox.left) - 1,
+            int(bbox.top) - 1,
+            int(bbox.right) + 2,
+            int(bbox.bottom) + 2,
+        )
+        if overlay is None:
+            return
+
+        cv2.rectangle(
+            overlay,
+            (int(bbox.left), int(bbox.top + radius)),
+            (int(bbox.right), int(bbox.bottom - radius)),
+            bg_color,
+            cv2.FILLED,
+        )
+        cv2.rectangle(
+            overlay,
+            (int(bbox.left + radius), int(bbox.top)),
+            (int(bbox.right - radius), int(bbox.bottom)),
+            bg_color,
+            cv2.FILLED,
+        )
+
+        # rounded corners: center(x, y), rotation angle
+        rounded_corners = [
+            ((int(bbox.left + radius), int(bbox.top + radius)), 180),  # left-top
+            ((int(bbox.right - radius), int(bbox.top + radius)), 270),  # right-top
+            ((int(bbox.left + radius), int(bbox.bottom - radius)), 90),  # left-bottom
+            ((int(bbox.right - radius), int(bbox.bottom - radius)), 0),  # right-bottom
+        ]
+        for center, angle in rounded_corners:
+            cv2.ellipse(
+                overlay,
+                center,
+                (radius, radius),
+                angle,
+                0,
+                90,
+                bg_color,
+                cv2.FILLED,
+                cv2.LINE_AA,
+            )
+
+    def add_circle(
+        self,
+        center: Tuple[int, int],
+        radius: int,
+        color: Tuple[int, int, int, int],
+        thickness: int,
+        line_type: int = cv2.LINE_AA,
+    ):
+        """Draw circle.
+
+        :param center: Circle center.
+        :param radius: Circle radius.
+        :param color: Circle line color, RGBA, ints in range [0;255].
+        :param thickness: Circle line thickness.
+        :param line_type: Circle line type.
+        """
+        if color[3] <= 0 or (thickness <= 0 and radius <= 0):
+            return
+        extent = radius + max(thickness, 0) + 1
+        overlay = self.__init_overlay(
+            center[0] - extent,
+            center[1] - extent,
+            center[0] + extent + 1,
+            center[1] + extent + 1,
+        )
+        if overlay is None:
+            return
+        cv2.circle(overlay, center, radius, color, thickness, line_type)
+
+    def add_line(
+        self,
+        pt1: Tuple[int, int],
+        pt2: Tuple[int, int],
+        color: Tuple[int, int, int, int] = (255, 0, 0, 255),  # RGBA, Red,
+        thickness: int = 3,
+        type: int = cv2.LINE_AA,
+    ):
+        """Draw line.
+
+        :param pt1: First point.
+        :param pt2: Second point.
+        :param color: Line color, RGBA, ints in range [0;255].
+        :param thickness: Line thickness.
+        :param type: Line type.
+        """
+        if color[3] <= 0 or thickness <= 0:
+            return
+        overlay = self.__init_overlay(
+            min(pt1[0], pt2[0]) - thickness,
+            min(pt1[1], pt2[1]) - thickness,
+            max(pt1[0], pt2[0]) + thickness + 1,
+            max(pt1[1], pt2[1]) + thickness + 1,
+        )
+        if overlay is None:
+            return
+        cv2.line(overlay, pt1, pt2, color, thickness, type)
+
+    def add_polygon(
+        self,
+        vertices: Union[np.ndarray, List[Tuple[int, int]]],
+        line_width: int = 3,
+        line_color: Tuple[int, int, int, int] = (255, 0, 0, 255),  # RGBA, Red
+        bg_color: Optional[Tuple[int, int, int, int]] = None,  # RGBA
+    ):
+        """Draw polygon.
+
+        :param vertices: List of points.
+        :param line_width: Line width.
+        :param line_color: Line color, RGBA, ints in range [0;255].
+        :param bg_color: Background color, RGBA, ints in range [0;255].
+        """
+        draw_contour = line_width > 0 and line_color[3] > 0
+        draw_fill = bg_color is not None and bg_color[3] > 0
+        if not draw_contour and not draw_fill:
+            return
+
+        vertices = np.array(vertices)
+        extent = max(line_width, 0) + 1
+        left, top = vertices.min(axis=0)
+        right, bottom = vertices.max(axis=0)
+        overlay = self.__init_overlay(
+            int(left) - extent,
+            int(top) - extent,
+            int(right) + extent + 1,
+            int(bottom) + extent + 1,
+        )
+        if overlay is None:
+            return
+        vertices = vertices[np.newaxis, ...]
+        if draw_fill:
+            cv2.drawContours(overlay, vertices, 0, bg_color, cv2.FILLED)
+        if draw_contour and (not draw_fill or line_color != bg_color):
+            cv2.drawContours(overlay, vertices, 0, line_color, line_width)
+
+    def blur(
+        self,
+        bbox: BBox,
+        padding: Tuple[int, int, int, int] = (0, 0, 0, 0),
+        sigma: Optional[float] = None,
+    ):
+        """Apply gaussian blur to the specified ROI.
+
+        :param bbox: ROI specified as Savant bbox.
+        :param padding: Increase the size of the rectangle in each direction,
+            value in pixels, left, top, right, bottom.
+        :param sigma: gaussian blur stddev.
+        """
+        if sigma is None:
+            sigma = min(bbox.width, bbox.height) / 10
+
+        radius = int(sigma * 4 + 0.5)
+        if radius % 2 == 0:
+            radius += 1
+        radius = max(radius, 1)
+        radius = min(radius, 31)
+
+        left, top, width, height = bbox.get_visual_box(
+            PaddingDraw(*padding), 0, self.max_col, self.max_row
+        ).as_ltwh_int()
+
+        if width < 1 or height < 1:
+            raise ValueError('Wrong bbox size.')
+
+        roi = self.frame[top : top + height, left : left + width]
+        roi[:] = cv2.GaussianBlur(roi, (radius, radius), sigma)
+
+    def copy_frame_region(
+        self, bbox: BBox, padding: Tuple[int, int, int, int] = (0, 0, 0, 0)
+    ) -> np.ndarray:
+        """Copy a region of the frame to a new array.
+
+        :param bbox: ROI specified as Savant bbox.
+        :param padding: Increase the size of the region in each direction,
+            value in pixels, left, top, right, bottom.
+        :return: Array with the specified region.
+        """
+        left, top, width, height = bbox.get_visual_box(
+            PaddingDraw(*padding), 0, self.max_col, self.max_row
+        ).as_ltwh_int()
+        return self.frame[top : top + height, left : left + width].copy()
+
+    def add_graphic(self, img: np.ndarray, origin: Tuple[int, int]):
+        """Overlays an image onto the frame, e.g. a logo.
+
+        :param img: RGBA image as numpy array
+        :param origin: Coordinates of left top corner of img in frame space. (left, top)
+        """
+        frame_left, frame_top = origin
+        img_h, img_w = img.shape[:2]
+        left = max(frame_left, 0)
+        top = max(frame_top, 0)
+        right = min(frame_left + img_w, self.width)
+        bottom = min(frame_top + img_h, self.height)
+        if right <= left or bottom <= top:
+            return
+
+        self.frame[top:bottom, left:right] = img[
+            top - frame_top : bottom - frame_top,
+            left - frame_left : right - frame_left,
+        ]
+
+    def __fill(self, left: int, top: int, right: int, bottom: int, color: Color):
+        """Fill the rect of the frame with the color."""
+        if right <= left or bottom <= top:
+            return
+        region = self.frame[top:bottom, left:right]
+        if color[3] >= 255:
+            region[:] = color
+        else:
+            region[:] = alpha_over(np.array(color, dtype=np.uint8), region)
+
+    def __paste(
+        self, image: np.ndarray, mask: Optional[np.ndarray], left: int, top: int
+    ):
+        """Draw the image on the overlay, only masked pixels are drawn."""
+        img_h, img_w = image.shape[:2]
+        overlay = self.__init_overlay(left, top, left + img_w, top + img_h)
+        if overlay is None:
+            return
+        frame_left = max(left, 0)
+        frame_top = max(top, 0)
+        frame_right = min(left + img_w, self.width)
+        frame_bottom = min(top + img_h, self.height)
+        region = overlay[frame_top:frame_bottom, frame_left:frame_right]
+        img_rows = slice(frame_top - top, frame_bottom - top)
+        img_cols = slice(frame_left - left, frame_right - left)
+        if mask is None:
+            region[:] = image[img_rows, img_cols]
+        else:
+            mask = mask[img_rows, img_cols]
+            region[mask] = image[img_rows, img_cols][mask]
+
+    def __init_overlay(
+        self, left: int, top: int, right: int, bottom: int
+    ) -> Optional[np.ndarray]:
+        """Init overlay image and add the rect to the drawn regions.
+        Returns None when the rect is outside the frame."""
+        left = max(int(left), 0)
+        top = max(int(top), 0)
+        right = min(int(right), self.width)
+        bottom = min(int(bottom), self.height)
+        if right <= left or bottom <= top:
+            return None
+
+        if self.overlay is None:
+            self.overlay = _acquire_overlay(self.height, self.width)
+        self._regions.append((left, top, right, bottom))
+        return self.overlay
+
+
+def _acquire_overlay(height: int, width: int) -> np.ndarray:
+    """Get a zeroed overlay released by an artist or allocate a new one."""
+    free = getattr(_free_overlays, 'by_size', None)
+    if free is None:
+        free = _free_overlays.by_size = {}
+    overlay = free.pop((height, width), None)
+    if overlay is None:
+        overlay = np.zeros((height, width, 4), dtype=np.uint8)
+    return overlay
+
+
+def _release_overlay(overlay: np.ndarray):
+    """Keep a zeroed overlay for the next artist of the thread."""
+    _free_overlays.by_size[overlay.shape[:2]] = overlay
+
+
+def alpha_over(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Composite RGBA pixels of the source over the destination,
+    the same way as :py:func:`cv2.cuda.alphaComp` with ``ALPHA_OVER`` does.
+
+    :param src: Source pixels, array of shape (..., 4).
+    :param dst: Destination pixels, array of shape (..., 4).
+    :return: Composited pixels.
+    """
+    src = src.astype(np.uint32)
+    dst = dst.astype(np.uint32)
+    src_alpha = src[..., 3:]
+    # destination alpha * (1 - source alpha), scaled by 255^2
+    dst_weight = dst[..., 3:] * (255 - src_alpha)
+    result = np.empty(np.broadcast_shapes(src.shape, dst.shape), dtype=np.uint32)
+    result[..., :3] = (
+        src[..., :3] * src_alpha * 255 + dst[..., :3] * dst_weight + 32512
+    ) // 65025
+    result[..., 3:] = (src_alpha * 255 + dst_weight + 127) // 255
+    return result.astype(np.uint8)
@@ -0,0 +1,170 @@
+"""Post-processing of the boxes detected by custom models."""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+__all__ = ['BBoxPostprocessor', 'PostprocessedBBoxes']
+
+BBOX_COLUMNS = 8
+"""Columns of post-processed boxes:
+(class_id, confidence, xc, yc, width, height, angle, index)."""
+
+
+class PostprocessedBBoxes:
+    """Boxes of a batch of ROIs grouped by ROI and by object class.
+
+    Arrays are views into the buffers of :py:class:`BBoxPostprocessor`,
+    they are valid until the next call of the post-processor.
+    """
+
+    def __init__(
+        self,
+        bboxes: np.ndarray,
+        offsets: np.ndarray,
+        rotated: np.ndarray,
+        class_slots: np.ndarray,
+        n_slots: int,
+    ):
+        self.bboxes = bboxes
+        """Boxes sorted by ROI and by class, (N, 8) array."""
+
+        self.offsets = offsets
+        """Offsets of the boxes of each (ROI, class slot) group."""
+
+        self.rotated = rotated
+        """Whether boxes of each ROI are rotated."""
+
+        self._class_slots = class_slots
+        self._n_slots = n_slots
+
+    def select(self, roi_idx: int, class_idx: int) -> np.ndarray:
+        """Boxes of the ROI and the class in the order of the converter output.
+
+        :param roi_idx: Index of the ROI in the batch.
+        :param class_idx: Index of the class in the list of the class IDs
+            passed to the post-processor.
+        """
+
+        group = roi_idx * self._n_slots + self._class_slots[class_idx]
+        return self.bboxes[self.offsets[group] : self.offsets[group + 1]]
+
+
+class BBoxPostprocessor:
+    """Post-processes boxes of all ROIs in a batch at once.
+
+    Converter outputs are tensors with (class_id, confidence, xc, yc, width,
+    height, [angle]) rows. Regular boxes (without angle) are clipped by the
+    frame rect and get zero angle, rotated boxes are kept as is. An index of
+    the box in the converter output is added to each box. Boxes are partitioned
+    by ROI and by class with a single stable sort, boxes of other classes are
+    dropped.
+
+    :param class_ids: Class IDs of the model objects.
+    :param capacity: Initial number of boxes in the buffers.
+    """
+
+    def __init__(self, class_ids: Sequence[int], capacity: int = 1024):
+        class_ids = np.asarray(class_ids, dtype=np.float32)
+        self._slot_class_ids, self._class_slots = np.unique(
+            class_ids, return_inverse=True
+        )
+        self._n_slots = len(self._slot_class_ids) + 1  # last slot for other classes
+        self._capacity = 0
+        self._reserve(capacity)
+
+    def __call__(
+        self,
+        bbox_tensors: Sequence[Optional[np.ndarray]],
+        frame_rects: np.ndarray,
+    ) -> PostprocessedBBoxes:
+        """Post-process converter outputs.
+
+        :param bbox_tensors: Converter outputs for each ROI, None for ROIs
+            without output.
+        :param frame_rects: Frame rects to clip boxes of each ROI,
+            (N, 4) array with (left, top, right, bottom) rows.
+        """
+
+        n_rois = len(bbox_tensors)
+        counts = np.fromiter(
+            (0 if x is None else x.shape[0] for x in bbox_tensors),
+            dtype=np.intp,
+            count=n_rois,
+        )
+        n_bboxes = int(counts.sum())
+        self._reserve(n_bboxes)
+        bboxes = self._bboxes[:n_bboxes]
+        roi_idx = self._roi_idx[:n_bboxes]
+        rotated = np.zeros(n_rois, dtype=bool)
+
+        start = 0
+        for i, (bbox_tensor, count) in enumerate(zip(bbox_tensors, counts)):
+            if count == 0:
+                continue
+            end = start + count
+            if bbox_tensor.shape[1] == 6:
+                bboxes[start:end, :6] = bbox_tensor
+                bboxes[start:end, 6] = 0
+            else:
+                rotated[i] = True
+                bboxes[start:end, :7] = bbox_tensor
+            bboxes[start:end, 7] = self._index[:count]
+            roi_idx[start:end] = i
+            start = end
+
+        if n_bboxes > 0 and not rotated.all():
+            frame_rects = np.asarray(frame_rects, dtype=np.float32)
+            if rotated.any():
+                rows = ~rotated[roi_idx]
+                regular = bboxes[rows]
+                self._clip(regular, frame_rects[roi_idx[rows]])
+                bboxes[rows] = regular
+            else:
+                self._clip(bboxes, frame_rects[roi_idx])
+
+        group = self._groups(bboxes[:, 0], roi_idx)
+        order = np.argsort(group, kind='stable')
+        sorted_bboxes = np.take(bboxes, order, axis=0, out=self._sorted[:n_bboxes])
+        offsets = np.zeros(n_rois * self._n_slots + 1, dtype=np.intp)
+        np.cumsum(np.bincount(group, minlength=n_rois * self._n_slots), out=offsets[1:])
+
+        return PostprocessedBBoxes(
+            sorted_bboxes, offsets, rotated, self._class_slots, self._n_slots
+        )
+
+    @staticmethod
+    def _clip(bboxes: np.ndarray, rects: np.ndarray):
+        """Clip regular boxes by the frame rects of the boxes in-place."""
+
+        half_width = bboxes[:, 4] / 2
+        half_height = bboxes[:, 5] / 2
+        left = np.maximum(bboxes[:, 2] - half_width, rects[:, 0])
+        top = np.maximum(bboxes[:, 3] - half_height, rects[:, 1])
+        right = np.minimum(bboxes[:, 2] - half_width + bboxes[:, 4], rects[:, 2])
+        bottom = np.minimum(bboxes[:, 3] - half_height + bboxes[:, 5], rects[:, 3])
+        np.subtract(right, left, out=bboxes[:, 4])
+        np.subtract(bottom, top, out=bboxes[:, 5])
+        np.add(left, bboxes[:, 4] / 2, out=bboxes[:, 2])
+        np.add(top, bboxes[:, 5] / 2, out=bboxes[:, 3])
+
+    def _groups(self, class_ids: np.ndarray, roi_idx: np.ndarray) -> np.ndarray:
+        """Group index of each box: ROI index * number of slots + class slot."""
+
+        if len(self._slot_class_ids) == 0:
+            return roi_idx * self._n_slots + self._n_slots - 1
+        slots = np.searchsorted(self._slot_class_ids, class_ids)
+        np.minimum(slots, len(self._slot_class_ids) - 1, out=slots)
+        other = self._slot_class_ids[slots] != class_ids
+        slots[other] = self._n_slots - 1
+        return roi_idx * self._n_slots + slots
+
+    def _reserve(self, n_bboxes: int):
+        if n_bboxes <= self._capacity:
+            return
+        capacity = max(n_bboxes, 2 * self._capacity)
+        self._bboxes = np.empty((capacity, BBOX_COLUMNS), dtype=np.float32)
+        self._sorted = np.empty((capacity, BBOX_COLUMNS), dtype=np.float32)
+        self._roi_idx = np.empty(capacity, dtype=np.intp)
+        self._index = np.arange(capacity, dtype=np.float32)
+        self._capacity = capacity
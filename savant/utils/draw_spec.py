@@ -1,5 +1,5 @@
 import copy
-from typing import Optional, Tuple
+from typing import NamedTuple, Optional, Tuple
 
 from savant_rs.draw_spec import (
     BoundingBoxDraw,
@@ -12,6 +12,11 @@ from savant_rs.draw_spec import (
     PaddingDraw,
 )
 
+from savant.utils.artist import Position
+
+Color = Tuple[int, int, int, int]
+Padding = Tuple[int, int, int, int]
+
 
 def convert_hex_to_rgba(hex_color: str) -> Tuple[int, int, int, int]:
     """Convert hex color to RGBA.
@@ -141,3 +146,109 @@ def get_default_draw_spec(track_id: bool = True) -> ObjectDraw:
             format=['{label} #{track_id}'],
         ),
     )
+
+
+class BoundingBoxRender(NamedTuple):
+    """Compiled bounding box drawing specification."""
+
+    thickness: int
+    border_color: Color
+    background_color: Color
+    padding: Padding
+
+
+class LabelRender(NamedTuple):
+    """Compiled label drawing specification."""
+
+    font_scale: float
+    thickness: int
+    font_color: Color
+    border_color: Color
+    background_color: Color
+    padding: Padding
+    formats: Tuple[str, ...]
+    """Format strings of the label lines in the drawing order."""
+    centered: bool
+    """Whether the label is drawn at the center of the box."""
+    anchor_point: Position
+    """Anchor point of the label drawn at the left-top corner of the box."""
+    margin_x: int
+    margin_y: int
+    line_offset_sign: int
+    """Direction of the next line anchor offset, -1 for lines drawn upwards."""
+
+
+class DotRender(NamedTuple):
+    """Compiled central dot drawing specification."""
+
+    radius: int
+    color: Color
+
+
+class ObjectRender(NamedTuple):
+    """Object drawing specification compiled to the arguments of
+    the :py:class:`~savant.utils.artist.Artist` calls."""
+
+    blur: bool
+    bounding_box: Optional[BoundingBoxRender]
+    label: Optional[LabelRender]
+    central_dot: Optional[DotRender]
+
+
+def compile_draw_spec(spec: ObjectDraw) -> ObjectRender:
+    """Compile ObjectDraw to the render instructions."""
+
+    # attributes of the specs are copied on each access, read them once
+    bounding_box = None
+    bbox_spec = spec.bounding_box
+    if bbox_spec:
+        bounding_box = BoundingBoxRender(
+            bbox_spec.thickness,
+            bbox_spec.border_color.rgba,
+            bbox_spec.background_color.rgba,
+            _get_padding(bbox_spec.padding),
+        )
+
+    label = None
+    label_spec = spec.label
+    if label_spec:
+        position = label_spec.position
+        position_kind = position.position
+        if position_kind == LabelPositionKind.TopLeftOutside:
+            formats = tuple(reversed(label_spec.format))
+            line_offset_sign = -1
+        else:
+            formats = tuple(label_spec.format)
+            line_offset_sign = 1
+        if position_kind == LabelPositionKind.TopLeftInside:
+            anchor_point = Position.LEFT_TOP
+        else:
+            # consider default position as TopLeftOutside
+            anchor_point = Position.LEFT_BOTTOM
+        label = LabelRender(
+            label_spec.font_scale,
+            label_spec.thickness,
+            label_spec.font_color.rgba,
+            label_spec.border_color.rgba,
+            label_spec.background_color.rgba,
+            _get_padding(label_spec.padding),
+            formats,
+            position_kind == LabelPositionKind.Center,
+            anchor_point,
+            position.margin_x,
+            position.margin_y,
+            line_offset_sign,
+        )
+
+    central_dot = None
+    dot_spec = spec.central_dot
+    if dot_spec:
+        central_dot = DotRender(dot_spec.radius, dot_spec.color.rgba)
+
+    return ObjectRender(bool(spec.blur), bounding_box, label, central_dot)
+
+
+def _get_padding(padding: Optional[PaddingDraw]) -> Padding:
+    if padding is not None:
+        return padding.padding
+    return 0, 0, 0, 0
@@ -1,11 +1,13 @@
 """Non-maximum suppression (NMS) implementation."""
 
+from typing import Optional, Tuple
+
 import cupy as cp
 
 # import numba as nb
 import numpy as np
 
-__all__ = ['nms_cpu', 'nms_gpu']
+__all__ = ['nms_cpu', 'nms_cpu_batched', 'soft_nms_cpu', 'nms_gpu']
 
 
 # @nb.njit('u4[:](f4[:, :], f4[:], f4, u2)', nogil=True, cache=True)
@@ -58,6 +60,268 @@ def nms_cpu(
     return mask[:mask_idx]
 
 
+def nms_cpu_batched(
+    bboxes: np.ndarray,
+    confidences: np.ndarray,
+    threshold: float,
+    top_k: int = 300,
+    class_ids: Optional[np.ndarray] = None,
+    batch_ids: Optional[np.ndarray] = None,
+    pre_top_k: int = 0,
+    block_size: int = 64,
+) -> np.ndarray:
+    """Performs non-maximum suppression (NMS) on the boxes according
+    to their intersection-over-union (IoU). Vectorized NumPy (CPU) version.
+
+    Boxes are processed in blocks of ``block_size`` in decreasing order of
+    scores: the suppression inside a block is resolved with a few matrix
+    iterations, then the boxes kept from the block suppress all the remaining
+    boxes with a single matrix operation. The kept indices are the same as
+    the greedy :py:func:`nms_cpu` returns.
+
+    Can be used as a drop-in replacement for :py:func:`nms_cpu`.
+
+    :param bboxes: Boxes to perform NMS on.
+        They are expected to be in (xc, yc, width, height) format.
+    :param confidences: Scores for each one of the boxes.
+    :param threshold: IoU threshold.
+        Discards all overlapping boxes with IoU > threshold.
+    :param top_k: Returns only K with max confidence/score
+        (per image if ``batch_ids`` are specified).
+    :param class_ids: Class of each one of the boxes. If specified,
+        NMS is performed independently per class (class aware NMS).
+    :param batch_ids: Image index of each one of the boxes. If specified,
+        NMS is performed independently per image (batched NMS).
+    :param pre_top_k: Keep only K boxes with max confidence/score
+        before performing NMS, 0 to keep all the boxes.
+    :param block_size: Number of boxes processed at once.
+    :return: Indices of the boxes that have been kept by NMS,
+        sorted in decreasing order of scores.
+    """
+    order = confidences.argsort()[::-1].astype(np.uint32)
+    if pre_top_k > 0:
+        order = order[:pre_top_k]
+    if order.size == 0 or top_k <= 0:
+        return order[:0]
+
+    x_left = bboxes[:, 0]
+    y_top = bboxes[:, 1]
+    x_right = bboxes[:, 0] + bboxes[:, 2]
+    y_bottom = bboxes[:, 1] + bboxes[:, 3]
+    areas = (x_right - x_left) * (y_bottom - y_top)
+    # sorted by score
+    coords = (
+        x_left[order],
+        y_top[order],
+        x_right[order],
+        y_bottom[order],
+        areas[order],
+    )
+
+    # non-intersecting boxes can be skipped
+    sparse = threshold >= 0 and bool(np.all(areas[order] > 0))
+
+    group_ids = _nms_group_ids(class_ids, batch_ids)
+    if group_ids is not None:
+        group_ids = group_ids[order]
+    # batched NMS applies top k per image after the suppression,
+    # other boxes of the image can't be kept anyway
+    max_kept = order.size if batch_ids is not None else top_k
+
+    kept = []
+    num_kept = 0
+    remaining = np.arange(order.size)
+    while remaining.size > 0 and num_kept < max_kept:
+        block = remaining[:block_size]
+        remaining = remaining[block_size:]
+
+        # suppression inside the block, box i suppresses box j only if i < j
+        # and box i is kept; iterate from "all kept" to the fixed point
+        # which is the greedy NMS result
+        suppressed = np.triu(
+            _nms_overlaps(coords, group_ids, block, block, threshold, sparse), 1
+        )
+        keep = np.ones((block.size,), dtype=bool)
+        while True:
+            new_keep = ~np.any(suppressed[keep], axis=0)
+            if np.array_equal(new_keep, keep):
+                break
+            keep = new_keep
+        block = block[keep]
+        kept.append(block)
+        num_kept += block.size
+
+        # the kept boxes of the block suppress the rest of the boxes at once
+        if remaining.size > 0 and num_kept < max_kept:
+            suppressed = _nms_overlaps(
+                coords, group_ids, block, remaining, threshold, sparse
+            )
+            remaining = remaining[~np.any(suppressed, axis=0)]
+
+    kept = np.concatenate(kept)
+    if batch_ids is None:
+        return order[kept[:top_k]]
+
+    # top k per image, keeping the decreasing order of scores
+    kept_batch_ids = batch_ids[order[kept]]
+    by_batch = np.argsort(kept_batch_ids, kind='stable')
+    sorted_batch_ids = kept_batch_ids[by_batch]
+    is_first = np.concatenate(([True], sorted_batch_ids[1:] != sorted_batch_ids[:-1]))
+    first_pos = np.maximum.accumulate(np.where(is_first, np.arange(is_first.size), 0))
+    rank = np.empty_like(by_batch)
+    rank[by_batch] = np.arange(by_batch.size) - first_pos
+    return order[kept[rank < top_k]]
+
+
+def soft_nms_cpu(
+    bboxes: np.ndarray,
+    confidences: np.ndarray,
+    threshold: float = 0.3,
+    top_k: int = 300,
+    sigma: float = 0.5,
+    score_threshold: float = 0.001,
+    method: str = 'gaussian',
+    class_ids: Optional[np.ndarray] = None,
+    pre_top_k: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Performs Soft-NMS on the boxes: instead of discarding the boxes
+    overlapping with a selected box, decays their scores depending on the IoU.
+    NumPy (CPU) version, each step is performed on all the remaining boxes
+    at once.
+
+    :param bboxes: Boxes to perform NMS on.
+        They are expected to be in (xc, yc, width, height) format.
+    :param confidences: Scores for each one of the boxes.
+    :param threshold: IoU threshold, used by the ``linear`` method only.
+        Scores of the boxes with IoU > threshold are decayed.
+    :param top_k: Returns only K with max confidence/score.
+    :param sigma: Gaussian decay parameter, used by the ``gaussian`` method only.
+    :param score_threshold: Discards the boxes with decayed score
+        less than threshold.
+    :param method: Score decay method, ``linear`` or ``gaussian``.
+    :param class_ids: Class of each one of the boxes. If specified,
+        boxes decay only the scores of the boxes of the same class.
+    :param pre_top_k: Keep only K boxes with max confidence/score
+        before performing NMS, 0 to keep all the boxes.
+    :return: Indices of the boxes that have been kept and their decayed scores,
+        sorted in decreasing order of decayed scores.
+    """
+    if method not in ('linear', 'gaussian'):
+        raise ValueError(f'Unsupported Soft-NMS method "{method}".')
+
+    remaining = np.flatnonzero(confidences >= score_threshold)
+    if 0 < pre_top_k < remaining.size:
+        remaining = remaining[
+            np.argpartition(confidences[remaining], -pre_top_k)[-pre_top_k:]
+        ]
+    scores = confidences[remaining].astype(np.float32)
+
+    x_left = bboxes[remaining, 0]
+    y_top = bboxes[remaining, 1]
+    x_right = x_left + bboxes[remaining, 2]
+    y_bottom = y_top + bboxes[remaining, 3]
+    areas = (x_right - x_left) * (y_bottom - y_top)
+    groups = class_ids[remaining] if class_ids is not None else None
+
+    kept = []
+    kept_scores = []
+    while remaining.size > 0 and len(kept) < top_k:
+        best = np.argmax(scores)
+        kept.append(remaining[best])
+        kept_scores.append(scores[best])
+
+        xx1 = np.maximum(x_left[best], x_left)
+        yy1 = np.maximum(y_top[best], y_top)
+        xx2 = np.minimum(x_right[best], x_right)
+        yy2 = np.minimum(y_bottom[best], y_bottom)
+        inter = np.maximum(0.0, xx2 - xx1) * np.maximum(0.0, yy2 - yy1)
+        over = inter / (areas[best] + areas - inter)
+        if method == 'linear':
+            decay = np.where(over > threshold, 1.0 - over, 1.0)
+        else:
+            decay = np.exp(-(over * over) / sigma)
+        if groups is not None:
+            decay[groups != groups[best]] = 1.0
+        scores = scores * decay
+
+        alive = scores >= score_threshold
+        alive[best] = False
+        remaining = remaining[alive]
+        scores = scores[alive]
+        x_left, y_top = x_left[alive], y_top[alive]
+        x_right, y_bottom = x_right[alive], y_bottom[alive]
+        areas = areas[alive]
+        if groups is not None:
+            groups = groups[alive]
+
+    return (
+        np.array(kept, dtype=np.uint32),
+        np.array(kept_scores, dtype=np.float32),
+    )
+
+
+def _nms_group_ids(
+    class_ids: Optional[np.ndarray], batch_ids: Optional[np.ndarray]
+) -> Optional[np.ndarray]:
+    """Combines class and image indices into a single group index,
+    boxes of different groups do not suppress each other.
+    """
+    if class_ids is None:
+        return batch_ids
+    class_ids = class_ids.astype(np.int64)
+    if batch_ids is None:
+        return class_ids
+    return batch_ids.astype(np.int64) * (int(class_ids.max()) + 1) + class_ids
+
+
+def _nms_overlaps(
+    coords: Tuple[np.ndarray, ...],
+    group_ids: Optional[np.ndarray],
+    rows: np.ndarray,
+    cols: np.ndarray,
+    threshold: float,
+    sparse: bool,
+) -> np.ndarray:
+    """Returns a boolean matrix of box pairs (rows x cols) with IoU
+    over the threshold.
+
+    In sparse mode IoU is computed only for the pairs overlapping
+    horizontally, it's valid when all the areas are positive and the threshold
+    is not negative (boxes that don't intersect are never suppressed).
+    """
+    x_left, y_top, x_right, y_bottom, areas = coords
+    xx1 = np.maximum(x_left[rows, None], x_left[None, cols])
+    xx2 = np.minimum(x_right[rows, None], x_right[None, cols])
+    if sparse:
+        candidates = xx2 > xx1
+        if group_ids is not None:
+            candidates &= group_ids[rows, None] == group_ids[None, cols]
+        row_idx, col_idx = np.nonzero(candidates)
+        xx1 = xx1[row_idx, col_idx]
+        xx2 = xx2[row_idx, col_idx]
+        rows_, cols_ = rows[row_idx], cols[col_idx]
+    else:
+        rows_, cols_ = rows[:, None], cols[None, :]
+    yy1 = np.maximum(y_top[rows_], y_top[cols_])
+    yy2 = np.minimum(y_bottom[rows_], y_bottom[cols_])
+
+    width = np.maximum(0.0, xx2 - xx1)
+    height = np.maximum(0.0, yy2 - yy1)
+    inter = width * height
+
+    over = inter / (areas[rows_] + areas[cols_] - inter)
+    # same comparison as nms_cpu (NaN IoU suppresses)
+    over_threshold = ~(over <= threshold)
+    if not sparse:
+        if group_ids is not None:
+            over_threshold &= group_ids[rows_] == group_ids[cols_]
+        return over_threshold
+
+    suppressed = np.zeros((rows.size, cols.size), dtype=bool)
+    suppressed[row_idx, col_idx] = over_threshold
+    return suppressed
+
+
 def nms_gpu(
     bboxes: cp.ndarray, confidences: cp.ndarray, threshold: float, top_k: int = 300
 ) -> cp.ndarray:
@@ -1,8 +1,11 @@
 """Sink factories."""
 
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, replace
-from typing import Any, Callable, Dict, List, Optional, Union
+from enum import Enum
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from savant_rs.primitives import EndOfStream, VideoFrame, VideoFrameContent
 from savant_rs.utils import PropagatedContext
@@ -17,6 +20,7 @@ from savant.api.enums import ExternalFrameType
 from savant.api.parser import convert_ts
 from savant.base.pyfunc import PyFunc
 from savant.config.schema import SinkElement
+from savant.metrics import get_or_create_counter, get_or_create_gauge
 from savant.utils.log import get_logger
 
 from .registry import Registry
@@ -120,26 +124,251 @@ class SinkFactory(ABC):
         """Sink factory method."""
 
 
+class SinkOverflowPolicy(Enum):
+    """What to do with a video frame when the sink queue is full."""
+
+    BLOCK = 'block'
+    """Wait for the space in the queue."""
+
+    DROP_OLDEST = 'drop_oldest'
+    """Drop the oldest video frame in the queue."""
+
+    DROP_NEWEST = 'drop_newest'
+    """Drop the frame."""
+
+
+@dataclass(frozen=True)
+class SinkQueueConfig:
+    """Configuration of the sink queue.
+
+    :param size: size of the queue, 0 means the sink is called synchronously.
+    :param overflow_policy: what to do with a video frame when the queue is full.
+    """
+
+    size: int
+    overflow_policy: SinkOverflowPolicy = SinkOverflowPolicy.BLOCK
+
+
+class SinkQueue:
+    """Bounded queue of messages for a sink.
+
+    Only video frames are dropped on overflow, EOS messages always wait for
+    the space in the queue.
+
+    :param config: queue configuration.
+    """
+
+    def __init__(self, config: SinkQueueConfig):
+        self._maxsize = config.size
+        self._overflow_policy = config.overflow_policy
+        self._items = deque()
+        self._condition = Condition()
+        self._closed = False
+
+    def put(self, msg: SinkMessage, kwargs: Dict[str, Any]) -> int:
+        """Put a message to the queue.
+
+        :return: number of dropped video frames.
+        """
+
+        with self._condition:
+            if self._closed:
+                return 0
+            dropped = 0
+            if len(self._items) >= self._maxsize and isinstance(msg, SinkVideoFrame):
+                if self._overflow_policy == SinkOverflowPolicy.DROP_NEWEST:
+                    return 1
+                if self._overflow_policy == SinkOverflowPolicy.DROP_OLDEST:
+                    dropped = self._drop_oldest_frame()
+            while len(self._items) >= self._maxsize and not self._closed:
+                self._condition.wait()
+            if not self._closed:
+                self._items.append((msg, kwargs))
+                self._condition.notify_all()
+            return dropped
+
+    def get(self) -> Optional[Tuple[SinkMessage, Dict[str, Any]]]:
+        """Get a message from the queue.
+
+        :return: message and its kwargs, None when the queue is closed and empty.
+        """
+
+        with self._condition:
+            while not self._items and not self._closed:
+                self._condition.wait()
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+
+    def close(self, discard: bool = False):
+        """Close the queue. Messages already in the queue are still returned
+        unless discarded, putting new messages does nothing.
+        """
+
+        with self._condition:
+            self._closed = True
+            if discard:
+                self._items.clear()
+            self._condition.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _drop_oldest_frame(self) -> int:
+        for i, (msg, _) in enumerate(self._items):
+            if isinstance(msg, SinkVideoFrame):
+                del self._items[i]
+                return 1
+        return 0
+
+
+class AsyncSink:
+    """Sends messages to a sink from a dedicated thread through a bounded queue.
+
+    Messages are sent in the order they were put to the queue, so the order
+    of messages of each source is kept.
+
+    :param name: sink name.
+    :param sink: sink callable.
+    :param config: queue configuration.
+    """
+
+    def __init__(self, name: str, sink: SinkCallable, config: SinkQueueConfig):
+        self.name = name
+        self.sent = 0
+        self.dropped = 0
+        self.error: Optional[Exception] = None
+        self._sink = sink
+        self._queue = SinkQueue(config)
+        self._sent_counter = get_or_create_counter(
+            'sink_messages',
+            'Number of messages sent to the sink',
+            ['sink'],
+        )
+        self._dropped_counter = get_or_create_counter(
+            'sink_dropped_frames',
+            'Number of video frames dropped on the sink queue overflow',
+            ['sink'],
+        )
+        self._queue_length_gauge = get_or_create_gauge(
+            'sink_queue_length',
+            'Number of messages in the sink queue',
+            ['sink'],
+        )
+        self._thread = Thread(target=self._run, name=f'sink-{name}', daemon=True)
+        self._thread.start()
+
+    def __call__(self, msg: SinkMessage, **kwargs):
+        self._check_error()
+        dropped = self._queue.put(msg, kwargs)
+        if dropped:
+            logger.debug(
+                'Sink "%s" queue is full, dropped %s frame(s).', self.name, dropped
+            )
+            self.dropped += dropped
+            self._dropped_counter.inc(dropped, label_values=[self.name])
+        self._queue_length_gauge.set(len(self._queue), label_values=[self.name])
+        self._check_error()
+
+    def close(self):
+        """Send the remaining messages and stop the sink thread."""
+
+        self._queue.close()
+        self._thread.join()
+        logger.info(
+            'Sink "%s" sent %s messages, dropped %s frames.',
+            self.name,
+            self.sent,
+            self.dropped,
+        )
+        self._check_error()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            msg, kwargs = item
+            try:
+                self._sink(msg, **kwargs)
+            except Exception as exc:
+                self.error = exc
+                self._queue.close(discard=True)
+                break
+            self.sent += 1
+            self._sent_counter.inc(1, label_values=[self.name])
+
+    def _check_error(self):
+        if self.error is not None:
+            raise RuntimeError(
+                f'Failed to send message to sink "{self.name}": {self.error}'
+            ) from self.error
+
+
 class MultiSinkFactory(SinkFactory):
     """Multiple sink combination, message is sent to each one.
 
+    Sinks with a queue send messages from dedicated threads, so a slow sink
+    doesn't delay the others.
+
     :param factories: sink factories.
+    :param queue_configs: queue configurations of the sinks,
+        all sinks are called synchronously when not set.
     """
 
-    def __init__(self, *factories: SinkFactory):
+    def __init__(
+        self,
+        *factories: SinkFactory,
+        queue_configs: Optional[List[SinkQueueConfig]] = None,
+    ):
         self.factories = factories
+        if queue_configs is None:
+            queue_configs = [SinkQueueConfig(0)] * len(factories)
+        self.queue_configs = queue_configs
 
-    def get_sink(self) -> SinkCallable:
-        sinks = [x.get_sink() for x in self.factories]
+    def get_sink(self) -> 'MultiSink':
+        sinks = []
+        for factory, queue_config in zip(self.factories, self.queue_configs):
+            sink = factory.get_sink()
+            if queue_config.size > 0 and len(self.factories) > 1:
+                sink = AsyncSink(factory.name, sink, queue_config)
+            sinks.append(sink)
 
-        def send_message(
-            msg: SinkMessage,
-            **kwargs,
-        ):
-            for sink in sinks:
-                sink(msg, **kwargs)
+        return MultiSink(sinks)
 
-        return send_message
+
+class MultiSink:
+    """Sends messages to each sink.
+
+    :param sinks: sinks.
+    """
+
+    def __init__(self, sinks: List[Union[SinkCallable, AsyncSink]]):
+        self._sinks = sinks
+
+    def __call__(self, msg: SinkMessage, **kwargs):
+        for sink in self._sinks:
+            sink(msg, **kwargs)
+
+    def close(self):
+        """Send the remaining messages to the sinks with a queue.
+
+        All the sinks are closed even if some of them failed,
+        the first error is raised after that.
+        """
+
+        error = None
+        for sink in self._sinks:
+            if isinstance(sink, AsyncSink):
+                try:
+                    sink.close()
+                except Exception as exc:
+                    if error is None:
+                        error = exc
+        if error is not None:
+            raise error
 
 
 SINK_REGISTRY = Registry('sink')
@@ -199,6 +428,9 @@ class ZeroMQSinkFactory(SinkFactory):
                         msg.source_id,
                         frame_pts,
                     )
+                    # the frame is shared with the other sinks running
+                    # in their own threads, so it is not modified in place
+                    video_frame = msg.video_frame.copy()
 
                     if msg.frame:
                         logger.debug(
@@ -207,7 +439,7 @@ class ZeroMQSinkFactory(SinkFactory):
                             frame_pts,
                             len(msg.frame),
                         )
-                        msg.video_frame.content = VideoFrameContent.external(
+                        video_frame.content = VideoFrameContent.external(
                             ExternalFrameType.ZEROMQ.value, None
                         )
                     else:
@@ -216,9 +448,9 @@ class ZeroMQSinkFactory(SinkFactory):
                             msg.source_id,
                             frame_pts,
                         )
-                        msg.video_frame.content = VideoFrameContent.none()
+                        video_frame.content = VideoFrameContent.none()
 
-                    message = msg.video_frame.to_message()
+                    message = video_frame.to_message()
                     if msg.span_context is not None:
                         message.span_context = msg.span_context
                     send_result = writer.send_message(
@@ -352,7 +584,9 @@ class DevNullSinkFactory(SinkFactory):
         return send_message
 
 
-def sink_factory(sink: Union[SinkElement, List[SinkElement]]) -> SinkCallable:
+def sink_factory(
+    sink: Union[SinkElement, List[SinkElement]]
+) -> Union[SinkCallable, MultiSink]:
     """Init sink from config."""
     if isinstance(sink, SinkElement):
         return SINK_REGISTRY.get(sink.element.lower())(
@@ -360,10 +594,14 @@ def sink_factory(sink: Union[SinkElement, List[SinkElement]]) -> SinkCallable:
         ).get_sink
 
     sink_factories = []
+    queue_configs = []
     for _sink in sink:
         sink_factories.append(
             SINK_REGISTRY.get(_sink.element.lower())(
                 _sink.full_name, _sink.egress_frame_filter, **_sink.properties
             )
         )
-    return MultiSinkFactory(*sink_factories).get_sink()
+        queue_configs.append(
+            SinkQueueConfig(_sink.queue_size, SinkOverflowPolicy(_sink.overflow_policy))
+        )
+    return MultiSinkFactory(*sink_factories, queue_configs=queue_configs).get_sink()
@@ -1,14 +1,15 @@
 """ZeroMQ utilities."""
 
 import asyncio
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
 from enum import Enum
-from typing import List, NamedTuple, Optional, Union
+from typing import Deque, List, NamedTuple, Optional, Union
 
 from savant_rs.utils.serialization import Message
 from savant_rs.zmq import (
     BlockingReader,
-    NonBlockingReader,
     ReaderConfig,
     ReaderConfigBuilder,
     ReaderResultBlacklisted,
@@ -57,6 +58,11 @@ class Defaults:
     RECEIVE_RETRIES = 3
     BLACKLIST_SIZE = 1024
     BLACKLIST_TTL = 10
+    RECEIVE_PREFETCH = 10
+
+
+# interval to check the receiver thread is stopped while the prefetch is full, seconds
+PREFETCH_WAIT_TIMEOUT = 0.1
 
 
 class BaseZeroMQSource(ABC):
@@ -69,7 +75,7 @@ class BaseZeroMQSource(ABC):
     :param source_id_prefix: filter inbound messages by topic prefix
     """
 
-    receiver: Union[BlockingReader, NonBlockingReader]
+    reader: BlockingReader
 
     def __init__(
         self,
@@ -129,7 +135,7 @@ class BaseZeroMQSource(ABC):
             return ZeroMQMessage(
                 result.topic,
                 result.message,
-                b''.join(result.data(i) for i in range(result.data_len())),
+                get_message_content(result),
             )
         elif isinstance(result, ReaderResultTimeout):
             logger.debug('Timeout exceeded when receiving the next frame')
@@ -183,16 +189,52 @@ class ZeroMQSource(BaseZeroMQSource):
         return BlockingReader(config)
 
 
+def _wake_up(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
 class AsyncZeroMQSource(ZeroMQSource):
-    """Async ZeroMQ Source class."""
+    """Async ZeroMQ Source class.
 
-    reader: NonBlockingReader
+    Messages are received in a dedicated thread and passed to the event loop
+    as soon as they arrive.
 
-    def _create_zmq_reader(self, config: ReaderConfig):
-        return NonBlockingReader(config, 10)  # TODO: make configurable
+    :param prefetch: maximum number of messages received in advance
+    """
 
-    async def _try_receive(self, loop):
-        return await loop.run_in_executor(None, self.reader.try_receive)
+    reader: BlockingReader
+
+    def __init__(
+        self,
+        socket: str,
+        receive_timeout: int = Defaults.RECEIVE_TIMEOUT,
+        receive_hwm: int = Defaults.RECEIVE_HWM,
+        source_id: Optional[str] = None,
+        source_id_prefix: Optional[str] = None,
+        set_ipc_socket_permissions: Optional[int] = 0o777,
+        blacklist_size: int = Defaults.BLACKLIST_SIZE,
+        blacklist_ttl: int = Defaults.BLACKLIST_TTL,
+        prefetch: int = Defaults.RECEIVE_PREFETCH,
+    ):
+        super().__init__(
+            socket=socket,
+            receive_timeout=receive_timeout,
+            receive_hwm=receive_hwm,
+            source_id=source_id,
+            source_id_prefix=source_id_prefix,
+            set_ipc_socket_permissions=set_ipc_socket_permissions,
+            blacklist_size=blacklist_size,
+            blacklist_ttl=blacklist_ttl,
+        )
+        self._prefetch_slots = threading.Semaphore(prefetch)
+        self._receiver_thread: Optional[threading.Thread] = None
+        self._receiver_running = False
+        # received results are not bound to an event loop, so the source
+        # can be used from different loops without losing prefetched messages
+        self._results: Deque[Union[ReaderResultMessage, Exception]] = deque()
+        self._results_lock = threading.Lock()
+        self._waiter: Optional[asyncio.Future] = None
 
     async def next_message(self) -> Optional[ZeroMQMessage]:
         """Try to receive next message."""
@@ -200,14 +242,90 @@ class AsyncZeroMQSource(ZeroMQSource):
         if not self.reader.is_started():
             raise RuntimeError('ZeroMQ source is not started.')
 
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, self.reader.try_receive)
-        while result is None:
-            await asyncio.sleep(0.01)  # TODO: make configurable
-            result = await loop.run_in_executor(None, self.reader.try_receive)
+        if self._receiver_thread is None:
+            self._start_receiver()
+
+        result = await self._next_result()
+        self._prefetch_slots.release()
+        if isinstance(result, Exception):
+            # the receiver thread stops on errors, the next call restarts it
+            await self._stop_receiver_async()
+            raise result
 
         return self._build_result(result)
 
+    async def _next_result(self) -> Union[ReaderResultMessage, Exception]:
+        """Wait for the next result received by the receiver thread."""
+
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._results_lock:
+                if self._results:
+                    return self._results.popleft()
+                waiter = self._waiter = loop.create_future()
+            try:
+                await waiter
+            finally:
+                with self._results_lock:
+                    self._waiter = None
+
+    def _start_receiver(self):
+        self._receiver_running = True
+        self._receiver_thread = threading.Thread(
+            target=self._receive_messages,
+            name='AsyncZeroMQSource',
+            daemon=True,
+        )
+        self._receiver_thread.start()
+
+    def _receive_messages(self):
+        """Receive messages from the socket and wake up the waiting coroutine.
+
+        Runs in the receiver thread. Receive timeout of the reader limits
+        the time to notice the source is terminated.
+        """
+
+        logger.debug('ZeroMQ receiver thread started.')
+        while self._receiver_running:
+            if not self._prefetch_slots.acquire(timeout=PREFETCH_WAIT_TIMEOUT):
+                continue
+            try:
+                result = self.reader.receive()
+            except Exception as e:
+                logger.error('Failed to receive message: %s', e)
+                result = e
+                self._receiver_running = False
+            with self._results_lock:
+                self._results.append(result)
+                waiter = self._waiter
+            if waiter is not None:
+                try:
+                    waiter.get_loop().call_soon_threadsafe(_wake_up, waiter)
+                except RuntimeError:
+                    # the result is kept for the next call
+                    logger.debug('Event loop of the waiting coroutine is closed.')
+        logger.debug('ZeroMQ receiver thread stopped.')
+
+    def _stop_receiver(self):
+        self._receiver_running = False
+        if self._receiver_thread is not None:
+            self._receiver_thread.join()
+            self._receiver_thread = None
+
+    async def _stop_receiver_async(self):
+        """Stop the receiver thread without blocking the event loop."""
+
+        self._receiver_running = False
+        thread, self._receiver_thread = self._receiver_thread, None
+        if thread is not None:
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+    def terminate(self):
+        """Stop receiving messages, finish and free zmq socket."""
+        self._stop_receiver()
+        self._results.clear()
+        super().terminate()
+
     def __aiter__(self):
         return self
 
@@ -216,10 +334,25 @@ class AsyncZeroMQSource(ZeroMQSource):
         while self.reader.is_started() and message is None:
             message = await self.next_message()
         if message is None:
-            raise StopIteration
+            raise StopAsyncIteration
         return message
 
 
+def get_message_content(result: ReaderResultMessage) -> bytes:
+    """Get content of the received message.
+
+    Frame payloads are usually sent in a single part, in that case the part
+    is returned as is without copying it. Multiple parts are joined.
+    """
+
+    data_len = result.data_len()
+    if data_len == 0:
+        return b''
+    if data_len == 1:
+        return result.data(0)
+    return b''.join(result.data(i) for i in range(data_len))
+
+
 def get_zmq_socket_uri_options(uri: str) -> Optional[str]:
     socket_options, _ = socket_uri_pattern.fullmatch(uri).groups()
     return socket_options
@@ -76,6 +76,21 @@ def build_common_bridge_envs(
     ),
     show_default=True,
 )
+@click.option(
+    '--batch-max-size',
+    default=1,
+    help='Maximum number of frames pushed to and popped from the buffer at once.',
+    show_default=True,
+)
+@click.option(
+    '--batch-max-linger',
+    default=0.01,
+    help=(
+        'Maximum time a frame waits in a batch before the batch '
+        'is pushed to the buffer, in seconds.'
+    ),
+    show_default=True,
+)
 @click.option(
     '--stats-log-interval',
     default=60,
@@ -119,6 +134,8 @@ def buffer_bridge(
     buffer_service_messages: int,
     buffer_threshold_percentage: int,
     idle_polling_period: float,
+    batch_max_size: int,
+    batch_max_linger: float,
     stats_log_interval: int,
     metrics_frame_period: int,
     metrics_time_period: Optional[float],
@@ -148,6 +165,8 @@ def buffer_bridge(
         f'BUFFER_SERVICE_MESSAGES={buffer_service_messages}',
         f'BUFFER_THRESHOLD_PERCENTAGE={buffer_threshold_percentage}',
         f'IDLE_POLLING_PERIOD={idle_polling_period}',
+        f'BATCH_MAX_SIZE={batch_max_size}',
+        f'BATCH_MAX_LINGER={batch_max_linger}',
         f'STATS_LOG_INTERVAL={stats_log_interval}',
         f'METRICS_FRAME_PERIOD={metrics_frame_period}',
         f'METRICS_HISTORY={metrics_history}',
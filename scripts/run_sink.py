@@ -213,6 +213,40 @@ def display_sink(
 @cli.command('meta-json')
 @skip_frames_without_objects_option
 @chunk_size_option(0)
+@click.option(
+    '--buffer-size',
+    type=click.INT,
+    default=1024 * 1024,
+    help='Size of the write buffer in bytes.',
+    show_default=True,
+)
+@click.option(
+    '--compression',
+    type=click.Choice(['none', 'gzip', 'zstd']),
+    default='none',
+    help='Compression of the metadata files.',
+    show_default=True,
+)
+@click.option(
+    '--rotate-size',
+    type=click.INT,
+    default=0,
+    help='Start a new file after writing this number of bytes (0 - no limit).',
+    show_default=True,
+)
+@click.option(
+    '--rotate-interval',
+    type=click.FLOAT,
+    default=0,
+    help='Start a new file after this number of seconds (0 - no limit).',
+    show_default=True,
+)
+@click.option(
+    '--background-writing',
+    is_flag=True,
+    default=False,
+    help='Encode and write metadata in a background thread.',
+)
 @common_options
 @source_id_option(required=False)
 @source_id_prefix_option
@@ -223,6 +257,11 @@ def meta_json_sink(
     docker_image: str,
     skip_frames_without_objects: bool,
     chunk_size: int,
+    buffer_size: int,
+    compression: str,
+    rotate_size: int,
+    rotate_interval: float,
+    background_writing: bool,
     location: str,
     source_id: Optional[str],
     source_id_prefix: Optional[str],
@@ -245,6 +284,11 @@ def meta_json_sink(
         f'LOCATION={location}',
         f'SKIP_FRAMES_WITHOUT_OBJECTS={skip_frames_without_objects}',
         f'CHUNK_SIZE={chunk_size}',
+        f'BUFFER_SIZE={buffer_size}',
+        f'COMPRESSION={compression}',
+        f'ROTATE_SIZE={rotate_size}',
+        f'ROTATE_INTERVAL={rotate_interval}',
+        f'BACKGROUND_WRITING={background_writing}',
     ]
 
     cmd = build_docker_run_command(
@@ -261,6 +305,26 @@ def meta_json_sink(
 @cli.command('image-files')
 @skip_frames_without_objects_option
 @chunk_size_option()
+@click.option(
+    '--write-workers',
+    type=click.INT,
+    default=0,
+    help='Number of threads writing images in background. 0 - write synchronously.',
+    show_default=True,
+)
+@click.option(
+    '--fsync-policy',
+    type=click.Choice(['none', 'chunk', 'file']),
+    default='none',
+    help='When written images are synced to the storage.',
+    show_default=True,
+)
+@click.option(
+    '--tar-output',
+    is_flag=True,
+    default=False,
+    help='Write images of each chunk to a tar archive.',
+)
 @common_options
 @source_id_option(required=False)
 @source_id_prefix_option
@@ -271,6 +335,9 @@ def image_files_sink(
     docker_image: str,
     skip_frames_without_objects: bool,
     chunk_size: int,
+    write_workers: int,
+    fsync_policy: str,
+    tar_output: bool,
     location: str,
     source_id: Optional[str],
     source_id_prefix: Optional[str],
@@ -291,6 +358,9 @@ def image_files_sink(
         f'DIR_LOCATION={location}',
         f'SKIP_FRAMES_WITHOUT_OBJECTS={skip_frames_without_objects}',
         f'CHUNK_SIZE={chunk_size}',
+        f'WRITE_WORKERS={write_workers}',
+        f'FSYNC_POLICY={fsync_policy}',
+        f'TAR_OUTPUT={tar_output}',
     ]
 
     cmd = build_docker_run_command(
@@ -733,6 +803,27 @@ def always_on_rtsp_sink(
     help='Maximum amount of messages in the queue.',
     show_default=True,
 )
+@click.option(
+    '--batch-size',
+    type=click.INT,
+    default=1,
+    help='Maximum amount of messages stored to Redis and sent to Kafka at once.',
+    show_default=True,
+)
+@click.option(
+    '--batch-max-linger',
+    type=click.FLOAT,
+    default=0.01,
+    help='Maximum time to wait for a batch to fill, in seconds.',
+    show_default=True,
+)
+@click.option(
+    '--processor-workers',
+    type=click.INT,
+    default=1,
+    help='Number of batches processed concurrently.',
+    show_default=True,
+)
 @adapter_docker_image_option('py')
 def kafka_redis_sink(
     in_endpoint: str,
@@ -754,6 +845,9 @@ def kafka_redis_sink(
     redis_key_prefix: str,
     redis_ttl_seconds: int,
     queue_size: int,
+    batch_size: int,
+    batch_max_linger: float,
+    processor_workers: int,
 ):
     """Sends video stream metadata to Kafka and frame content to Redis.
 
@@ -781,6 +875,9 @@ def kafka_redis_sink(
         f'REDIS_KEY_PREFIX={redis_key_prefix}',
         f'REDIS_TTL_SECONDS={redis_ttl_seconds}',
         f'QUEUE_SIZE={queue_size}',
+        f'BATCH_SIZE={batch_size}',
+        f'BATCH_MAX_LINGER={batch_max_linger}',
+        f'PROCESSOR_WORKERS={processor_workers}',
     ]
     cmd = build_docker_run_command(
         f'sink-kafka-redis-{uuid.uuid4().hex}',
@@ -2,7 +2,7 @@
 """Run source adapter."""
 import os
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import click
 from common import (
@@ -880,6 +880,27 @@ def ffmpeg_source(
     help='Maximum amount of messages in the queue.',
     show_default=True,
 )
+@click.option(
+    '--batch-size',
+    type=click.INT,
+    default=1,
+    help='Maximum amount of messages processed at once.',
+    show_default=True,
+)
+@click.option(
+    '--batch-max-linger',
+    type=click.FLOAT,
+    default=0.01,
+    help='Maximum time to wait for a batch to fill, in seconds.',
+    show_default=True,
+)
+@click.option(
+    '--processor-workers',
+    type=click.INT,
+    default=1,
+    help='Number of batches processed concurrently.',
+    show_default=True,
+)
 @adapter_docker_image_option('py')
 def kafka_redis_source(
     out_endpoint: str,
@@ -900,6 +921,9 @@ def kafka_redis_source(
     create_topic_replication_factor: int,
     create_topic_config: str,
     queue_size: int,
+    batch_size: int,
+    batch_max_linger: float,
+    processor_workers: int,
 ):
     """Takes video stream metadata from Kafka and fetches frame content from Redis.
 
@@ -926,6 +950,9 @@ def kafka_redis_source(
         f'KAFKA_CREATE_TOPIC_REPLICATION_FACTOR={create_topic_replication_factor}',
         f'KAFKA_CREATE_TOPIC_CONFIG={create_topic_config}',
         f'QUEUE_SIZE={queue_size}',
+        f'BATCH_SIZE={batch_size}',
+        f'BATCH_MAX_LINGER={batch_max_linger}',
+        f'PROCESSOR_WORKERS={processor_workers}',
     ]
     cmd = build_docker_run_command(
         f'source-kafka-redis-{uuid.uuid4().hex}',
@@ -942,7 +969,8 @@ def kafka_redis_source(
 @click.option(
     '--playlist',
     required=True,
-    help='Path to the playlist file.',
+    multiple=True,
+    help='Path to the playlist file. Several playlists are played concurrently.',
 )
 @click.option(
     '--dump-files-dir',
@@ -961,9 +989,57 @@ def kafka_redis_source(
     default=False,
     help='Send frames from source synchronously (i.e. at the source file rate).',
 )
+@click.option(
+    '--start-timestamp',
+    type=click.FLOAT,
+    help='Play messages dumped at or after the timestamp (UNIX time in seconds).',
+)
+@click.option(
+    '--end-timestamp',
+    type=click.FLOAT,
+    help='Play messages dumped at or before the timestamp (UNIX time in seconds).',
+)
+@click.option(
+    '--source-ids',
+    help='Comma-separated list of source IDs to play.',
+)
+@click.option(
+    '--speed-factor',
+    type=click.FLOAT,
+    default=1.0,
+    help='Speed factor of the synchronous playing.',
+    show_default=True,
+)
+@click.option(
+    '--target-fps',
+    type=click.FLOAT,
+    help='Send messages from each playlist at the fixed rate.',
+)
+@click.option(
+    '--clones',
+    type=click.INT,
+    default=1,
+    help='Number of streams to send from each source in the dump.',
+    show_default=True,
+)
+@click.option(
+    '--source-id-template',
+    help='Template of the source ID of the cloned streams.',
+)
 @adapter_docker_image_option('py')
 def message_dump_player_source(
-    out_endpoint: str, docker_image: str, playlist: str, dump_files_dir: str, sync: bool
+    out_endpoint: str,
+    docker_image: str,
+    playlist: Tuple[str, ...],
+    dump_files_dir: str,
+    sync: bool,
+    start_timestamp: Optional[float],
+    end_timestamp: Optional[float],
+    source_ids: Optional[str],
+    speed_factor: float,
+    target_fps: Optional[float],
+    clones: int,
+    source_id_template: Optional[str],
 ):
     """Plays video dumps sequentially from a playlist file and sends them to a module."""
 
@@ -974,13 +1050,26 @@ def message_dump_player_source(
         fps_output=None,
         zmq_endpoint=out_endpoint,
     ) + [
-        f'PLAYLIST_PATH={playlist}',
+        f'PLAYLIST_PATH={",".join(playlist)}',
         f'SYNC_OUTPUT={sync}',
+        f'SPEED_FACTOR={speed_factor}',
+        f'CLONES={clones}',
     ]
+    if start_timestamp is not None:
+        envs.append(f'START_TIMESTAMP={start_timestamp}')
+    if end_timestamp is not None:
+        envs.append(f'END_TIMESTAMP={end_timestamp}')
+    if source_ids:
+        envs.append(f'SOURCE_IDS={source_ids}')
+    if target_fps is not None:
+        envs.append(f'TARGET_FPS={target_fps}')
+    if source_id_template:
+        envs.append(f'SOURCE_ID_TEMPLATE={source_id_template}')
     cmd = build_docker_run_command(
         f'source-message-dump-player-{uuid.uuid4().hex}',
         zmq_endpoints=[out_endpoint],
-        volumes=[f'{playlist}:{playlist}:ro', f'{dump_files_dir}:{dump_files_dir}'],
+        volumes=[f'{x}:{x}:ro' for x in playlist]
+        + [f'{dump_files_dir}:{dump_files_dir}'],
         entrypoint='python',
         args=['-m', 'adapters.python.sources.message_dump_player'],
         envs=envs,
@@ -1,78 +1,61 @@
-from unittest import mock
-from unittest.mock import AsyncMock, MagicMock, call
+import asyncio
 
 import pytest
-from aiohttp import ClientResponse
-from watchdog.buffer_metrics import get_metrics, parse_metrics
+from aiohttp import ClientSession, web
+from watchdog.buffer_metrics import BufferMetricsScraper, parse_metric_lines
 
 
-@pytest.mark.asyncio
-@mock.patch('aiohttp.ClientSession', new_callable=MagicMock)
-async def test_get_metrics(session_mock: MagicMock):
-    session = session_mock()
-    response_mock = MagicMock(ClientResponse)
-    response = response_mock()
-
-    session_in_with = session.__aenter__.return_value
-    session_in_with.get = response_mock
-    response_in_with: AsyncMock = response.__aenter__.return_value
-    response_in_with.text = AsyncMock(return_value='content')
-
-    result = await get_metrics('localhost:8080')
-
-    assert result == 'content'
-    assert response_mock.call_count == 2
-    assert response_mock.call_args_list[0] == call()  # initial call in test itself
-    assert response_mock.call_args_list[1] == call('http://localhost:8080/metrics')
-
-
-@pytest.mark.asyncio
-async def test_get_metrics_session_exception():
-    with mock.patch('aiohttp.ClientSession', side_effect=RuntimeError('error')):
-        with pytest.raises(RuntimeError, match='error'):
-            await get_metrics('localhost:8080')
+def test_parse_metric_lines():
+    content = '''
+        # HELP buffer_size Number of messages in the buffer
+        # TYPE buffer_size gauge
+        buffer_size{adapter="buffer",path="/tmp/a b}"} 18.0
+        buffer_size_bytes 1024.0
+        last_sent_message 1720441634.5 1720441634544
+        '''
 
+    result = parse_metric_lines(
+        content.splitlines(), ['buffer_size', 'last_sent_message', 'unknown']
+    )
 
-@pytest.mark.asyncio
-@mock.patch('aiohttp.ClientSession', new_callable=MagicMock)
-async def test_get_metrics_response_exception(session_mock):
-    with pytest.raises(RuntimeError, match='error'):
-        session = session_mock()
-        response_mock = MagicMock(ClientResponse, side_effect=RuntimeError('error'))
-
-        session_in_with = session.__aenter__.return_value
-        session_in_with.get = response_mock
-
-        await get_metrics('localhost:8080')
-
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    'content, expected',
-    [
-        (
-            '''
-            # HELP received_messages_total Number of messages received by the adapter
-            # TYPE received_messages_total counter
-            received_messages_total{adapter="buffer"} 120.0
-            # HELP pushed_messages_total Number of messages pushed to the buffer
-            # TYPE pushed_messages_total counter
-            pushed_messages_total{adapter="buffer"} 34.0 1720441634544
-            ''',
-            {'received_messages_total': 120.0, 'pushed_messages_total': 34.0},
-        ),
-    ],
-)
-async def test_parse_metrics(content, expected):
-    result = await parse_metrics(content)
-
-    assert result == expected
+    assert result == {'buffer_size': 18.0, 'last_sent_message': 1720441634.5}
 
 
 @pytest.mark.asyncio
-async def test_parse_metrics_invalid_content_type():
-    with pytest.raises(
-        TypeError,
-        match='initial_value must be str or None, not int',
-    ):
-        await parse_metrics(123)  # type: ignore
+async def test_scraper_shares_scrape():
+    requests = []
+
+    async def handle_metrics(request):
+        requests.append(request)
+        return web.Response(
+            text=(
+                '# TYPE buffer_size gauge\n'
+                'buffer_size{adapter="buffer"} 5.0\n'
+                'last_sent_message 100.0 1720441634544\n'
+                'other 1.0\n'
+            )
+        )
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        async with ClientSession() as session:
+            scraper = BufferMetricsScraper(
+                f'127.0.0.1:{port}', ['buffer_size', 'last_sent_message'], 60, session
+            )
+            results = await asyncio.gather(*[scraper.get() for _ in range(3)])
+            assert len(requests) == 1
+
+            scraper.ttl = 0
+            await scraper.get()
+            assert len(requests) == 2
+    finally:
+        await runner.cleanup()
+
+    assert results == [{'buffer_size': 5.0, 'last_sent_message': 100.0}] * 3
@@ -1,19 +1,90 @@
-from typing import Dict
+import asyncio
+import time
+from typing import Collection, Dict, Iterable, Optional, Tuple
 
 import aiohttp
-from prometheus_client.parser import text_string_to_metric_families
 
 
-async def get_metrics(buffer_url: str) -> str:
-    async with aiohttp.ClientSession() as session:
-        async with session.get(f'http://{buffer_url}/metrics') as response:
-            content = await response.text()
-            return content
+def parse_metric_lines(
+    lines: Iterable[str], names: Collection[str]
+) -> Dict[str, float]:
+    """Extract values of the metrics with the specified names from lines
+    in the Prometheus text format.
 
+    Only lines of the requested metrics are parsed, the rest are skipped
+    without parsing. When a metric has several samples, the last one is taken.
+    """
 
-async def parse_metrics(content: str) -> Dict[str, float]:
+    names = frozenset(names)
     metrics = {}
-    for family in text_string_to_metric_families(content):
-        for sample in family.samples:
-            metrics[sample[0]] = float(sample[2])
+    for line in lines:
+        parsed = _parse_sample_line(line, names)
+        if parsed is not None:
+            metrics[parsed[0]] = parsed[1]
     return metrics
+
+
+def _parse_sample_line(line: str, names: frozenset) -> Optional[Tuple[str, float]]:
+    line = line.strip()
+    if not line or line[0] == '#':
+        return None
+
+    name_end = len(line)
+    for sep in ('{', ' '):
+        pos = line.find(sep, 0, name_end)
+        if pos != -1:
+            name_end = pos
+    name = line[:name_end]
+    if name not in names:
+        return None
+
+    rest = line[name_end:]
+    if rest.startswith('{'):
+        rest = rest[rest.rfind('}') + 1 :]
+    value = rest.split(None, 1)[0]
+    return name, float(value)
+
+
+class BufferMetricsScraper:
+    """Scrapes metrics of a buffer for several watchers.
+
+    The buffer is scraped at most once per ``ttl`` seconds, concurrent
+    requests wait for the same scrape. Only the specified metrics are
+    extracted from the response (see :py:func:`parse_metric_lines`).
+
+    :param buffer_url: Buffer url to retrieve metrics.
+    :param names: Names of the metrics to extract.
+    :param ttl: Time in seconds the scraped metrics are reused.
+    :param session: HTTP session reused between scrapes.
+    """
+
+    def __init__(
+        self,
+        buffer_url: str,
+        names: Collection[str],
+        ttl: float,
+        session: aiohttp.ClientSession,
+    ):
+        self.buffer_url = buffer_url
+        self.names = frozenset(names)
+        self.ttl = ttl
+        self._session = session
+        self._url = f'http://{buffer_url}/metrics'
+        self._lock = asyncio.Lock()
+        self._metrics: Optional[Dict[str, float]] = None
+        self._scraped_at = 0.0
+
+    async def get(self) -> Dict[str, float]:
+        """Get the metrics, scrapes the buffer when the cached ones expired."""
+
+        async with self._lock:
+            if self._metrics is None or time.monotonic() - self._scraped_at >= self.ttl:
+                self._metrics = await self._scrape()
+                self._scraped_at = time.monotonic()
+            return self._metrics
+
+    async def _scrape(self) -> Dict[str, float]:
+        async with self._session.get(self._url) as response:
+            response.raise_for_status()
+            lines = [line.decode() async for line in response.content]
+        return parse_metric_lines(lines, self.names)
@@ -7,10 +7,11 @@ import time
 from typing import List
 
 import aiodocker
+import aiohttp
 from aiodocker import DockerError
 from aiodocker.containers import DockerContainer
 
-from .buffer_metrics import get_metrics, parse_metrics
+from .buffer_metrics import BufferMetricsScraper
 from .config.parser import Config, ConfigParser
 from .config.schema import Action, FlowConfig, QueueConfig, WatchConfig
 from .config.validator import validate
@@ -95,18 +96,21 @@ async def process_action(
         raise RuntimeError(f'Unknown action: {action}')
 
 
-async def watch_queue(docker_client: DockerClient, buffer: str, config: QueueConfig):
+async def watch_queue(
+    docker_client: DockerClient, scraper: BufferMetricsScraper, config: QueueConfig
+):
     await asyncio.sleep(config.polling_interval)
 
     while True:
-        content = await get_metrics(buffer)
-        metrics = await parse_metrics(content)
+        metrics = await scraper.get()
 
         buffer_size = metrics[BUFFER_SIZE_METRIC]
 
         if buffer_size > config.length:
             logger.debug(
-                'Buffer %s is full, processing action %s', buffer, config.action
+                'Buffer %s is full, processing action %s',
+                scraper.buffer_url,
+                config.action,
             )
             await process_action(docker_client, config.action, config.container_labels)
             await asyncio.sleep(config.cooldown)
@@ -114,19 +118,22 @@ async def watch_queue(docker_client: DockerClient, buffer: str, config: QueueCon
             await asyncio.sleep(config.polling_interval)
 
 
-async def watch_egress(docker_client: DockerClient, buffer: str, config: FlowConfig):
+async def watch_egress(
+    docker_client: DockerClient, scraper: BufferMetricsScraper, config: FlowConfig
+):
     await asyncio.sleep(config.polling_interval)
 
     while True:
-        content = await get_metrics(buffer)
-        metrics = await parse_metrics(content)
+        metrics = await scraper.get()
 
         last_sent_message = metrics[LAST_SENT_MESSAGE_METRIC]
         now = time.time()
 
         if now - last_sent_message > config.idle:
             logger.debug(
-                'Egress flow %s is idle, processing action %s', buffer, config.action
+                'Egress flow %s is idle, processing action %s',
+                scraper.buffer_url,
+                config.action,
             )
             await process_action(docker_client, config.action, config.container_labels)
             await asyncio.sleep(config.cooldown)
@@ -134,19 +141,22 @@ async def watch_egress(docker_client: DockerClient, buffer: str, config: FlowCon
             await asyncio.sleep(config.polling_interval)
 
 
-async def watch_ingress(docker_client: DockerClient, buffer: str, config: FlowConfig):
+async def watch_ingress(
+    docker_client: DockerClient, scraper: BufferMetricsScraper, config: FlowConfig
+):
     await asyncio.sleep(config.polling_interval)
 
     while True:
-        content = await get_metrics(buffer)
-        metrics = await parse_metrics(content)
+        metrics = await scraper.get()
 
         last_received_message = metrics[LAST_RECEIVED_MESSAGE_METRIC]
         now = time.time()
 
         if now - last_received_message > config.idle:
             logger.debug(
-                'Ingress flow %s is idle, processing action %s', buffer, config.action
+                'Ingress flow %s is idle, processing action %s',
+                scraper.buffer_url,
+                config.action,
             )
             await process_action(docker_client, config.action, config.container_labels)
             await asyncio.sleep(config.cooldown)
@@ -154,31 +164,52 @@ async def watch_ingress(docker_client: DockerClient, buffer: str, config: FlowCo
             await asyncio.sleep(config.polling_interval)
 
 
-async def watch_buffer(docker_client: DockerClient, config: WatchConfig):
+async def watch_buffer(
+    docker_client: DockerClient, session: aiohttp.ClientSession, config: WatchConfig
+):
     logger.info('Watching buffer [%s] metrics', config.buffer)
     watches = []
+    metric_names = []
+    polling_intervals = []
 
     if config.queue:
         logger.info('Watching queue: %s', config.queue)
-        watches.append(watch_queue(docker_client, config.buffer, config.queue))
+        metric_names.append(BUFFER_SIZE_METRIC)
+        polling_intervals.append(config.queue.polling_interval)
     if config.egress:
         logger.info('Watching egress flow: %s', config.egress)
-        watches.append(watch_egress(docker_client, config.buffer, config.egress))
+        metric_names.append(LAST_SENT_MESSAGE_METRIC)
+        polling_intervals.append(config.egress.polling_interval)
     if config.ingress:
         logger.info('Watching ingress flow: %s', config.ingress)
-        watches.append(watch_ingress(docker_client, config.buffer, config.ingress))
+        metric_names.append(LAST_RECEIVED_MESSAGE_METRIC)
+        polling_intervals.append(config.ingress.polling_interval)
+
+    # one scrape of the buffer is shared by all its watchers
+    scraper = BufferMetricsScraper(
+        config.buffer, metric_names, min(polling_intervals), session
+    )
+    if config.queue:
+        watches.append(watch_queue(docker_client, scraper, config.queue))
+    if config.egress:
+        watches.append(watch_egress(docker_client, scraper, config.egress))
+    if config.ingress:
+        watches.append(watch_ingress(docker_client, scraper, config.ingress))
 
     await asyncio.gather(*watches)
 
 
 async def watch(config: Config):
     docker_client = DockerClient()
+    session = aiohttp.ClientSession()
 
-    await asyncio.gather(
-        *[watch_buffer(docker_client, x) for x in config.watch_configs]
-    )
-
-    await docker_client.close()
+    try:
+        await asyncio.gather(
+            *[watch_buffer(docker_client, session, x) for x in config.watch_configs]
+        )
+    finally:
+        await session.close()
+        await docker_client.close()
 
 
 def main():
@@ -0,0 +1,106 @@
+import json
+
+import numpy as np
+import pytest
+from savant_rs.primitives import VideoFrame, VideoFrameContent
+from savant_rs.primitives.geometry import RBBox
+
+from savant.api.parser import (
+    encode_video_frame,
+    parse_video_frame,
+    parse_video_objects,
+    parse_video_objects_batch,
+)
+from savant.meta.constants import UNTRACKED_OBJECT_ID
+
+
+def build_frame(n_objects: int) -> VideoFrame:
+    """Frame with detected objects, every third of them has a child object."""
+
+    frame = VideoFrame(
+        source_id='test',
+        framerate='30/1',
+        width=1280,
+        height=720,
+        content=VideoFrameContent.none(),
+        codec=None,
+        keyframe=True,
+        pts=0,
+    )
+    for i in range(n_objects):
+        obj = frame.create_object(
+            'detector',
+            'car',
+            None,
+            0.5,
+            RBBox(10 * i, 20, 30, 40, None),
+            i,
+            None,
+            None,
+        )
+        if i % 3 == 0:
+            frame.create_object(
+                'classifier',
+                'color',
+                obj.id,
+                None,
+                RBBox(10 * i, 20, 5, 5, None),
+                None,
+                None,
+                None,
+            )
+    return frame
+
+
+@pytest.mark.parametrize('n_objects', [0, 5, 100])
+def test_parse_video_objects_parents(n_objects):
+    """Child objects reference their parents in small and crowded frames."""
+
+    objects = parse_video_objects(build_frame(n_objects))
+    children = [x for x in objects if x['model_name'] == 'classifier']
+    assert len(objects) == n_objects + len(children)
+    assert sorted(x['parent_object_id'] for x in children) == list(
+        range(0, n_objects, 3)
+    )
+    for obj in objects:
+        if obj['model_name'] == 'classifier':
+            assert obj['parent_model_name'] == 'detector'
+            assert obj['parent_label'] == 'car'
+            assert obj['object_id'] == UNTRACKED_OBJECT_ID
+        else:
+            assert obj['parent_model_name'] is None
+
+
+def test_encode_video_frame():
+    frame = build_frame(5)
+    expected = parse_video_frame(frame)
+    expected['schema'] = 'VideoFrame'
+    assert encode_video_frame(frame, schema='VideoFrame') == json.dumps(expected)
+
+
+def test_parse_video_objects_batch():
+    frames = [build_frame(n) for n in (2, 0, 40)]
+    batch = parse_video_objects_batch(frames)
+    objects = [x for frame in frames for x in parse_video_objects(frame)]
+
+    assert len(batch) == len(objects)
+    assert batch.bboxes.shape == (len(objects), 5)
+    assert batch.frame_idx.tolist() == [0] * 3 + [2] * 54
+    for i, obj in enumerate(objects):
+        bbox = obj['bbox']
+        assert batch.bboxes[i].tolist() == pytest.approx(
+            [bbox['xc'], bbox['yc'], bbox['width'], bbox['height'], 0]
+        )
+        assert batch.names[batch.model_names[i]] == obj['model_name']
+        assert batch.names[batch.labels[i]] == obj['label']
+        assert batch.track_ids[i] == obj['object_id']
+        if obj['confidence'] is None:
+            assert np.isnan(batch.confidences[i])
+        else:
+            assert batch.confidences[i] == pytest.approx(obj['confidence'])
+        parent = batch.parent_idx[i]
+        if obj['parent_object_id'] is None:
+            assert parent == -1
+        else:
+            assert batch.frame_idx[parent] == batch.frame_idx[i]
+            assert batch.track_ids[parent] == obj['parent_object_id']
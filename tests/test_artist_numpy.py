@@ -0,0 +1,149 @@
+import cv2
+import numpy as np
+import pytest
+from savant_rs.primitives.geometry import BBox
+
+from savant.utils.artist import ArtistNumPy, Position
+from savant.utils.artist.artist_numpy import alpha_over, render_label_sprite
+from savant.utils.artist.position import get_bottom_left_point
+
+FONT_FACE = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def random_frame(width=320, height=240):
+    frame = np.random.default_rng(0).integers(
+        0, 256, (height, width, 4), dtype=np.uint8
+    )
+    frame[:, :, 3] = 255
+    return frame
+
+
+def draw_label_on_overlay(overlay, text, anchor, border_width, bg_color, padding):
+    """Draw a label on the full-frame overlay as ArtistGPUMat does."""
+
+    text_size, baseline = cv2.getTextSize(text, FONT_FACE, 0.5, 1)
+    left, bottom = get_bottom_left_point(Position.CENTER, anchor, text_size, baseline)
+    rect_tl = (
+        left - border_width - padding[0],
+        bottom - text_size[1] - border_width - padding[1],
+    )
+    rect_br = (
+        left + text_size[0] + border_width + padding[2],
+        bottom + baseline + border_width + padding[3],
+    )
+    if bg_color is not None:
+        cv2.rectangle(overlay, rect_tl, rect_br, bg_color, cv2.FILLED)
+    if border_width > 0:
+        cv2.rectangle(overlay, rect_tl, rect_br, (255, 0, 0, 255), border_width)
+    cv2.putText(
+        overlay,
+        text,
+        (left, bottom),
+        FONT_FACE,
+        0.5,
+        (255, 255, 255, 255),
+        1,
+        cv2.LINE_AA,
+    )
+
+
+@pytest.mark.parametrize(
+    'border_width,bg_color,padding',
+    [
+        (0, (0, 0, 0, 255), (0, 0, 0, 0)),
+        (2, (0, 0, 0, 255), (3, 2, 1, 4)),
+        (0, None, (0, 0, 0, 0)),
+        (3, (0, 0, 255, 128), (1, 1, 1, 1)),
+    ],
+)
+def test_add_text(border_width, bg_color, padding):
+    """Labels drawn from the cached sprites are the same as the labels
+    drawn on a full-frame overlay, including the labels clipped by the frame."""
+
+    frame = random_frame()
+    expected_overlay = np.zeros_like(frame)
+    labels = [('person #42', (100, 100)), ('car #7', (200, 60)), ('edge', (2, 2))]
+    for text, anchor in labels:
+        draw_label_on_overlay(
+            expected_overlay, text, anchor, border_width, bg_color, padding
+        )
+    expected = alpha_over(expected_overlay, frame)
+
+    for _ in range(2):
+        actual = frame.copy()
+        with ArtistNumPy(actual) as artist:
+            for text, anchor in labels:
+                text_size, baseline = artist.add_text(
+                    text,
+                    anchor,
+                    border_width=border_width,
+                    bg_color=bg_color,
+                    padding=padding,
+                )
+                assert (text_size, baseline) == cv2.getTextSize(text, FONT_FACE, 0.5, 1)
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_label_sprite_cache():
+    render_label_sprite.cache_clear()
+    frame = random_frame()
+    for _ in range(3):
+        with ArtistNumPy(frame) as artist:
+            artist.add_text('person #42', (100, 100))
+            artist.add_text('person #42', (150, 150))
+            artist.add_text('person #43', (100, 150))
+    cache_info = render_label_sprite.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (2, 7)
+
+
+def test_overlay_is_lazy():
+    frame = random_frame()
+    expected = frame.copy()
+    with ArtistNumPy(frame) as artist:
+        artist.add_text('', (100, 100))
+        artist.add_text('hidden', (-500, -500))
+        artist.add_bbox(BBox(100, 100, 50, 50), border_color=(0, 0, 0, 0))
+        assert artist.overlay is None
+    np.testing.assert_array_equal(frame, expected)
+
+
+def test_add_bbox():
+    """Opaque colors are set, translucent colors are alpha-blended."""
+
+    frame = np.zeros((100, 100, 4), dtype=np.uint8)
+    frame[:, :, 3] = 255
+    with ArtistNumPy(frame) as artist:
+        artist.add_bbox(
+            BBox(50, 50, 40, 40),
+            border_width=2,
+            border_color=(0, 255, 0, 255),
+            bg_color=(255, 0, 0, 128),
+        )
+
+    np.testing.assert_array_equal(frame[28, 28], [0, 255, 0, 255])
+    np.testing.assert_array_equal(frame[71, 50], [0, 255, 0, 255])
+    np.testing.assert_array_equal(frame[50, 50], [128, 0, 0, 255])
+    np.testing.assert_array_equal(frame[10, 10], [0, 0, 0, 255])
+
+
+def test_released_overlay_is_clean():
+    """Anti-aliased pixels outside the drawn shape are not left on the overlay
+    reused by the next artist."""
+
+    frame = np.zeros((100, 100, 4), dtype=np.uint8)
+    frame[:, :, 3] = 255
+    with ArtistNumPy(frame) as artist:
+        artist.add_rounded_rect(BBox(70, 70, 40, 40), 5, (255, 0, 0, 255))
+
+    frame = np.zeros((100, 100, 4), dtype=np.uint8)
+    frame[:, :, 3] = 255
+    expected = frame.copy()
+    with ArtistNumPy(frame) as artist:
+        # the drawn region overlaps the corner of the first rect
+        artist.add_circle((47, 55), 1, (0, 255, 0, 255), cv2.FILLED)
+
+    drawn = np.zeros((100, 100), dtype=np.uint8)
+    cv2.circle(drawn, (47, 55), 1, 255, cv2.FILLED, cv2.LINE_AA)
+
+    outside = drawn == 0
+    np.testing.assert_array_equal(frame[outside], expected[outside])
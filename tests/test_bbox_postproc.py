@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from savant.utils.bbox_postproc import BBoxPostprocessor
+
+CLASS_IDS = [2, 0, 5]
+
+
+def postprocess_per_object(bbox_tensor: np.ndarray, frame_rect, class_ids):
+    """Reference per-object post-processing."""
+
+    bbox_tensor = bbox_tensor.copy()
+    if bbox_tensor.shape[1] == 6:
+        bbox_tensor[:, 2] -= bbox_tensor[:, 4] / 2
+        bbox_tensor[:, 3] -= bbox_tensor[:, 5] / 2
+        bbox_tensor[:, 4] += bbox_tensor[:, 2]
+        bbox_tensor[:, 5] += bbox_tensor[:, 3]
+        bbox_tensor[:, 2][bbox_tensor[:, 2] < frame_rect[0]] = frame_rect[0]
+        bbox_tensor[:, 3][bbox_tensor[:, 3] < frame_rect[1]] = frame_rect[1]
+        bbox_tensor[:, 4][bbox_tensor[:, 4] > frame_rect[2]] = frame_rect[2]
+        bbox_tensor[:, 5][bbox_tensor[:, 5] > frame_rect[3]] = frame_rect[3]
+        bbox_tensor[:, 4] -= bbox_tensor[:, 2]
+        bbox_tensor[:, 5] -= bbox_tensor[:, 3]
+        bbox_tensor[:, 2] += bbox_tensor[:, 4] / 2
+        bbox_tensor[:, 3] += bbox_tensor[:, 5] / 2
+        bbox_tensor = np.concatenate(
+            [bbox_tensor, np.zeros((bbox_tensor.shape[0], 1), dtype=np.float32)],
+            axis=1,
+        )
+    bbox_tensor = np.concatenate(
+        [
+            bbox_tensor,
+            np.arange(bbox_tensor.shape[0], dtype=np.float32).reshape(-1, 1),
+        ],
+        axis=1,
+    )
+    return [bbox_tensor[bbox_tensor[:, 0] == class_id] for class_id in class_ids]
+
+
+def random_bbox_tensor(n_boxes: int, rotated: bool, rng: np.random.Generator):
+    bbox_tensor = np.concatenate(
+        [
+            rng.integers(0, 7, (n_boxes, 1)),
+            rng.random((n_boxes, 1)),
+            rng.random((n_boxes, 2)) * 1000 - 100,
+            rng.random((n_boxes, 2)) * 300,
+        ]
+        + ([rng.random((n_boxes, 1)) * 90] if rotated else []),
+        axis=1,
+    )
+    return bbox_tensor.astype(np.float32)
+
+
+@pytest.mark.parametrize('mixed', [False, True])
+def test_bbox_postprocessor(mixed):
+    """Batch post-processing matches per-object post-processing."""
+
+    rng = np.random.default_rng(0)
+    postprocessor = BBoxPostprocessor(CLASS_IDS, capacity=4)
+    for _ in range(3):
+        bbox_tensors = [
+            random_bbox_tensor(int(rng.integers(0, 50)), mixed and i % 3 == 0, rng)
+            for i in range(10)
+        ]
+        bbox_tensors[4] = None
+        frame_rects = [
+            (i * 10, i * 5, 800 + i * 10, 600 + i * 5) for i in range(len(bbox_tensors))
+        ]
+
+        result = postprocessor(bbox_tensors, np.array(frame_rects))
+
+        for roi_idx, (bbox_tensor, frame_rect) in enumerate(
+            zip(bbox_tensors, frame_rects)
+        ):
+            if bbox_tensor is None:
+                for class_idx in range(len(CLASS_IDS)):
+                    assert result.select(roi_idx, class_idx).shape == (0, 8)
+                continue
+            expected = postprocess_per_object(bbox_tensor, frame_rect, CLASS_IDS)
+            assert result.rotated[roi_idx] == (bbox_tensor.shape[1] == 7)
+            for class_idx, expected_bboxes in enumerate(expected):
+                np.testing.assert_array_equal(
+                    result.select(roi_idx, class_idx), expected_bboxes
+                )
+
+
+def test_bbox_postprocessor_duplicate_classes():
+    postprocessor = BBoxPostprocessor([1, 1])
+    bbox_tensor = np.array([[1, 0.9, 10, 10, 4, 4], [0, 0.8, 20, 20, 4, 4]])
+
+    result = postprocessor([bbox_tensor], np.array([(0, 0, 100, 100)]))
+
+    expected = [[1, 0.9, 10, 10, 4, 4, 0, 0]]
+    for class_idx in range(2):
+        np.testing.assert_allclose(result.select(0, class_idx), expected, rtol=1e-6)
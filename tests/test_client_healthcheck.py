@@ -0,0 +1,109 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from savant.client.runner.healthcheck import HealthCheck
+
+
+class StatusServer(ThreadingHTTPServer):
+    """HTTP server returning the module status, counts requests."""
+
+    def __init__(self, status=None):
+        super().__init__(('127.0.0.1', 0), StatusRequestHandler)
+        self.status = status
+        self.n_requests = 0
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/status'
+
+
+class StatusRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.n_requests += 1
+        content = json.dumps(self.server.status).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def server():
+    server = StatusServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def test_wait_module_is_ready(server):
+    """Waiting returns when the module is running, subsequent waits
+    read the polled status without requests."""
+
+    health_check = HealthCheck(server.url, interval=0.05, timeout=5)
+    threading.Timer(0.2, setattr, (server, 'status', 'running')).start()
+    try:
+        started = time.time()
+        health_check.wait_module_is_ready()
+        assert time.time() - started >= 0.2
+
+        n_requests = server.n_requests
+        for _ in range(1000):
+            health_check.wait_module_is_ready()
+        assert server.n_requests - n_requests <= 2
+    finally:
+        health_check.close()
+
+
+def test_wait_module_is_ready_timeout(server):
+    server.status = 'starting'
+    health_check = HealthCheck(server.url, interval=0.05, timeout=0.2)
+    try:
+        with pytest.raises(TimeoutError):
+            health_check.wait_module_is_ready()
+        assert health_check.last_status == 'starting'
+    finally:
+        health_check.close()
+
+
+def test_async_wait_module_is_ready(server):
+    server.status = 'starting'
+    health_check = HealthCheck(server.url, interval=0.05, timeout=5)
+    timed_out_check = HealthCheck(server.url, interval=0.05, timeout=0.2)
+
+    async def wait():
+        with pytest.raises(TimeoutError):
+            await timed_out_check.async_wait_module_is_ready()
+        asyncio.get_running_loop().call_later(0.1, setattr, server, 'status', 'running')
+        await asyncio.gather(
+            *(health_check.async_wait_module_is_ready() for _ in range(3))
+        )
+
+    try:
+        asyncio.run(wait())
+    finally:
+        health_check.close()
+        timed_out_check.close()
+    assert health_check.last_status == 'running'
+
+
+def test_module_not_available():
+    health_check = HealthCheck(
+        'http://127.0.0.1:1/status', interval=0.05, timeout=0.2, request_timeout=0.1
+    )
+    try:
+        with pytest.raises(TimeoutError):
+            health_check.wait_module_is_ready()
+        assert health_check.last_status is None
+    finally:
+        health_check.close()
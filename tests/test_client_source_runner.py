@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+import pytest
+from savant_rs.primitives import EndOfStream, VideoFrame, VideoFrameContent
+
+from savant.client.frame_source import FrameSource
+from savant.client.runner.source import AsyncSourceRunner, SourceRunner
+
+BUILD_TIME = 0.01
+N_FRAMES = 30
+
+
+class SlowFrameSource(FrameSource):
+    """Frame source which takes time to build a frame.
+
+    With a barrier, building a frame waits for another frame being built.
+    """
+
+    def __init__(
+        self, source_id: str, pts: int, barrier: Optional[threading.Barrier] = None
+    ):
+        self._source_id = source_id
+        self._pts = pts
+        self._barrier = barrier
+
+    @property
+    def source_id(self) -> str:
+        return self._source_id
+
+    def with_pts(self, pts: int) -> 'SlowFrameSource':
+        return SlowFrameSource(self._source_id, pts, self._barrier)
+
+    def with_update(self, update) -> 'SlowFrameSource':
+        return self
+
+    def build_frame(self):
+        if self._barrier is not None:
+            self._barrier.wait()
+        time.sleep(BUILD_TIME)
+        video_frame = VideoFrame(
+            source_id=self._source_id,
+            framerate='30/1',
+            width=16,
+            height=16,
+            content=VideoFrameContent.none(),
+            codec=None,
+            keyframe=True,
+            pts=self._pts,
+        )
+        return video_frame, b''
+
+
+def build_sources(barrier: Optional[threading.Barrier] = None):
+    sources = [SlowFrameSource(f'cam-{i % 3}', i, barrier) for i in range(N_FRAMES)]
+    sources.insert(10, EndOfStream('cam-0'))
+    return sources
+
+
+def build_runner(runner_class, tmp_path):
+    return runner_class(
+        socket=f'pub+bind:ipc://{tmp_path}/input',
+        log_provider=None,
+        retries=3,
+        module_health_check_url=None,
+        module_health_check_timeout=1,
+        module_health_check_interval=1,
+        telemetry_enabled=False,
+    )
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 8])
+def test_send_iter_prefetch(tmp_path, prefetch):
+    """Frames are sent in the original order, stages are measured."""
+
+    runner = build_runner(SourceRunner, tmp_path)
+
+    results = list(runner.send_iter(build_sources(), prefetch=prefetch))
+
+    assert [x.pts for x in results] == list(range(N_FRAMES))
+    stats = runner.send_stats
+    assert stats.frames == N_FRAMES
+    assert stats.build >= N_FRAMES * BUILD_TIME
+    assert stats.fps > 0
+
+
+def test_send_iter_builds_in_parallel(tmp_path):
+    """Prefetched frames are built in parallel: each build waits at a barrier
+    for another one, sequential builds fail with BrokenBarrierError."""
+
+    runner = build_runner(SourceRunner, tmp_path)
+    barrier = threading.Barrier(2, timeout=10)
+
+    results = list(runner.send_iter(build_sources(barrier), prefetch=8))
+
+    assert [x.pts for x in results] == list(range(N_FRAMES))
+
+
+@pytest.mark.parametrize('prefetch', [0, 8])
+def test_async_send_iter_prefetch(tmp_path, prefetch):
+    runner = build_runner(AsyncSourceRunner, tmp_path)
+
+    async def send():
+        return [x async for x in runner.send_iter(build_sources(), prefetch=prefetch)]
+
+    results = asyncio.run(send())
+
+    assert [x.pts for x in results] == list(range(N_FRAMES))
+    assert runner.send_stats.frames == N_FRAMES
@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from savant.converter.classifier import TensorToLabelConverter
+from savant.converter.yolo import TensorToBBoxConverter
+
+BATCH_SIZE = 8
+NUM_DETECTIONS = 300
+NUM_CLASSES = 3
+
+
+def yolo_output_layers(layout: str, rng: np.random.Generator):
+    if layout == 'yolov5':
+        output = rng.random(
+            (BATCH_SIZE, NUM_DETECTIONS, NUM_CLASSES + 5), dtype=np.float32
+        )
+        output[:, :, :4] *= 640
+        return [output]
+    if layout == 'yolov8':
+        output = rng.random(
+            (BATCH_SIZE, NUM_CLASSES + 4, NUM_DETECTIONS), dtype=np.float32
+        )
+        output[:, :4] *= 640
+        return [output]
+    # after NMS: num_dets, boxes (ltrb), scores, classes
+    boxes = rng.random((BATCH_SIZE, NUM_DETECTIONS, 4), dtype=np.float32)
+    boxes[:, :, 2:] += boxes[:, :, :2]
+    return [
+        rng.integers(0, NUM_DETECTIONS, (BATCH_SIZE, 1)).astype(np.int32),
+        boxes,
+        rng.random((BATCH_SIZE, NUM_DETECTIONS), dtype=np.float32),
+        rng.integers(0, NUM_CLASSES, (BATCH_SIZE, NUM_DETECTIONS)).astype(np.float32),
+    ]
+
+
+class TestBatchConverter:
+    @pytest.mark.parametrize('layout', ['yolov5', 'yolov8', 'nms'])
+    @pytest.mark.parametrize('maintain_aspect_ratio', [True, False])
+    @pytest.mark.parametrize('nms_iou_threshold', [0.0, 0.5])
+    def test_yolo(self, layout, maintain_aspect_ratio, nms_iou_threshold):
+        """Batch conversion result matches per-ROI conversion result."""
+        rng = np.random.default_rng(0)
+        model = SimpleNamespace(
+            input=SimpleNamespace(
+                width=640,
+                height=640,
+                maintain_aspect_ratio=maintain_aspect_ratio,
+            ),
+            output=SimpleNamespace(num_detected_classes=NUM_CLASSES),
+        )
+        output_layers = yolo_output_layers(layout, rng)
+        rois = (rng.random((BATCH_SIZE, 4)) * 500 + 1).astype(np.float32)
+        converter = TensorToBBoxConverter(
+            nms_iou_threshold=nms_iou_threshold, top_k=50, class_ids=(0, 2)
+        )
+        assert converter.is_batched
+
+        batch_result = converter.convert_batch(
+            *[layer.copy() for layer in output_layers], model=model, rois=rois
+        )
+        assert len(batch_result) == BATCH_SIZE
+        for i in range(BATCH_SIZE):
+            expected = converter(
+                *[layer[i].copy() for layer in output_layers],
+                model=model,
+                roi=tuple(rois[i].tolist()),
+            )
+            result = batch_result[i]
+            if nms_iou_threshold == 0:
+                # top k selection does not keep the order
+                expected = expected[np.lexsort(expected.T[::-1])]
+                result = result[np.lexsort(result.T[::-1])]
+            np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+    @pytest.mark.parametrize('apply_softmax', [True, False])
+    def test_classifier(self, apply_softmax):
+        """Batch conversion result matches per-ROI conversion result."""
+        rng = np.random.default_rng(0)
+        model = SimpleNamespace(
+            output=SimpleNamespace(
+                attributes=[
+                    SimpleNamespace(
+                        name='single',
+                        labels=['a', 'b', 'c'],
+                        multi_label=False,
+                        threshold=0.3,
+                    ),
+                    SimpleNamespace(
+                        name='multi',
+                        labels=None,
+                        multi_label=True,
+                        threshold=0.5,
+                    ),
+                ]
+            )
+        )
+        output_layers = [
+            rng.random((BATCH_SIZE, 3), dtype=np.float32) * 1.05 for _ in range(2)
+        ]
+        rois = np.zeros((BATCH_SIZE, 4), dtype=np.float32)
+        converter = TensorToLabelConverter(apply_softmax=apply_softmax)
+
+        batch_result = converter.convert_batch(*output_layers, model=model, rois=rois)
+        for i in range(BATCH_SIZE):
+            expected = converter(
+                *[layer[i] for layer in output_layers], model=model, roi=(0, 0, 0, 0)
+            )
+            assert [x[:2] for x in batch_result[i]] == [x[:2] for x in expected]
+            np.testing.assert_allclose(
+                [x[2] for x in batch_result[i]], [x[2] for x in expected], rtol=1e-6
+            )
@@ -0,0 +1,75 @@
+import pytest
+
+from savant.utils.artist import Position
+from savant.utils.draw_spec import (
+    BoundingBoxRender,
+    DotRender,
+    compile_draw_spec,
+    get_default_draw_spec,
+    get_obj_draw_spec,
+)
+
+
+def test_compile_draw_spec():
+    render = compile_draw_spec(
+        get_obj_draw_spec(
+            {
+                'bbox': {'border_color': 'FF0000FF', 'padding': {'left': 2, 'top': 3}},
+                'label': {
+                    'format': ['{label}', '{track_id}'],
+                    'position': {'position': 'TopLeftOutside', 'margin_x': 4},
+                },
+                'central_dot': {'radius': 3},
+                'blur': True,
+            }
+        )
+    )
+
+    assert render.blur
+    assert render.bounding_box == BoundingBoxRender(
+        thickness=2,
+        border_color=(255, 0, 0, 255),
+        background_color=(0, 0, 0, 0),
+        padding=(2, 3, 0, 0),
+    )
+    assert render.central_dot == DotRender(radius=3, color=(0, 255, 0, 255))
+    # lines outside the box are drawn upwards starting from the last one
+    assert render.label.formats == ('{track_id}', '{label}')
+    assert render.label.line_offset_sign == -1
+    assert render.label.anchor_point == Position.LEFT_BOTTOM
+    assert not render.label.centered
+    assert render.label.margin_x == 4
+    assert render.label.font_color == (255, 255, 255, 255)
+
+
+@pytest.mark.parametrize(
+    'position,formats,sign,anchor_point,centered',
+    [
+        ('TopLeftInside', ('a', 'b'), 1, Position.LEFT_TOP, False),
+        ('Center', ('a', 'b'), 1, Position.LEFT_BOTTOM, True),
+    ],
+)
+def test_compile_label_position(position, formats, sign, anchor_point, centered):
+    render = compile_draw_spec(
+        get_obj_draw_spec(
+            {'label': {'format': ['a', 'b'], 'position': {'position': position}}}
+        )
+    )
+
+    assert render.bounding_box is None
+    assert render.central_dot is None
+    assert render.label.formats == formats
+    assert render.label.line_offset_sign == sign
+    assert render.label.anchor_point == anchor_point
+    assert render.label.centered == centered
+
+
+def test_compile_default_draw_spec():
+    render = compile_draw_spec(get_default_draw_spec(track_id=True))
+
+    assert not render.blur
+    assert render.bounding_box.border_color == (0, 255, 0, 255)
+    assert render.label.formats == ('{label} #{track_id}',)
+    # compiled specs group objects in a dict
+    assert render == compile_draw_spec(get_default_draw_spec(track_id=True))
+    assert hash(render) == hash(compile_draw_spec(get_default_draw_spec(track_id=True)))
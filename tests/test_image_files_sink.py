@@ -0,0 +1,77 @@
+import os
+import tarfile
+from types import SimpleNamespace
+
+import pytest
+from savant_rs.primitives import EndOfStream, VideoFrame, VideoFrameContent
+
+from adapters.python.sinks.image_files import (
+    FsyncPolicy,
+    ImageFilesSink,
+    ImageWritePool,
+)
+
+SOURCES = ['cam-1', 'cam-2', 'cam-3']
+
+
+def build_message(source_id: str, pts: int):
+    frame = VideoFrame(
+        source_id=source_id,
+        framerate='30/1',
+        width=1280,
+        height=720,
+        content=VideoFrameContent.internal(f'{source_id}-{pts}'.encode()),
+        codec='jpeg',
+        keyframe=True,
+        pts=pts,
+    )
+    return SimpleNamespace(message=frame.to_message(), content=None)
+
+
+def read_images(location: str, tar_output: bool):
+    if tar_output:
+        with tarfile.open(f'{location}.tar') as tar:
+            return {
+                member.name: tar.extractfile(member).read()
+                for member in tar.getmembers()
+            }
+    return {
+        name: open(os.path.join(location, name), 'rb').read()
+        for name in os.listdir(location)
+    }
+
+
+@pytest.mark.parametrize('write_workers', [0, 2])
+@pytest.mark.parametrize('tar_output', [False, True])
+@pytest.mark.parametrize('fsync_policy', list(FsyncPolicy))
+def test_image_files_sink(tmp_path, write_workers, tar_output, fsync_policy):
+    """Images of each source are written to chunks in order."""
+
+    write_pool = ImageWritePool(write_workers, 3, 60) if write_workers else None
+    sink = ImageFilesSink(
+        str(tmp_path / '%source_id'),
+        chunk_size=4,
+        write_pool=write_pool,
+        fsync_policy=fsync_policy,
+        tar_output=tar_output,
+    )
+    for pts in range(10):
+        for source_id in SOURCES:
+            sink.write(build_message(source_id, pts))
+    for source_id in SOURCES:
+        sink.write(SimpleNamespace(message=EndOfStream(source_id).to_message()))
+    sink.terminate()
+
+    for source_id in SOURCES:
+        for chunk_idx in range(3):
+            location = tmp_path / source_id / f'{chunk_idx:08}' / 'images'
+            images = read_images(str(location), tar_output)
+            expected_pts = range(chunk_idx * 4, min(chunk_idx * 4 + 4, 10))
+            assert images == {
+                f'{i:08}.jpeg': f'{source_id}-{pts}'.encode()
+                for i, pts in enumerate(expected_pts)
+            }
+
+    if write_pool is not None:
+        assert write_pool.pending == 0
+        assert write_pool.failed == 0
@@ -0,0 +1,65 @@
+import io
+import struct
+
+import cv2
+import numpy as np
+import pytest
+
+from savant.client.image_source.img_header_parse import (
+    get_image_size_codec,
+    get_image_size_codec_from_buffer,
+)
+
+WIDTH = 123
+HEIGHT = 45
+
+
+def encode_image(ext: str, params=()) -> bytes:
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    ok, data = cv2.imencode(ext, image, params)
+    assert ok
+    return data.tobytes()
+
+
+def with_thumbnail(jpeg: bytes) -> bytes:
+    """Insert an APP1 segment with an embedded JPEG of a different size."""
+
+    thumbnail = cv2.imencode('.jpg', np.zeros((8, 16, 3), dtype=np.uint8))[1]
+    payload = b'Exif\0\0' + thumbnail.tobytes()
+    segment = b'\xff\xe1' + struct.pack('>H', len(payload) + 2) + payload
+    return jpeg[:2] + segment + jpeg[2:]
+
+
+@pytest.mark.parametrize(
+    'content,codec',
+    [
+        (encode_image('.jpg'), 'jpeg'),
+        (encode_image('.jpg', [cv2.IMWRITE_JPEG_PROGRESSIVE, 1]), 'jpeg'),
+        (with_thumbnail(encode_image('.jpg')), 'jpeg'),
+        (encode_image('.png'), 'png'),
+    ],
+)
+def test_get_image_size_codec(tmp_path, content, codec):
+    path = tmp_path / 'image'
+    path.write_bytes(content)
+    file = io.BytesIO(b'prefix' + content)
+    file.seek(6)
+
+    assert get_image_size_codec_from_buffer(content) == (WIDTH, HEIGHT, codec)
+    assert get_image_size_codec(path) == (WIDTH, HEIGHT, codec)
+    assert get_image_size_codec(file) == (WIDTH, HEIGHT, codec)
+    assert file.tell() == 6
+
+
+@pytest.mark.parametrize(
+    'content',
+    [
+        b'',
+        b'GIF89a' + b'\0' * 100,
+        encode_image('.jpg')[:20],
+        encode_image('.png')[:12],
+    ],
+)
+def test_get_image_size_codec_invalid(content):
+    with pytest.raises(ValueError):
+        get_image_size_codec_from_buffer(content)
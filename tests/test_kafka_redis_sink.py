@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from savant_rs.primitives import VideoFrameTranscodingMethod
+
+from adapters.python.sinks.kafka_redis import KafkaRedisSink
+from savant.utils.log import get_logger
+
+REDIS_CONFIG = SimpleNamespace(
+    host='redis',
+    port=6379,
+    db=0,
+    key_prefix='savant:frames',
+    ttl_seconds=60,
+)
+
+
+def build_sink(deduplicate: bool) -> KafkaRedisSink:
+    sink = KafkaRedisSink.__new__(KafkaRedisSink)
+    sink._config = SimpleNamespace(deduplicate=deduplicate, redis=REDIS_CONFIG)
+    sink._logger = get_logger(__name__)
+    sink._redis_client = FakeAsyncRedis()
+    return sink
+
+
+def build_frame(uuid: int, encoded: bool):
+    return SimpleNamespace(
+        uuid=uuid,
+        source_id='test',
+        pts=uuid,
+        transcoding_method=(
+            VideoFrameTranscodingMethod.Encoded
+            if encoded
+            else VideoFrameTranscodingMethod.Copy
+        ),
+    )
+
+
+@pytest.mark.parametrize('deduplicate', [True, False])
+def test_store_frame_contents(deduplicate):
+    """Contents are stored with a pipeline, pass-through contents already
+    in Redis are not overwritten when deduplication is enabled."""
+
+    async def run():
+        sink = build_sink(deduplicate)
+        redis = sink._redis_client
+        await redis.set('savant:frames:1', b'stored-1')
+        await redis.set('savant:frames:2', b'stored-2')
+        frames = [
+            (build_frame(1, encoded=False), b'content-1'),
+            (build_frame(2, encoded=True), b'content-2'),
+            (build_frame(3, encoded=False), b'content-3'),
+            (build_frame(3, encoded=False), b'content-3-duplicate'),
+        ]
+        contents = await sink.store_frame_contents(frames)
+        stored = [await redis.get(f'savant:frames:{i}') for i in range(1, 4)]
+        ttls = [await redis.ttl(f'savant:frames:{i}') for i in range(1, 4)]
+        return contents, stored, ttls
+
+    contents, stored, ttls = asyncio.run(run())
+    assert [x.get_location() for x in contents] == [
+        f'redis:6379:0/savant:frames:{i}' for i in (1, 2, 3, 3)
+    ]
+    if deduplicate:
+        assert stored == [b'stored-1', b'content-2', b'content-3']
+    else:
+        assert stored == [b'content-1', b'content-2', b'content-3-duplicate']
+    assert all(0 < ttl <= REDIS_CONFIG.ttl_seconds for ttl in ttls)
@@ -0,0 +1,142 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+from savant_rs.primitives import EndOfStream, VideoFrame, VideoFrameContent
+from savant_rs.utils.serialization import save_message_to_bytes
+
+from adapters.python.shared.kafka_redis import STOP
+from adapters.python.sources.kafka_redis import KafkaRedisSource
+from savant.api.enums import ExternalFrameType
+from savant.utils.log import get_logger
+
+SERVERS = ['redis-1:6379:0', 'redis-2:6379:1']
+
+
+def build_frame(pts: int, content: VideoFrameContent) -> VideoFrame:
+    return VideoFrame(
+        source_id='test',
+        framerate='30/1',
+        codec='jpeg',
+        width=1280,
+        height=720,
+        content=content,
+        keyframe=True,
+        pts=pts,
+    )
+
+
+def build_source(batch_size: int, processor_workers: int = 1) -> KafkaRedisSource:
+    source = KafkaRedisSource.__new__(KafkaRedisSource)
+    source._config = SimpleNamespace(
+        batch_size=batch_size,
+        batch_max_linger=0,
+        processor_workers=processor_workers,
+    )
+    source._logger = get_logger(__name__)
+    source._error = None
+    source._is_running = True
+    source._frame_clients = {
+        host_port_db: FakeAsyncRedis(server=FakeServer()) for host_port_db in SERVERS
+    }
+    source.count_frame = lambda: None
+    source.observe_latency = lambda *args: None
+    source._processor_executor = (
+        ThreadPoolExecutor(processor_workers) if processor_workers > 1 else None
+    )
+    return source
+
+
+async def build_messages(source: KafkaRedisSource):
+    """Frames stored in different Redis servers, internal frames,
+    frames missing in Redis and EOS."""
+
+    messages = []
+    expected = []
+    for pts in range(20):
+        if pts % 5 == 4:
+            messages.append(save_message_to_bytes(EndOfStream('test').to_message()))
+            expected.append(('eos', None))
+            continue
+        content = f'frame-{pts}'.encode()
+        if pts % 5 == 3:
+            frame = build_frame(pts, VideoFrameContent.internal(content))
+        else:
+            host_port_db = SERVERS[pts % 2]
+            key = f'savant:frames:{pts}'
+            if pts % 5 == 2:
+                content = None
+            else:
+                await source._frame_clients[host_port_db].set(key, content)
+            frame = build_frame(
+                pts,
+                VideoFrameContent.external(
+                    ExternalFrameType.REDIS.value, f'{host_port_db}/{key}'
+                ),
+            )
+        messages.append(save_message_to_bytes(frame.to_message()))
+        expected.append(None if content is None else (pts, content))
+
+    return messages, expected
+
+
+def check_result(result, expected):
+    if expected is None:
+        assert result is None
+    elif expected[0] == 'eos':
+        assert isinstance(result, EndOfStream)
+    else:
+        video_frame, content = result
+        assert (video_frame.pts, content) == expected
+        assert video_frame.content.get_method() == ExternalFrameType.ZEROMQ.value
+
+
+def test_process_messages():
+    """Frame contents are fetched from each Redis server, the order is kept."""
+
+    async def run():
+        source = build_source(batch_size=20)
+        messages, expected = await build_messages(source)
+        return await source.process_messages(messages), expected
+
+    results, expected = asyncio.run(run())
+    assert len(results) == len(expected)
+    for result, expected_result in zip(results, expected):
+        check_result(result, expected_result)
+
+
+@pytest.mark.parametrize('batch_size', [1, 3, 20])
+@pytest.mark.parametrize('processor_workers', [1, 4])
+def test_messages_processor(batch_size, processor_workers):
+    """Messages are sent with their offsets in the original order,
+    missing frames are skipped."""
+
+    async def run():
+        source = build_source(batch_size, processor_workers)
+        messages, expected = await build_messages(source)
+        source._poller_queue = asyncio.Queue()
+        source._processing_queue = asyncio.Queue(processor_workers)
+        source._sender_queue = asyncio.Queue()
+        for offset, data in enumerate(messages):
+            source._poller_queue.put_nowait((offset, data))
+        source._poller_queue.put_nowait(STOP)
+        await asyncio.gather(
+            source.messages_processor(),
+            source.results_reassembler(),
+        )
+
+        sent = []
+        while True:
+            item = source._sender_queue.get_nowait()
+            if item is STOP:
+                break
+            sent.append(item)
+        return sent, expected
+
+    sent, expected = asyncio.run(run())
+    expected_offsets = [i for i, x in enumerate(expected) if x is not None]
+    assert [offset for offset, _ in sent] == expected_offsets
+    for offset, result in sent:
+        check_result(result, expected[offset])
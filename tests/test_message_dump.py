@@ -0,0 +1,172 @@
+import msgpack
+import pytest
+
+from adapters.python.shared.message_dump import (
+    MessageDumpIndex,
+    MessageDumpSegmentReader,
+    get_index_path,
+)
+
+SOURCES = ['cam-1', 'cam-2', 'cam-3']
+
+
+def write_segment(path, n_messages: int, indexed: bool):
+    """Write a segment as MessageDumper does, return the written records."""
+
+    records = []
+    index = MessageDumpIndex()
+    offset = 0
+    with open(path, 'wb') as f:
+        for i in range(n_messages):
+            source_id = SOURCES[i % len(SOURCES)]
+            record = (
+                1_000_000_000 * i,
+                list(source_id.encode()),
+                f'meta-{i}'.encode(),
+                f'content-{i}'.encode() * (i % 7),
+            )
+            data = msgpack.packb(record, use_bin_type=True)
+            f.write(data)
+            index.add(record[0], source_id, offset)
+            offset += len(data)
+            records.append(record)
+    if indexed:
+        index.write(get_index_path(str(path)))
+
+    return records
+
+
+@pytest.mark.parametrize('indexed', [True, False])
+@pytest.mark.parametrize(
+    'start_ts,end_ts,source_ids',
+    [
+        (None, None, None),
+        (10_000_000_000, None, None),
+        (None, 5_500_000_000, None),
+        (3_000_000_000, 20_000_000_000, {'cam-2'}),
+        (None, None, {'cam-1', 'cam-3', 'unknown'}),
+        (None, None, {'unknown'}),
+    ],
+)
+def test_segment_reader(tmp_path, indexed, start_ts, end_ts, source_ids):
+    """Indexed and sequential reading return the same filtered records."""
+
+    path = tmp_path / 'dump.msgpack'
+    records = write_segment(path, 30, indexed)
+    expected = [
+        list(record)
+        for record in records
+        if (start_ts is None or record[0] >= start_ts)
+        and (end_ts is None or record[0] <= end_ts)
+        and (source_ids is None or bytes(record[1]).decode() in source_ids)
+    ]
+
+    reader = MessageDumpSegmentReader(str(path), start_ts, end_ts, source_ids)
+    assert reader.is_indexed == indexed
+    assert [list(record) for record in reader] == expected
+
+
+def test_index_roundtrip(tmp_path):
+    path = str(tmp_path / 'dump.msgpack.index')
+    index = MessageDumpIndex()
+    for i in range(10):
+        index.add(i * 10, SOURCES[i % 2], i * 100)
+    index.write(path)
+
+    loaded = MessageDumpIndex.load(path)
+    assert loaded.sources == SOURCES[:2]
+    assert loaded.records.tolist() == index.records.tolist()
+    assert loaded.select(start_ts=35, source_ids={'cam-2'}).tolist() == [5, 7, 9]
+
+
+class ListReader:
+    def __init__(self, messages):
+        self._messages = iter(messages)
+
+    def read(self):
+        return next(self._messages, None)
+
+
+class ListWriter:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, topic, meta, content):
+        self.messages.append((topic, meta, content))
+
+
+@pytest.mark.parametrize('sync_output', ['False', 'True'])
+def test_player_replay(monkeypatch, sync_output):
+    """Replay finishes with the rate stats logged, with and without sync."""
+
+    from threading import Lock
+
+    from savant_rs.primitives import EndOfStream
+
+    from adapters.python.sources.message_dump_player import Config, Player
+
+    monkeypatch.setenv('PLAYLIST_PATH', 'playlist.txt')
+    monkeypatch.setenv('ZMQ_ENDPOINT', 'pub+connect:ipc:///tmp/test')
+    monkeypatch.setenv('SYNC_OUTPUT', sync_output)
+    monkeypatch.setenv('SPEED_FACTOR', '100')
+    messages = [
+        (1_000_000 * i, 'cam-1', EndOfStream('cam-1').to_message(), b'')
+        for i in range(5)
+    ]
+    writer = ListWriter()
+    player = Player('playlist.txt', ListReader(messages), writer, Lock(), Config())
+
+    player.play()
+
+    assert [x[0] for x in writer.messages] == ['cam-1'] * 5
+
+
+def test_player_rewrites_source_id(monkeypatch):
+    """Source IDs of the cloned messages match their topics."""
+
+    from threading import Lock
+
+    from savant_rs.primitives import (
+        AttributeValue,
+        EndOfStream,
+        UserData,
+        VideoFrame,
+        VideoFrameContent,
+    )
+
+    from adapters.python.sources.message_dump_player import Config, Player
+
+    monkeypatch.setenv('PLAYLIST_PATH', 'playlist.txt')
+    monkeypatch.setenv('ZMQ_ENDPOINT', 'pub+connect:ipc:///tmp/test')
+    monkeypatch.setenv('CLONES', '2')
+    user_data = UserData('cam-1')
+    user_data.set_persistent_attribute(
+        'test', 'value', False, None, [AttributeValue.integer(42)]
+    )
+    video_frame = VideoFrame(
+        source_id='cam-1',
+        framerate='30/1',
+        width=1280,
+        height=720,
+        content=VideoFrameContent.none(),
+    )
+    messages = [
+        (0, 'cam-1', video_frame.to_message(), b''),
+        (1, 'cam-1', user_data.to_message(), b''),
+        (2, 'cam-1', EndOfStream('cam-1').to_message(), b''),
+    ]
+    writer = ListWriter()
+    player = Player('playlist.txt', ListReader(messages), writer, Lock(), Config())
+
+    player.play()
+
+    assert [x[0] for x in writer.messages] == ['cam-1-0', 'cam-1-1'] * 3
+    for topic, meta, _ in writer.messages:
+        if meta.is_video_frame():
+            assert meta.as_video_frame().source_id == topic
+        elif meta.is_user_data():
+            assert meta.as_user_data().source_id == topic
+            attribute = meta.as_user_data().get_attribute('test', 'value')
+            assert attribute.values[0].as_integer() == 42
+        else:
+            assert meta.as_end_of_stream().source_id == topic
@@ -0,0 +1,70 @@
+import gzip
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from savant_rs.primitives import EndOfStream, VideoFrame, VideoFrameContent
+from savant_rs.primitives.geometry import RBBox
+
+from adapters.python.sinks.metadata_json import Compression, MetadataJsonSink
+
+
+def build_message(pts: int):
+    frame = VideoFrame(
+        source_id='test',
+        framerate='30/1',
+        width=1280,
+        height=720,
+        content=VideoFrameContent.none(),
+        codec=None,
+        keyframe=True,
+        pts=pts,
+    )
+    frame.create_object(
+        'detector', 'car', None, 0.5, RBBox(pts, 20, 30, 40, None), None, None, None
+    )
+    return SimpleNamespace(message=frame.to_message())
+
+
+def read_lines(path: str, compression: Compression):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if compression == Compression.GZIP:
+        data = gzip.decompress(data)
+    elif compression == Compression.ZSTD:
+        zstandard = pytest.importorskip('zstandard')
+        data = zstandard.ZstdDecompressor().stream_reader(data).read()
+    return [json.loads(x) for x in data.decode().splitlines()]
+
+
+@pytest.mark.parametrize('compression', list(Compression))
+@pytest.mark.parametrize('write_queue_size', [0, 3])
+def test_metadata_json_sink(tmp_path, compression, write_queue_size):
+    """Files are compressed and rotated by size, all frames are written in order."""
+
+    if compression == Compression.ZSTD:
+        pytest.importorskip('zstandard')
+    sink = MetadataJsonSink(
+        str(tmp_path / 'meta.json'),
+        skip_frames_without_objects=False,
+        buffer_size=1024,
+        compression=compression,
+        rotate_size=3000,
+        write_queue_size=write_queue_size,
+    )
+    for pts in range(20):
+        sink.write(build_message(pts))
+    sink.write(SimpleNamespace(message=EndOfStream('test').to_message()))
+    sink.terminate()
+
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) > 1
+    assert all(x.endswith(f'.json{compression.extension}') for x in files)
+    lines = [
+        line for path in files for line in read_lines(str(tmp_path / path), compression)
+    ]
+    assert [x['metadata']['objects'][0]['bbox']['xc'] for x in lines[:-1]] == list(
+        range(20)
+    )
+    assert lines[-1] == {'source_id': 'test', 'schema': 'EndOfStream'}
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from savant.metrics import delete, get_or_create_histogram, get_or_create_summary
+
+
+def test_histogram_threads():
+    """Observations from several threads are merged on flush."""
+
+    histogram = get_or_create_histogram(
+        'test_latency', 'Test latency', ['stage'], buckets=[0.1, 1, 10]
+    )
+    assert (
+        get_or_create_histogram('test_latency', None, ['stage'], [0.1, 1, 10])
+        is histogram
+    )
+
+    def observe(n):
+        for value in [0.05, 0.1, 0.5, 5, 50]:
+            histogram.observe(value, ('process',), n)
+        histogram.observe(1, ['send'])
+
+    threads = [threading.Thread(target=observe, args=(n,)) for n in range(1, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    histogram.flush()
+
+    counts, value_sum = histogram.get(('process',))
+    assert counts == [20, 30, 40, 50]
+    assert value_sum == pytest.approx(sum([0.05, 0.1, 0.5, 5, 50]) * 10)
+    assert histogram.get(('send',)) == ([0, 4, 4, 4], 4)
+    assert histogram.get(('unknown',)) == ([0, 0, 0, 0], 0)
+
+    # flushed observations are not added twice
+    with histogram.time(('send',)):
+        pass
+    histogram.flush()
+    histogram.flush()
+    assert histogram.get(('send',))[0] == [1, 5, 5, 5]
+    delete('test_latency')
+
+
+def test_summary():
+    summary = get_or_create_summary('test_size', 'Test size')
+    summary.observe(10)
+    summary.observe(20, count=2)
+    summary.flush()
+    assert summary.get() == ([3], 50)
+    delete('test_size')
+
+
+def test_existing_metric_mismatch():
+    """Requesting an existing metric with other type, labels or buckets fails."""
+
+    get_or_create_histogram('test_mismatch', 'Test', ['stage'], buckets=[0.1, 1])
+    try:
+        with pytest.raises(ValueError, match='labels'):
+            get_or_create_histogram('test_mismatch', 'Test', ['step'], [0.1, 1])
+        with pytest.raises(ValueError, match='buckets'):
+            get_or_create_histogram('test_mismatch', 'Test', ['stage'], [0.1, 10])
+        with pytest.raises(ValueError, match='HistogramFamily'):
+            get_or_create_summary('test_mismatch', 'Test', ['stage'])
+    finally:
+        delete('test_mismatch')
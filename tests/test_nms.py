@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from savant.utils.nms import nms_cpu, nms_cpu_batched, soft_nms_cpu
+
+
+def random_boxes(n_boxes: int, rng: np.random.Generator):
+    bboxes = np.concatenate(
+        (rng.random((n_boxes, 2)) * 500, rng.random((n_boxes, 2)) * 100 + 5),
+        axis=1,
+    ).astype(np.float32)
+    confidences = rng.random(n_boxes, dtype=np.float32)
+    return bboxes, confidences
+
+
+class TestNmsCpuBatched:
+    @pytest.mark.parametrize('n_boxes', [1, 2, 10, 100, 1000])
+    @pytest.mark.parametrize('threshold', [0.3, 0.5, 0.7])
+    @pytest.mark.parametrize('top_k', [5, 300])
+    @pytest.mark.parametrize('block_size', [1, 7, 64])
+    def test_same_as_nms_cpu(self, n_boxes, threshold, top_k, block_size):
+        """Kept indices are identical to the greedy implementation."""
+        bboxes, confidences = random_boxes(n_boxes, np.random.default_rng(0))
+        expected = nms_cpu(bboxes, confidences, threshold, top_k)
+        result = nms_cpu_batched(
+            bboxes, confidences, threshold, top_k, block_size=block_size
+        )
+        np.testing.assert_array_equal(result, expected)
+        assert result.dtype == expected.dtype
+
+    def test_degenerate_boxes(self):
+        """Zero size and coinciding boxes are handled as in the greedy
+        implementation."""
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            n_boxes = int(rng.integers(1, 50))
+            bboxes = np.round(rng.random((n_boxes, 4)) * [20, 20, 6, 6])
+            bboxes = bboxes.astype(np.float32)
+            confidences = rng.integers(0, 5, n_boxes).astype(np.float32)
+            with np.errstate(invalid='ignore'):
+                expected = nms_cpu(bboxes, confidences, 0.3, n_boxes)
+                result = nms_cpu_batched(bboxes, confidences, 0.3, n_boxes)
+            np.testing.assert_array_equal(result, expected)
+
+    @pytest.mark.parametrize('class_aware', [True, False])
+    @pytest.mark.parametrize('batched', [True, False])
+    def test_groups(self, class_aware, batched):
+        """Boxes of different classes/images don't suppress each other,
+        top k is applied per image."""
+        n_boxes, top_k = 500, 7
+        rng = np.random.default_rng(0)
+        bboxes, confidences = random_boxes(n_boxes, rng)
+        class_ids = rng.integers(0, 4, n_boxes) if class_aware else None
+        batch_ids = rng.integers(0, 3, n_boxes) if batched else None
+
+        groups = np.zeros(n_boxes, dtype=np.int64)
+        if class_aware:
+            groups += class_ids
+        if batched:
+            groups += batch_ids * 10
+
+        expected = []
+        for group in np.unique(groups):
+            idx = np.flatnonzero(groups == group)
+            expected.extend(idx[nms_cpu(bboxes[idx], confidences[idx], 0.5, idx.size)])
+        expected = np.array(expected)
+        expected = expected[np.argsort(-confidences[expected], kind='stable')]
+        if batched:
+            expected = np.concatenate(
+                [expected[batch_ids[expected] == i][:top_k] for i in range(3)]
+            )
+        else:
+            expected = expected[:top_k]
+
+        result = nms_cpu_batched(
+            bboxes,
+            confidences,
+            0.5,
+            top_k,
+            class_ids=class_ids,
+            batch_ids=batch_ids,
+        )
+        np.testing.assert_array_equal(np.sort(result), np.sort(expected))
+        assert np.all(np.diff(confidences[result]) <= 0)
+
+    def test_pre_top_k(self):
+        bboxes, confidences = random_boxes(1000, np.random.default_rng(0))
+        order = np.argsort(-confidences)[:100]
+        expected = order[nms_cpu(bboxes[order], confidences[order], 0.5, 1000)]
+        result = nms_cpu_batched(bboxes, confidences, 0.5, 1000, pre_top_k=100)
+        np.testing.assert_array_equal(result, expected)
+
+
+class TestSoftNmsCpu:
+    @pytest.mark.parametrize('method', ['linear', 'gaussian'])
+    def test_scores_decay(self, method):
+        bboxes = np.array(
+            [[0, 0, 10, 10], [1, 1, 10, 10], [100, 100, 10, 10]], dtype=np.float32
+        )
+        confidences = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+        keep, scores = soft_nms_cpu(bboxes, confidences, method=method)
+        np.testing.assert_array_equal(keep, [0, 2, 1])
+        np.testing.assert_allclose(scores[:2], [0.9, 0.7])
+        assert scores[2] < 0.8
+
+    def test_no_overlaps(self):
+        bboxes, confidences = random_boxes(10, np.random.default_rng(0))
+        bboxes[:, 0] = np.arange(10) * 1000
+        keep, scores = soft_nms_cpu(bboxes, confidences)
+        np.testing.assert_array_equal(keep, np.argsort(-confidences))
+        np.testing.assert_allclose(scores, confidences[keep])
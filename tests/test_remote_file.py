@@ -0,0 +1,282 @@
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from savant.remote_file import (
+    RemoteFile,
+    RemoteFileCache,
+    process_remote,
+    process_remotes,
+)
+from savant.remote_file.http import HTTPFileHandler, OrderedChecksum
+
+ETAG = '"v1"'
+
+
+def build_archive() -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for name in ['model.onnx', 'config.txt']:
+            content = random.Random(name).randbytes(5000)
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class FileServer(ThreadingHTTPServer):
+    """HTTP server supporting range requests, can fail requests to chunks."""
+
+    def __init__(self, files, accept_ranges: bool = True):
+        super().__init__(('127.0.0.1', 0), RangeRequestHandler)
+        self.files = files
+        self.accept_ranges = accept_ranges
+        self.failing_ranges = set()
+        self.requests = []
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}'
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_file(with_body=False)
+
+    def do_GET(self):
+        self.send_file(with_body=True)
+
+    def send_file(self, with_body: bool):
+        content = self.server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+
+        range_header = self.headers.get('Range')
+        if with_body:
+            self.server.requests.append(range_header)
+        if range_header and self.server.accept_ranges:
+            start, end = map(int, re.match(r'bytes=(\d+)-(\d+)', range_header).groups())
+            if start in self.server.failing_ranges:
+                self.send_error(500)
+                return
+            content = content[start : end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(content)}')
+        else:
+            self.send_response(200)
+        if self.server.accept_ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(content)
+
+
+@pytest.fixture
+def archive():
+    return build_archive()
+
+
+def run_server(files, accept_ranges=True):
+    server = FileServer(files, accept_ranges)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.mark.parametrize('accept_ranges', [True, False])
+def test_download_with_checksum(tmp_path, archive, accept_ranges):
+    """Files are downloaded in chunks or in a single stream,
+    the checksum is calculated while downloading."""
+
+    server = run_server({'/model.tar.gz': archive}, accept_ranges)
+    try:
+        handler = HTTPFileHandler(chunk_size=1000, max_connections=3)
+        path, checksum = handler.download_with_checksum(
+            f'{server.url}/model.tar.gz', tmp_path
+        )
+    finally:
+        server.shutdown()
+
+    assert path == tmp_path / 'model.tar.gz'
+    assert path.read_bytes() == archive
+    assert checksum == hashlib.md5(archive).hexdigest()
+    n_chunks = (len(archive) + 999) // 1000
+    assert len(server.requests) == (n_chunks if accept_ranges else 1)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_resume_download(tmp_path, archive):
+    """Interrupted download is resumed from the downloaded chunks."""
+
+    server = run_server({'/model.tar.gz': archive})
+    url = f'{server.url}/model.tar.gz'
+    handler = HTTPFileHandler(chunk_size=1000, max_connections=2)
+    server.failing_ranges.add(3000)
+    try:
+        with pytest.raises(requests.HTTPError):
+            handler.download_with_checksum(url, tmp_path)
+        with open(tmp_path / 'model.tar.gz.part.json') as f:
+            downloaded = json.load(f)['downloaded']
+        assert 3 not in downloaded
+
+        server.failing_ranges.clear()
+        server.requests.clear()
+        path, checksum = handler.download_with_checksum(url, tmp_path)
+    finally:
+        server.shutdown()
+
+    assert path.read_bytes() == archive
+    assert checksum == hashlib.md5(archive).hexdigest()
+    assert len(server.requests) == (len(archive) + 999) // 1000 - len(downloaded)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_process_remote(tmp_path, archive):
+    """Archive and checksum are downloaded, the archive is verified and unpacked."""
+
+    server = run_server(
+        {
+            '/model.tar.gz': archive,
+            '/model.md5': f'{hashlib.md5(archive).hexdigest()}  model.tar.gz\n'.encode(),
+            '/invalid.md5': b'0' * 32,
+        }
+    )
+    remote = RemoteFile(
+        url=f'{server.url}/model.tar.gz',
+        checksum_url=f'{server.url}/model.md5',
+        parameters={'chunk_size': 1000},
+    )
+    invalid_remote = RemoteFile(
+        url=f'{server.url}/model.tar.gz',
+        checksum_url=f'{server.url}/invalid.md5',
+    )
+    try:
+        process_remote(remote, tmp_path / 'downloads', tmp_path / 'model')
+        with pytest.raises(Exception, match='Checksum'):
+            process_remote(
+                invalid_remote, tmp_path / 'downloads-2', tmp_path / 'model-2'
+            )
+    finally:
+        server.shutdown()
+
+    assert sorted(x.name for x in (tmp_path / 'model').iterdir()) == [
+        'config.txt',
+        'model.onnx',
+    ]
+
+
+@pytest.mark.parametrize('with_checksum', [True, False])
+def test_remote_file_cache(tmp_path, archive, with_checksum):
+    """Modules share one download of an archive, files are hard-linked
+    when they are protected from writing, least recently used entries
+    are evicted."""
+
+    other_archive = build_archive() + b'\0' * 1024
+    server = run_server(
+        {
+            '/model.tar.gz': archive,
+            '/other.tar.gz': other_archive,
+            '/model.md5': hashlib.md5(archive).hexdigest().encode(),
+        }
+    )
+    remote = RemoteFile(
+        url=f'{server.url}/model.tar.gz',
+        checksum_url=f'{server.url}/model.md5' if with_checksum else None,
+    )
+    other_remote = RemoteFile(url=f'{server.url}/other.tar.gz')
+    cache = RemoteFileCache(tmp_path / 'cache', max_size=15000)
+    try:
+        process_remotes(
+            [
+                (remote, tmp_path / f'downloads-{i}', tmp_path / f'model-{i}')
+                for i in range(3)
+            ],
+            cache=cache,
+        )
+        archive_requests = server.requests.copy()
+        process_remote(
+            other_remote, tmp_path / 'downloads-3', tmp_path / 'model-3', cache=cache
+        )
+    finally:
+        server.shutdown()
+
+    # archive is downloaded once when its checksum is known
+    assert len(archive_requests) == (4 if with_checksum else 3)
+    model_files = [tmp_path / f'model-{i}' / 'model.onnx' for i in range(3)]
+    if os.access(model_files[0], os.W_OK):
+        # read-only files are writable for the process, they are copied
+        assert len({x.stat().st_ino for x in model_files}) == 3
+    else:
+        assert len({x.stat().st_ino for x in model_files}) == 1
+        assert model_files[0].stat().st_nlink == 3
+    # the first archive is evicted, its files are kept in the modules
+    assert [x.name for x in (tmp_path / 'cache' / 'entries').iterdir()] == [
+        cache.get_key(other_remote.url, hashlib.md5(other_archive).hexdigest())
+    ]
+    assert all(x.read_bytes() == model_files[0].read_bytes() for x in model_files)
+    assert sorted(x.name for x in (tmp_path / 'model-3').iterdir()) == [
+        'config.txt',
+        'model.onnx',
+    ]
+
+
+def test_ordered_checksum(tmp_path, archive):
+    """Out-of-order chunks are read back from the file, not kept in memory."""
+
+    path = tmp_path / 'model.tar.gz'
+    path.write_bytes(archive)
+    chunk_size = 1000
+    chunks = [archive[i : i + chunk_size] for i in range(0, len(archive), chunk_size)]
+    with open(path, 'rb') as f:
+        checksum = OrderedChecksum(f.fileno(), chunk_size)
+        for chunk_idx in reversed(range(1, len(chunks))):
+            checksum.add(chunk_idx, chunks[chunk_idx])
+            assert checksum.pending[chunk_idx] is None
+        checksum.add(0, chunks[0])
+
+    assert not checksum.pending
+    assert checksum.hexdigest() == hashlib.md5(archive).hexdigest()
+
+
+def test_remote_file_cache_read_only(tmp_path, archive):
+    """Rewriting a materialized file doesn't modify the cached one."""
+
+    server = run_server({'/model.tar.gz': archive})
+    remote = RemoteFile(url=f'{server.url}/model.tar.gz')
+    cache = RemoteFileCache(tmp_path / 'cache')
+    try:
+        process_remote(
+            remote, tmp_path / 'downloads-0', tmp_path / 'model-0', cache=cache
+        )
+        model_file = tmp_path / 'model-0' / 'model.onnx'
+        if os.access(model_file, os.W_OK):
+            model_file.write_bytes(b'engine')
+        else:
+            with pytest.raises(PermissionError):
+                model_file.write_bytes(b'engine')
+        process_remote(
+            remote, tmp_path / 'downloads-1', tmp_path / 'model-1', cache=cache
+        )
+    finally:
+        server.shutdown()
+
+    cached_files = list((tmp_path / 'cache' / 'entries').glob('*/files/*'))
+    assert len(cached_files) == 2
+    assert all(not x.stat().st_mode & 0o222 for x in cached_files)
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        expected = tar.extractfile('model.onnx').read()
+    assert (tmp_path / 'model-1' / 'model.onnx').read_bytes() == expected
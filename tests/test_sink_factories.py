@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+
+from savant.config.schema import SinkElement
+from savant.utils.sink_factories import (
+    AsyncSink,
+    MultiSinkFactory,
+    SinkEndOfStream,
+    SinkFactory,
+    SinkOverflowPolicy,
+    SinkQueue,
+    SinkQueueConfig,
+    SinkVideoFrame,
+    sink_factory,
+)
+
+
+class RecordingSinkFactory(SinkFactory):
+    def __init__(self, name: str, delay: float = 0, fail_on: int = None):
+        self.name = name
+        self.delay = delay
+        self.fail_on = fail_on
+        self.received = []
+
+    def get_sink(self):
+        def send_message(msg, **kwargs):
+            if self.fail_on is not None and len(self.received) == self.fail_on:
+                raise ValueError('sink failure')
+            time.sleep(self.delay)
+            self.received.append(msg)
+
+        return send_message
+
+
+def frame(source_id: str, idx: int) -> SinkVideoFrame:
+    return SinkVideoFrame(video_frame=(source_id, idx), frame=None)
+
+
+def eos(source_id: str) -> SinkEndOfStream:
+    return SinkEndOfStream(eos=source_id)
+
+
+def test_multi_sink_keeps_order():
+    """Every sink receives all messages in the original order,
+    a slow sink doesn't delay a fast one."""
+
+    slow = RecordingSinkFactory('slow', delay=0.01)
+    fast = RecordingSinkFactory('fast')
+    sink = MultiSinkFactory(
+        slow,
+        fast,
+        queue_configs=[SinkQueueConfig(100), SinkQueueConfig(100)],
+    ).get_sink()
+    messages = [frame(f'source-{i % 3}', i) for i in range(30)]
+    started = time.time()
+    for msg in messages:
+        sink(msg)
+    assert time.time() - started < 0.3 * len(messages) * slow.delay
+    sink.close()
+
+    assert slow.received == messages
+    assert fast.received == messages
+
+
+@pytest.mark.parametrize(
+    'overflow_policy,expected',
+    [
+        (SinkOverflowPolicy.DROP_NEWEST, [0, 1, 'eos']),
+        (SinkOverflowPolicy.DROP_OLDEST, [3, 4, 'eos']),
+    ],
+)
+def test_sink_queue_drop(overflow_policy, expected):
+    """Only video frames are dropped when the queue is full."""
+
+    queue = SinkQueue(SinkQueueConfig(2, overflow_policy))
+    dropped = sum(queue.put(frame('test', i), {}) for i in range(5))
+    put_eos = threading.Thread(target=queue.put, args=(eos('test'), {}))
+    put_eos.start()
+    time.sleep(0.01)
+    assert put_eos.is_alive()
+
+    received = []
+    while len(received) < 3:
+        msg, _ = queue.get()
+        received.append(
+            msg.video_frame[1] if isinstance(msg, SinkVideoFrame) else 'eos'
+        )
+    put_eos.join()
+
+    assert dropped == 3
+    assert received == expected
+
+
+def test_multi_sink_error():
+    """Sink error is raised in the sending thread, other sinks are not affected."""
+
+    failing = RecordingSinkFactory('failing', fail_on=2)
+    other = RecordingSinkFactory('other')
+    sink = MultiSinkFactory(
+        failing,
+        other,
+        queue_configs=[SinkQueueConfig(1), SinkQueueConfig(1)],
+    ).get_sink()
+    with pytest.raises(RuntimeError, match='failing'):
+        for i in range(100):
+            sink(frame('test', i))
+            time.sleep(0.001)
+    assert len(other.received) >= 2
+
+
+def test_sink_factory_queue_config():
+    """Sinks with a queue are asynchronous when the pipeline has several sinks."""
+
+    sink = sink_factory(
+        [
+            SinkElement(
+                element='devnull_sink', queue_size=10, overflow_policy='drop_oldest'
+            ),
+            SinkElement(element='devnull_sink'),
+        ]
+    )
+    assert isinstance(sink._sinks[0], AsyncSink)
+    assert not isinstance(sink._sinks[1], AsyncSink)
+    sink(eos('test'))
+    sink.close()
+    assert sink._sinks[0].sent == 1
+
+    with pytest.raises(ValueError):
+        sink_factory([SinkElement(element='devnull_sink', overflow_policy='unknown')])
+
+
+def test_multi_sink_close_after_error():
+    """All sinks are closed when one of them failed."""
+
+    failing = RecordingSinkFactory('failing', fail_on=0)
+    other = RecordingSinkFactory('other', delay=0.01)
+    sink = MultiSinkFactory(
+        failing,
+        other,
+        queue_configs=[SinkQueueConfig(10), SinkQueueConfig(10)],
+    ).get_sink()
+    sink(frame('test', 0))
+    sink(eos('test'))
+    with pytest.raises(RuntimeError, match='failing'):
+        sink.close()
+    assert other.received == [frame('test', 0), eos('test')]
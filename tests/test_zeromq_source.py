@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+
+from savant.utils.zeromq import AsyncZeroMQSource
+
+
+class FailingReader:
+    """Reader failing to receive messages."""
+
+    def __init__(self):
+        self.n_receives = 0
+
+    def is_started(self):
+        return True
+
+    def receive(self):
+        self.n_receives += 1
+        raise RuntimeError('receive failed')
+
+
+def test_async_source_raises_on_each_receive_error(tmp_path):
+    """Every call fails while the reader fails, calls don't hang."""
+
+    source = AsyncZeroMQSource(f'sub+bind:ipc://{tmp_path}/input', prefetch=2)
+    reader = FailingReader()
+    source.reader = reader
+
+    async def receive():
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match='receive failed'):
+                await asyncio.wait_for(source.next_message(), 5)
+
+    try:
+        asyncio.run(receive())
+    finally:
+        source._stop_receiver()
+    assert reader.n_receives == 3
+
+
+class ListReader:
+    """Reader receiving messages from the list."""
+
+    def __init__(self, results):
+        self.results = list(results)
+
+    def is_started(self):
+        return True
+
+    def receive(self):
+        if self.results:
+            return self.results.pop(0)
+        time.sleep(0.01)
+        return None
+
+
+def test_async_source_used_from_different_loops(tmp_path):
+    """Prefetched messages are received in the next event loop."""
+
+    source = AsyncZeroMQSource(f'sub+bind:ipc://{tmp_path}/input', prefetch=3)
+    source.reader = ListReader(range(5))
+    source._build_result = lambda result: result
+
+    async def receive(n):
+        return [await asyncio.wait_for(source.next_message(), 5) for _ in range(n)]
+
+    try:
+        assert asyncio.run(receive(1)) == [0]
+        assert asyncio.run(receive(4)) == [1, 2, 3, 4]
+    finally:
+        source._stop_receiver()